@@ -36,6 +36,7 @@ if "health" in query_params:
 from components.cluster_view_simple import display_clustered_insight_cards
 from components.enhanced_insight_view import render_insight_cards
 from components.floating_filters import render_floating_filters, filter_by_time
+from components.keyword_matcher import register_groups, match_insight
 
 # ─────────────────────────────────────────────
 # Env & model
@@ -147,8 +148,24 @@ def _is_true_price_guide_signal(item):
         return True
     return False
 
+# Promotional / marketing content: seller self-promo tweets, platform marketing, giveaway
+# announcements — NOT customer feedback. They pollute retrieval and inflate competitive signals.
+# Matched through the shared keyword matcher, so the scan is reused by workstream routing.
+_PROMO_PATTERNS = [
+    "we are live on", "we're live on", "going live on", "live right now",
+    "come join the show", "join the show", "join us live",
+    "free giveaway", "giveaway every", "giving away",
+    "use code ", "use my link", "use this link", "sign up for",
+    "check out my", "follow me on", "subscribe to",
+    "auctioning vintage cards of stars",  # Just Collect promo template
+    "register your interest",  # eBay Live marketing
+    "and we are live:",  # Platform PR headlines
+    "beauty is winning on whatnot",  # PR/marketing article
+]
+register_groups({"app.promo": _PROMO_PATTERNS})
+
 def normalize_insight(i, suggestion_cache):
-    i["ideas"] = suggestion_cache.get(i.get("text",""), [])
+    i["ideas"] = suggestion_cache.get(i.get("text","")) or i.get("ideas") or []
     i["persona"] = i.get("persona", "Unknown")
     i["journey_stage"] = i.get("journey_stage", "Unknown")
 
@@ -208,22 +225,9 @@ def normalize_insight(i, suggestion_cache):
     i["evidence_count"] = i.get("evidence_count", 1)
     i["last_seen"] = i.get("last_seen") or i.get("_logged_date") or i.get("post_date") or "Unknown"
 
-    # ── Promotional / marketing content detection ──
-    # These are seller self-promo tweets, platform marketing, giveaway announcements —
-    # NOT customer feedback. They pollute retrieval and inflate competitive signals.
+    # ── Promotional / marketing content detection (see _PROMO_PATTERNS) ──
     _combined_lower = (i.get("text", "") + " " + i.get("title", "")).lower()
-    _PROMO_PATTERNS = [
-        "we are live on", "we're live on", "going live on", "live right now",
-        "come join the show", "join the show", "join us live",
-        "free giveaway", "giveaway every", "giving away",
-        "use code ", "use my link", "use this link", "sign up for",
-        "check out my", "follow me on", "subscribe to",
-        "auctioning vintage cards of stars",  # Just Collect promo template
-        "register your interest",  # eBay Live marketing
-        "and we are live:",  # Platform PR headlines
-        "beauty is winning on whatnot",  # PR/marketing article
-    ]
-    i["_is_promotional"] = any(p in _combined_lower for p in _PROMO_PATTERNS)
+    i["_is_promotional"] = match_insight(i, _combined_lower).any("app.promo")
 
     return i
 
@@ -388,9 +392,19 @@ st.title("📡 SignalSynth")
 st.caption("AI-powered collectibles insight engine — community signals → actionable intelligence")
 
 @st.cache_data(ttl=600, show_spinner=False)
-def _load_json(path):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+def _load_json(path, stamp=None):
+    # `stamp` (size, mtime) re-reads a file as soon as the pipeline rewrites it
+    # Record files (JSON arrays / .jsonl) are parsed incrementally instead of via one big string
+    from components.record_stream import read_json
+    return read_json(path)
+
+@st.cache_resource(show_spinner=False)
+def _load_suggestion_ideas(insights_stamp, cache_stamps):
+    # PM ideas from the shared LLM cache (pm_ideas namespace), by insight text; keyed on the
+    # stamps of the insights file and the cache shard, so new suggestions show up on the next run
+    from components.ai_suggester import cached_pm_ideas
+    from components.retriever_registry import INSIGHTS_PATH
+    return cached_pm_ideas(_load_json(INSIGHTS_PATH, insights_stamp))
 
 def _load_json_safe(path, default=None):
     try:
@@ -398,11 +412,32 @@ def _load_json_safe(path, default=None):
     except Exception:
         return default if default is not None else []
 
+@st.cache_resource(show_spinner=False)
+def _load_insight_columns(source_stamp, _insights):
+    # Keyed on the JSON's (size, mtime) so a pipeline refresh re-opens the memory-mapped columns;
+    # the store itself is validated by content digest, so a fresh checkout still uses it
+    from components.insight_columns import load_insight_columns
+    return load_insight_columns(insights=_insights)
+
+def _insight_columns(scraped, extra):
+    """Columnar views for vectorized KPI counts: (pipeline insights, pipeline + ad-hoc)."""
+    from components.insight_columns import InsightColumns
+    cols = None
+    try:
+        from components.retriever_registry import file_stamp
+        cols = _load_insight_columns(file_stamp("precomputed_insights.json"), scraped)
+    except Exception:
+        pass
+    if cols is None or len(cols) != len(scraped):
+        cols = InsightColumns.build(scraped)
+    return cols, (InsightColumns.concat([cols, InsightColumns.build(extra)]) if extra else cols)
+
 # ─────────────────────────────────────────────
 # Data load
 # ─────────────────────────────────────────────
 try:
-    scraped_insights = _load_json("precomputed_insights.json")
+    from components.retriever_registry import file_stamp, INSIGHTS_PATH
+    scraped_insights = _load_json(INSIGHTS_PATH, file_stamp(INSIGHTS_PATH))
     # Validate insights structure
     if not isinstance(scraped_insights, list):
         st.error("Insights data corrupted - not a list")
@@ -410,7 +445,12 @@ try:
     if len(scraped_insights) == 0:
         st.warning("No insights data available")
         scraped_insights = []
-    cache = _load_json_safe("gpt_suggestion_cache.json", default={})
+    try:
+        from components.llm_cache import shard_path
+        _pm_shard = shard_path("pm_ideas")
+        cache = _load_suggestion_ideas(file_stamp(INSIGHTS_PATH), (file_stamp(_pm_shard), file_stamp(_pm_shard + "-wal")))
+    except Exception:
+        cache = {}
 
     competitor_posts_raw = _load_json_safe("data/scraped_competitor_posts.json")
 
@@ -434,20 +474,28 @@ try:
         clusters_data = {"clusters": []}
     clusters_count = len(clusters_data.get("clusters", []))
 
-    adhoc_raw = _load_json_safe("data/adhoc_scraped_posts.json")
+    try:
+        from utils.adhoc_store import load_adhoc_posts
+        adhoc_raw = load_adhoc_posts()
+    except Exception:
+        adhoc_raw = []
 
     normalized = [normalize_insight(i, cache) for i in scraped_insights]
 
-    # Initialize hybrid retriever for Ask AI (graceful fallback to legacy scoring)
+    # Initialize hybrid retriever for Ask AI (graceful fallback to legacy scoring).
+    # One retriever per published artifact set is shared by every session; the session
+    # only holds a lease on it (released when the session ends or moves to a newer one).
     _hybrid_retriever = None
     try:
         from components.hybrid_retrieval import HybridRetriever
-        # Cache key: insight count + first fingerprint (changes when data refreshes)
-        _retriever_key = f"{len(normalized)}_{normalized[0].get('fingerprint','') if normalized else ''}"
-        if "_hybrid_retriever_cache" not in st.session_state or st.session_state.get("_retriever_key") != _retriever_key:
-            st.session_state["_hybrid_retriever_cache"] = HybridRetriever(normalized)
-            st.session_state["_retriever_key"] = _retriever_key
-        _hybrid_retriever = st.session_state["_hybrid_retriever_cache"]
+        from components.retriever_registry import get_retriever_registry, artifact_key
+        _retriever_key = artifact_key()
+        _lease = st.session_state.get("_retriever_lease")
+        if _lease is None or _lease.key != _retriever_key:
+            _snapshot = list(normalized)  # adhoc posts are added to the retriever below
+            _lease = get_retriever_registry().acquire(_retriever_key, lambda: HybridRetriever(_snapshot))
+            st.session_state["_retriever_lease"] = _lease
+        _hybrid_retriever = _lease.retriever
     except Exception as _retriever_err:
         pass  # Fall back to legacy retrieval
 
@@ -478,8 +526,16 @@ try:
         p.setdefault("signal_strength", 30)
         normalized.append(p)
 
+    # Index adhoc posts in the shared retriever (already-indexed posts are skipped)
+    if _hybrid_retriever is not None and adhoc_raw:
+        try:
+            _hybrid_retriever.add_documents(adhoc_raw)
+        except Exception as _add_err:
+            print(f"[RETRIEVAL] Could not index adhoc posts: {_add_err}")
+
     total = len(normalized)
-    complaints = sum(1 for i in normalized if _taxonomy_type(i) == "Complaint" or i.get("brand_sentiment") == "Negative")
+    _scraped_cols, _cols = _insight_columns(normalized[:len(scraped_insights)], normalized[len(scraped_insights):])
+    complaints = _cols.count(_cols.mask(type="Complaint") | _cols.mask(sentiment="Negative"))
     
     # Read accurate pipeline stats (written by quick_process.py)
     _pipeline_meta = {}
@@ -491,15 +547,13 @@ try:
 
     total_posts = _pipeline_meta.get("total_posts_loaded", len(scraped_insights))
 
-    dates = [i.get("post_date", "") for i in scraped_insights if i.get("post_date")]
+    dates = _scraped_cols.date_range()
     date_range = ""
     if dates:
-        valid_dates = sorted([d for d in dates if d and len(d) >= 10])
-        if valid_dates:
-            _recent_3d = (datetime.now() - timedelta(days=3)).strftime("%Y-%m-%d")
-            recent_count = sum(1 for d in dates if d >= _recent_3d)
-            
-            date_range = f"{valid_dates[0]} to {valid_dates[-1]} ({recent_count:,} posts in last 3 days)"
+        _recent_3d = (datetime.now() - timedelta(days=3)).strftime("%Y-%m-%d")
+        recent_count = _scraped_cols.count(since=_recent_3d)
+        
+        date_range = f"{dates[0]} to {dates[1]} ({recent_count:,} posts in last 3 days)"
 
 except Exception as e:
     st.error(f"Failed to load data: {e}")
@@ -528,7 +582,7 @@ if _refresh_ts_header:
         
         _recent_cutoff = (datetime.now() - timedelta(days=3)).strftime("%Y-%m-%d")
         if dates:
-            recent_posts = sum(1 for d in dates if d >= _recent_cutoff)
+            recent_posts = _scraped_cols.count(since=_recent_cutoff)
             if recent_posts > 100:
                 _freshness_label += " 🆕"
     except Exception:
@@ -621,6 +675,10 @@ else:
         "What are the biggest authentication and grading pain points, and how do they affect buyer trust?",
         "What are the signals around instant offers and liquidity — who's winning and why?",
     ]
+    # Pre-encode the example prompts (shared encoder + disk cache, so this is a no-op after the first session)
+    if _hybrid_retriever is not None and not st.session_state.get("_rp_warmed"):
+        _hybrid_retriever.warm_encoder(_rp_options[1:])
+        st.session_state["_rp_warmed"] = True
     def _on_prompt_select():
         val = st.session_state.get("_rp_select", "")
         if val:
@@ -825,12 +883,12 @@ else:
             _triangulation_block = "\n\nCROSS-SOURCE CORROBORATION (high confidence — multiple independent sources agree):\n" + "\n".join(_triangulated[:8])
 
         # ── Aggregate intelligence context ──
-        total_neg = sum(1 for i in normalized if i.get("brand_sentiment") == "Negative")
-        total_pos = sum(1 for i in normalized if i.get("brand_sentiment") == "Positive")
-        total_complaints = sum(1 for i in normalized if _taxonomy_type(i) == "Complaint")
-        total_features = sum(1 for i in normalized if _taxonomy_type(i) == "Feature Request")
-        total_churn = sum(1 for i in normalized if i.get("type_tag") == "Churn Signal")
-        total_praise = sum(1 for i in normalized if i.get("type_tag") == "Praise")
+        total_neg = _cols.count(sentiment="Negative")
+        total_pos = _cols.count(sentiment="Positive")
+        total_complaints = _cols.count(type="Complaint")
+        total_features = _cols.count(type="Feature Request")
+        total_churn = _cols.count(type="Churn Signal")
+        total_praise = _cols.count(type="Praise")
         subtag_counts = defaultdict(int)
         type_counts = defaultdict(int)
         for i in normalized:
@@ -1823,10 +1881,22 @@ RELEVANT SIGNALS (sorted by relevance to the question):
     if st.session_state.get("_adhoc_scrape_pending"):
         adhoc_topic = st.session_state.pop("_adhoc_scrape_pending")
         adhoc_question = st.session_state.pop("_adhoc_reask_question", adhoc_topic)
-        with st.spinner(f"🔍 Live-scraping 6 sources (Google News, Bing News, Reddit, Twitter/X, YouTube, Bluesky) for \"{adhoc_topic}\"..."):
+        _adhoc_label = f"🔍 Live-scraping 6 sources (Google News, Bing News, Reddit, Twitter/X, YouTube, Bluesky) for \"{adhoc_topic}\""
+        with st.status(f"{_adhoc_label}...", expanded=True) as _adhoc_status:
             try:
                 from utils.adhoc_scrape import run_adhoc_scrape
-                new_posts, summary = run_adhoc_scrape(adhoc_topic)
+
+                # Searches run concurrently; show each one as it lands
+                def _on_adhoc_source(source, query, posts, done, total):
+                    _adhoc_status.update(label=f"{_adhoc_label} — {done}/{total} searches done")
+                    top = max(posts, key=lambda p: p.get("_relevance_score", 0), default=None)
+                    line = f"✓ **{source}** · {query}: {len(posts)} posts"
+                    if top is not None:
+                        line += f" — _{top.get('title', '')[:90]}_"
+                    _adhoc_status.write(line)
+
+                new_posts, summary = run_adhoc_scrape(adhoc_topic, on_source=_on_adhoc_source)
+                _adhoc_status.update(label=f"📡 Ad-hoc scrape complete for \"{adhoc_topic}\"", state="complete")
                 st.session_state["qa_messages"].append({
                     "role": "assistant",
                     "content": f"📡 **Ad-hoc scrape complete.** {summary}\n\nRe-analyzing with new data...",
@@ -1844,6 +1914,7 @@ RELEVANT SIGNALS (sorted by relevance to the question):
                 # Trigger re-ask by setting state
                 st.session_state["_adhoc_reask"] = adhoc_question
             except Exception as e:
+                _adhoc_status.update(state="error")
                 st.session_state["qa_messages"].append({
                     "role": "assistant",
                     "content": f"⚠️ Ad-hoc scrape failed: {e}",
@@ -3603,19 +3674,19 @@ with tabs[0]:
 
     from collections import Counter as _PulseCounter
     _14d_ago = (datetime.now() - __import__('datetime').timedelta(days=14)).strftime("%Y-%m-%d")
-    _recent = [i for i in normalized if (i.get("post_date", "") or "") >= _14d_ago]
-
-    _pulse_neg = sum(1 for i in normalized if i.get("brand_sentiment") in ("Negative", "Complaint"))
-    _pulse_pos = sum(1 for i in normalized if i.get("brand_sentiment") in ("Positive", "Praise"))
-    _pulse_complaints = sum(1 for i in normalized if _taxonomy_type(i) == "Complaint")
-    _pulse_churn = sum(1 for i in normalized if i.get("type_tag") == "Churn Signal")
-    _pulse_requests = sum(1 for i in normalized if _taxonomy_type(i) == "Feature Request")
-
-    _recent_neg = sum(1 for i in _recent if i.get("brand_sentiment") in ("Negative", "Complaint"))
-    _recent_complaints = sum(1 for i in _recent if _taxonomy_type(i) == "Complaint")
-    _recent_churn = sum(1 for i in _recent if i.get("type_tag") == "Churn Signal")
-    _recent_requests = sum(1 for i in _recent if _taxonomy_type(i) == "Feature Request")
-    _recent_pos = sum(1 for i in _recent if i.get("brand_sentiment") in ("Positive", "Praise"))
+    _recent = _cols.dated(since=_14d_ago)
+
+    _pulse_neg = _cols.count(sentiment=["Negative", "Complaint"])
+    _pulse_pos = _cols.count(sentiment=["Positive", "Praise"])
+    _pulse_complaints = _cols.count(type="Complaint")
+    _pulse_churn = _cols.count(type="Churn Signal")
+    _pulse_requests = _cols.count(type="Feature Request")
+
+    _recent_neg = _cols.count(_recent, sentiment=["Negative", "Complaint"])
+    _recent_complaints = _cols.count(_recent, type="Complaint")
+    _recent_churn = _cols.count(_recent, type="Churn Signal")
+    _recent_requests = _cols.count(_recent, type="Feature Request")
+    _recent_pos = _cols.count(_recent, sentiment=["Positive", "Praise"])
 
     _ep1, _ep2, _ep3, _ep4, _ep5 = st.columns(5)
     _ep1.metric("Negative", _pulse_neg, delta=f"{_recent_neg} in 14d", delta_color="inverse" if _recent_neg else "off")
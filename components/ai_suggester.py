@@ -1,6 +1,6 @@
 # components/ai_suggester.py - env-driven GPT, cache-safe doc builders, VP critique loop
 
-import os, json, hashlib, tempfile
+import os, hashlib, tempfile
 from dotenv import load_dotenv
 from openai import OpenAI
 def _get_Document():
@@ -45,7 +45,7 @@ def _get_openai_key():
     return None
 
 _api_key = _get_openai_key()
-client = OpenAI(api_key=_api_key) if _api_key else None
+client = OpenAI(api_key=_api_key, max_retries=0) if _api_key else None
 
 # Prefer Streamlit secrets (remote deploy), then env vars (local dev).
 def _get_model_setting(key, default):
@@ -67,32 +67,32 @@ MODEL_MAIN = _get_model_setting(
 )
 MODEL_FALLBACK = _get_model_setting("OPENAI_MODEL_FALLBACK", "gpt-4.1")
 MODEL_MINI = _get_model_setting("OPENAI_MODEL_SCREENER", "gpt-4.1-mini")
-CACHE_PATH = "gpt_suggestion_cache.json"
+CACHE_PATH = "gpt_suggestion_cache.json"  # legacy JSON cache, imported into the shared LLM cache once
 
 
-def _load_cache():
-    if os.path.exists(CACHE_PATH):
-        try:
-            with open(CACHE_PATH, "r", encoding="utf-8") as f:
-                content = f.read().strip()
-                return json.loads(content) if content else {}
-        except Exception:
-            return {}
-    return {}
+def _sugg_cache():
+    from components.llm_cache import get_cache
+    return get_cache("pm_ideas", legacy_json=CACHE_PATH)
 
 
-_sugg_cache = _load_cache()
+def cache_and_return(key, value):
+    return _sugg_cache().put(key, value)
 
 
-def _save_cache():
-    with open(CACHE_PATH, "w", encoding="utf-8") as f:
-        json.dump(_sugg_cache, f, indent=2)
+def pm_ideas_key(text, brand="eBay"):
+    """Cache key of generate_pm_ideas(text, brand)."""
+    return hashlib.md5(f"{text}_{brand}".encode()).hexdigest()
 
 
-def cache_and_return(key, value):
-    _sugg_cache[key] = value
-    _save_cache()
-    return value
+def cached_pm_ideas(insights):
+    """text → cached PM ideas for insights (by text + target_brand), in one batched cache read."""
+    keys = {}
+    for i in insights:
+        text = i.get("text", "")
+        if text:
+            keys.setdefault(pm_ideas_key(text, i.get("target_brand")), text)
+    found = _sugg_cache().get_many(keys)
+    return {keys[k]: v for k, v in found.items() if v}
 
 
 def clean_gpt_input(text, max_words=1000):
@@ -174,14 +174,18 @@ def generate_exec_summary():
 _REASONING_MODELS = {"o3-mini", "o3", "o1", "o1-mini", "o1-pro"}
 
 
-def _chat(model, system, user, max_completion_tokens=2000, temperature=0.3, reasoning_effort="high"):
+def _chat(model, system, user, max_completion_tokens=2000, temperature=0.3, reasoning_effort="high", lane="interactive"):
     """
-    Wrapper around chat.completions.create.
+    Wrapper around chat.completions.create, routed through the shared LLM scheduler.
     Automatically adapts parameters for reasoning models (o-series) vs standard models.
+    App calls use the "interactive" lane; pipeline callers pass lane="batch".
     """
     if client is None:
         return f"[LLM disabled] {system}\n\n{user[:800]}"
 
+    from components.llm_scheduler import get_scheduler
+    scheduler = get_scheduler(lane)
+
     def _call(model_name):
         is_reasoning = any(model_name.startswith(r) for r in _REASONING_MODELS)
         if is_reasoning:
@@ -199,7 +203,8 @@ def _chat(model, system, user, max_completion_tokens=2000, temperature=0.3, reas
             messages = [{"role": "user", "content": combined_prompt}]
             # Use at least 10000 tokens for reasoning models to ensure output space
             reasoning_tokens = max(max_completion_tokens * 3, 10000)
-            resp = client.chat.completions.create(
+            resp = scheduler.complete(
+                client,
                 model=model_name,
                 messages=messages,
                 max_completion_tokens=reasoning_tokens,
@@ -210,7 +215,8 @@ def _chat(model, system, user, max_completion_tokens=2000, temperature=0.3, reas
                 {"role": "system", "content": system},
                 {"role": "user", "content": user},
             ]
-            resp = client.chat.completions.create(
+            resp = scheduler.complete(
+                client,
                 model=model_name,
                 messages=messages,
                 temperature=temperature,
@@ -260,10 +266,11 @@ def generate_gpt_doc(prompt, title, max_tokens=4000):
         return f"⚠️ GPT Error: {e}"
 
 
-def generate_pm_ideas(text, brand="eBay"):
-    key = hashlib.md5(f"{text}_{brand}".encode()).hexdigest()
-    if key in _sugg_cache:
-        return _sugg_cache[key]
+def generate_pm_ideas(text, brand="eBay", lane="interactive"):
+    key = pm_ideas_key(text, brand)
+    cached = _sugg_cache().get(key)
+    if cached is not None:
+        return cached
 
     prompt = (
         "You are a senior PM at a marketplace like eBay.\n"
@@ -277,6 +284,7 @@ def generate_pm_ideas(text, brand="eBay"):
             prompt,
             max_completion_tokens=320,
             temperature=0.2,
+            lane=lane,
         )
         # If offline stub, just return one idea with trimmed prompt context
         if ideas.startswith("[LLM disabled]"):
@@ -297,7 +305,7 @@ def generate_pm_ideas_batch(texts, brand="eBay"):
     results = []
     for t in (texts or []):
         try:
-            results.append(generate_pm_ideas(text=t, brand=brand))
+            results.append(generate_pm_ideas(text=t, brand=brand, lane="batch"))
         except Exception as e:
             results.append([f"[GPT error: {e}]"])
     return results
@@ -0,0 +1,411 @@
+# ann_index.py — IVF-PQ approximate-nearest-neighbour index over precomputed embeddings, memory-mapped at load
+#
+# HybridRetriever's dense half scored every row (embeddings @ q) and argsorted all of them,
+# with the full float32 matrix in RAM. This index is built once by the pipeline's embed step:
+#   1. Spherical k-means (numpy) splits the normalized vectors into `nlist` inverted lists
+#   2. Each vector is product-quantized: split into `m` sub-vectors of `dsub` dims, each
+#      stored as a uint8 code into a 256-entry codebook (768-d e5 → 96 bytes per row)
+#   3. Codes, original row ids and a float16 copy of the vectors are stored grouped by
+#      list (CSR indptr), with the fingerprint of every row. Each list's codes are stored
+#      sub-quantizer-major (an (m, rows) block) so scoring reads them contiguously
+#   4. At query time the `nprobe` nearest lists are scored from their codes through a
+#      per-query lookup table; only the best `rerank` candidates are re-scored against
+#      their float16 vectors. Top-k uses np.argpartition, never a full sort
+#
+# Centroids, codebooks and codes are memory-mapped read-only. The float16 vectors are
+# read with plain file reads (only the `rerank` rows a query needs), because a page
+# fault on a mapped file can pull a whole large folio into the process' RSS — resident
+# memory stays near the size of the codes, not the matrix.
+# faiss / hnswlib are not dependencies of this repo, so the index is plain .npy files.
+#
+# Usage:
+#   index = IVFPQIndex.build(embeddings, fingerprints)
+#   index.save("precomputed_ann", meta={"model": ...})
+#   index = IVFPQIndex.load("precomputed_ann")
+#   rows, sims = index.search(query_embedding, k=50)
+
+import os
+import json
+import math
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+_ARRAYS = ("centroids", "codebooks", "indptr", "row_ids", "codes", "vectors")
+_KSUB = 256
+
+
+def top_k_desc(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k largest scores, best first (argpartition + sort of the k)."""
+    n = scores.shape[0]
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    if n > k:
+        part = np.argpartition(-scores, k - 1)[:k]
+    else:
+        part = np.arange(n)
+    return part[np.argsort(-scores[part], kind="stable")]
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray, batch: int = 16384) -> np.ndarray:
+    """Nearest centroid (max inner product) for every row, in batches."""
+    out = np.empty(vectors.shape[0], dtype=np.int32)
+    for start in range(0, vectors.shape[0], batch):
+        block = np.asarray(vectors[start:start + batch], dtype=np.float32)
+        out[start:start + batch] = np.argmax(block @ centroids.T, axis=1)
+    return out
+
+
+def _sample_rows(vectors: np.ndarray, take: int, rng) -> np.ndarray:
+    n = vectors.shape[0]
+    rows = np.sort(rng.choice(n, size=take, replace=False)) if take < n else np.arange(n)
+    return np.asarray(vectors[rows], dtype=np.float32)
+
+
+def spherical_kmeans(
+    vectors: np.ndarray,
+    nlist: int,
+    iters: int = 10,
+    sample: int = 64,
+    seed: int = 0,
+) -> np.ndarray:
+    """Unit-norm centroids trained on up to `sample` rows per list."""
+    rng = np.random.default_rng(seed)
+    train = _normalize(_sample_rows(vectors, min(vectors.shape[0], nlist * sample), rng))
+    take = train.shape[0]
+    centroids = train[rng.choice(take, size=nlist, replace=False)].copy()
+    for _ in range(iters):
+        labels = _assign(train, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, train)
+        empty = np.bincount(labels, minlength=nlist) == 0
+        if empty.any():
+            sums[empty] = train[rng.choice(take, size=int(empty.sum()), replace=False)]
+        centroids = _normalize(sums)
+    return centroids
+
+
+def _sub_dim(dim: int) -> int:
+    """Dimensions per PQ sub-vector: 8 when it divides the embedding size, else the largest of 4/2/1."""
+    return next(d for d in (8, 4, 2, 1) if dim % d == 0)
+
+
+def train_pq(vectors: np.ndarray, dsub: int, iters: int = 10, sample: int = 16384, seed: int = 0) -> np.ndarray:
+    """(m, 256, dsub) codebooks from L2 k-means on each sub-space of a row sample."""
+    rng = np.random.default_rng(seed)
+    train = _sample_rows(vectors, min(vectors.shape[0], sample), rng)
+    n, dim = train.shape
+    m = dim // dsub
+    ksub = min(_KSUB, n)
+    codebooks = np.zeros((m, _KSUB, dsub), dtype=np.float32)
+    for j in range(m):
+        sub = train[:, j * dsub:(j + 1) * dsub]
+        cb = sub[rng.choice(n, size=ksub, replace=False)].copy()
+        for _ in range(iters):
+            labels = _pq_encode_sub(sub, cb)
+            counts = np.bincount(labels, minlength=ksub)
+            sums = np.zeros_like(cb)
+            np.add.at(sums, labels, sub)
+            filled = counts > 0
+            cb[filled] = sums[filled] / counts[filled, None]
+        codebooks[j, :ksub] = cb
+    return codebooks
+
+
+def _pq_encode_sub(sub: np.ndarray, codebook: np.ndarray) -> np.ndarray:
+    """Nearest (L2) codeword for each sub-vector."""
+    dist = (codebook ** 2).sum(axis=1)[None, :] - 2.0 * sub @ codebook.T
+    return np.argmin(dist, axis=1)
+
+
+def pq_encode(vectors: np.ndarray, codebooks: np.ndarray, batch: int = 16384) -> np.ndarray:
+    m, _, dsub = codebooks.shape
+    codes = np.empty((vectors.shape[0], m), dtype=np.uint8)
+    for start in range(0, vectors.shape[0], batch):
+        block = np.asarray(vectors[start:start + batch], dtype=np.float32)
+        for j in range(m):
+            codes[start:start + batch, j] = _pq_encode_sub(block[:, j * dsub:(j + 1) * dsub], codebooks[j])
+    return codes
+
+
+class IVFPQIndex:
+    """Inverted-file + product-quantization index; rows are embedding-matrix row ids, scores are inner products."""
+
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        codebooks: np.ndarray,
+        indptr: np.ndarray,
+        row_ids: np.ndarray,
+        codes: np.ndarray,
+        vectors: np.ndarray,
+        nprobe: Optional[int] = None,
+        rerank: int = 1000,
+        meta: Optional[Dict[str, Any]] = None,
+        fingerprints: Optional[List[str]] = None,
+        path: Optional[str] = None,
+    ):
+        self.centroids = centroids
+        self.codebooks = codebooks
+        self.indptr = indptr
+        self.row_ids = row_ids
+        self.codes = codes
+        self.vectors = vectors
+        self.meta = meta or {}
+        self.nlist = int(centroids.shape[0])
+        self.count = int(row_ids.shape[0])
+        self.dim = int(centroids.shape[1])
+        self.m = int(codebooks.shape[0])
+        self.nprobe = nprobe or default_nprobe(self.nlist)
+        self.rerank = rerank
+        self._fingerprints = fingerprints
+        self._path = path
+        self._row_pos: Optional[np.ndarray] = None
+
+    @classmethod
+    def build(
+        cls,
+        embeddings: np.ndarray,
+        fingerprints: List[str],
+        nlist: Optional[int] = None,
+        iters: int = 10,
+        seed: int = 0,
+    ) -> "IVFPQIndex":
+        """Cluster and quantize `embeddings` (one L2-normalized row per fingerprint)."""
+        n, dim = int(embeddings.shape[0]), int(embeddings.shape[1])
+        if len(fingerprints) != n:
+            raise ValueError(f"{len(fingerprints)} fingerprints for {n} embedding rows")
+        nlist = max(1, min(nlist or int(4 * math.sqrt(n)), n))
+        centroids = spherical_kmeans(embeddings, nlist, iters=iters, seed=seed) if nlist > 1 else \
+            _normalize(np.asarray(embeddings, dtype=np.float32).mean(axis=0, keepdims=True))
+        codebooks = train_pq(embeddings, _sub_dim(dim), seed=seed)
+        labels = _assign(embeddings, centroids)
+        order = np.argsort(labels, kind="stable").astype(np.int32)
+        indptr = np.zeros(nlist + 1, dtype=np.int64)
+        np.cumsum(np.bincount(labels, minlength=nlist), out=indptr[1:])
+
+        m = codebooks.shape[0]
+        codes = np.empty((n, m), dtype=np.uint8)
+        vectors = np.empty((n, dim), dtype=np.float16)
+        for start in range(0, n, 65536):
+            block = np.asarray(embeddings[order[start:start + 65536]], dtype=np.float32)
+            codes[start:start + 65536] = pq_encode(block, codebooks)
+            vectors[start:start + 65536] = block
+        blocked = np.empty(n * m, dtype=np.uint8)
+        for c in range(nlist):
+            a, b = int(indptr[c]), int(indptr[c + 1])
+            blocked[a * m:b * m] = codes[a:b].T.ravel()
+        return cls(centroids.astype(np.float32), codebooks, indptr, order, blocked, vectors, fingerprints=list(fingerprints))
+
+    # ── Persistence ──
+
+    def save(self, path: str, meta: Optional[Dict[str, Any]] = None) -> str:
+        """Write one .npy per array plus fingerprints.json and meta.json into a directory."""
+        os.makedirs(path, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(path, "fingerprints.json"), "w", encoding="utf-8") as f:
+            json.dump(self.fingerprints(), f)
+        self.meta = dict(meta or self.meta)
+        self.meta.update({
+            "count": self.count,
+            "dim": self.dim,
+            "nlist": self.nlist,
+            "nprobe": self.nprobe,
+            "pq_m": self.m,
+            "rerank": self.rerank,
+        })
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, indent=2)
+        self._path = path
+        return path
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "IVFPQIndex":
+        """Open a saved index. Arrays are memory-mapped read-only; fingerprints load on demand."""
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        mode = "r" if mmap else None
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode) for name in _ARRAYS}
+        for small in ("centroids", "codebooks", "indptr"):
+            arrays[small] = np.asarray(arrays[small])
+        return cls(nprobe=meta.get("nprobe"), rerank=meta.get("rerank", 1000), meta=meta, path=path, **arrays)
+
+    def fingerprints(self) -> List[str]:
+        """Fingerprint of each embedding row (row id → fingerprint)."""
+        if self._fingerprints is None:
+            with open(os.path.join(self._path, "fingerprints.json"), "r", encoding="utf-8") as f:
+                self._fingerprints = json.load(f)
+        return self._fingerprints
+
+    # ── Search ──
+
+    def _list_codes(self, a: int, b: int) -> np.ndarray:
+        """(m, b - a) codes of list positions [a, b)."""
+        return np.asarray(self.codes[a * self.m:b * self.m]).reshape(self.m, b - a)
+
+    def _pq_scores(self, q: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Approximate inner products from (m, rows) PQ codes via a (m, 256) per-query lookup table."""
+        table = np.einsum("jkd,jd->jk", self.codebooks, q.reshape(self.m, -1))
+        sims = np.zeros(codes.shape[1], dtype=np.float32)
+        for j in range(self.m):
+            sims += table[j].take(codes[j])
+        return sims
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int = 50,
+        nprobe: Optional[int] = None,
+        rerank: Optional[int] = None,
+        allowed: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k (row_ids, similarities) among the lists nearest to the query, best first.
+
+        Candidates are ranked by their PQ codes; the best `rerank` (0 = none) are re-scored
+        exactly from the stored vectors. `allowed` is an optional bool array over row ids;
+        other rows are never returned.
+        """
+        q = np.asarray(query, dtype=np.float32).ravel()
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        rerank = self.rerank if rerank is None else rerank
+        lists = top_k_desc(self.centroids @ q, nprobe)
+        spans = [(int(self.indptr[c]), int(self.indptr[c + 1])) for c in lists]
+        spans = [s for s in spans if s[1] > s[0]]
+        if not spans:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+
+        positions = np.concatenate([np.arange(a, b) for a, b in spans])
+        rows = np.asarray(self.row_ids[positions])
+        codes = np.concatenate([self._list_codes(a, b) for a, b in spans], axis=1)
+        if allowed is not None:
+            keep = allowed[rows]
+            positions, rows, codes = positions[keep], rows[keep], codes[:, keep]
+        sims = self._pq_scores(q, codes)
+
+        if rerank:
+            cand = top_k_desc(sims, max(rerank, k))
+            cand = cand[np.argsort(positions[cand])]  # read vector rows in file order
+            exact = self._read_vectors(positions[cand]) @ q
+            best = top_k_desc(exact, k)
+            return rows[cand[best]], exact[best]
+        best = top_k_desc(sims, k)
+        return rows[best], sims[best]
+
+    def search_exact(self, query: np.ndarray, k: int = 50) -> Tuple[np.ndarray, np.ndarray]:
+        """Brute-force top-k over every stored vector (recall reference)."""
+        q = np.asarray(query, dtype=np.float32).ravel()
+        sims = np.empty(self.count, dtype=np.float32)
+        for start in range(0, self.count, 65536):
+            sims[start:start + 65536] = np.asarray(self.vectors[start:start + 65536], dtype=np.float32) @ q
+        best = top_k_desc(sims, k)
+        return np.asarray(self.row_ids[best]), sims[best]
+
+    def vectors_for_rows(self, rows: np.ndarray) -> np.ndarray:
+        """float32 vectors for embedding row ids (e.g. to build a proxy query)."""
+        if self._row_pos is None:
+            pos = np.empty(self.count, dtype=np.int32)
+            pos[np.asarray(self.row_ids)] = np.arange(self.count, dtype=np.int32)
+            self._row_pos = pos
+        return self._read_vectors(np.sort(self._row_pos[np.asarray(rows)]))
+
+    def _read_vectors(self, positions: np.ndarray) -> np.ndarray:
+        """float32 vectors at list positions; ascending positions read the file sequentially."""
+        vectors = self.vectors
+        if not isinstance(vectors, np.memmap) or vectors.filename is None:
+            return np.asarray(vectors[positions], dtype=np.float32)
+        row_bytes = vectors.dtype.itemsize * self.dim
+        out = np.empty((len(positions), self.dim), dtype=vectors.dtype)
+        with open(vectors.filename, "rb", buffering=0) as f:
+            for k, pos in enumerate(positions):
+                f.seek(vectors.offset + int(pos) * row_bytes)
+                out[k] = np.frombuffer(f.read(row_bytes), dtype=vectors.dtype)
+        return out.astype(np.float32)
+
+
+def default_nprobe(nlist: int) -> int:
+    """Lists probed per query: ~1/20 of them, at least 8."""
+    return min(nlist, max(8, nlist // 20))
+
+
+# ---------------------------------------------------------------------------
+# CLI — recall / latency benchmark on synthetic clustered vectors
+# ---------------------------------------------------------------------------
+
+def _resident_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def benchmark(count: int = 100_000, dim: int = 768, queries: int = 50, k: int = 50) -> Dict[str, Any]:
+    """Build an index over synthetic topic-clustered vectors; report recall@k, latency and RSS."""
+    import time
+    import tempfile
+
+    rng = np.random.default_rng(7)
+    topics = _normalize(rng.standard_normal((max(16, count // 500), dim)).astype(np.float32))
+    emb = topics[rng.integers(0, topics.shape[0], size=count)]
+    emb = _normalize(emb + 0.08 * rng.standard_normal((count, dim)).astype(np.float32))
+    fps = [str(i) for i in range(count)]
+
+    t0 = time.perf_counter()
+    built = IVFPQIndex.build(emb, fps)
+    build_s = time.perf_counter() - t0
+    qs = _normalize(emb[rng.integers(0, count, size=queries)] + 0.05 * rng.standard_normal((queries, dim)).astype(np.float32))
+    del emb
+
+    with tempfile.TemporaryDirectory() as tmp:
+        built.save(tmp)
+        del built
+        index = IVFPQIndex.load(tmp)
+        found, ann_ms = [], []
+        for q in qs:
+            t0 = time.perf_counter()
+            rows, _ = index.search(q, k)
+            ann_ms.append((time.perf_counter() - t0) * 1000)
+            found.append(set(rows.tolist()))
+        rss_mb = _resident_mb()
+        recall, exact_ms = [], []
+        for q, got in zip(qs, found):
+            t0 = time.perf_counter()
+            exact, _ = index.search_exact(q, k)
+            exact_ms.append((time.perf_counter() - t0) * 1000)
+            recall.append(len(got & set(exact.tolist())) / max(len(exact), 1))
+        row = {
+            "count": count,
+            "dim": dim,
+            "nlist": index.nlist,
+            "nprobe": index.nprobe,
+            "pq_m": index.m,
+            "build_s": round(build_s, 1),
+            f"recall@{k}": round(float(np.mean(recall)), 3),
+            "ann_ms_p50": round(float(np.median(ann_ms)), 2),
+            "exact_ms_p50": round(float(np.median(exact_ms)), 2),
+            "rss_mb_after_ann": rss_mb,
+        }
+    print(f"[ANN] {row}")
+    return row
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="IVF-PQ ANN index — recall / latency benchmark")
+    parser.add_argument("--benchmark", type=int, default=100_000, help="Synthetic vectors to index")
+    parser.add_argument("--dim", type=int, default=768)
+    args = parser.parse_args()
+    benchmark(args.benchmark, dim=args.dim)
+
+
+if __name__ == "__main__":
+    main()
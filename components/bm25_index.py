@@ -0,0 +1,258 @@
+# bm25_index.py — Inverted-index BM25 with CSR postings, saved as .npy and memory-mapped at load
+#
+# Replaces the per-session rank_bm25 / SimpleBM25 build in hybrid_retrieval.py with:
+#   1. Postings lists stored CSR-style (indptr → doc ids + term frequencies)
+#   2. Build once in the pipeline, save next to precomputed_embeddings.npy
+#   3. Memory-map at app startup (no index build on cold start)
+#   4. Query scoring only touches documents that share a query term
+#   5. add_documents() indexes new documents (e.g. ad-hoc posts) without a rebuild: their
+#      postings go to a small in-memory delta next to the (read-only) CSR arrays, and N,
+#      avgdl and document frequencies cover both, so scores equal a full rebuild's;
+#      compact() (run by save()) folds the delta into the CSR arrays
+#
+# Usage:
+#   index = InvertedBM25Index.build(tokenized_corpus)
+#   index.save("precomputed_bm25", meta={"digest": ...})
+#   index = InvertedBM25Index.load("precomputed_bm25")
+#   doc_ids, scores = index.top_k(["vault", "withdrawal"], k=50)
+#   new_ids = index.add_documents(tokenized_new_docs)
+
+import os
+import json
+import math
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+_ARRAYS = ("indptr", "postings", "tf", "doc_len")
+
+
+class InvertedBM25Index:
+    """BM25 over CSR postings. Scores use the non-negative Lucene-style IDF."""
+
+    def __init__(
+        self,
+        vocab: Dict[str, int],
+        indptr: np.ndarray,
+        postings: np.ndarray,
+        tf: np.ndarray,
+        doc_len: np.ndarray,
+        k1: float = 1.5,
+        b: float = 0.75,
+        meta: Optional[Dict[str, Any]] = None,
+    ):
+        self.vocab = vocab
+        self.indptr = indptr
+        self.postings = postings
+        self.tf = tf
+        self.doc_len = doc_len
+        self.k1 = k1
+        self.b = b
+        self.meta = meta or {}
+        self.N = int(doc_len.shape[0])
+        self.avgdl = float(doc_len.sum() / max(self.N, 1)) if self.N else 0.0
+        self._norm: Optional[np.ndarray] = None
+        # Postings of documents added since build/load: term → (doc ids, term frequencies).
+        # Replaced (never mutated) on add, so concurrent queries see a consistent snapshot.
+        self._delta: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def build(cls, corpus: List[List[str]], k1: float = 1.5, b: float = 0.75) -> "InvertedBM25Index":
+        """Build postings from a tokenized corpus (one token list per document)."""
+        vocab: Dict[str, int] = {}
+        term_ids: List[int] = []
+        doc_ids: List[int] = []
+        tfs: List[int] = []
+        doc_len = np.zeros(len(corpus), dtype=np.float32)
+
+        for d, doc in enumerate(corpus):
+            doc_len[d] = len(doc)
+            for term, count in Counter(doc).items():
+                tid = vocab.setdefault(term, len(vocab))
+                term_ids.append(tid)
+                doc_ids.append(d)
+                tfs.append(count)
+
+        term_arr = np.asarray(term_ids, dtype=np.int64)
+        order = np.argsort(term_arr, kind="stable")
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_arr, minlength=len(vocab)), out=indptr[1:])
+        postings = np.asarray(doc_ids, dtype=np.int32)[order]
+        tf = np.asarray(tfs, dtype=np.float32)[order]
+        return cls(vocab, indptr, postings, tf, doc_len, k1=k1, b=b)
+
+    # ── Persistence ──
+
+    def save(self, path: str, meta: Optional[Dict[str, Any]] = None) -> str:
+        """Write one .npy per array plus vocab.json and meta.json into a directory."""
+        self.compact()
+        os.makedirs(path, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        terms = [""] * len(self.vocab)
+        for term, tid in self.vocab.items():
+            terms[tid] = term
+        with open(os.path.join(path, "vocab.json"), "w", encoding="utf-8") as f:
+            json.dump(terms, f, ensure_ascii=False)
+        self.meta = dict(meta or self.meta)
+        self.meta.update({
+            "docs": self.N,
+            "terms": len(self.vocab),
+            "postings": int(self.postings.shape[0]),
+            "k1": self.k1,
+            "b": self.b,
+        })
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, indent=2)
+        return path
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "InvertedBM25Index":
+        """Open a saved index. Arrays are memory-mapped read-only by default."""
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(os.path.join(path, "vocab.json"), "r", encoding="utf-8") as f:
+            terms = json.load(f)
+        mode = "r" if mmap else None
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode) for name in _ARRAYS}
+        return cls(
+            {t: i for i, t in enumerate(terms)},
+            k1=meta.get("k1", 1.5),
+            b=meta.get("b", 0.75),
+            meta=meta,
+            **arrays,
+        )
+
+    # ── Incremental updates ──
+
+    def add_documents(self, corpus: List[List[str]]) -> np.ndarray:
+        """Index more tokenized documents; returns their doc ids (N, N+1, ...).
+
+        Not safe against concurrent add_documents() calls (callers serialize them);
+        queries may run concurrently.
+        """
+        first = self.N
+        if not corpus:
+            return np.arange(first, first)
+        added: Dict[str, Tuple[List[int], List[int]]] = {}
+        for d, doc in enumerate(corpus, start=first):
+            for term, count in Counter(doc).items():
+                docs, tfs = added.setdefault(term, ([], []))
+                docs.append(d)
+                tfs.append(count)
+        delta = dict(self._delta)
+        for term, (docs, tfs) in added.items():
+            new_docs, new_tf = np.asarray(docs, dtype=np.int32), np.asarray(tfs, dtype=np.float32)
+            if term in delta:
+                new_docs = np.concatenate([delta[term][0], new_docs])
+                new_tf = np.concatenate([delta[term][1], new_tf])
+            delta[term] = (new_docs, new_tf)
+
+        # Lengths and statistics first: a query that sees the new postings also sees their lengths
+        doc_len = np.concatenate([np.asarray(self.doc_len), np.fromiter(map(len, corpus), dtype=np.float32, count=len(corpus))])
+        self.avgdl = float(doc_len.sum() / doc_len.shape[0])
+        self.doc_len = doc_len
+        self.N = int(doc_len.shape[0])
+        self._norm = None
+        self._delta = delta
+        return np.arange(first, self.N)
+
+    def compact(self):
+        """Fold the added documents' postings into the CSR arrays (in memory)."""
+        delta = self._delta
+        if not delta:
+            return
+        vocab = dict(self.vocab)
+        for term in delta:
+            vocab.setdefault(term, len(vocab))
+        base_terms = np.repeat(np.arange(len(self.vocab), dtype=np.int64), np.diff(np.asarray(self.indptr)))
+        delta_terms = np.concatenate([np.full(docs.shape[0], vocab[t], dtype=np.int64) for t, (docs, _) in delta.items()])
+        term_arr = np.concatenate([base_terms, delta_terms])
+        order = np.argsort(term_arr, kind="stable")  # base postings (lower doc ids) stay first per term
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_arr, minlength=len(vocab)), out=indptr[1:])
+        self.postings = np.concatenate([np.asarray(self.postings)] + [d for d, _ in delta.values()])[order]
+        self.tf = np.concatenate([np.asarray(self.tf)] + [t for _, t in delta.values()])[order]
+        self.indptr = indptr
+        self.vocab = vocab
+        self._delta = {}
+
+    # ── Scoring ──
+
+    def _doc_norm(self) -> np.ndarray:
+        norm = self._norm
+        if norm is None or norm.shape[0] != self.N:
+            norm = (self.k1 * (1 - self.b + self.b * np.asarray(self.doc_len) / max(self.avgdl, 1))).astype(np.float32)
+            self._norm = norm
+        return norm
+
+    def df(self, term: str) -> int:
+        """Number of documents containing `term` (built and added)."""
+        tid = self.vocab.get(term)
+        base = int(self.indptr[tid + 1] - self.indptr[tid]) if tid is not None else 0
+        added = self._delta.get(term)
+        return base + (added[0].shape[0] if added is not None else 0)
+
+    def idf(self, term: str) -> float:
+        df = self.df(term)
+        return math.log((self.N - df + 0.5) / (df + 0.5) + 1)
+
+    def _postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(doc ids, term frequencies) of `term`: CSR postings, then those of added documents."""
+        tid = self.vocab.get(term)
+        docs = tf = None
+        if tid is not None:
+            start, end = int(self.indptr[tid]), int(self.indptr[tid + 1])
+            docs, tf = np.asarray(self.postings[start:end]), np.asarray(self.tf[start:end])
+        added = self._delta.get(term)
+        if added is not None:
+            if docs is None or not docs.shape[0]:
+                return added
+            return np.concatenate([docs, added[0]]), np.concatenate([tf, added[1]])
+        if docs is None:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        return docs, tf
+
+    def _score_touched(self, query: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (doc_ids, scores) for documents sharing at least one query term."""
+        norm = self._doc_norm()
+        n = norm.shape[0]
+        doc_parts, score_parts = [], []
+        for term in query:
+            docs, tf = self._postings(term)
+            if not docs.shape[0]:
+                continue
+            if docs[-1] >= n:  # added while this query runs
+                keep = docs < n
+                docs, tf = docs[keep], tf[keep]
+            df = docs.shape[0]
+            idf = math.log((n - df + 0.5) / (df + 0.5) + 1)
+            doc_parts.append(docs)
+            score_parts.append(idf * tf * (self.k1 + 1) / np.maximum(tf + norm[docs], 1e-9))
+
+        if not doc_parts:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        if len(doc_parts) == 1:
+            return doc_parts[0], score_parts[0]
+        docs = np.concatenate(doc_parts)
+        uniq, inverse = np.unique(docs, return_inverse=True)
+        return uniq, np.bincount(inverse, weights=np.concatenate(score_parts))
+
+    def get_scores(self, query: List[str]) -> np.ndarray:
+        """Dense score vector over all documents (drop-in for BM25Okapi.get_scores)."""
+        scores = np.zeros(self.N)
+        docs, vals = self._score_touched(query)
+        scores[docs] = vals
+        return scores
+
+    def top_k(self, query: List[str], k: int = 50) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k (doc_ids, scores) by descending BM25 score, positive scores only."""
+        docs, vals = self._score_touched(query)
+        if docs.shape[0] > k:
+            part = np.argpartition(-vals, k - 1)[:k]
+            docs, vals = docs[part], vals[part]
+        order = np.lexsort((docs, -vals))
+        docs, vals = docs[order], vals[order]
+        keep = vals > 0
+        return docs[keep], vals[keep]
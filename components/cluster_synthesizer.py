@@ -8,6 +8,17 @@ import numpy as np
 from dotenv import load_dotenv
 from openai import OpenAI
 
+# Routing tables + precomputed `_routing` records live in workstream_routing (no model imports)
+from components.workstream_routing import (
+    WORKSTREAM_KEYWORDS as _WORKSTREAM_KEYWORDS,
+    annotate_workstreams,
+    workstream_category,
+    is_topical,
+    is_keyword_topical,
+    keyword_offset,
+    snippet_text,
+)
+
 # Heavy imports (sklearn, sentence_transformers, torch) are lazy-loaded
 # to keep fast-mode clustering instant (<2s vs 60+s).
 # They are only imported inside _ensure_embedding_model() when slow mode is used.
@@ -65,7 +76,7 @@ def _get_model_setting(key, default):
 
 
 OPENAI_KEY = _get_openai_key()
-client = OpenAI(api_key=OPENAI_KEY) if OPENAI_KEY else None
+client = OpenAI(api_key=OPENAI_KEY, max_retries=0) if OPENAI_KEY else None
 
 # === Tunables ===
 EMBED_MODEL = os.getenv("SS_CLUSTER_EMBED_MODEL", "intfloat/e5-base-v2")
@@ -269,7 +280,7 @@ def _best_samples(cluster, n=8, workstream_name=""):
     """Pick the most representative, highest-engagement posts for GPT summarization.
     Prioritizes topical complaints and feature requests with high engagement scores."""
     def _is_topical(item):
-        return _is_topical_for_workstream(item, workstream_name)
+        return is_topical(item, workstream_name)
     
     # Separate topical complaints/feature requests from rest
     topical_actionable = [i for i in cluster if _is_topical(i) and (
@@ -335,7 +346,9 @@ def generate_cluster_metadata(cluster, workstream_name=""):
         f"\nPosts:\n{combined}\n\nFormat your response as:\nTitle: ...\nTheme: ...\nProblem: ..."
     )
     try:
-        response = client.chat.completions.create(
+        from components.llm_scheduler import get_scheduler
+        response = get_scheduler().complete(
+            client,
             model=_get_model_setting("OPENAI_MODEL_CLUSTER_META", _get_model_setting("OPENAI_MODEL_SCREENER", "gpt-4o-mini")),
             messages=[
                 {"role": "system", "content": "You are a senior product strategist."},
@@ -367,102 +380,8 @@ def generate_cluster_metadata(cluster, workstream_name=""):
         }
 
 
-_WORKSTREAM_KEYWORDS = {
-    "Vault & Storage Trust": ["ebay vault", "psa vault", "vault withdraw", "vault transfer", "vaulted", "vaulting", "vault storage", "vault fee", "vault program"],
-    "Authentication & Grading Confidence": ["grading", "graded", "authentication", "authenticity", "counterfeit", "fake", "psa", "bgs", "sgc", "cgc", "misgrade"],
-    "Competitive Positioning": ["whatnot app", "whatnot live", "whatnot seller", "whatnot vs", "selling on whatnot", "fanatics", "heritage auction", "heritage auctions", "vinted", "beckett", "competitor", "switched to", "leaving ebay", "moving to whatnot", "whatnot breaks"],
-    "Seller Economics & Fees": ["fee", "fees", "final value", "fvf", "take rate", "commission", "seller fee", "insertion fee", "promoted listing cost"],
-    "Payment & Checkout Friction": ["checkout", "payment method", "payment failed", "wire transfer", "managed payments", "payout", "payouts", "funds held", "payment hold", "can't pay", "unpaid item", "payment processing"],
-    "Customer Service & Support": ["customer service", "customer support", "support team", "chat bot", "ai bot", "can't reach", "call center", "live agent", "support ticket", "ebay support"],
-    "Shipping & Fulfillment": ["shipping", "delivery", "tracking", "lost package", "damaged", "return", "returns", "refund", "inad", "standard envelope", "usps", "ups", "fedex"],
-    "Pricing & Valuation Tools": ["price guide", "card ladder", "scan to price", "market value", "worth", "value", "comps"],
-    "Live Commerce & Breaks": ["live break", "case break", "box break", "live stream", "ebay live", "whatnot live"],
-    "Instant Liquidity & Buyback": ["instant offer", "buyback", "buy back", "cash out", "sell now", "psa offers", "courtyard", "arena club"],
-    "Subsidiary Ecosystem": ["goldin", "tcgplayer", "tcg player", "tcg"],
-    "Trust & Safety": ["scam", "fraud", "stolen", "chargeback", "buyer abuse", "seller protection"],
-    "Search & Discovery": ["search", "best match", "visibility", "promoted listing", "no views", "not showing up", "filter", "recommend"],
-    "Seller Tools & App Experience": ["seller hub", "app crash", "app bug", "listing tool", "bulk listing", "mobile app"],
-}
-
-_WORKSTREAM_TOPIC_TAGS = {
-    "Vault & Storage Trust": ["vault", "vault friction"],
-    "Authentication & Grading Confidence": ["trust issue", "counterfeit concern", "grading complaint"],
-    "Competitive Positioning": ["competitive churn"],
-    "Seller Economics & Fees": ["fees/pricing", "fee frustration", "upi"],
-    "Payment & Checkout Friction": ["payments", "payouts/holds"],
-    "Shipping & Fulfillment": ["shipping concern", "tracking confusion", "returns/policy"],
-    "Pricing & Valuation Tools": ["price guide"],
-    "Live Commerce & Breaks": ["live shopping", "case break / repack"],
-    "Instant Liquidity & Buyback": ["instant offers / liquidity", "instant offers"],
-    "Search & Discovery": ["search/relevancy"],
-    "Trust & Safety": ["fraud concern"],
-    "Subsidiary Ecosystem": ["consignment/auctions"],
-}
-
-_WORKSTREAM_FLAG_FIELDS = {
-    "Vault & Storage Trust": ["is_vault_signal"],
-    "Authentication & Grading Confidence": ["is_ag_signal", "is_psa_turnaround"],
-    "Seller Economics & Fees": ["is_fees_concern", "_upi_flag"],
-    "Payment & Checkout Friction": ["_payment_issue"],
-    "Shipping & Fulfillment": ["is_shipping_issue", "is_refund_issue"],
-    "Pricing & Valuation Tools": ["is_price_guide_signal"],
-    "Instant Liquidity & Buyback": ["_liquidity_signal"],
-}
-
-
-def _keyword_in_text(text, keyword):
-    """Match keywords as whole words where possible to avoid false positives (e.g., 'fee' in 'feedback')."""
-    if not keyword:
-        return False
-    if any(ch in keyword for ch in ["/", "-"]):
-        return keyword in text
-    if " " in keyword:
-        return re.search(r"\b" + re.escape(keyword) + r"\b", text) is not None
-    return re.search(r"\b" + re.escape(keyword) + r"\b", text) is not None
-
-
-def _is_topical_for_workstream(item, workstream_name):
-    ws_keywords = _WORKSTREAM_KEYWORDS.get(workstream_name, [])
-    ws_topics = _WORKSTREAM_TOPIC_TAGS.get(workstream_name, [])
-    ws_flags = _WORKSTREAM_FLAG_FIELDS.get(workstream_name, [])
-
-    text = (item.get("text", "") + " " + item.get("title", "")).lower()
-    if ws_keywords and any(_keyword_in_text(text, kw) for kw in ws_keywords):
-        if workstream_name == "Vault & Storage Trust":
-            if not any(ctx in text for ctx in ["psa", "ebay", "card", "graded", "grading", "storage", "consignment"]):
-                return False
-        if workstream_name == "Competitive Positioning":
-            # Require marketplace/collectibles context to filter out casual uses of competitor names
-            if not any(ctx in text for ctx in ["ebay", "sell", "buy", "card", "collectible", "auction", "marketplace", "platform", "fee", "shipping", "grading", "listing", "seller", "buyer"]):
-                return False
-        return True
-
-    if ws_topics:
-        item_topics = [t.lower() for t in (item.get("topic_focus") or item.get("topic_focus_list") or [])]
-        if any(t in item_topics for t in ws_topics):
-            return True
-
-    if ws_flags and any(item.get(flag) for flag in ws_flags):
-        return True
-
-    if workstream_name == "Competitive Positioning" and item.get("mentions_competitor"):
-        return True
-
-    if workstream_name == "Subsidiary Ecosystem":
-        comps = [c.lower() for c in (item.get("mentions_competitor") or [])]
-        if any(c in ("tcgplayer", "goldin") for c in comps):
-            return True
-        source = (item.get("source", "") or "").lower()
-        if "tcgplayer" in source or "goldin" in source:
-            return True
-
-    if not (ws_keywords or ws_topics or ws_flags):
-        return True
-
-    return False
-
-
 def synthesize_cluster(cluster, workstream_name=""):
+    annotate_workstreams(cluster)  # revalidate _routing once; the readers below trust it
     meta = generate_cluster_metadata(cluster, workstream_name=workstream_name)
     brand = cluster[0].get("target_brand") or "Unknown"
     type_tag = cluster[0].get("type_tag") or "Insight"
@@ -471,39 +390,33 @@ def synthesize_cluster(cluster, workstream_name=""):
     ws_keywords = _WORKSTREAM_KEYWORDS.get(workstream_name, [])
 
     def _is_keyword_topical(item):
-        if not ws_keywords:
-            return True
-        text = (item.get("text", "") + " " + item.get("title", "")).lower()
-        return any(_keyword_in_text(text, kw) for kw in ws_keywords)
+        return is_keyword_topical(item, workstream_name)
 
     def _extract_snippet(item, max_len=220):
         """Extract a preview snippet centered on the first workstream keyword.
         Falls back to the start of the text if no keyword is present.
         """
-        title = (item.get("title", "") or "").strip()
-        body = (item.get("text", "") or "").strip()
-        text = (title + ". " + body).strip(". ") if title else body
+        text = snippet_text(item)
         if not text:
             return ""
         if not ws_keywords:
             return text[:max_len]
 
-        text_lower = text.lower()
-        for kw in ws_keywords:
-            idx = text_lower.find(kw)
-            if idx != -1:
-                start = max(0, idx - 90)
-                end = min(len(text), idx + 130)
-                snippet = text[start:end].strip()
-                if start > 0:
-                    snippet = "…" + snippet
-                if end < len(text):
-                    snippet = snippet + "…"
-                return snippet[:max_len]
+        # Keyword offset precomputed during enrichment (_routing.kw_offsets)
+        idx = keyword_offset(item, workstream_name)
+        if idx != -1:
+            start = max(0, idx - 90)
+            end = min(len(text), idx + 130)
+            snippet = text[start:end].strip()
+            if start > 0:
+                snippet = "…" + snippet
+            if end < len(text):
+                snippet = snippet + "…"
+            return snippet[:max_len]
         return text[:max_len]
 
     def _is_topical(item):
-        return _is_topical_for_workstream(item, workstream_name)
+        return is_topical(item, workstream_name)
     
     # First: keyword-topical complaints sorted by engagement
     topical_complaints = sorted(
@@ -602,327 +515,12 @@ def synthesize_cluster(cluster, workstream_name=""):
     }
 
 
-def _get_signal_category(insight):
-    """Map each insight to an exec-actionable workstream.
-    
-    These are designed as workstreams an eBay Collectibles VP would assign
-    to a PM or team lead — each one is a deliverable initiative, not a
-    generic topic bucket.
-    
-    FILTER: Only include eBay Collectibles-relevant content. Exclude gaming, general content, etc.
-    """
-    text = (insight.get("text", "") + " " + insight.get("title", "")).lower()
-    subtag = (insight.get("type_subtag") or insight.get("subtag") or "").lower()
-    topics = [t.lower() for t in (insight.get("topic_focus") or insight.get("topic_focus_list") or [])]
-    competitors = [c.lower() for c in (insight.get("mentions_competitor") or [])]
-    partners = [p.lower() for p in (insight.get("mentions_ecosystem_partner") or [])]
-
-    # ── FILTER OUT PROMOTIONAL / MARKETING CONTENT ──
-    # Seller self-promo, platform marketing, giveaway ads are NOT customer feedback
-    _PROMO_PATTERNS = [
-        "we are live on", "we're live on", "going live on", "live right now",
-        "come join the show", "join the show", "join us live",
-        "free giveaway", "giveaway every", "giving away",
-        "use code ", "use my link", "use this link", "sign up for",
-        "check out my", "follow me on", "subscribe to",
-        "auctioning vintage cards of stars",
-        "register your interest",
-        "and we are live:",
-        "beauty is winning on whatnot",
-        # PSA memes (Public Service Announcement, not grading)
-        "psa, your human", "psa: your human", "psa, if exposed",
-        "psa: do not use the seed vault", "psa do not use the seed vault",
-    ]
-    if any(p in text for p in _PROMO_PATTERNS):
-        return "EXCLUDE_NON_COLLECTIBLES"
-
-    # ── FILTER OUT NON-COLLECTIBLES CONTENT ──
-    # Exclude gaming, general tech, and other irrelevant content for eBay Collectibles
-    _exclude_keywords = [
-        # Gaming terms
-        "psa:", "public service announcement", "psa do not", "psa warning", "psa alert",
-        "seed vault", "stella montis", "run", "lost", "die to this", "game", "gaming", "video game",
-        "minecraft", "fortnite", "call of duty", "playstation", "xbox", "nintendo",
-        # General tech/non-collectibles
-        "software", "programming", "coding", "app development", "website", "tech support",
-        # Non-collectibles hobbies
-        "cooking", "fitness", "travel", "movies", "music"
-    ]
-    
-    # Allow if it contains collectibles-related terms even if it has exclude keywords
-    _collectibles_keywords = [
-        "card", "cards", "trading card", "sports card", "pokemon", "magic", "yugioh", 
-        "collectible", "collectibles", "graded", "slab", "psa grading", "bgs", "sgc",
-        "autograph", "memorabilia", "comic", "coin", "stamp", "ebay", "whatnot", "fanatics",
-        "auction", "auctions", "seller", "buyer", "listing", "sale", "purchase"
-    ]
-    
-    _has_exclude = any(exclude in text for exclude in _exclude_keywords)
-    _has_collectibles = any(collectible in text for collectible in _collectibles_keywords)
-    
-    # Filter out if has exclude keywords but no collectibles context
-    if _has_exclude and not _has_collectibles:
-        return "EXCLUDE_NON_COLLECTIBLES"
-
-    # ── Pre-compute cross-cutting concern flags ──
-    # These override domain routing when they are the PRIMARY complaint
-    _payment_primary = any(w in text for w in [
-        "checkout", "payment method", "payment failed", "failed payment",
-        "can't pay", "won't accept", "wire transfer", "managed payments",
-        "payout delay", "funds held", "payment hold", "checkout error",
-        "payment issue", "unpaid item", "buyer didn't pay", "payment problem",
-        "payment not going", "payment processing", "can't complete purchase"])
-    _cs_primary = any(w in text for w in [
-        "customer service", "customer support", "support team", "chat bot",
-        "ai bot", "can't reach", "no response", "call center", "help desk",
-        "live agent", "talk to a human", "automated response", "support ticket",
-        "ebay support", "contact ebay", "get ahold of", "get a hold of"])
-
-    # ── 1. Vault & Storage Trust ──
-    # Owner: Vault PM. Covers: PSA Vault, eBay Vault, withdrawal, transfer, vaulting UX
-    _vault_phrases = ["ebay vault", "psa vault", "vault withdraw", "vault transfer",
-                       "vault storage", "vaulted card", "vaulted item", "vault fee",
-                       "my vault", "the vault", "in the vault", "from the vault",
-                       "vault program", "vault review", "vault trust", "vault ship"]
-    if (insight.get("is_vault_signal") or
-        any(v in text for v in _vault_phrases) or
-        any(t in topics for t in ["vault", "vault friction"])):
-        # Override: if the primary complaint is about checkout/payment friction WITH vault
-        if _payment_primary:
-            return "Payment & Checkout Friction"
-        if _cs_primary:
-            return "Customer Service & Support"
-        return "Vault & Storage Trust"
-
-    # ── 2. Authentication & Grading Confidence ──
-    # Owner: AG PM. Covers: Authenticity Guarantee, grading disputes, PSA/BGS turnaround, counterfeit
-    if (insight.get("is_ag_signal") or insight.get("is_psa_turnaround") or
-        "authenticity guarantee" in text or "authentication" in text or
-        ("grading" in text and any(g in text for g in ["psa grading", "psa card", "psa slab", "psa authenticated", "psa 10", "psa 9", "psa 8", "bgs", "sgc", "cgc"]) and 
-         not any(gaming in text for gaming in ["psa:", "public service announcement", "psa do not", "psa warning", "psa alert"])) or
-        "counterfeit" in text or "fake card" in text or
-        any(t in topics for t in ["trust issue", "counterfeit concern", "grading complaint"])):
-        # Override: if the primary complaint is about customer service around grading
-        if _cs_primary:
-            return "Customer Service & Support"
-        return "Authentication & Grading Confidence"
-
-    # ── 3. Competitive Positioning ──
-    # Owner: Strategy. Covers: Whatnot, Fanatics, Heritage, Vinted, Beckett, competitive churn
-    if (competitors or
-        any(c in text for c in ["whatnot", "fanatics", "heritage auction", "vinted", "beckett", "stockx"]) or
-        any(t in topics for t in ["competitive churn"]) or
-        "switched to" in text or "leaving ebay" in text or "moving to" in text):
-        # Override: if primary complaint is payment friction or customer service on a competitor
-        if _payment_primary:
-            return "Payment & Checkout Friction"
-        if _cs_primary:
-            return "Customer Service & Support"
-        return "Competitive Positioning"
-
-    # ── 4. Seller Economics & Fees ──
-    # Owner: Seller Experience PM. Covers: fees, take rate, promoted listings cost, commission structures
-    _fee_keywords = ["fee", "fees", "final value", "fvf", "take rate", "commission",
-                     "promoted listing cost", "seller fee", "insertion fee"]
-    if (insight.get("is_fees_concern") or insight.get("_upi_flag") or
-        any(t in topics for t in ["fees/pricing", "fee frustration", "upi"]) or
-        any(w in text for w in _fee_keywords)):
-        if _cs_primary:
-            return "Customer Service & Support"
-        return "Seller Economics & Fees"
-
-    # ── 4b. Payment & Checkout Friction ──
-    # Owner: Payments PM. Covers: checkout errors, payment method issues, wire transfer,
-    # managed payments setup, payout delays, funds held, buyer can't pay, seller can't get paid
-    _payment_friction_keywords = ["checkout", "payment method", "payment failed", "failed payment",
-                                   "can't pay", "won't accept", "wire transfer", "managed payments",
-                                   "payout", "payouts", "payout delay", "funds held", "payment hold",
-                                   "payment not going", "checkout error", "payment issue",
-                                   "unpaid item", "buyer didn't pay", "didn't pay",
-                                   "payment processing", "payment problem"]
-    _fraud_scam_keywords = ["scam", "fraud", "fake", "counterfeit", "stolen", "chargeback"]
-    _has_payment_text = any(w in text for w in _payment_friction_keywords)
-    _has_fraud_text = any(w in text for w in _fraud_scam_keywords)
-    
-    if _has_payment_text and not _has_fraud_text:
-        return "Payment & Checkout Friction"
-    if (insight.get("_payment_issue") or any(t in topics for t in ["payments", "payouts/holds"])):
-        if _has_fraud_text:
-            pass  # Let fall through to Trust & Safety
-        else:
-            return "Payment & Checkout Friction"
-
-    # ── 5. Shipping & Fulfillment ──
-    # Owner: Shipping PM. Covers: shipping damage, tracking, standard envelope, international shipping, returns logistics
-    if (insight.get("is_shipping_issue") or insight.get("is_refund_issue") or
-        any(t in topics for t in ["shipping concern", "tracking confusion", "returns/policy"]) or
-        any(w in text for w in ["shipping", "tracking", "lost package", "damaged in transit",
-                                 "standard envelope", "return", "refund", "inad"])):
-        if _cs_primary:
-            return "Customer Service & Support"
-        return "Shipping & Fulfillment"
-
-    # ── 6. Pricing & Valuation Tools ──
-    # Owner: Price Guide PM. Covers: Price Guide, Card Ladder, scan to price, comps, market value
-    if (insight.get("is_price_guide_signal") or
-        any(t in topics for t in ["price guide"]) or
-        any(w in text for w in ["price guide", "card ladder", "scan to price", "market value",
-                                 "what is it worth", "comps", "card value"])):
-        return "Pricing & Valuation Tools"
-
-    # ── 7. Live Commerce & Breaks ──
-    # Owner: eBay Live PM. Covers: live breaks, case breaks, streaming, eBay Live
-    if (any(t in topics for t in ["live shopping", "case break / repack"]) or
-        any(w in text for w in ["live break", "case break", "box break", "live shopping",
-                                 "ebay live", "live stream", "card break"])):
-        return "Live Commerce & Breaks"
-
-    # ── 8. Instant Liquidity & Buyback ──
-    # Owner: Marketplace Innovation PM. Covers: instant offers, buyback, PSA Offers, Courtyard, cash out
-    if (insight.get("_liquidity_signal") or
-        any(t in topics for t in ["instant offers / liquidity", "instant offers"]) or
-        any(w in text for w in ["instant offer", "buyback", "cash out", "sell now",
-                                 "psa offers", "courtyard", "arena club"])):
-        return "Instant Liquidity & Buyback"
-
-    # ── 9. Subsidiary Ecosystem (Goldin & TCGPlayer) ──
-    # Owner: Subsidiary Integration PM. Covers: Goldin, TCGPlayer, cross-platform synergy
-    if (any(w in text for w in ["goldin", "tcgplayer", "tcg player"]) or
-        any(t in topics for t in ["consignment/auctions"]) and any(w in text for w in ["goldin", "heritage"])):
-        return "Subsidiary Ecosystem"
-
-    # ── 10. Trust & Safety ──
-    # Owner: Trust & Safety. Covers: scams, fraud, seller protection, buyer abuse, INAD abuse
-    if (any(t in topics for t in ["fraud concern"]) or
-        any(w in text for w in ["scam", "fraud", "buyer abuse", "seller protection",
-                                 "chargeback", "fake buyer", "stolen"])):
-        return "Trust & Safety"
-
-    # ── 11. Customer Service & Support ──
-    # Owner: CX PM. Covers: AI bot complaints, can't reach human, chat support, phone support
-    if any(w in text for w in ["customer service", "customer support", "support team",
-                                "chat bot", "ai bot", "can't reach", "no response",
-                                "call center", "help desk", "live agent", "talk to a human",
-                                "automated response", "support ticket", "ebay support"]):
-        return "Customer Service & Support"
-
-    # ── 12. Search & Discovery ──
-    # Owner: Search PM. Covers: search relevancy, Best Match, visibility, promoted listings effectiveness
-    if (any(t in topics for t in ["search/relevancy"]) or
-        any(w in text for w in ["search", "best match", "cassini", "no views", "visibility",
-                                 "not showing up", "promoted listing"])):
-        return "Search & Discovery"
-
-    # ── 13. Seller Tools & App Experience ──
-    # Owner: Seller Hub PM. Covers: Seller Hub, app bugs, listing tools, mobile experience
-    if (any(w in text for w in ["seller hub", "app crash", "app bug", "listing tool",
-                                 "mobile app", "app update", "app glitch"])):
-        return "Seller Tools & App Experience"
-
-    # ── Route remaining subtag-tagged posts to appropriate workstreams ──
-    if subtag in ("grading complaint", "speed issue", "trust issue", "counterfeit concern"):
-        return "Authentication & Grading Confidence"
-    if subtag in ("delays", "tracking confusion", "refund issue", "shipping concern"):
-        return "Shipping & Fulfillment"
-    if subtag in ("fee frustration",):
-        return "Seller Economics & Fees"
-    if subtag in ("fraud concern",):
-        return "Trust & Safety"
-    if subtag in ("payments",) and any(w in text for w in ["scam", "fraud", "fake", "stolen"]):
-        return "Trust & Safety"
-
-    # ── Filter out gaming content (PSA = Public Service Announcement in gaming) ──
-    _gaming_keywords = ["psa:", "public service announcement", "psa do not", "psa warning", "psa alert", 
-                       "seed vault", "stella montis", "die to this"]
-    if any(gaming in text for gaming in _gaming_keywords) and "grading" not in text and "card" not in text:
-        return "EXCLUDE_NON_COLLECTIBLES"
-
-    # ── NEW WORKSTREAMS — break up the General catch-all ──
-
-    # ── 16. Collector Community & Hobby Health ──
-    # Owner: Community PM. Covers: collecting culture, hobby sentiment, mail day, pulls, set building
-    _collector_keywords = ["collection", "collecting", "collector", "hobby", "mail day", "pickup",
-                          "pulled", "just pulled", "rip", "box break", "hit", "chase",
-                          "set build", "rainbow", "master set", "parallel", "insert",
-                          "lcs", "card show", "card shop", "local card"]
-    if any(w in text for w in _collector_keywords):
-        return "Collector Community & Hobby"
-
-    # ── 17. Buyer Experience & Purchase Flow ──
-    # Owner: Buyer Experience PM. Covers: buying friction, offer flow, bidding, purchase issues
-    _buyer_keywords = ["buyer", "purchased", "buying", "won auction", "best offer",
-                      "shopping", "bid", "bidding", "snipe", "outbid", "won the auction",
-                      "just bought", "order", "tracking", "delivery",
-                      "buyer protection", "money back guarantee"]
-    if (any(w in text for w in _buyer_keywords) and
-        not any(w in text for w in ["seller", "selling", "listed", "listing"])):
-        return "Buyer Experience & Purchase Flow"
-
-    # ── 18. Listing & Catalog Quality ──
-    # Owner: Catalog PM. Covers: listing descriptions, photos, category accuracy, item specifics
-    _listing_keywords = ["listing", "description", "photo", "title", "category",
-                        "condition", "item specifics", "catalog", "stock photo",
-                        "duplicate listing", "relisted", "ended listing"]
-    if any(w in text for w in _listing_keywords):
-        return "Listing & Catalog Quality"
-
-    # ── 19. App & Platform Technical Issues ──
-    # Owner: Platform Engineering. Covers: app bugs, crashes, errors, UX issues
-    _tech_keywords = ["app", "bug", "glitch", "crash", "error", "broken",
-                     "update", "not working", "doesn't work", "won't load",
-                     "page error", "blank page", "slow", "frozen",
-                     "notification", "email", "alert"]
-    if any(w in text for w in _tech_keywords):
-        return "App & Platform Technical"
-
-    # ── 20. Market Intelligence & Pricing Trends ──
-    # Owner: Market Strategy. Covers: price trends, market shifts, investment signals, valuations
-    _market_keywords = ["price", "pricing", "market", "value", "invest",
-                       "undervalued", "overpriced", "comp", "sold for",
-                       "going for", "worth", "trend", "bubble", "crash",
-                       "flip", "profit", "roi"]
-    if any(w in text for w in _market_keywords):
-        return "Market Intelligence & Pricing"
-
-    # ── 21. Account & Policy Issues ──
-    # Owner: Trust & Policy PM. Covers: suspensions, restrictions, policy confusion
-    _account_keywords = ["suspended", "restricted", "banned", "account",
-                        "locked out", "deactivated", "policy", "terms of service",
-                        "violation", "appeal", "reinstate"]
-    if any(w in text for w in _account_keywords):
-        return "Account & Policy Issues"
-
-    # ── Route by taxonomy topic for remaining signals ──
-    _tax_topic = ((insight.get("taxonomy") or {}).get("topic") or insight.get("subtag") or "").lower()
-
-    if _tax_topic == "trust":
-        return "Trust & Safety"
-    if _tax_topic in ("comc",):
-        return "Subsidiary Ecosystem"
-    if _tax_topic in ("heritage auctions",):
-        return "Competitive Positioning"
-    if _tax_topic in ("goldin",):
-        return "Subsidiary Ecosystem"
-    if _tax_topic in ("competitor intel",):
-        return "Competitive Positioning"
-
-    # ── Route Trustpilot reviews to their respective workstreams ──
-    _source = (insight.get("source") or "").lower()
-    if "trustpilot" in _source:
-        if "whatnot" in _source or "heritage" in _source or "fanatics" in _source:
-            return "Competitive Positioning"
-        if "goldin" in _source or "tcgplayer" in _source:
-            return "Subsidiary Ecosystem"
-        return "Customer Service & Support"  # Trustpilot:eBay → CX signal
-
-    return "General Platform Feedback"
-
-
 def cluster_by_subtag_fast(insights, min_cluster_size=MIN_CLUSTER_SIZE):
     """Fast clustering by signal category - no embeddings, instant results."""
+    annotate_workstreams(insights)  # revalidate _routing once; workstream_category trusts it
     grouped = defaultdict(list)
     for i in insights:
-        category = _get_signal_category(i)
+        category = workstream_category(i)
         # Skip non-collectibles content entirely
         if category == "EXCLUDE_NON_COLLECTIBLES":
             continue
@@ -938,19 +536,13 @@ def cluster_by_subtag_fast(insights, min_cluster_size=MIN_CLUSTER_SIZE):
     return all_clusters
 
 
-def cluster_by_subtag_then_embed(insights, min_cluster_size=MIN_CLUSTER_SIZE, fast_mode=True):
-    """Cluster insights. fast_mode=True uses keyword grouping only (instant), False uses embeddings (slow)."""
-    if fast_mode:
-        return cluster_by_subtag_fast(insights, min_cluster_size)
-    
-    # Original slow mode with embeddings
-    if not model:
-        return cluster_by_subtag_fast(insights, min_cluster_size)
-    
+def _subtag_groups(insights):
+    """Collectibles insights grouped by type subtag (an insight can be in several groups)."""
+    annotate_workstreams(insights)
     grouped = defaultdict(list)
     for i in insights:
         # Skip non-collectibles content entirely
-        category = _get_signal_category(i)
+        category = workstream_category(i)
         if category == "EXCLUDE_NON_COLLECTIBLES":
             continue
             
@@ -959,6 +551,81 @@ def cluster_by_subtag_then_embed(insights, min_cluster_size=MIN_CLUSTER_SIZE, fa
             subtags = [subtags]
         for subtag in subtags:
             grouped[subtag].append(i)
+    return grouped
+
+
+def _store_coherence(vectors, texts):
+    """is_semantically_coherent(fast_mode=False) on cached vectors: (coherent, adjusted avg similarity).
+    The word-overlap penalty is estimated from at most 256 evenly spaced members."""
+    from components.density_clustering import mean_pairwise_similarity
+    if len(texts) <= 2:
+        return True, 1.0
+    step = max(1, -(-len(texts) // 256))
+    adj = max(0.0, mean_pairwise_similarity(vectors) - _word_overlap_penalty(texts[::step]))
+    return adj >= COHERENCE_THRESHOLD, adj
+
+
+def cluster_by_subtag_from_store(insights, store_path=None, min_cluster_size=MIN_CLUSTER_SIZE):
+    """Embedding clustering mode on the embedding store's cached vectors (no model, no re-encoding).
+
+    Same steps as cluster_by_subtag_then_embed(fast_mode=False): DBSCAN per subtag group,
+    coherence check, incoherent clusters re-clustered at RECLUSTER_EPS. Insights without a
+    stored vector are left out.
+    """
+    from components.embedding_store import EmbeddingStore, EMBEDDING_STORE_PATH
+    from components.density_clustering import unit_rows, dbscan_cosine, cluster_members
+    from components.hybrid_retrieval import _insight_fingerprint
+
+    store = EmbeddingStore.open(store_path or EMBEDDING_STORE_PATH)
+    fingerprints = [_insight_fingerprint(i) for i in insights]
+    vectors, found = store.gather(fingerprints)
+    vectors = unit_rows(vectors)
+    row_of = {id(i): k for k, i in enumerate(insights)}
+    print(f"[CLUSTER] {int(found.sum())}/{len(insights)} insights have stored vectors ({store.model})")
+
+    all_clusters = []
+    for subtag, group in _subtag_groups(insights).items():
+        rows = np.array([row_of[id(i)] for i in group], dtype=np.int64)
+        rows = rows[found[rows]]
+        if rows.shape[0] < min_cluster_size:
+            continue
+        for members in cluster_members(dbscan_cosine(vectors[rows], DBSCAN_EPS, min_cluster_size)):
+            c_rows = rows[members]
+            c = [insights[k] for k in c_rows]
+            coherent, score = _store_coherence(vectors[c_rows], [i.get("text", "") for i in c])
+            if coherent:
+                all_clusters.append((c, {"coherent": True, "was_reclustered": False, "avg_similarity": score}))
+                continue
+            # split_incoherent_cluster: re-cluster at RECLUSTER_EPS, pairs become singletons
+            if len(c_rows) <= 3:
+                subs = [c_rows]
+            else:
+                subs = []
+                for sub in cluster_members(dbscan_cosine(vectors[c_rows], RECLUSTER_EPS, 2)):
+                    sub_rows = c_rows[sub]
+                    subs.extend([[k] for k in sub_rows] if len(sub_rows) <= 2 else [sub_rows])
+            for sub_rows in subs:
+                sub = [insights[k] for k in sub_rows]
+                sub_coherent, sub_score = _store_coherence(vectors[np.asarray(sub_rows)], [i.get("text", "") for i in sub])
+                all_clusters.append((sub, {"coherent": sub_coherent, "was_reclustered": True, "avg_similarity": sub_score}))
+    return all_clusters
+
+
+def cluster_by_subtag_then_embed(insights, min_cluster_size=MIN_CLUSTER_SIZE, fast_mode=True, store_path=None):
+    """Cluster insights. fast_mode=True uses keyword grouping only (instant), False uses embeddings
+    (cached vectors from the embedding store when one exists, else the slow re-encoding path)."""
+    if fast_mode:
+        return cluster_by_subtag_fast(insights, min_cluster_size)
+
+    from components.embedding_store import EmbeddingStore, EMBEDDING_STORE_PATH
+    if EmbeddingStore.exists(store_path or EMBEDDING_STORE_PATH):
+        return cluster_by_subtag_from_store(insights, store_path, min_cluster_size)
+
+    # Original slow mode with embeddings
+    if not model:
+        return cluster_by_subtag_fast(insights, min_cluster_size)
+    
+    grouped = _subtag_groups(insights)
 
     all_clusters = []
     for subtag, group in grouped.items():
@@ -0,0 +1,194 @@
+# dedup_store.py — Persistent dedup index (exact-prefix hashes + SimHash band tables) across pipeline runs
+#
+# Lets deduplicate_insights skip everything it has already seen:
+#   1. Prefix hashes of every post seen before, marked kept or dropped
+#   2. SimHash fingerprints of kept posts + one sorted row table per 16-bit band
+#   3. New posts are fingerprinted and probed against the stored bands only
+#   4. Prefixes that left the corpus are forgotten each run (retain), so an expired
+#      post stops suppressing its near-duplicates and the store tracks the corpus size
+#
+# Usage:
+#   store = DedupStore("data/dedup_index")
+#   unique, stats = deduplicate_insights(posts, store=store)
+#   store.save()
+
+import os
+import json
+import hashlib
+from datetime import datetime, timezone
+from typing import List, Dict, Any
+
+import numpy as np
+
+UNKNOWN, KEPT, DROPPED = 0, 1, 2
+
+DEDUP_STORE_PATH = os.path.join("data", "dedup_index")
+
+_ARRAYS = ("keys", "status", "fps", "fp_keys", "band_rows")
+_FORMAT = 2
+
+
+def prefix_key(prefix: str) -> int:
+    """Stable 64-bit key for a normalized text prefix."""
+    return int.from_bytes(hashlib.blake2b(prefix.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class DedupStore:
+    """
+    On-disk dedup state. keys/status are sorted by key for O(log n) membership;
+    fps holds kept fingerprints (fp_keys their prefix keys) and band_rows[b] orders
+    fps rows by band b.
+    """
+
+    def __init__(self, path: str = DEDUP_STORE_PATH, prefix_chars: int = 150, band_size: int = 16):
+        self.path = path
+        self.prefix_chars = prefix_chars
+        self.band_size = band_size
+        self.n_bands = 64 // band_size
+        self._band_keys: List[np.ndarray] = []
+        self._pending_keys: List[np.ndarray] = []
+        self._pending_status: List[np.ndarray] = []
+        self._pending_fps: List[np.ndarray] = []
+        self._pending_fp_keys: List[np.ndarray] = []
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self.keys = np.empty(0, dtype=np.uint64)
+        self.status = np.empty(0, dtype=np.uint8)
+        self.fps = np.empty(0, dtype=np.uint64)
+        self.fp_keys = np.empty(0, dtype=np.uint64)
+        self.band_rows = np.empty((self.n_bands, 0), dtype=np.int64)
+
+    def _load(self):
+        meta_path = os.path.join(self.path, "meta.json")
+        if not os.path.exists(meta_path):
+            return
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if (meta.get("format") != _FORMAT or meta.get("prefix_chars") != self.prefix_chars
+                    or meta.get("band_size") != self.band_size):
+                print(f"[DEDUP] Store at {self.path} was built with different parameters — starting fresh")
+                return
+            for name in _ARRAYS:
+                setattr(self, name, np.load(os.path.join(self.path, f"{name}.npy")))
+        except Exception as e:
+            print(f"[DEDUP] Failed to load store at {self.path}: {e} — starting fresh")
+            self._reset()
+
+    def __len__(self) -> int:
+        return int(self.keys.shape[0])
+
+    # ── Lookups ──
+
+    def lookup(self, keys: np.ndarray) -> np.ndarray:
+        """Status per key: UNKNOWN, KEPT or DROPPED."""
+        out = np.zeros(len(keys), dtype=np.uint8)
+        if not len(self.keys) or not len(keys):
+            return out
+        pos = np.searchsorted(self.keys, keys)
+        pos_clipped = np.minimum(pos, len(self.keys) - 1)
+        found = self.keys[pos_clipped] == keys
+        out[found] = self.status[pos_clipped[found]]
+        return out
+
+    def _band_values(self, fps: np.ndarray, band: int) -> np.ndarray:
+        shift = np.uint64(band * self.band_size)
+        return (fps >> shift) & np.uint64((1 << self.band_size) - 1)
+
+    def match(self, fps: np.ndarray, threshold: int) -> np.ndarray:
+        """True for each fingerprint within `threshold` bits of a stored kept fingerprint."""
+        from components.deduplicator import _popcount64
+
+        matched = np.zeros(len(fps), dtype=bool)
+        if not len(self.fps) or not len(fps):
+            return matched
+        if not self._band_keys:
+            self._band_keys = [self._band_values(self.fps[self.band_rows[b]], b) for b in range(self.n_bands)]
+
+        for b in range(self.n_bands):
+            probe = np.flatnonzero(~matched)
+            if not probe.size:
+                break
+            vals = self._band_values(fps[probe], b)
+            lo = np.searchsorted(self._band_keys[b], vals, side="left")
+            hi = np.searchsorted(self._band_keys[b], vals, side="right")
+            counts = hi - lo
+            if not counts.any():
+                continue
+            query = np.repeat(probe, counts)
+            offsets = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+            rows = self.band_rows[b][np.repeat(lo, counts) + offsets]
+            close = _popcount64(fps[query] ^ self.fps[rows]) <= threshold
+            matched[query[close]] = True
+        return matched
+
+    # ── Updates ──
+
+    def add(self, keys: np.ndarray, fps: np.ndarray, kept: np.ndarray):
+        """Record newly seen prefixes; fingerprints are stored for kept posts only."""
+        if not len(keys):
+            return
+        self._pending_keys.append(np.asarray(keys, dtype=np.uint64))
+        self._pending_status.append(np.where(kept, KEPT, DROPPED).astype(np.uint8))
+        self._pending_fps.append(np.asarray(fps, dtype=np.uint64)[kept])
+        self._pending_fp_keys.append(np.asarray(keys, dtype=np.uint64)[kept])
+
+    def retain(self, keys: np.ndarray) -> int:
+        """
+        Forget every prefix not in `keys` (the current run's corpus); returns entries removed.
+
+        When a kept post leaves, dropped verdicts are forgotten too: the post that
+        suppressed them may be the one that left, so they are decided again.
+        """
+        self._merge()
+        keep = np.isin(self.keys, np.asarray(keys, dtype=np.uint64))
+        if (~keep & (self.status == KEPT)).any():
+            keep &= self.status != DROPPED
+        removed = int((~keep).sum())
+        if removed:
+            self.keys, self.status = self.keys[keep], self.status[keep]
+            fp_keep = np.isin(self.fp_keys, self.keys)
+            self.fps, self.fp_keys = self.fps[fp_keep], self.fp_keys[fp_keep]
+            self._index_bands()
+        return removed
+
+    def _index_bands(self):
+        self.band_rows = np.stack([
+            np.argsort(self._band_values(self.fps, b), kind="stable") for b in range(self.n_bands)
+        ]) if len(self.fps) else np.empty((self.n_bands, 0), dtype=np.int64)
+        self._band_keys = []
+
+    def _merge(self):
+        """Fold pending entries into the sorted key table and the band index."""
+        if not self._pending_keys:
+            return
+        keys = np.concatenate([self.keys] + self._pending_keys)
+        status = np.concatenate([self.status] + self._pending_status)
+        order = np.argsort(keys, kind="stable")
+        self.keys, self.status = keys[order], status[order]
+        self.fps = np.concatenate([self.fps] + self._pending_fps)
+        self.fp_keys = np.concatenate([self.fp_keys] + self._pending_fp_keys)
+        self._index_bands()
+        self._pending_keys, self._pending_status, self._pending_fps, self._pending_fp_keys = [], [], [], []
+
+    def save(self) -> str:
+        """Merge pending entries and write each array via temp file + os.replace."""
+        self._merge()
+        os.makedirs(self.path, exist_ok=True)
+        for name in _ARRAYS:
+            tmp = os.path.join(self.path, f"{name}.tmp.npy")
+            np.save(tmp, getattr(self, name))
+            os.replace(tmp, os.path.join(self.path, f"{name}.npy"))
+        meta: Dict[str, Any] = {
+            "format": _FORMAT,
+            "prefix_chars": self.prefix_chars,
+            "band_size": self.band_size,
+            "seen": len(self),
+            "kept": int(self.fps.shape[0]),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with open(os.path.join(self.path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        return self.path
@@ -7,11 +7,20 @@
 # Usage:
 #   from components.deduplicator import deduplicate_insights
 #   unique = deduplicate_insights(insights, similarity_threshold=3)
+#
+# Pass store=DedupStore(...) (components/dedup_store.py) to dedup incrementally
+# against everything seen in earlier pipeline runs. deduplicate_stream() gives the
+# same verdicts over a re-readable stream of posts without holding the posts.
 
 import re
-import hashlib
-from collections import defaultdict
-from typing import List, Dict, Any, Tuple
+import time
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from components.dedup_store import DedupStore
 
 # ---------------------------------------------------------------------------
 # Tokenizer
@@ -26,80 +35,222 @@ _STOPWORDS = {
 }
 
 
+# Alphanumeric runs of 3+ chars that are not stopwords, in a single regex pass
+_TOKEN_RE = re.compile(
+    r"(?<![a-z0-9])(?!(?:%s)(?![a-z0-9]))[a-z0-9]{3,}"
+    % "|".join(sorted((w for w in _STOPWORDS if len(w) > 2), key=len, reverse=True))
+)
+
+
 def _tokenize(text: str) -> List[str]:
-    tokens = re.findall(r"[a-z0-9]+", (text or "").lower())
-    return [t for t in tokens if t not in _STOPWORDS and len(t) > 2]
+    return _TOKEN_RE.findall((text or "").lower())
 
 
 # ---------------------------------------------------------------------------
 # SimHash — 64-bit fingerprint for near-duplicate detection
 # ---------------------------------------------------------------------------
-
-def _simhash(tokens: List[str], hashbits: int = 64) -> int:
+#
+# Fingerprints are computed for the whole corpus at once as NumPy uint64 arrays:
+# tokens are joined per post (ASCII-only after _tokenize), every character n-gram
+# is packed into an integer, mixed with the MurmurHash3 64-bit finalizer, and the
+# per-bit +1/-1 votes are accumulated with bit-sliced counters over shingle blocks.
+
+_FMIX_C1 = np.uint64(0xFF51AFD7ED558CCD)
+_FMIX_C2 = np.uint64(0xC4CEB9FE1A85EC53)
+_POPCOUNT8 = np.array([bin(x).count("1") for x in range(256)], dtype=np.uint8)
+
+
+def _fmix64(x: np.ndarray) -> np.ndarray:
+    """MurmurHash3 fmix64 finalizer — fast, well-mixed, non-cryptographic."""
+    with np.errstate(over="ignore"):
+        x = x ^ (x >> np.uint64(33))
+        x = x * _FMIX_C1
+        x = x ^ (x >> np.uint64(33))
+        x = x * _FMIX_C2
+        x = x ^ (x >> np.uint64(33))
+    return x
+
+
+def _popcount64(x: np.ndarray) -> np.ndarray:
+    """Per-element popcount of a uint64 array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(x)
+    x = np.ascontiguousarray(x, dtype=np.uint64)
+    return _POPCOUNT8[x.view(np.uint8)].reshape(-1, 8).sum(axis=1, dtype=np.uint8)
+
+
+def _shingle_bytes(text: str, n: int = 3) -> bytes:
+    """Normalized text for shingling; short texts are padded to one n-gram."""
+    joined = " ".join(_tokenize(text)).encode("ascii")
+    if 0 < len(joined) < n:
+        joined = joined.ljust(n, b"\0")
+    return joined
+
+
+def _simhash_block(buf: bytes, lengths: np.ndarray, n: int) -> np.ndarray:
+    """SimHash for a block of concatenated documents (all lengths >= n or 0)."""
+    fps = np.zeros(len(lengths), dtype=np.uint64)
+    counts = np.maximum(lengths - (n - 1), 0)
+    if not counts.any():
+        return fps
+
+    arr = np.frombuffer(buf, dtype=np.uint8).astype(np.uint64)
+    doc_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    shingle_starts = np.cumsum(counts) - counts
+    total = int(counts.sum())
+    pos = np.arange(total, dtype=np.int64) + np.repeat(doc_starts - shingle_starts, counts)
+
+    codes = np.zeros(total, dtype=np.uint64)
+    for k in range(n):
+        codes = (codes << np.uint64(8)) | arr[pos + k]
+    hashes = _fmix64(codes)
+
+    # Bit-parallel vote counting: one ripple-carry adder per document whose
+    # bit planes hold all 64 per-bit counters at once. Documents are sorted by
+    # shingle count so round r only touches the prefix still holding shingles.
+    order = np.argsort(-counts, kind="stable")
+    sorted_counts = counts[order]
+    sorted_starts = shingle_starts[order]
+    planes = [np.zeros(len(counts), dtype=np.uint64) for _ in range(int(sorted_counts[0]).bit_length())]
+    for r in range(int(sorted_counts[0])):
+        live = int(np.searchsorted(-sorted_counts, -r, side="left"))
+        carry = hashes[sorted_starts[:live] + r]
+        for plane in planes:
+            p = plane[:live]
+            nxt = p & carry
+            p ^= carry
+            carry = nxt
+            if not carry.any():
+                break
+
+    shifts = np.arange(64, dtype=np.uint64)
+    ones = np.zeros((len(counts), 64), dtype=np.int64)
+    for j, plane in enumerate(planes):
+        ones += ((plane[:, None] >> shifts) & np.uint64(1)).astype(np.int64) << j
+    votes = (2 * ones) > sorted_counts[:, None]
+    fps[order] = np.packbits(votes, axis=1, bitorder="little").view(np.uint64).ravel()
+    return fps
+
+
+def simhash_batch(texts: List[str], n: int = 3, block_shingles: int = 1 << 22) -> np.ndarray:
     """
-    Compute a SimHash fingerprint for a list of tokens.
+    Compute 64-bit character n-gram SimHash fingerprints for many texts.
     Two documents with similar content will have similar SimHash values
-    (small Hamming distance).
+    (small Hamming distance). Empty texts hash to 0.
     """
-    if not tokens:
-        return 0
-
-    v = [0] * hashbits
-    for token in tokens:
-        # Use MD5 hash of each token as a consistent hash function
-        h = int(hashlib.md5(token.encode("utf-8")).hexdigest(), 16)
-        for i in range(hashbits):
-            bitmask = 1 << i
-            if h & bitmask:
-                v[i] += 1
-            else:
-                v[i] -= 1
+    docs = [_shingle_bytes(t, n=n) for t in texts]
+    out = np.zeros(len(docs), dtype=np.uint64)
+    start = 0
+    while start < len(docs):
+        end, budget = start, 0
+        while end < len(docs) and (end == start or budget + len(docs[end]) <= block_shingles):
+            budget += len(docs[end])
+            end += 1
+        lengths = np.fromiter((len(d) for d in docs[start:end]), dtype=np.int64, count=end - start)
+        out[start:end] = _simhash_block(b"".join(docs[start:end]), lengths, n)
+        start = end
+    return out
 
-    fingerprint = 0
-    for i in range(hashbits):
-        if v[i] > 0:
-            fingerprint |= (1 << i)
-    return fingerprint
+
+def _simhash_shingles(text: str, n: int = 3) -> int:
+    """SimHash for a single text (character n-gram shingles)."""
+    return int(simhash_batch([text], n=n)[0])
 
 
 def _hamming_distance(a: int, b: int) -> int:
     """Count differing bits between two integers."""
-    x = a ^ b
-    count = 0
-    while x:
-        count += 1
-        x &= x - 1
-    return count
-
+    return (a ^ b).bit_count()
 
-# ---------------------------------------------------------------------------
-# N-gram shingling for better near-duplicate detection
-# ---------------------------------------------------------------------------
 
-def _shingles(tokens: List[str], n: int = 3) -> List[str]:
-    """Create character n-gram shingles from token list."""
-    text = " ".join(tokens)
-    if len(text) < n:
-        return [text]
-    return [text[i:i+n] for i in range(len(text) - n + 1)]
-
-
-def _simhash_shingles(text: str, n: int = 3, hashbits: int = 64) -> int:
-    """SimHash using character n-gram shingles (more robust than word tokens)."""
-    tokens = _tokenize(text)
-    shings = _shingles(tokens, n=n)
-    return _simhash(shings, hashbits=hashbits)
+def _band_candidate_hits(
+    hashes: np.ndarray,
+    active: np.ndarray,
+    band_start: int,
+    band_size: int,
+    threshold: int,
+) -> np.ndarray:
+    """
+    All (bucket_rank, a, b) pairs with a < b sharing a band value and Hamming
+    distance <= threshold, ordered the way the pairwise bucket scan visits them.
+    """
+    band = (hashes[active] >> np.uint64(band_start)) & np.uint64((1 << band_size) - 1)
+    order = np.argsort(band, kind="stable")
+    idx = active[order]
+    sorted_band = band[order]
+    h = hashes[idx]
+
+    m = len(idx)
+    new_group = np.ones(m, dtype=bool)
+    new_group[1:] = sorted_band[1:] != sorted_band[:-1]
+    group_start = np.flatnonzero(new_group)
+    group_id = np.cumsum(new_group) - 1
+    group_end = np.append(group_start[1:], m)[group_id]
+    # Buckets are visited in order of their first member
+    rank = np.empty(len(group_start), dtype=np.int64)
+    rank[np.argsort(idx[group_start], kind="stable")] = np.arange(len(group_start))
+
+    hits = []
+    live = np.flatnonzero(group_end - np.arange(m) > 1)
+    offset = 1
+    while live.size:
+        partner = live + offset
+        close = _popcount64(h[live] ^ h[partner]) <= threshold
+        if close.any():
+            a, b = live[close], partner[close]
+            hits.append(np.stack([rank[group_id[a]], idx[a], idx[b]], axis=1))
+        offset += 1
+        live = live[group_end[live] - live > offset]
+
+    if not hits:
+        return np.empty((0, 3), dtype=np.int64)
+    hits = np.concatenate(hits)
+    return hits[np.lexsort((hits[:, 2], hits[:, 1], hits[:, 0]))]
 
 
 # ---------------------------------------------------------------------------
 # Deduplication Engine
 # ---------------------------------------------------------------------------
 
+def _mark_near_duplicates(
+    hashes: np.ndarray,
+    scores: List[Any],
+    is_new: np.ndarray,
+    is_duplicate: np.ndarray,
+    similarity_threshold: int,
+    prefer_higher_score: bool,
+) -> int:
+    """SimHash pass over new, not-yet-dropped survivors; marks is_duplicate in place, returns the count."""
+    near_dupes = 0
+    # Use bucket-based approach for efficiency:
+    # Split hash into bands and only compare within same band
+    band_size = 16  # Split 64-bit hash into 4 bands of 16 bits
+
+    for band_start in range(0, 64, band_size):
+        active = np.flatnonzero(is_new & ~is_duplicate)
+        hits = _band_candidate_hits(hashes, active, band_start, band_size, similarity_threshold)
+
+        # Resolve matches in scan order; a row is skipped if its anchor was
+        # already a duplicate when the row started
+        row, row_skipped = None, False
+        for bucket, idx_a, idx_b in hits.tolist():
+            if (bucket, idx_a) != row:
+                row, row_skipped = (bucket, idx_a), bool(is_duplicate[idx_a])
+            if row_skipped or is_duplicate[idx_b]:
+                continue
+            # Mark the lower-scored one as duplicate
+            if prefer_higher_score and scores[idx_b] > scores[idx_a]:
+                is_duplicate[idx_a] = True
+            else:
+                is_duplicate[idx_b] = True
+            near_dupes += 1
+    return near_dupes
+
 def deduplicate_insights(
     insights: List[Dict[str, Any]],
     similarity_threshold: int = 5,
     prefix_chars: int = 150,
     prefer_higher_score: bool = True,
+    store: Optional["DedupStore"] = None,
 ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Deduplicate insights using a two-pass approach:
@@ -112,6 +263,12 @@ def deduplicate_insights(
                              Lower = stricter. 3-5 is typical for near-dupes.
         prefix_chars: Number of leading characters for exact match (pass 1)
         prefer_higher_score: When deduplicating, keep the higher-scored version
+        store: Optional persistent DedupStore. Posts whose prefix was seen in an
+               earlier run keep their earlier verdict; only new posts are
+               fingerprinted and probed against the stored bands. A new post that
+               near-duplicates a stored one is dropped regardless of score.
+               Prefixes missing from `insights` are forgotten, so pass the whole
+               corpus each run. Call store.save() afterwards to persist the update.
 
     Returns:
         (unique_insights, dedup_stats)
@@ -122,6 +279,7 @@ def deduplicate_insights(
     # Pass 1: Exact prefix match (same as before but more robust)
     seen_prefixes = {}
     pass1_survivors = []
+    survivor_prefixes = []
     exact_dupes = 0
 
     for i in insights:
@@ -141,54 +299,40 @@ def deduplicate_insights(
         else:
             seen_prefixes[prefix] = len(pass1_survivors)
             pass1_survivors.append(i)
+            survivor_prefixes.append(prefix)
 
     # Pass 2: SimHash near-duplicate detection
-    # Compute SimHash for all survivors
-    hashes = []
-    for i in pass1_survivors:
-        text = i.get("text", "")
-        h = _simhash_shingles(text)
-        hashes.append(h)
-
-    # Use bucket-based approach for efficiency:
-    # Split hash into bands and only compare within same band
+    scores = [i.get("score", 0) for i in pass1_survivors]
     near_dupes = 0
-    is_duplicate = [False] * len(pass1_survivors)
-    band_size = 16  # Split 64-bit hash into 4 bands of 16 bits
-
-    for band_start in range(0, 64, band_size):
-        band_mask = ((1 << band_size) - 1) << band_start
-        buckets = defaultdict(list)
-
-        for idx, h in enumerate(hashes):
-            if is_duplicate[idx]:
-                continue
-            band_value = (h & band_mask) >> band_start
-            buckets[band_value].append(idx)
-
-        # Only compare within same bucket (candidate pairs)
-        for bucket_indices in buckets.values():
-            if len(bucket_indices) < 2:
-                continue
-            for ii in range(len(bucket_indices)):
-                if is_duplicate[bucket_indices[ii]]:
-                    continue
-                for jj in range(ii + 1, len(bucket_indices)):
-                    idx_a = bucket_indices[ii]
-                    idx_b = bucket_indices[jj]
-                    if is_duplicate[idx_b]:
-                        continue
-
-                    dist = _hamming_distance(hashes[idx_a], hashes[idx_b])
-                    if dist <= similarity_threshold:
-                        # Mark the lower-scored one as duplicate
-                        score_a = pass1_survivors[idx_a].get("score", 0)
-                        score_b = pass1_survivors[idx_b].get("score", 0)
-                        if prefer_higher_score and score_b > score_a:
-                            is_duplicate[idx_a] = True
-                        else:
-                            is_duplicate[idx_b] = True
-                        near_dupes += 1
+    known_dupes = 0
+    n_survivors = len(pass1_survivors)
+    is_duplicate = np.zeros(n_survivors, dtype=bool)
+    is_new = np.ones(n_survivors, dtype=bool)
+    hashes = np.zeros(n_survivors, dtype=np.uint64)
+
+    if store is not None:
+        if store.prefix_chars != prefix_chars:
+            raise ValueError(f"DedupStore uses prefix_chars={store.prefix_chars}, got {prefix_chars}")
+        # Earlier runs already decided every known prefix; only the delta is hashed
+        from components.dedup_store import prefix_key, DROPPED, UNKNOWN
+        keys = np.fromiter((prefix_key(p) for p in survivor_prefixes), dtype=np.uint64, count=n_survivors)
+        # Posts that left the corpus no longer suppress anything
+        forgotten = store.retain(keys)
+        status = store.lookup(keys)
+        is_new = status == UNKNOWN
+        is_duplicate |= status == DROPPED
+        known_dupes = int(is_duplicate.sum())
+
+    new_idx = np.flatnonzero(is_new)
+    # Compute SimHash for all new survivors in one vectorized batch
+    hashes[new_idx] = simhash_batch([pass1_survivors[k].get("text", "") for k in new_idx])
+
+    if store is not None:
+        stored_match = store.match(hashes[new_idx], similarity_threshold)
+        is_duplicate[new_idx[stored_match]] = True
+        near_dupes += int(stored_match.sum())
+
+    near_dupes += _mark_near_duplicates(hashes, scores, is_new, is_duplicate, similarity_threshold, prefer_higher_score)
 
     unique = [ins for ins, dup in zip(pass1_survivors, is_duplicate) if not dup]
 
@@ -201,4 +345,195 @@ def deduplicate_insights(
         "dedup_rate": round(1 - len(unique) / max(len(insights), 1), 4),
     }
 
+    if store is not None:
+        store.add(keys[new_idx], hashes[new_idx], ~is_duplicate[new_idx])
+        stats.update({
+            "forgotten": forgotten,
+            "known": n_survivors - len(new_idx),
+            "known_dupes": known_dupes,
+            "fingerprinted": len(new_idx),
+        })
+
     return unique, stats
+
+
+def deduplicate_stream(
+    make_stream: Callable[[], Iterable[Dict[str, Any]]],
+    similarity_threshold: int = 5,
+    prefix_chars: int = 150,
+    prefer_higher_score: bool = True,
+    store: Optional["DedupStore"] = None,
+    chunk_size: int = 4096,
+) -> Tuple[Iterator[Dict[str, Any]], Dict[str, Any]]:
+    """
+    deduplicate_insights over a stream, holding no posts in memory.
+
+    make_stream() must return the same posts in the same order each time it is called
+    (e.g. a fresh iter_records over the input files). The first pass keeps only a prefix
+    key, score and SimHash per exact-prefix survivor and decides every verdict; the
+    returned generator then streams the posts again and yields the kept ones.
+
+    The verdicts and stats equal deduplicate_insights'. Kept posts come out in stream
+    order: when a later, higher-scored post wins an exact-prefix tie it is yielded at its
+    own position, not at the position of the post it replaced.
+    """
+    if store is not None and store.prefix_chars != prefix_chars:
+        raise ValueError(f"DedupStore uses prefix_chars={store.prefix_chars}, got {prefix_chars}")
+    from components.dedup_store import prefix_key, KEPT, DROPPED, UNKNOWN
+
+    # Pass 1: exact prefix match, per survivor: (stream position, score, key, SimHash)
+    survivor_of: Dict[int, int] = {}
+    positions: List[int] = []
+    scores: List[Any] = []
+    keys: List[int] = []
+    hashes = np.zeros(chunk_size, dtype=np.uint64)
+    total = exact_dupes = 0
+
+    stream = iter(make_stream())
+    while True:
+        chunk = list(islice(stream, chunk_size))
+        if not chunk:
+            break
+        pending: Dict[int, str] = {}  # survivor → text to fingerprint (the last one seen wins)
+        for i in chunk:
+            pos = total
+            total += 1
+            text = (i.get("text", "") or "").strip()
+            if not text:
+                continue
+            key = prefix_key(text[:prefix_chars].lower().strip())
+            k = survivor_of.get(key)
+            if k is None:
+                k = survivor_of[key] = len(positions)
+                positions.append(pos)
+                scores.append(i.get("score", 0))
+                keys.append(key)
+            else:
+                exact_dupes += 1
+                # Keep the one with higher score
+                if not (prefer_higher_score and i.get("score", 0) > scores[k]):
+                    continue
+                positions[k], scores[k] = pos, i.get("score", 0)
+            pending[k] = i.get("text", "")
+        if store is not None and pending:
+            # Prefixes kept by earlier runs keep their verdict and are not fingerprinted
+            # (dropped ones may be decided again once the corpus is known)
+            status = store.lookup(np.array([keys[k] for k in pending], dtype=np.uint64))
+            pending = {k: t for (k, t), st in zip(pending.items(), status) if st != KEPT}
+        if len(positions) > len(hashes):
+            hashes = np.concatenate([hashes, np.zeros(max(len(hashes), len(positions) - len(hashes)), dtype=np.uint64)])
+        if pending:
+            hashes[list(pending)] = simhash_batch(list(pending.values()))
+    del survivor_of
+
+    n_survivors = len(positions)
+    hashes = hashes[:n_survivors]
+    keys_arr = np.array(keys, dtype=np.uint64)
+    is_duplicate = np.zeros(n_survivors, dtype=bool)
+    is_new = np.ones(n_survivors, dtype=bool)
+    near_dupes = known_dupes = 0
+
+    if store is not None:
+        forgotten = store.retain(keys_arr)
+        status = store.lookup(keys_arr)
+        is_new = status == UNKNOWN
+        is_duplicate |= status == DROPPED
+        known_dupes = int(is_duplicate.sum())
+        new_idx = np.flatnonzero(is_new)
+        stored_match = store.match(hashes[new_idx], similarity_threshold)
+        is_duplicate[new_idx[stored_match]] = True
+        near_dupes += int(stored_match.sum())
+
+    # Pass 2 works on the survivor arrays only
+    near_dupes += _mark_near_duplicates(hashes, scores, is_new, is_duplicate, similarity_threshold, prefer_higher_score)
+
+    kept = np.sort(np.asarray(positions, dtype=np.int64)[~is_duplicate])
+    unique_count = int(kept.shape[0])
+    stats = {
+        "total": total,
+        "after_exact_dedup": n_survivors,
+        "exact_dupes": exact_dupes,
+        "near_dupes": near_dupes,
+        "unique": unique_count,
+        "dedup_rate": round(1 - unique_count / max(total, 1), 4),
+    }
+    if store is not None:
+        new_idx = np.flatnonzero(is_new)
+        store.add(keys_arr[new_idx], hashes[new_idx], ~is_duplicate[new_idx])
+        stats.update({
+            "forgotten": forgotten,
+            "known": n_survivors - len(new_idx),
+            "known_dupes": known_dupes,
+            "fingerprinted": len(new_idx),
+        })
+
+    def _unique() -> Iterator[Dict[str, Any]]:
+        nxt = 0
+        for p, post in enumerate(make_stream()):
+            if nxt >= unique_count:
+                return
+            if p == kept[nxt]:
+                nxt += 1
+                yield post
+
+    return _unique(), stats
+
+
+# ---------------------------------------------------------------------------
+# CLI — throughput benchmark
+# ---------------------------------------------------------------------------
+
+def _synthetic_posts(count: int, dupe_rate: float = 0.1, seed: int = 7) -> List[Dict[str, Any]]:
+    """Random forum-like posts with a share of lightly edited reposts."""
+    import random
+    rng = random.Random(seed)
+    vocab = [
+        "psa", "vault", "grading", "slab", "ebay", "seller", "buyer", "shipping", "refund",
+        "whatnot", "fanatics", "auction", "bid", "fees", "payout", "tracking", "pokemon",
+        "rookie", "auto", "refractor", "break", "repack", "listing", "offer", "return",
+    ] + ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 10))) for _ in range(5000)]
+    posts = []
+    for k in range(count):
+        if posts and rng.random() < dupe_rate:
+            words = posts[rng.randrange(len(posts))]["text"].split()
+            words[rng.randrange(len(words))] = rng.choice(vocab)
+        else:
+            words = rng.choices(vocab, k=rng.randint(20, 80))
+        posts.append({"text": " ".join(words), "score": rng.randint(0, 100)})
+    return posts
+
+
+def benchmark(sizes: List[int]) -> List[Dict[str, Any]]:
+    """Fingerprint + full dedup throughput on synthetic corpora."""
+    rows = []
+    for size in sizes:
+        posts = _synthetic_posts(size)
+        t0 = time.perf_counter()
+        simhash_batch([p["text"] for p in posts])
+        t1 = time.perf_counter()
+        _, stats = deduplicate_insights(posts)
+        t2 = time.perf_counter()
+        row = {
+            "posts": size,
+            "fingerprint_s": round(t1 - t0, 2),
+            "fingerprint_posts_per_s": int(size / max(t1 - t0, 1e-9)),
+            "dedup_s": round(t2 - t1, 2),
+            "dedup_posts_per_s": int(size / max(t2 - t1, 1e-9)),
+            "near_dupes": stats["near_dupes"],
+        }
+        print(f"[DEDUP] {row}")
+        rows.append(row)
+    return rows
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Deduplicator — SimHash throughput benchmark")
+    parser.add_argument("--benchmark", type=int, nargs="+", default=[40_000, 200_000, 1_000_000],
+                        help="Corpus sizes to benchmark")
+    args = parser.parse_args()
+    benchmark(args.benchmark)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# density_clustering.py — Blocked NumPy DBSCAN + coherence over cached (unit-norm) embeddings
+#
+# The embedding clustering path in cluster_synthesizer re-encoded every subtag group with
+# the SentenceTransformer, then each cluster again for its coherence check and again to
+# split incoherent clusters. With the vectors already in the embedding store
+# (components/embedding_store.py), clustering is plain array math:
+#   1. dbscan_cosine(): neighbours are cosine distance <= eps, computed in row blocks of
+#      the upper triangle of the similarity matrix (bounded memory, each pair once); core
+#      points are joined with a vectorized union-find, border points take the lowest
+#      adjacent cluster — the same labels as sklearn's DBSCAN(metric="cosine"), without
+#      sklearn or scipy
+#   2. mean_pairwise_similarity(): average off-diagonal cosine in O(n·d) from the sum
+#      vector, instead of an n×n matrix
+#
+# Usage:
+#   vectors = unit_rows(store.gather(fingerprints)[0])
+#   labels = dbscan_cosine(vectors, eps=0.38, min_samples=3)      # -1 = noise
+#   score = mean_pairwise_similarity(vectors[labels == 0])
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Similarity-matrix entries computed per block (~16MB of float32)
+BLOCK_ENTRIES = 4_000_000
+# Neighbour pairs kept from the counting pass (int32 pairs, ~64MB); denser groups recompute
+MAX_PAIRS = 8_000_000
+
+
+def unit_rows(vectors: np.ndarray) -> np.ndarray:
+    """float32 copy with every non-zero row scaled to unit length."""
+    out = np.asarray(vectors, dtype=np.float32).copy()
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    np.divide(out, norms, out=out, where=norms > 0)
+    return out
+
+
+def _row_blocks(rows: int, cols: int, block_entries: int):
+    step = max(1, block_entries // max(1, cols))
+    for start in range(0, rows, step):
+        yield start, min(rows, start + step)
+
+
+def _neighbour_blocks(vectors: np.ndarray, threshold: np.float32, block_entries: int):
+    """Yield (start, neighbours) for row blocks of the upper triangle: neighbours[r, c] means
+    rows start + r and start + c (c > r) are within eps. Each pair is computed once."""
+    n = vectors.shape[0]
+    start = 0
+    while start < n:
+        stop = min(n, start + max(1, block_entries // (n - start)))
+        near = vectors[start:stop] @ vectors[start:].T >= threshold
+        near[:, :stop - start] &= np.triu(np.ones((stop - start, stop - start), dtype=bool), k=1)
+        yield start, near
+        start = stop
+
+
+def _compress(parent: np.ndarray) -> np.ndarray:
+    while True:
+        grand = parent[parent]
+        if np.array_equal(grand, parent):
+            return parent
+        parent = grand
+
+
+def _union(parent: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Merge the sets of each (a[k], b[k]) pair; roots are always the smallest member."""
+    while a.shape[0]:
+        ra, rb = parent[a], parent[b]
+        keep = ra != rb
+        if not keep.any():
+            break
+        ra, rb = ra[keep], rb[keep]
+        np.minimum.at(parent, np.maximum(ra, rb), np.minimum(ra, rb))
+        parent = _compress(parent)
+        a, b = ra, rb
+    return parent
+
+
+def dbscan_cosine(
+    vectors: np.ndarray,
+    eps: float,
+    min_samples: int,
+    block_entries: int = BLOCK_ENTRIES,
+    max_pairs: int = MAX_PAIRS,
+) -> np.ndarray:
+    """DBSCAN labels (-1 = noise) for unit-norm rows under cosine distance."""
+    n = vectors.shape[0]
+    if n == 0:
+        return np.empty(0, dtype=np.int32)
+    threshold = np.float32(1.0 - eps)
+
+    # Pass 1: neighbour counts (self included, as in sklearn) → core points. The
+    # neighbour pairs are kept for pass 2 unless there are more than max_pairs.
+    counts = np.ones(n, dtype=np.int64)
+    pairs: Optional[List[Tuple[np.ndarray, np.ndarray]]] = []
+    kept = 0
+    for start, near in _neighbour_blocks(vectors, threshold, block_entries):
+        counts[start:start + near.shape[0]] += np.count_nonzero(near, axis=1)
+        counts[start:] += np.count_nonzero(near, axis=0)
+        if pairs is not None:
+            rows, cols = np.nonzero(near)
+            kept += rows.shape[0]
+            if kept > max_pairs:
+                pairs = None
+            else:
+                pairs.append(((rows + start).astype(np.int32), (cols + start).astype(np.int32)))
+    is_core = counts >= min_samples
+    core = np.nonzero(is_core)[0]
+    labels = np.full(n, -1, dtype=np.int32)
+    if not core.shape[0]:
+        return labels
+
+    # Pass 2: connected components of the core-core neighbour graph. Roots are the
+    # smallest core index of each component, so clusters are numbered in order of their
+    # first core point (sklearn's order).
+    parent = np.arange(n, dtype=np.int64)
+    if pairs is not None:
+        a = np.concatenate([r for r, _ in pairs]) if pairs else np.empty(0, dtype=np.int32)
+        b = np.concatenate([c for _, c in pairs]) if pairs else np.empty(0, dtype=np.int32)
+        both = is_core[a] & is_core[b]
+        parent = _union(parent, a[both], b[both])
+    else:
+        core_vecs = vectors[core]
+        for start, near in _neighbour_blocks(core_vecs, threshold, block_entries):
+            rows, cols = np.nonzero(near)
+            parent = _union(parent, core[rows + start], core[cols + start])
+    _, core_labels = np.unique(parent[core], return_inverse=True)
+    labels[core] = core_labels
+
+    # Pass 3: border points join the lowest-numbered cluster among their core neighbours
+    none = np.iinfo(np.int32).max
+    if pairs is not None:
+        best = np.full(n, none, dtype=np.int64)
+        for x, y in ((a, b), (b, a)):
+            sel = ~is_core[x] & is_core[y]
+            np.minimum.at(best, x[sel], labels[y[sel]])
+        border = np.nonzero(best < none)[0]
+        labels[border] = best[border]
+    else:
+        border = np.nonzero(~is_core & (counts > 1))[0]
+        for start, stop in _row_blocks(border.shape[0], core.shape[0], block_entries):
+            rows = border[start:stop]
+            near = vectors[rows] @ core_vecs.T >= threshold
+            best = np.where(near, core_labels[None, :].astype(np.int32), np.int32(none)).min(axis=1)
+            labels[rows] = np.where(best == none, -1, best)
+    return labels
+
+
+def cluster_members(labels: np.ndarray) -> List[np.ndarray]:
+    """Row indices of each cluster, in label order (noise excluded)."""
+    if not labels.shape[0] or labels.max() < 0:
+        return []
+    order = np.argsort(labels, kind="stable")
+    sorted_labels = labels[order]
+    starts = np.searchsorted(sorted_labels, np.arange(labels.max() + 2))
+    return [order[starts[k]:starts[k + 1]] for k in range(labels.max() + 1)]
+
+
+def mean_pairwise_similarity(vectors: np.ndarray) -> float:
+    """Mean cosine similarity over all pairs i < j of unit-norm rows."""
+    n = vectors.shape[0]
+    if n < 2:
+        return 1.0
+    v = np.asarray(vectors, dtype=np.float64)
+    total = v.sum(axis=0)
+    return float((total @ total - np.einsum("ij,ij->", v, v)) / (n * (n - 1)))
@@ -0,0 +1,253 @@
+# embedding_store.py — Append-only, fingerprint-keyed embedding store (float16 segments on disk)
+#
+# precompute_embeddings used to re-encode every insight on each pipeline run and write one
+# monolithic .npy plus a JSON list of every fingerprint. The store keeps vectors across runs:
+#   1. Vectors live in append-only float16 segment files (one per embed run that added rows)
+#   2. A compact binary index maps md5(fingerprint) → (segment, row): sorted 16-byte keys
+#      in keys.npy with parallel segment.npy / row.npy, looked up with np.searchsorted
+#   3. The embed step encodes only fingerprints that are not stored yet, then drops the
+#      rows of insights that are gone (retain); segments that fall below half live are
+#      rewritten (compact), empty ones deleted
+#   4. Readers memory-map the segments and the index read-only
+#
+# Layout: <path>/manifest.json, keys.npy, segment.npy, row.npy, seg_<id>.npy
+#
+# Usage:
+#   store = EmbeddingStore.open("precomputed_embedding_store", model="intfloat/e5-base-v2", dim=768)
+#   todo = store.missing(fingerprints)
+#   store.append(todo, model.encode(texts_for(todo)))
+#   store.retain(fingerprints); store.compact(); store.save()
+
+import os
+import re
+import json
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+EMBEDDING_STORE_PATH = "precomputed_embedding_store"
+
+_KEY_DTYPE = "S16"
+
+
+def fingerprint_keys(fingerprints: Iterable[str]) -> np.ndarray:
+    """16-byte md5 keys for fingerprints (the store's index key)."""
+    return np.array([hashlib.md5(fp.encode("utf-8")).digest() for fp in fingerprints], dtype=_KEY_DTYPE)
+
+
+class EmbeddingStore:
+    """Fingerprint → float16 vector, stored as append-only segments plus a sorted key index."""
+
+    def __init__(self, path: str, manifest: Dict[str, Any], keys: np.ndarray, segment: np.ndarray, row: np.ndarray):
+        self.path = path
+        self.manifest = manifest
+        self.keys = keys
+        self.segment = segment
+        self.row = row
+        self._segments: Dict[int, np.ndarray] = {}
+
+    # ── Open / persist ──
+
+    @classmethod
+    def open(
+        cls,
+        path: str = EMBEDDING_STORE_PATH,
+        model: Optional[str] = None,
+        dim: Optional[int] = None,
+        mmap: bool = True,
+    ) -> "EmbeddingStore":
+        """Open (or start) a store. A store for a different model or dimension is started over.
+
+        Starting over keeps segment numbering past every seg_<id>.npy already in the directory,
+        so the new store never rewrites a segment file a reader may still have memory-mapped;
+        the old segments are deleted by save() once the new manifest is in place.
+        """
+        manifest_path = os.path.join(path, "manifest.json")
+        next_segment = 0
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if (model is None or manifest.get("model") == model) and (dim is None or manifest.get("dim") == dim):
+                mode = "r" if mmap else None
+                arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode) for name in ("keys", "segment", "row")}
+                return cls(path, manifest, **arrays)
+            print(f"[EMBED-STORE] {path} holds {manifest.get('model')} ({manifest.get('dim')}d) — starting over for {model}")
+            next_segment = int(manifest.get("next_segment", 0))
+        if os.path.isdir(path):
+            on_disk = [int(name[4:-4]) for name in os.listdir(path) if re.fullmatch(r"seg_\d+\.npy", name)]
+            next_segment = max([next_segment] + [s + 1 for s in on_disk])
+        manifest = {"model": model, "dim": dim, "segments": {}, "next_segment": next_segment}
+        return cls(
+            path,
+            manifest,
+            np.empty(0, dtype=_KEY_DTYPE),
+            np.empty(0, dtype=np.int32),
+            np.empty(0, dtype=np.int32),
+        )
+
+    @classmethod
+    def exists(cls, path: str = EMBEDDING_STORE_PATH) -> bool:
+        return os.path.exists(os.path.join(path, "manifest.json"))
+
+    def save(self):
+        """Write the index and manifest (temp file + os.replace) and delete unreferenced segments."""
+        os.makedirs(self.path, exist_ok=True)
+        for name in ("keys", "segment", "row"):
+            tmp = os.path.join(self.path, f"{name}.tmp.npy")
+            np.save(tmp, np.asarray(getattr(self, name)))
+            os.replace(tmp, os.path.join(self.path, f"{name}.npy"))
+        self.manifest["rows"] = len(self)
+        self.manifest["updated_at"] = datetime.now(timezone.utc).isoformat()
+        tmp = os.path.join(self.path, "manifest.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp, os.path.join(self.path, "manifest.json"))
+
+        live = {self._segment_file(int(s)) for s in self.manifest["segments"]}
+        for name in os.listdir(self.path):
+            if name.startswith("seg_") and name.endswith(".npy") and name not in live:
+                os.remove(os.path.join(self.path, name))
+
+    # ── Segments ──
+
+    @property
+    def model(self) -> Optional[str]:
+        return self.manifest.get("model")
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self.manifest.get("dim")
+
+    def _segment_file(self, seg_id: int) -> str:
+        return f"seg_{seg_id:06d}.npy"
+
+    def segment_ids(self) -> List[int]:
+        return sorted(int(s) for s in self.manifest["segments"])
+
+    def segment_array(self, seg_id: int) -> np.ndarray:
+        """Memory-mapped (rows, dim) float16 vectors of one segment."""
+        arr = self._segments.get(seg_id)
+        if arr is None:
+            arr = np.load(os.path.join(self.path, self._segment_file(seg_id)), mmap_mode="r")
+            self._segments[seg_id] = arr
+        return arr
+
+    def iter_segments(self) -> Iterator[Tuple[int, np.ndarray]]:
+        for seg_id in self.segment_ids():
+            yield seg_id, self.segment_array(seg_id)
+
+    # ── Lookup ──
+
+    def __len__(self) -> int:
+        return int(self.keys.shape[0])
+
+    def locate(self, fingerprints: Iterable[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(segment ids, rows, found mask) for each fingerprint; missing entries are -1."""
+        query = fingerprint_keys(fingerprints)
+        seg = np.full(query.shape[0], -1, dtype=np.int32)
+        row = np.full(query.shape[0], -1, dtype=np.int32)
+        if not len(self) or not query.shape[0]:
+            return seg, row, np.zeros(query.shape[0], dtype=bool)
+        pos = np.searchsorted(self.keys, query)
+        pos_c = np.minimum(pos, len(self) - 1)
+        found = np.asarray(self.keys[pos_c]) == query
+        seg[found] = np.asarray(self.segment)[pos_c[found]]
+        row[found] = np.asarray(self.row)[pos_c[found]]
+        return seg, row, found
+
+    def missing(self, fingerprints: Iterable[str]) -> List[str]:
+        """Fingerprints (deduplicated, in first-seen order) that have no stored vector."""
+        unique = list(dict.fromkeys(fingerprints))
+        _, _, found = self.locate(unique)
+        return [fp for fp, ok in zip(unique, found) if not ok]
+
+    def gather(self, fingerprints: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(float16 matrix, found mask) for fingerprints in order; missing rows are zero."""
+        seg, row, found = self.locate(fingerprints)
+        out = np.zeros((len(fingerprints), self.dim or 0), dtype=np.float16)
+        for seg_id in np.unique(seg[found]):
+            sel = np.nonzero(seg == seg_id)[0]
+            rows = row[sel]
+            order = np.argsort(rows)
+            out[sel[order]] = self.segment_array(int(seg_id))[rows[order]]
+        return out, found
+
+    # ── Mutation (pipeline side) ──
+
+    def append(self, fingerprints: List[str], vectors: np.ndarray) -> int:
+        """Store vectors for new fingerprints as one new segment; returns rows added."""
+        if not fingerprints:
+            return 0
+        vectors = np.asarray(vectors)
+        if vectors.shape[0] != len(fingerprints):
+            raise ValueError(f"{vectors.shape[0]} vectors for {len(fingerprints)} fingerprints")
+        if self.dim is None:
+            self.manifest["dim"] = int(vectors.shape[1])
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"vector dim {vectors.shape[1]} != store dim {self.dim}")
+
+        seg_id = int(self.manifest["next_segment"])
+        os.makedirs(self.path, exist_ok=True)
+        np.save(os.path.join(self.path, self._segment_file(seg_id)), vectors.astype(np.float16))
+        self.manifest["next_segment"] = seg_id + 1
+        self.manifest["segments"][str(seg_id)] = int(vectors.shape[0])
+
+        self._merge(
+            fingerprint_keys(fingerprints),
+            np.full(len(fingerprints), seg_id, dtype=np.int32),
+            np.arange(len(fingerprints), dtype=np.int32),
+        )
+        return len(fingerprints)
+
+    def _merge(self, keys: np.ndarray, segment: np.ndarray, row: np.ndarray):
+        """Insert entries into the sorted index; a new entry replaces an existing key."""
+        keys_all = np.concatenate([keys, np.asarray(self.keys)])
+        seg_all = np.concatenate([segment, np.asarray(self.segment)])
+        row_all = np.concatenate([row, np.asarray(self.row)])
+        uniq, first = np.unique(keys_all, return_index=True)  # first occurrence = newest
+        self.keys, self.segment, self.row = uniq, seg_all[first], row_all[first]
+
+    def retain(self, fingerprints: Iterable[str]) -> int:
+        """Drop every entry whose fingerprint is not in `fingerprints`; returns rows dropped."""
+        keep = np.isin(np.asarray(self.keys), fingerprint_keys(set(fingerprints)))
+        dropped = int((~keep).sum())
+        if dropped:
+            self.keys = np.asarray(self.keys)[keep]
+            self.segment = np.asarray(self.segment)[keep]
+            self.row = np.asarray(self.row)[keep]
+        return dropped
+
+    def live_counts(self) -> Dict[int, int]:
+        counts = np.bincount(np.asarray(self.segment), minlength=int(self.manifest["next_segment"])) if len(self) else []
+        return {seg_id: int(counts[seg_id]) if seg_id < len(counts) else 0 for seg_id in self.segment_ids()}
+
+    def compact(self, min_live: float = 0.5) -> int:
+        """Rewrite segments under `min_live` live rows into one new segment; returns rows reclaimed."""
+        live = self.live_counts()
+        sparse = [s for s in self.segment_ids() if live[s] < min_live * self.manifest["segments"][str(s)]]
+        if not sparse:
+            return 0
+        reclaimed = sum(self.manifest["segments"][str(s)] - live[s] for s in sparse)
+        moving = np.nonzero(np.isin(np.asarray(self.segment), sparse))[0]
+        if moving.shape[0]:
+            parts = []
+            seg_arr, row_arr = np.asarray(self.segment), np.asarray(self.row)
+            for s in sparse:
+                sel = moving[seg_arr[moving] == s]
+                parts.append((sel, np.asarray(self.segment_array(s)[np.sort(row_arr[sel])]), np.argsort(row_arr[sel])))
+            order = np.concatenate([sel[o] for sel, _, o in parts])
+            vectors = np.concatenate([v for _, v, _ in parts])
+            seg_id = int(self.manifest["next_segment"])
+            np.save(os.path.join(self.path, self._segment_file(seg_id)), vectors.astype(np.float16))
+            self.manifest["next_segment"] = seg_id + 1
+            self.manifest["segments"][str(seg_id)] = int(vectors.shape[0])
+            self.segment = seg_arr.copy()
+            self.row = row_arr.copy()
+            self.segment[order] = seg_id
+            self.row[order] = np.arange(order.shape[0], dtype=np.int32)
+        for s in sparse:
+            del self.manifest["segments"][str(s)]
+            self._segments.pop(s, None)
+        return int(reclaimed)
@@ -5,34 +5,13 @@ import re
 from components.brand_recognizer import recognize_brand
 from components.scoring_utils import estimate_severity, calculate_pm_priority, gpt_estimate_sentiment_subtag
 
-# Use lightweight transformer model unless disabled
+# Use lightweight transformer model unless disabled (loaded on first use by sentiment_engine)
 USE_LIGHT_MODEL = os.getenv("USE_LIGHT_CLASSIFIERS", "1") == "1"
 
-if USE_LIGHT_MODEL:
-    import torch
-    from transformers import AutoTokenizer, AutoModelForSequenceClassification
-    from scipy.special import softmax
-
-    MODEL_NAME = "cardiffnlp/twitter-roberta-base-sentiment"
-    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-    model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
-else:
-    tokenizer = None
-    model = None
-
 def classify_sentiment(text):
-    if tokenizer and model:
-        encoded_input = tokenizer(text, return_tensors='pt', truncation=True, padding=True, max_length=512)
-        with torch.no_grad():
-            output = model(**encoded_input)
-            scores = softmax(output.logits[0].numpy())
-            labels = ["Negative", "Neutral", "Positive"]
-            label = labels[scores.argmax()]
-            confidence = round(float(scores.max()) * 100, 2)
-        return {
-            "sentiment": {"Positive": "Praise", "Negative": "Complaint", "Neutral": "Neutral"}.get(label, "Neutral"),
-            "confidence": confidence
-        }
+    if USE_LIGHT_MODEL:
+        from components.sentiment_engine import get_sentiment_engine
+        return get_sentiment_engine().classify(text)
 
     # fallback to GPT-based
     result = gpt_estimate_sentiment_subtag(text)
@@ -41,6 +20,13 @@ def classify_sentiment(text):
         "confidence": 70
     }
 
+def classify_sentiment_many(texts):
+    """classify_sentiment for a chunk of texts — one batched model pass in light mode."""
+    if USE_LIGHT_MODEL:
+        from components.sentiment_engine import get_sentiment_engine
+        return get_sentiment_engine().classify_many(list(texts))
+    return [classify_sentiment(t) for t in texts]
+
 def detect_subtags(text):
     if not USE_LIGHT_MODEL:
         return gpt_estimate_sentiment_subtag(text)["subtags"]
@@ -70,7 +56,9 @@ def detect_subtags(text):
             found.add(label)
     return list(found) if found else ["General"]
 
-def enhance_insight(insight, skip_gpt=False):
+def enhance_insight(insight, skip_gpt=False, sentiment=None):
+    """sentiment: precomputed classify_sentiment(text.lower()) result, e.g. from classify_sentiment_many
+    ({} when the model failed on the text — brand_sentiment is then left as it was)."""
     text = insight.get("text", "").lower()
 
     # Brand detection
@@ -78,15 +66,18 @@ def enhance_insight(insight, skip_gpt=False):
     insight["target_brand"] = brand
 
     # Sentiment classification
-    if skip_gpt or USE_LIGHT_MODEL:
-        sentiment_result = classify_sentiment(text)
+    if sentiment is not None:
+        sentiment_result = sentiment
+    elif skip_gpt or USE_LIGHT_MODEL:
+        sentiment_result = classify_sentiment(text) or {}
     else:
         sentiment_result = {
             "sentiment": gpt_estimate_sentiment_subtag(text)["sentiment"],
             "confidence": 70
         }
-    insight["brand_sentiment"] = sentiment_result["sentiment"]
-    insight["sentiment_confidence"] = sentiment_result["confidence"]
+    if sentiment_result:
+        insight["brand_sentiment"] = sentiment_result["sentiment"]
+        insight["sentiment_confidence"] = sentiment_result["confidence"]
 
     # Subtags
     if skip_gpt or USE_LIGHT_MODEL:
@@ -6,7 +6,7 @@ from openai import OpenAI
 
 load_dotenv()
 load_dotenv(os.path.expanduser(os.path.join("~", "signalsynth", ".env")), override=True)
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY")) if os.getenv("OPENAI_API_KEY") else None
+client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0) if os.getenv("OPENAI_API_KEY") else None
 
 # Keyword and pattern rules
 PRAISE_KEYWORDS = [
@@ -48,8 +48,16 @@ def classify_brand_sentiment(text, brand):
 
     # Fallback to AI sentiment classification
     if client and len(text_lower) > 30:
+        from components.llm_cache import get_cache, make_key
+        cache = get_cache("brand_sentiment")
+        key = make_key(text, brand)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
         try:
-            response = client.chat.completions.create(
+            from components.llm_scheduler import get_scheduler
+            response = get_scheduler().complete(
+                client,
                 model=os.getenv("OPENAI_MODEL_SENTIMENT", "gpt-4o-mini"),
                 messages=[
                     {"role": "system", "content": "Classify this customer's sentiment toward a brand as Praise, Complaint, or Neutral. Only return one of those words."},
@@ -60,7 +68,7 @@ def classify_brand_sentiment(text, brand):
             )
             classification = response.choices[0].message.content.strip()
             if classification in ["Praise", "Complaint", "Neutral"]:
-                return classification
+                return cache.put(key, classification)
         except Exception as e:
             print("[Sentiment Fallback Error]", e)
 
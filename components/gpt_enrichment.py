@@ -18,7 +18,7 @@ import os
 import time
 import hashlib
 from typing import List, Dict, Any, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -26,11 +26,12 @@ load_dotenv(os.path.expanduser(os.path.join("~", "signalsynth", ".env")), overri
 
 from openai import OpenAI
 
+from components.llm_scheduler import get_scheduler
+
 # ── Config ──
 MODEL = "gpt-4o-mini"
 BATCH_SIZE = 10  # Signals per API call (balance cost vs accuracy)
-MAX_WORKERS = 4  # Parallel API calls
-CACHE_PATH = "data/gpt_enrichment_cache.json"
+CACHE_PATH = "data/gpt_enrichment_cache.json"  # legacy JSON cache, imported into the shared LLM cache once
 
 # ── Prompt ──
 SYSTEM_PROMPT = """You are a signal classifier for eBay's Collectibles & Trading Cards business unit.
@@ -62,25 +63,13 @@ def _get_client() -> OpenAI:
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key or "YOUR_" in api_key.upper():
         raise ValueError("OPENAI_API_KEY not configured")
-    return OpenAI(api_key=api_key)
-
+    return OpenAI(api_key=api_key, max_retries=0)
 
-def _load_cache() -> Dict[str, Any]:
-    """Load enrichment cache."""
-    if os.path.exists(CACHE_PATH):
-        try:
-            with open(CACHE_PATH, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            pass
-    return {}
 
-
-def _save_cache(cache: Dict[str, Any]):
-    """Save enrichment cache."""
-    os.makedirs(os.path.dirname(CACHE_PATH) or ".", exist_ok=True)
-    with open(CACHE_PATH, "w", encoding="utf-8") as f:
-        json.dump(cache, f, ensure_ascii=False)
+def _load_cache():
+    """Shared enrichment cache (components.llm_cache)."""
+    from components.llm_cache import get_cache
+    return get_cache("gpt_enrichment", legacy_json=CACHE_PATH)
 
 
 def _signal_fingerprint(signal: Dict[str, Any]) -> str:
@@ -104,7 +93,8 @@ def _enrich_batch(client: OpenAI, signals: List[Dict[str, Any]]) -> List[Dict[st
 {chr(10).join(signal_texts)}"""
 
     try:
-        completion = client.chat.completions.create(
+        completion = get_scheduler().complete(
+            client,
             model=MODEL,
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT},
@@ -138,7 +128,7 @@ def _enrich_batch(client: OpenAI, signals: List[Dict[str, Any]]) -> List[Dict[st
 def enrich_signals_with_gpt(
     signals: List[Dict[str, Any]],
     batch_size: int = BATCH_SIZE,
-    max_workers: int = MAX_WORKERS,
+    max_workers: Optional[int] = None,
     use_cache: bool = True,
 ) -> List[Dict[str, Any]]:
     """
@@ -146,19 +136,15 @@ def enrich_signals_with_gpt(
     
     Returns signals with updated taxonomy, sentiment, entities, and executive summaries.
     Uses caching to avoid re-processing already-enriched signals.
+    Batches run on the shared LLM scheduler, which sets concurrency and rate
+    limits (SS_LLM_CONCURRENCY / SS_LLM_RPM / SS_LLM_TPM); max_workers is ignored.
     """
     client = _get_client()
-    cache = _load_cache() if use_cache else {}
+    cache = _load_cache() if use_cache else None
     
     # Split into cached and uncached
-    to_process = []
-    cached_results = {}
-    for sig in signals:
-        fp = _signal_fingerprint(sig)
-        if fp in cache:
-            cached_results[fp] = cache[fp]
-        else:
-            to_process.append(sig)
+    cached_results = cache.get_many(_signal_fingerprint(sig) for sig in signals) if cache is not None else {}
+    to_process = [sig for sig in signals if _signal_fingerprint(sig) not in cached_results]
     
     print(f"  GPT enrichment: {len(signals)} signals ({len(cached_results)} cached, {len(to_process)} to process)")
     
@@ -175,35 +161,26 @@ def enrich_signals_with_gpt(
     new_enrichments = {}
     processed = 0
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {}
-        for batch_idx, batch in enumerate(batches):
-            future = executor.submit(_enrich_batch, client, batch)
-            futures[future] = (batch_idx, batch)
-        
-        for future in as_completed(futures):
-            batch_idx, batch = futures[future]
-            try:
-                results = future.result()
-                for sig, enrichment in zip(batch, results):
-                    fp = _signal_fingerprint(sig)
-                    new_enrichments[fp] = enrichment
-                    cache[fp] = enrichment
-                processed += len(batch)
-                if processed % 100 == 0 or processed == len(to_process):
-                    print(f"    Processed {processed}/{len(to_process)} signals...")
-                # Save cache incrementally every 500 signals
-                if use_cache and processed % 500 == 0:
-                    _save_cache(cache)
-            except Exception as e:
-                print(f"    ⚠️ Batch {batch_idx} failed: {e}")
-                # Save cache on error too
-                if use_cache:
-                    _save_cache(cache)
+    scheduler = get_scheduler()
+    futures = {}
+    for batch_idx, batch in enumerate(batches):
+        future = scheduler.run(_enrich_batch, client, batch)
+        futures[future] = (batch_idx, batch)
     
-    # Save updated cache
-    if use_cache:
-        _save_cache(cache)
+    for future in as_completed(futures):
+        batch_idx, batch = futures[future]
+        try:
+            results = future.result()
+            batch_enrichments = {_signal_fingerprint(sig): enrichment for sig, enrichment in zip(batch, results)}
+            new_enrichments.update(batch_enrichments)
+            # Each batch is appended to the cache as soon as it lands
+            if cache is not None:
+                cache.put_many(batch_enrichments)
+            processed += len(batch)
+            if processed % 100 == 0 or processed == len(to_process):
+                print(f"    Processed {processed}/{len(to_process)} signals...")
+        except Exception as e:
+            print(f"    ⚠️ Batch {batch_idx} failed: {e}")
     
     # Apply all enrichments (cached + new)
     all_enrichments = {**cached_results, **new_enrichments}
@@ -271,6 +248,10 @@ def _apply_enrichment(signal: Dict[str, Any], enrichment: Dict[str, Any]):
     # Flag as GPT-enriched
     signal["_gpt_enriched"] = True
 
+    # Subtag / competitors may have changed — refresh the stored workstream routing
+    from components.workstream_routing import annotate_workstream
+    annotate_workstream(signal)
+
 
 if __name__ == "__main__":
     # Test with a small batch
@@ -7,32 +7,41 @@
 #   4. Source diversity cap to prevent single-source dominance
 #
 # Usage:
-#   retriever = HybridRetriever(insights, embeddings_path="precomputed_embeddings.npy")
+#   retriever = HybridRetriever(insights)
 #   results = retriever.retrieve(query, top_k=25)
+#
+# The BM25 half is served from a prebuilt inverted index (components/bm25_index.py)
+# written by the pipeline next to the embeddings and memory-mapped at startup.
+# The dense half is served from a prebuilt IVF-PQ index (components/ann_index.py), also
+# memory-mapped; without it, the live segments of the embedding store
+# (components/embedding_store.py) — or legacy .npy embeddings — are scored exactly.
+#
+# add_documents() indexes posts that arrive after startup (Ask AI ad-hoc scrapes) without a
+# rebuild: BM25 statistics are updated incrementally, their vectors (from the embedding
+# store, else the query encoder's model) are held in a small in-memory matrix scored
+# exactly next to the index, and their boost features are appended.
 
 import os
 import json
 import re
-import math
 import hashlib
+import importlib.util
+import threading
 from collections import defaultdict, Counter
+from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional, Tuple
 
 import numpy as np
 
-# Optional: rank_bm25 for proper BM25 scoring
-try:
-    from rank_bm25 import BM25Okapi
-    HAS_BM25 = True
-except ImportError:
-    HAS_BM25 = False
+from components.ann_index import IVFPQIndex, top_k_desc
+from components.bm25_index import InvertedBM25Index
+from components.embedding_store import EmbeddingStore, EMBEDDING_STORE_PATH
+from components.insight_columns import _parse_date
+from components.keyword_matcher import register_groups, match_insight
+from components.query_encoder import get_query_encoder, QueryEncoder
 
-# Optional: sentence-transformers for query encoding at runtime
-try:
-    from sentence_transformers import SentenceTransformer
-    HAS_ST = True
-except ImportError:
-    HAS_ST = False
+# Optional: sentence-transformers for query encoding at runtime (imported on first use)
+HAS_ST = importlib.util.find_spec("sentence_transformers") is not None
 
 
 # ---------------------------------------------------------------------------
@@ -58,48 +67,60 @@ def _tokenize(text: str) -> List[str]:
     return [t for t in tokens if t not in _STOPWORDS and len(t) > 1]
 
 
-# ---------------------------------------------------------------------------
-# Lightweight BM25 fallback (no external dependency)
-# ---------------------------------------------------------------------------
+# Breaking news signals (lawsuits, policy changes, major events) boosted for competitive
+# questions; matched through the shared keyword matcher (memoized per insight)
+_BREAKING_TERMS = ["lawsuit", "class action", "sued", "gambling",
+                   "rico", "legal", "regulation", "policy change",
+                   "hot water", "reckoning", "investigation",
+                   "settlement", "fine", "penalty", "banned",
+                   "regulate", "compliance", "enforcement"]
+register_groups({"retrieval.breaking": _BREAKING_TERMS})
 
-class SimpleBM25:
-    """Minimal BM25 implementation for when rank_bm25 is not installed."""
-
-    def __init__(self, corpus: List[List[str]], k1: float = 1.5, b: float = 0.75):
-        self.k1 = k1
-        self.b = b
-        self.corpus = corpus
-        self.N = len(corpus)
-        self.avgdl = sum(len(doc) for doc in corpus) / max(self.N, 1)
-
-        # Document frequency
-        self.df: Dict[str, int] = defaultdict(int)
-        for doc in corpus:
-            for term in set(doc):
-                self.df[term] += 1
-
-        # Term frequency per document
-        self.tf: List[Dict[str, int]] = []
-        self.doc_lens: List[int] = []
-        for doc in corpus:
-            tf = defaultdict(int)
-            for term in doc:
-                tf[term] += 1
-            self.tf.append(dict(tf))
-            self.doc_lens.append(len(doc))
-
-    def get_scores(self, query: List[str]) -> np.ndarray:
-        scores = np.zeros(self.N)
-        for term in query:
-            if term not in self.df:
-                continue
-            idf = math.log((self.N - self.df[term] + 0.5) / (self.df[term] + 0.5) + 1)
-            for idx in range(self.N):
-                tf = self.tf[idx].get(term, 0)
-                dl = self.doc_lens[idx]
-                denom = tf + self.k1 * (1 - self.b + self.b * dl / max(self.avgdl, 1))
-                scores[idx] += idf * (tf * (self.k1 + 1)) / max(denom, 1e-9)
-        return scores
+# News/industry sources boosted for competitive questions — these often have score:0 but
+# contain breaking intelligence (substring of the lowercased source)
+_NEWS_SOURCES = ("news:", "cllct", "podcast", "industry analysis",
+                 "mantel", "whatnot", "heritage", "goldin blog",
+                 "heritage blog", "card ladder", "sports card investor")
+# Competitor platforms: a source from the competitor named in the question is boosted
+_COMP_NAMES = ["whatnot", "fanatics", "heritage", "goldin", "tcgplayer", "comc", "beckett", "vinted"]
+
+# Source categories (bit flags per distinct source)
+_SRC_TRUSTPILOT = 1
+_SRC_PERSONA = 2
+_SRC_NEWS = 4
+
+# Boost per signal-strength / engagement bucket (0 = low)
+_SIGNAL_BOOST = np.array([0.0, 0.01, 0.02])
+_ENGAGEMENT_BOOST = np.array([0.0, 0.005, 0.015])
+
+
+def _insight_fingerprint(insight: Dict[str, Any]) -> str:
+    return insight.get("fingerprint", hashlib.md5(insight.get("text", "").encode()).hexdigest())
+
+
+def _bm25_document(insight: Dict[str, Any]) -> List[str]:
+    """Tokens indexed for one insight: text + metadata fields."""
+    text = insight.get("text", "")
+    title = insight.get("title", "")
+    source = insight.get("source", "")
+    subtag = (insight.get("taxonomy", {}) or {}).get("topic", insight.get("subtag", ""))
+    persona = insight.get("persona", "")
+    competitor = " ".join(insight.get("mentions_competitor", []) or [])
+    return _tokenize(f"{title} {text} {source} {subtag} {persona} {competitor}")
+
+
+def fingerprint_digest(fingerprints: List[str]) -> str:
+    """Content hash of a fingerprint list (in order) used to validate saved indexes."""
+    h = hashlib.md5()
+    for fp in fingerprints:
+        h.update(fp.encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def corpus_digest(insights: List[Dict[str, Any]]) -> str:
+    """Content hash of the insight list (fingerprints in order) used to validate saved indexes."""
+    return fingerprint_digest(_insight_fingerprint(i) for i in insights)
 
 
 # ---------------------------------------------------------------------------
@@ -126,60 +147,120 @@ def reciprocal_rank_fusion(
 # Precomputed Embeddings Manager
 # ---------------------------------------------------------------------------
 
+# Legacy monolithic embeddings (still read by HybridRetriever when no store / ANN index exists)
 EMBEDDINGS_PATH = "precomputed_embeddings.npy"
 EMBEDDINGS_META_PATH = "precomputed_embeddings_meta.json"
 
 
+def _embedding_text(insight: Dict[str, Any]) -> str:
+    """Rich text representation for embedding."""
+    text = insight.get("text", "")
+    title = insight.get("title", "")
+    source = insight.get("source", "")
+    subtag = (insight.get("taxonomy", {}) or {}).get("topic", insight.get("subtag", ""))
+    return f"{title} {text} | {source} | {subtag}"
+
+
 def precompute_embeddings(
     insights: List[Dict[str, Any]],
     model_name: str = "intfloat/e5-base-v2",
-    output_path: str = EMBEDDINGS_PATH,
-    meta_path: str = EMBEDDINGS_META_PATH,
+    output_path: str = EMBEDDING_STORE_PATH,
     batch_size: int = 64,
 ) -> str:
     """
-    Precompute and save embeddings for all insights.
+    Bring the embedding store up to date with `insights`: encode only fingerprints it does
+    not hold yet, drop rows for insights that are gone, compact sparse segments.
     Run this during the pipeline step so the app doesn't need sentence-transformers at runtime.
+
+    `insights` is read twice (a list or a RecordFile): once for the fingerprints, then
+    for the texts of the ones to encode, so only new texts are held in memory.
     """
     if not HAS_ST:
         raise RuntimeError("sentence-transformers required for precomputing embeddings. pip install sentence-transformers")
 
+    from sentence_transformers import SentenceTransformer
+
+    fingerprints = list(dict.fromkeys(_insight_fingerprint(i) for i in insights))
+
     model = SentenceTransformer(model_name)
+    store = EmbeddingStore.open(output_path, model=model_name, dim=model.get_sentence_embedding_dimension())
+    todo = store.missing(fingerprints)
+    print(f"[EMBED] {len(fingerprints) - len(todo)} embeddings reused, encoding {len(todo)} new with {model_name}...")
+    if todo:
+        texts_by_fp: Dict[str, str] = dict.fromkeys(todo)
+        for i in insights:
+            fp = _insight_fingerprint(i)
+            if fp in texts_by_fp and texts_by_fp[fp] is None:
+                texts_by_fp[fp] = _embedding_text(i)
+        embeddings = model.encode(
+            [texts_by_fp[fp] for fp in todo],
+            batch_size=batch_size,
+            show_progress_bar=True,
+            normalize_embeddings=True,
+        )
+        store.append(todo, embeddings)
+    dropped = store.retain(fingerprints)
+    reclaimed = store.compact()
+    store.save()
+
+    print(f"[EMBED] Store at {output_path}: {len(store)} rows in {len(store.segment_ids())} segments "
+          f"({dropped} dropped, {reclaimed} reclaimed by compaction)")
+    return output_path
+
+
+# ---------------------------------------------------------------------------
+# Precomputed BM25 Index
+# ---------------------------------------------------------------------------
+
+BM25_INDEX_PATH = "precomputed_bm25"
 
-    texts = []
-    fingerprints = []
-    for i in insights:
-        text = i.get("text", "")
-        title = i.get("title", "")
-        source = i.get("source", "")
-        subtag = (i.get("taxonomy", {}) or {}).get("topic", i.get("subtag", ""))
-        # Rich text representation for embedding
-        combined = f"{title} {text} | {source} | {subtag}"
-        texts.append(combined)
-        fp = i.get("fingerprint", hashlib.md5(text.encode()).hexdigest())
-        fingerprints.append(fp)
-
-    print(f"[EMBED] Encoding {len(texts)} insights with {model_name}...")
-    embeddings = model.encode(
-        texts,
-        batch_size=batch_size,
-        show_progress_bar=True,
-        normalize_embeddings=True,
-    )
-
-    np.save(output_path, embeddings)
-
-    meta = {
-        "model": model_name,
-        "count": len(texts),
-        "dim": embeddings.shape[1],
-        "created_at": __import__("datetime").datetime.utcnow().isoformat() + "Z",
-        "fingerprints": fingerprints,
-    }
-    with open(meta_path, "w", encoding="utf-8") as f:
-        json.dump(meta, f, indent=2)
-
-    print(f"[EMBED] Saved {embeddings.shape} embeddings to {output_path}")
+
+def build_bm25_index(
+    insights: List[Dict[str, Any]],
+    output_path: str = BM25_INDEX_PATH,
+) -> str:
+    """
+    Build and save the inverted BM25 index for all insights.
+    Run this during the pipeline step so the app memory-maps it instead of indexing on startup.
+    """
+    index = InvertedBM25Index.build([_bm25_document(i) for i in insights])
+    index.save(output_path, meta={
+        "digest": corpus_digest(insights),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    })
+    print(f"[BM25] Saved index ({index.N} docs, {len(index.vocab)} terms) to {output_path}")
+    return output_path
+
+
+# ---------------------------------------------------------------------------
+# Precomputed ANN Index
+# ---------------------------------------------------------------------------
+
+ANN_INDEX_PATH = "precomputed_ann"
+
+
+def build_ann_index(
+    insights: List[Dict[str, Any]],
+    store_path: str = EMBEDDING_STORE_PATH,
+    output_path: str = ANN_INDEX_PATH,
+) -> str:
+    """
+    Build and save the IVF-PQ index over the stored embeddings of `insights` (rows keyed by fingerprint).
+    Run this right after precompute_embeddings so the app never scores every row.
+    """
+    store = EmbeddingStore.open(store_path)
+    fingerprints = list(dict.fromkeys(_insight_fingerprint(i) for i in insights))
+    vectors, found = store.gather(fingerprints)
+    if not found.all():
+        fingerprints = [fp for fp, ok in zip(fingerprints, found) if ok]
+        vectors = vectors[found]
+    index = IVFPQIndex.build(vectors, fingerprints)
+    index.save(output_path, meta={
+        "model": store.model,
+        "digest": fingerprint_digest(fingerprints),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    })
+    print(f"[ANN] Saved index ({index.count} vectors, {index.nlist} lists, nprobe {index.nprobe}) to {output_path}")
     return output_path
 
 
@@ -190,8 +271,8 @@ def precompute_embeddings(
 class HybridRetriever:
     """
     Hybrid BM25 + dense retrieval with RRF fusion.
-    Loads precomputed embeddings at startup (no sentence-transformers needed at runtime).
-    Falls back gracefully to BM25-only if embeddings are unavailable.
+    Memory-maps the precomputed ANN index (or embeddings) at startup (no sentence-transformers
+    needed at runtime). Falls back gracefully to BM25-only if embeddings are unavailable.
     """
 
     def __init__(
@@ -199,39 +280,197 @@ class HybridRetriever:
         insights: List[Dict[str, Any]],
         embeddings_path: str = EMBEDDINGS_PATH,
         embeddings_meta_path: str = EMBEDDINGS_META_PATH,
+        bm25_index_path: str = BM25_INDEX_PATH,
+        ann_index_path: str = ANN_INDEX_PATH,
+        embedding_store_path: str = EMBEDDING_STORE_PATH,
     ):
         self.insights = insights
         self.n = len(insights)
-
-        # Build BM25 index
-        self._build_bm25_index()
-
-        # Load precomputed embeddings if available
+        self._digest: Optional[str] = None
+        # Documents 0.._base_n-1 are covered by the loaded indexes; later ones were added
+        self._base_n = self.n
+        self._fingerprints = {_insight_fingerprint(i) for i in insights}
+        self._add_lock = threading.Lock()
+
+        # Load (or build) BM25 index
+        self._build_bm25_index(bm25_index_path)
+
+        # Open the ANN index, else the embedding store, else legacy embeddings (all memory-mapped, read-only)
+        self.ann_index: Optional[IVFPQIndex] = None
+        self.embedding_store: Optional[EmbeddingStore] = None
         self.embeddings: Optional[np.ndarray] = None
-        self._embed_model = None
+        # Embedding store: per-insight (segment, row) and per-segment row → insight index
+        self._doc_seg: Optional[np.ndarray] = None
+        self._doc_seg_row: Optional[np.ndarray] = None
+        self._seg_docs: Dict[int, np.ndarray] = {}
+        # Embedding row ↔ insight index when they are not in the same order (-1 = absent)
+        self._row_to_doc: Optional[np.ndarray] = None
+        self._doc_to_row: Optional[np.ndarray] = None
+        self._row_loaded: Optional[np.ndarray] = None
         self._embed_model_name: Optional[str] = None
-        self._load_embeddings(embeddings_path, embeddings_meta_path)
-
-    def _build_bm25_index(self):
-        """Build BM25 index over insight text + metadata fields."""
-        corpus = []
-        for i in self.insights:
-            text = i.get("text", "")
-            title = i.get("title", "")
-            source = i.get("source", "")
-            subtag = (i.get("taxonomy", {}) or {}).get("topic", i.get("subtag", ""))
-            persona = i.get("persona", "")
-            competitor = " ".join(i.get("mentions_competitor", []) or [])
-            combined = f"{title} {text} {source} {subtag} {persona} {competitor}"
-            corpus.append(_tokenize(combined))
-
-        if HAS_BM25:
-            self.bm25 = BM25Okapi(corpus)
-        else:
-            self.bm25 = SimpleBM25(corpus)
+        # Added documents with a vector: (insight indices ascending, unit-norm rows), swapped as one
+        self._added: Tuple[np.ndarray, np.ndarray] = (np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.float32))
+        if not self._load_ann_index(ann_index_path) and not self._load_embedding_store(embedding_store_path):
+            self._load_embeddings(embeddings_path, embeddings_meta_path)
+
+        # Per-document boost features, so _apply_signal_boosts is array math over candidates
+        self._build_boost_features()
+
+        # Start loading the shared query encoder now, not on the first question
+        self.warm_encoder()
+
+    @property
+    def has_dense(self) -> bool:
+        return self.ann_index is not None or self.embedding_store is not None or self.embeddings is not None
+
+    def _corpus_digest(self) -> str:
+        if self._digest is None:
+            self._digest = corpus_digest(self.insights)
+        return self._digest
+
+    def _build_bm25_index(self, path: str = BM25_INDEX_PATH):
+        """Memory-map the pipeline's BM25 index; build in memory only if it is missing or stale."""
+        if os.path.exists(os.path.join(path, "meta.json")):
+            try:
+                index = InvertedBM25Index.load(path)
+                if index.N == self.n and index.meta.get("digest") == self._corpus_digest():
+                    self.bm25 = index
+                    return
+                print(f"[RETRIEVAL] BM25 index at {path} is stale — rebuilding in memory")
+            except Exception as e:
+                print(f"[RETRIEVAL] Failed to load BM25 index: {e}")
+        self.bm25 = InvertedBM25Index.build([_bm25_document(i) for i in self.insights])
+
+    def _build_boost_features(self):
+        """Bucket signal strength / engagement, parse post dates, and flag sources once per corpus."""
+        self._f_signal = np.zeros(0, dtype=np.int8)
+        self._f_engagement = np.zeros(0, dtype=np.int8)
+        self._f_date = np.empty(0, dtype="datetime64[D]")
+        self._f_source = np.zeros(0, dtype=np.int32)
+        self._f_competitor = np.zeros(0, dtype=bool)
+        self._f_breaking = np.zeros(0, dtype=bool)
+        self._source_ids: Dict[str, int] = {}
+        self._source_flags = np.zeros(0, dtype=np.int8)
+        self._source_comp = np.zeros((len(_COMP_NAMES), 0), dtype=bool)
+        self._append_boost_features(self.insights)
+
+    def _append_boost_features(self, insights: List[Dict[str, Any]]):
+        """Boost features of `insights`, appended after the existing ones (new sources get new ids)."""
+        n = len(insights)
+        signal = np.zeros(n, dtype=np.int8)
+        engagement = np.zeros(n, dtype=np.int8)
+        date = np.empty(n, dtype="datetime64[D]")
+        source_ids = np.zeros(n, dtype=np.int32)
+        competitor = np.zeros(n, dtype=bool)
+        breaking = np.zeros(n, dtype=bool)
+
+        def _num(value: Any) -> float:
+            try:
+                return float(value or 0)
+            except (TypeError, ValueError):
+                return 0.0
+
+        sources = dict(self._source_ids)
+        known_sources = len(sources)
+        dates: Dict[Any, np.datetime64] = {}
+        for k, insight in enumerate(insights):
+            eng = _num(insight.get("score", 0))
+            sig = _num(insight.get("signal_strength", eng))
+            signal[k] = 2 if sig > 60 else 1 if sig > 30 else 0
+            engagement[k] = 2 if eng >= 50 else 1 if eng >= 10 else 0
+            d = insight.get("post_date")
+            key = d if isinstance(d, str) else None
+            if key not in dates:
+                dates[key] = _parse_date(d)
+            date[k] = dates[key]
+            source_ids[k] = sources.setdefault((insight.get("source", "") or "").lower(), len(sources))
+            competitor[k] = bool(insight.get("mentions_competitor"))
+            breaking[k] = match_insight(insight).any("retrieval.breaking")
+
+        # Per distinct source: category bits and which competitor names it contains
+        source_flags = np.zeros(len(sources), dtype=np.int8)
+        source_comp = np.zeros((len(_COMP_NAMES), len(sources)), dtype=bool)
+        source_flags[:known_sources] = self._source_flags
+        source_comp[:, :known_sources] = self._source_comp
+        for source, sid in sources.items():
+            if sid < known_sources:
+                continue
+            flags = 0
+            if "trustpilot" in source:
+                flags |= _SRC_TRUSTPILOT
+            if source in ("seller community", "app reviews"):
+                flags |= _SRC_PERSONA
+            if any(ns in source for ns in _NEWS_SOURCES):
+                flags |= _SRC_NEWS
+            source_flags[sid] = flags
+            for c, cn in enumerate(_COMP_NAMES):
+                source_comp[c, sid] = cn in source
+
+        # Source tables before the per-document arrays that index into them
+        self._source_ids = sources
+        self._source_flags = source_flags
+        self._source_comp = source_comp
+        self._f_signal = np.concatenate([self._f_signal, signal])
+        self._f_engagement = np.concatenate([self._f_engagement, engagement])
+        self._f_date = np.concatenate([self._f_date, date])
+        self._f_source = np.concatenate([self._f_source, source_ids])
+        self._f_competitor = np.concatenate([self._f_competitor, competitor])
+        self._f_breaking = np.concatenate([self._f_breaking, breaking])
+
+    def _align_rows(self, embed_fps: List[str]) -> int:
+        """Map embedding rows to insights by fingerprint; returns how many insights matched."""
+        fp_to_row = {fp: idx for idx, fp in enumerate(embed_fps)}
+        doc_to_row = np.full(self.n, -1, dtype=np.int64)
+        for i, insight in enumerate(self.insights):
+            doc_to_row[i] = fp_to_row.get(_insight_fingerprint(insight), -1)
+        matched = np.nonzero(doc_to_row >= 0)[0]
+        row_to_doc = np.full(len(embed_fps), -1, dtype=np.int64)
+        row_to_doc[doc_to_row[matched]] = matched
+        self._doc_to_row, self._row_to_doc = doc_to_row, row_to_doc
+        self._row_loaded = row_to_doc >= 0
+        return int(matched.shape[0])
+
+    def _load_ann_index(self, path: str) -> bool:
+        """Memory-map the pipeline's ANN index; rows are matched to insights by fingerprint."""
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            return False
+        try:
+            index = IVFPQIndex.load(path)
+            self._embed_model_name = index.meta.get("model")
+            if index.count != self.n or index.meta.get("digest") != self._corpus_digest():
+                matched = self._align_rows(index.fingerprints())
+                print(f"[RETRIEVAL] Aligned ANN index: {matched}/{self.n} matched by fingerprint")
+            self.ann_index = index
+            return True
+        except Exception as e:
+            print(f"[RETRIEVAL] Failed to load ANN index: {e}")
+            self._row_to_doc = self._doc_to_row = self._row_loaded = None
+            return False
+
+    def _load_embedding_store(self, path: str) -> bool:
+        """Memory-map the live segments of the pipeline's embedding store, located by fingerprint."""
+        if not EmbeddingStore.exists(path):
+            return False
+        try:
+            store = EmbeddingStore.open(path)
+            seg, row, found = store.locate(_insight_fingerprint(i) for i in self.insights)
+            seg_docs = {}
+            for seg_id, arr in store.iter_segments():
+                docs = np.full(arr.shape[0], -1, dtype=np.int64)
+                sel = np.nonzero(seg == seg_id)[0]
+                docs[row[sel]] = sel
+                seg_docs[seg_id] = docs
+            self._doc_seg, self._doc_seg_row, self._seg_docs = seg, row, seg_docs
+            self._embed_model_name = store.model
+            self.embedding_store = store
+            print(f"[RETRIEVAL] Embedding store: {int(found.sum())}/{self.n} insights have vectors")
+            return True
+        except Exception as e:
+            print(f"[RETRIEVAL] Failed to load embedding store: {e}")
+            return False
 
     def _load_embeddings(self, path: str, meta_path: str):
-        """Load precomputed embeddings, aligning by fingerprint."""
+        """Memory-map precomputed embeddings, aligning by fingerprint."""
         if not os.path.exists(path):
             # Only warn once (not on every Streamlit rerun)
             if not getattr(self.__class__, '_embed_warned', False):
@@ -240,31 +479,16 @@ class HybridRetriever:
             return
 
         try:
-            self.embeddings = np.load(path)
+            self.embeddings = np.load(path, mmap_mode="r")
+            meta = None
             if os.path.exists(meta_path):
                 with open(meta_path, "r", encoding="utf-8") as f:
-                    _meta_top = json.load(f)
-                self._embed_model_name = _meta_top.get("model")
+                    meta = json.load(f)
+                self._embed_model_name = meta.get("model")
             if self.embeddings.shape[0] != self.n:
                 # Try to align by fingerprint
-                if os.path.exists(meta_path):
-                    with open(meta_path, "r", encoding="utf-8") as f:
-                        meta = json.load(f)
-                    self._embed_model_name = meta.get("model")
-                    embed_fps = meta.get("fingerprints", [])
-                    insight_fps = [
-                        i.get("fingerprint", hashlib.md5(i.get("text", "").encode()).hexdigest())
-                        for i in self.insights
-                    ]
-                    # Build lookup from fingerprint → embedding row
-                    fp_to_row = {fp: idx for idx, fp in enumerate(embed_fps)}
-                    aligned = np.zeros((self.n, self.embeddings.shape[1]), dtype=np.float32)
-                    matched = 0
-                    for i, fp in enumerate(insight_fps):
-                        if fp in fp_to_row:
-                            aligned[i] = self.embeddings[fp_to_row[fp]]
-                            matched += 1
-                    self.embeddings = aligned
+                if meta is not None:
+                    matched = self._align_rows(meta.get("fingerprints", []))
                     print(f"[RETRIEVAL] Aligned embeddings: {matched}/{self.n} matched by fingerprint")
                 else:
                     print(f"[RETRIEVAL] Embedding count mismatch ({self.embeddings.shape[0]} vs {self.n}), using BM25 only")
@@ -272,6 +496,37 @@ class HybridRetriever:
         except Exception as e:
             print(f"[RETRIEVAL] Failed to load embeddings: {e}")
             self.embeddings = None
+            self._row_to_doc = self._doc_to_row = self._row_loaded = None
+
+    def _doc_vectors(self, doc_ids: List[int]) -> np.ndarray:
+        """Stored embeddings for insight indices (insights without one are skipped)."""
+        docs = np.asarray(doc_ids, dtype=np.int64)
+        base = docs[docs < self._base_n]
+        vectors = self._indexed_vectors(base) if base.shape[0] else np.empty((0, 0), dtype=np.float32)
+        added_docs, added_vectors = self._added
+        extra = docs[docs >= self._base_n]
+        if extra.shape[0] and added_docs.shape[0]:
+            pos = np.minimum(np.searchsorted(added_docs, extra), added_docs.shape[0] - 1)
+            pos = pos[added_docs[pos] == extra]
+            if pos.shape[0]:
+                vectors = np.concatenate([vectors, added_vectors[pos]]) if vectors.shape[0] else added_vectors[pos]
+        return vectors
+
+    def _indexed_vectors(self, docs: np.ndarray) -> np.ndarray:
+        """Embeddings of documents covered by the loaded dense index (insights without one are skipped)."""
+        if self.embedding_store is not None:
+            docs = docs[self._doc_seg[docs] >= 0]
+            return np.stack([
+                np.asarray(self.embedding_store.segment_array(int(self._doc_seg[d]))[self._doc_seg_row[d]], dtype=np.float32)
+                for d in docs
+            ]) if docs.shape[0] else np.empty((0, 0), dtype=np.float32)
+        rows = docs
+        if self._doc_to_row is not None:
+            rows = self._doc_to_row[rows]
+            rows = rows[rows >= 0]
+        if self.ann_index is not None:
+            return self.ann_index.vectors_for_rows(rows)
+        return np.asarray(self.embeddings[rows], dtype=np.float32)
 
     def _bm25_retrieve(self, query: str, top_k: int = 50) -> List[int]:
         """Get top-k document indices by BM25 score."""
@@ -279,49 +534,179 @@ class HybridRetriever:
         if not tokens:
             return []
 
-        if HAS_BM25:
-            scores = self.bm25.get_scores(tokens)
-        else:
-            scores = self.bm25.get_scores(tokens)
+        # Only documents sharing a query term are scored; zero scores are dropped
+        top_indices, _ = self.bm25.top_k(tokens, k=top_k)
+        return [int(i) for i in top_indices]
 
-        top_indices = np.argsort(scores)[::-1][:top_k]
-        # Filter out zero-score results
-        return [int(i) for i in top_indices if scores[i] > 0]
-
-    def _dense_retrieve(self, query: str, top_k: int = 50) -> List[int]:
+    def _dense_retrieve(self, query: str, top_k: int = 50, query_embedding: Optional[np.ndarray] = None) -> List[int]:
         """Get top-k document indices by cosine similarity with query embedding."""
-        if self.embeddings is None:
+        if not self.has_dense:
             return []
 
-        query_embedding = self._encode_query(query)
+        if query_embedding is None:
+            query_embedding = self._encode_query(query)
         if query_embedding is None:
             return []
 
         # Cosine similarity (embeddings are pre-normalized)
-        sims = self.embeddings @ query_embedding
-        top_indices = np.argsort(sims)[::-1][:top_k]
+        if self.ann_index is not None:
+            # Skip index rows whose insights are not loaded
+            rows, sims = self.ann_index.search(query_embedding, k=top_k, allowed=self._row_loaded)
+            docs = rows if self._row_to_doc is None else self._row_to_doc[rows]
+        elif self.embedding_store is not None:
+            docs, sims = self._store_retrieve(query_embedding, top_k)
+        else:
+            all_sims = np.asarray(self.embeddings @ query_embedding, dtype=np.float32)
+            if self._row_loaded is not None:
+                all_sims[~self._row_loaded] = -np.inf
+            rows = top_k_desc(all_sims, top_k)
+            sims = all_sims[rows]
+            docs = rows if self._row_to_doc is None else self._row_to_doc[rows]
+
+        docs, sims = self._merge_added(docs, sims, query_embedding, top_k)
         # Filter out very low similarity
-        return [int(i) for i in top_indices if sims[i] > 0.1]
+        return [int(d) for d, s in zip(docs, sims) if s > 0.1 and d >= 0][:top_k]
+
+    def _merge_added(self, docs: np.ndarray, sims: np.ndarray, query_embedding: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Merge the exact similarities of added documents into the index's top-k."""
+        added_docs, added_vectors = self._added
+        if not added_docs.shape[0]:
+            return docs, sims
+        docs, sims = np.asarray(docs, dtype=np.int64), np.asarray(sims, dtype=np.float32)
+        keep = docs >= 0
+        docs = np.concatenate([docs[keep], added_docs])
+        sims = np.concatenate([sims[keep], added_vectors @ np.asarray(query_embedding, dtype=np.float32)])
+        best = top_k_desc(sims, top_k)
+        return docs[best], sims[best]
+
+    def _store_retrieve(self, query_embedding: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact top-k (insight indices, similarities) scanned segment by segment from the store."""
+        q = np.asarray(query_embedding, dtype=np.float32)
+        doc_parts, sim_parts = [], []
+        for seg_id, arr in self.embedding_store.iter_segments():
+            docs = self._seg_docs.get(seg_id)
+            if docs is None:
+                continue
+            sims = np.empty(arr.shape[0], dtype=np.float32)
+            for start in range(0, arr.shape[0], 65536):
+                sims[start:start + 65536] = np.asarray(arr[start:start + 65536], dtype=np.float32) @ q
+            sims[docs < 0] = -np.inf
+            best = top_k_desc(sims, top_k)
+            doc_parts.append(docs[best])
+            sim_parts.append(sims[best])
+        if not doc_parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        docs, sims = np.concatenate(doc_parts), np.concatenate(sim_parts)
+        best = top_k_desc(sims, top_k)
+        return docs[best], sims[best]
+
+    # ── Incremental ingestion ──
+
+    def add_documents(self, insights: List[Dict[str, Any]]) -> int:
+        """Index insights that arrive after startup (e.g. ad-hoc posts); returns how many were new.
+
+        Insights whose fingerprint is already indexed are skipped, so repeating a call is a
+        no-op. BM25 statistics and boost features are extended right away; vectors come from
+        the embedding store or are encoded with the query encoder's model — in the
+        background if it is still loading. Queries may run concurrently.
+        """
+        with self._add_lock:
+            new = []
+            for insight in insights:
+                fp = _insight_fingerprint(insight)
+                if fp not in self._fingerprints:
+                    self._fingerprints.add(fp)
+                    new.append(insight)
+            if not new:
+                return 0
+            first = self.n
+            docs = np.arange(first, first + len(new), dtype=np.int64)
+
+            # Everything indexed by insight index grows before n, so queries never see an
+            # index they cannot resolve (they skip candidates >= n)
+            self.insights = self.insights + new
+            self._append_boost_features(new)
+            self.bm25.add_documents([_bm25_document(i) for i in new])
+            self.n = first + len(new)
+            self._digest = None
+
+            pending = self._add_stored_vectors(docs, new) if self.has_dense else []
+        if pending:
+            self._encode_added(pending)
+        print(f"[RETRIEVAL] Added {len(new)} documents ({self.n} indexed)")
+        return len(new)
+
+    def _add_vectors(self, docs: np.ndarray, vectors: np.ndarray):
+        """Append (insight index, vector) rows to the added-document matrix (add lock held)."""
+        added_docs, added_vectors = self._added
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if added_vectors.shape[0] and added_vectors.shape[1] != vectors.shape[1]:
+            print(f"[RETRIEVAL] Added vectors have dimension {vectors.shape[1]}, expected {added_vectors.shape[1]} — skipped")
+            return
+        all_docs = np.concatenate([added_docs, docs])
+        all_vectors = np.concatenate([added_vectors, vectors]) if added_vectors.shape[0] else vectors
+        order = np.argsort(all_docs, kind="stable")
+        self._added = (all_docs[order], all_vectors[order])
+
+    def _add_stored_vectors(self, docs: np.ndarray, insights: List[Dict[str, Any]]) -> List[Tuple[int, Dict[str, Any]]]:
+        """Take vectors the embedding store already holds; returns the (index, insight) pairs still without one."""
+        found = np.zeros(len(insights), dtype=bool)
+        if self.embedding_store is not None:
+            vectors, found = self.embedding_store.gather([_insight_fingerprint(i) for i in insights])
+            if found.any():
+                self._add_vectors(docs[found], vectors[found])
+        return [(int(d), i) for d, i, ok in zip(docs, insights, found) if not ok]
+
+    def _encode_added(self, pending: List[Tuple[int, Dict[str, Any]]]):
+        """Encode added insights with the query encoder's model (inline if loaded, else once it is)."""
+        encoder = self._query_encoder()
+        if encoder is None or not encoder.available:
+            return
+
+        docs = np.asarray([d for d, _ in pending], dtype=np.int64)
+        texts = [_embedding_text(i) for _, i in pending]
+
+        def encode():
+            vectors = encoder.encode_texts(texts)
+            if vectors is not None:
+                with self._add_lock:
+                    self._add_vectors(docs, vectors)
+
+        if encoder.ready:
+            encode()
+        else:
+            threading.Thread(target=encode, name="retriever-add", daemon=True).start()
+
+    def _query_encoder(self) -> Optional[QueryEncoder]:
+        """Process-wide encoder for the embeddings' model (None without sentence-transformers)."""
+        if not HAS_ST:
+            return None
+        return get_query_encoder(os.getenv("SS_EMBED_MODEL", self._embed_model_name or "intfloat/e5-base-v2"))
+
+    def warm_encoder(self, questions: List[str] = ()):
+        """Load the query encoder in the background and pre-encode `questions` (with their expansions)."""
+        encoder = self._query_encoder() if self.has_dense else None
+        if encoder is not None:
+            encoder.warm([q for question in questions for q in self._expand_query(question)])
+
+    def _encode_queries(self, queries: List[str]) -> List[Optional[np.ndarray]]:
+        """Encode all query variants in one batch (cached per normalized query), else proxy each one."""
+        encoder = self._query_encoder()
+        encoded = encoder.encode_many(queries) if encoder is not None else [None] * len(queries)
+        return [e if e is not None else self._proxy_query_embedding(q) for q, e in zip(queries, encoded)]
 
     def _encode_query(self, query: str) -> Optional[np.ndarray]:
         """Encode query using sentence-transformers if available, else skip."""
-        if self._embed_model is not None:
-            return self._embed_model.encode(query, normalize_embeddings=True)
-
-        if HAS_ST:
-            try:
-                model_name = os.getenv("SS_EMBED_MODEL", self._embed_model_name or "intfloat/e5-base-v2")
-                self._embed_model = SentenceTransformer(model_name)
-                return self._embed_model.encode(query, normalize_embeddings=True)
-            except Exception:
-                pass
+        return self._encode_queries([query])[0]
 
+    def _proxy_query_embedding(self, query: str) -> Optional[np.ndarray]:
         # If no sentence-transformers, try to approximate with precomputed
         # by finding the closest BM25 hit and using its embedding as a proxy
-        if self.embeddings is not None:
+        if self.has_dense:
             bm25_top = self._bm25_retrieve(query, top_k=5)
-            if bm25_top:
-                proxy = np.mean(self.embeddings[bm25_top], axis=0)
+            vectors = self._doc_vectors(bm25_top) if bm25_top else None
+            if vectors is not None and len(vectors):
+                proxy = np.mean(vectors, axis=0)
                 norm = np.linalg.norm(proxy)
                 if norm > 0:
                     return proxy / norm
@@ -333,6 +718,8 @@ class HybridRetriever:
         query: str,
     ) -> List[Tuple[int, float]]:
         """Apply domain-specific boosts: signal strength, engagement, source relevance."""
+        if not scored:
+            return []
         q_lower = query.lower()
 
         # Detect query context for targeted boosts
@@ -340,78 +727,44 @@ class HybridRetriever:
         is_persona_q = any(t in q_lower for t in ["seller", "buyer", "collector", "investor"])
         is_competitive_q = any(t in q_lower for t in ["whatnot", "fanatics", "heritage", "competitor", "vs "])
 
-        # Date thresholds for recency boosting
-        from datetime import datetime, timedelta
-        _now = datetime.now().strftime("%Y-%m-%d")
-        _30d = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
-        _90d = (datetime.now() - timedelta(days=90)).strftime("%Y-%m-%d")
-        _1y = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
-
-        boosted = []
-        for idx, score in scored:
-            insight = self.insights[idx]
-            boost = 0.0
-
-            # Signal strength boost
-            sig = insight.get("signal_strength", insight.get("score", 0))
-            if sig > 60:
-                boost += 0.02
-            elif sig > 30:
-                boost += 0.01
-
-            # Engagement boost
-            eng = insight.get("score", 0)
-            if eng >= 50:
-                boost += 0.015
-            elif eng >= 10:
-                boost += 0.005
-
-            # Date recency boost — recent signals are more actionable
-            date = insight.get("post_date", "") or ""
-            if date >= _30d:
-                boost += 0.03   # Last 30 days: strong boost
-            elif date >= _90d:
-                boost += 0.015  # Last 90 days: moderate boost
-            elif date >= _1y:
-                boost += 0.0    # Last year: neutral
-            else:
-                boost -= 0.02   # Older than 1 year: penalty
-
-            # Context-aware source boost
-            source = (insight.get("source", "") or "").lower()
-            text_lower = (insight.get("text", "") + " " + insight.get("title", "")).lower()
-            if is_review_q and "trustpilot" in source:
-                boost += 0.03
-            if is_persona_q and source in ("seller community", "app reviews"):
-                boost += 0.02
-            if is_competitive_q:
-                competitors = insight.get("mentions_competitor", [])
-                if competitors:
-                    boost += 0.025
-                # Boost news/industry sources for competitive questions —
-                # these often have score:0 but contain breaking intelligence
-                _NEWS_SOURCES = {"news:", "cllct", "podcast", "industry analysis",
-                                 "mantel", "whatnot", "heritage", "goldin blog",
-                                 "heritage blog", "card ladder", "sports card investor"}
-                if any(ns in source for ns in _NEWS_SOURCES):
-                    boost += 0.035
-                # If source IS the competitor being asked about, strong boost
-                _COMP_NAMES = ["whatnot", "fanatics", "heritage", "goldin", "tcgplayer", "comc", "beckett", "vinted"]
-                for cn in _COMP_NAMES:
-                    if cn in q_lower and cn in source:
-                        boost += 0.04  # Source directly from the competitor platform
-                # Extra boost for breaking news signals (lawsuits, policy changes, major events)
-                _BREAKING_TERMS = ["lawsuit", "class action", "sued", "gambling",
-                                   "rico", "legal", "regulation", "policy change",
-                                   "hot water", "reckoning", "investigation",
-                                   "settlement", "fine", "penalty", "banned",
-                                   "regulate", "compliance", "enforcement"]
-                if any(bt in text_lower for bt in _BREAKING_TERMS):
-                    boost += 0.06  # Strong boost for breaking/legal news
-
-            boosted.append((idx, score + boost))
-
-        return sorted(boosted, key=lambda x: -x[1])
+        idx = np.fromiter((i for i, _ in scored), dtype=np.int64, count=len(scored))
+        scores = np.fromiter((sc for _, sc in scored), dtype=np.float64, count=len(scored))
+        valid = idx < self.n
+        docs = idx[valid]
+        boost = np.zeros(docs.shape[0])
+
+        # Signal strength + engagement boosts
+        boost += _SIGNAL_BOOST[self._f_signal[docs]]
+        boost += _ENGAGEMENT_BOOST[self._f_engagement[docs]]
+
+        # Date recency boost — recent signals are more actionable: +0.03 last 30 days,
+        # +0.015 last 90 days, neutral within a year, -0.02 older (or undated)
+        today = np.datetime64("today", "D")
+        date = self._f_date[docs]
+        boost += np.where(date >= today - 30, 0.03,
+                 np.where(date >= today - 90, 0.015,
+                 np.where(date >= today - 365, 0.0, -0.02)))
+
+        # Context-aware source boost
+        source = self._f_source[docs]
+        flags = self._source_flags[source]
+        if is_review_q:
+            boost += np.where(flags & _SRC_TRUSTPILOT, 0.03, 0.0)
+        if is_persona_q:
+            boost += np.where(flags & _SRC_PERSONA, 0.02, 0.0)
+        if is_competitive_q:
+            boost += np.where(self._f_competitor[docs], 0.025, 0.0)
+            boost += np.where(flags & _SRC_NEWS, 0.035, 0.0)
+            # Source directly from the competitor platform the question is about
+            for c, cn in enumerate(_COMP_NAMES):
+                if cn in q_lower:
+                    boost += np.where(self._source_comp[c, source], 0.04, 0.0)
+            # Strong boost for breaking/legal news
+            boost += np.where(self._f_breaking[docs], 0.06, 0.0)
+
+        scores[valid] += boost
+        order = np.argsort(-scores, kind="stable")
+        return list(zip(idx[order].tolist(), scores[order].tolist()))
 
     def _expand_query(self, query: str) -> List[str]:
         """Generate query variations for multi-query retrieval.
@@ -467,12 +820,13 @@ class HybridRetriever:
         # Step 1: Multi-query expansion
         queries = self._expand_query(query)
         
-        # Step 2: Retrieve for each query variation and merge
+        # Step 2: Retrieve for each query variation and merge (all variants encoded in one batch)
+        query_embeddings = self._encode_queries(queries) if self.has_dense else [None] * len(queries)
         all_bm25 = []
         all_dense = []
-        for q in queries:
+        for q, q_emb in zip(queries, query_embeddings):
             all_bm25.extend(self._bm25_retrieve(q, top_k=candidate_pool))
-            dense = self._dense_retrieve(q, top_k=candidate_pool)
+            dense = self._dense_retrieve(q, top_k=candidate_pool, query_embedding=q_emb) if q_emb is not None else []
             if dense:
                 all_dense.extend(dense)
         
@@ -512,21 +866,27 @@ class HybridRetriever:
 
 
 # ---------------------------------------------------------------------------
-# CLI — precompute embeddings
+# CLI — precompute embeddings + BM25 / ANN indexes
 # ---------------------------------------------------------------------------
 
 def main():
     import argparse
-    parser = argparse.ArgumentParser(description="Hybrid Retrieval — precompute embeddings")
+    parser = argparse.ArgumentParser(description="Hybrid Retrieval — precompute embeddings + BM25 / ANN indexes")
     parser.add_argument("--input", default="precomputed_insights.json", help="Input insights JSON")
-    parser.add_argument("--output", default=EMBEDDINGS_PATH, help="Output embeddings .npy path")
+    parser.add_argument("--output", default=EMBEDDING_STORE_PATH, help="Embedding store directory")
+    parser.add_argument("--bm25-output", default=BM25_INDEX_PATH, help="Output BM25 index directory")
+    parser.add_argument("--ann-output", default=ANN_INDEX_PATH, help="Output ANN index directory")
     parser.add_argument("--model", default="intfloat/e5-base-v2", help="Embedding model name")
+    parser.add_argument("--bm25-only", action="store_true", help="Only rebuild the BM25 index")
     args = parser.parse_args()
 
     with open(args.input, "r", encoding="utf-8") as f:
         insights = json.load(f)
 
-    precompute_embeddings(insights, model_name=args.model, output_path=args.output)
+    build_bm25_index(insights, output_path=args.bm25_output)
+    if not args.bm25_only:
+        precompute_embeddings(insights, model_name=args.model, output_path=args.output)
+        build_ann_index(insights, store_path=args.output, output_path=args.ann_output)
 
 
 if __name__ == "__main__":
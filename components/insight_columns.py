@@ -0,0 +1,302 @@
+# insight_columns.py — Columnar, memory-mapped view of precomputed insights for fast aggregates
+#
+# The app's KPI banner and tab aggregates used to scan every insight dict in Python
+# (sum(1 for i in normalized if ...)). The pipeline now also writes a column store:
+#   1. Categorical fields (type, topic, sentiment, source, ...) dictionary-encoded as int codes
+#   2. Boolean flags (is_*, _*) as bool arrays, post_date as datetime64[D], scores as float32
+#   3. One .npy per column + meta.json (categories, flags, corpus digest for staleness)
+#   4. Loaded with np.load(mmap_mode="r"); filters and counts are vectorized
+#
+# pyarrow is not a dependency of this repo, so columns are plain .npy files.
+#
+# Usage:
+#   build_insight_columns(insights)
+#   cols = load_insight_columns(insights=insights)
+#   complaints = cols.count(cols.mask(type="Complaint") | cols.mask(sentiment="Negative"))
+#   by_source = cols.value_counts("source")
+
+import os
+import json
+from typing import List, Dict, Any, Optional, Sequence, Union
+
+import numpy as np
+
+INSIGHT_COLUMNS_PATH = "precomputed_insights_columns"
+
+_NUMERIC = ("score", "signal_strength")
+_NAT = np.datetime64("NaT", "D")
+
+Values = Union[str, Sequence[str]]
+
+
+def _canonical_type(i: Dict[str, Any]) -> str:
+    taxonomy = i.get("taxonomy") if isinstance(i.get("taxonomy"), dict) else {}
+    return taxonomy.get("type") or i.get("type_tag") or i.get("insight_type") or "Unclassified"
+
+
+def _canonical_topic(i: Dict[str, Any]) -> str:
+    taxonomy = i.get("taxonomy") if isinstance(i.get("taxonomy"), dict) else {}
+    topic = taxonomy.get("topic") or i.get("subtag")
+    if topic:
+        return topic
+    tf = i.get("topic_focus_list") or i.get("topic_focus") or []
+    if isinstance(tf, list) and tf:
+        return tf[0]
+    if isinstance(tf, str) and tf.strip():
+        return tf.strip()
+    return "General"
+
+
+# Same defaults as app.normalize_insight
+_CATEGORICAL = {
+    "type": _canonical_type,
+    "topic": _canonical_topic,
+    "sentiment": lambda i: i.get("brand_sentiment") or "Neutral",
+    "source": lambda i: i.get("source") or "Unknown",
+    "persona": lambda i: i.get("persona") or "Unknown",
+    "target_brand": lambda i: i.get("target_brand") or "Unknown",
+    "opportunity_tag": lambda i: i.get("opportunity_tag") or "General Insight",
+}
+
+
+def _is_flag(key: str, value: Any) -> bool:
+    return isinstance(value, bool) and (key.startswith("is_") or key.startswith("_"))
+
+
+def _parse_date(value: Any) -> np.datetime64:
+    if not isinstance(value, str) or len(value) < 10:
+        return _NAT
+    try:
+        return np.datetime64(value[:10], "D")
+    except ValueError:
+        return _NAT
+
+
+class InsightColumns:
+    """Column arrays for a list of insights, in the same order as the source list."""
+
+    def __init__(
+        self,
+        codes: Dict[str, np.ndarray],
+        categories: Dict[str, List[str]],
+        numeric: Dict[str, np.ndarray],
+        flags: Dict[str, np.ndarray],
+        post_date: np.ndarray,
+        meta: Optional[Dict[str, Any]] = None,
+    ):
+        self.codes = codes
+        self.categories = categories
+        self.numeric = numeric
+        self.flags = flags
+        self.post_date = post_date
+        self.meta = meta or {}
+        self.n = int(post_date.shape[0])
+        self._lookup = {c: {v: k for k, v in enumerate(cats)} for c, cats in categories.items()}
+
+    def __len__(self) -> int:
+        return self.n
+
+    # ── Build / persist ──
+
+    @classmethod
+    def build(cls, insights: List[Dict[str, Any]]) -> "InsightColumns":
+        n = len(insights)
+        categories: Dict[str, List[str]] = {}
+        codes: Dict[str, np.ndarray] = {}
+        for name, get in _CATEGORICAL.items():
+            index: Dict[str, int] = {}
+            arr = np.empty(n, dtype=np.int32)
+            for k, i in enumerate(insights):
+                arr[k] = index.setdefault(str(get(i)), len(index))
+            categories[name] = list(index)
+            codes[name] = arr
+
+        numeric = {}
+        for name in _NUMERIC:
+            arr = np.zeros(n, dtype=np.float32)
+            for k, i in enumerate(insights):
+                try:
+                    arr[k] = float(i.get(name) or 0)
+                except (TypeError, ValueError):
+                    pass
+            numeric[name] = arr
+
+        flag_names = sorted({key for i in insights for key, v in i.items() if _is_flag(key, v)})
+        flags = {name: np.zeros(n, dtype=bool) for name in flag_names}
+        for k, i in enumerate(insights):
+            for key, v in i.items():
+                if v is True and key in flags:
+                    flags[key][k] = True
+
+        date_cache: Dict[Any, np.datetime64] = {}
+        post_date = np.empty(n, dtype="datetime64[D]")
+        for k, i in enumerate(insights):
+            d = i.get("post_date")
+            key = d if isinstance(d, str) else None
+            if key not in date_cache:
+                date_cache[key] = _parse_date(d)
+            post_date[k] = date_cache[key]
+
+        return cls(codes, categories, numeric, flags, post_date)
+
+    def save(self, path: str = INSIGHT_COLUMNS_PATH, meta: Optional[Dict[str, Any]] = None) -> str:
+        os.makedirs(path, exist_ok=True)
+        arrays = {f"cat_{c}": a for c, a in self.codes.items()}
+        arrays.update({f"num_{c}": a for c, a in self.numeric.items()})
+        arrays.update({f"flag_{c}": a for c, a in self.flags.items()})
+        arrays["post_date"] = self.post_date
+        for name, arr in arrays.items():
+            np.save(os.path.join(path, f"{name}.npy"), arr)
+        self.meta = dict(meta or self.meta)
+        self.meta.update({
+            "count": self.n,
+            "categories": self.categories,
+            "numeric": list(self.numeric),
+            "flags": list(self.flags),
+        })
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+        return path
+
+    @classmethod
+    def load(cls, path: str = INSIGHT_COLUMNS_PATH, mmap: bool = True) -> "InsightColumns":
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        mode = "r" if mmap else None
+        _load = lambda name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode)
+        return cls(
+            codes={c: _load(f"cat_{c}") for c in meta["categories"]},
+            categories=meta["categories"],
+            numeric={c: _load(f"num_{c}") for c in meta["numeric"]},
+            flags={c: _load(f"flag_{c}") for c in meta["flags"]},
+            post_date=_load("post_date"),
+            meta=meta,
+        )
+
+    @classmethod
+    def concat(cls, parts: List["InsightColumns"]) -> "InsightColumns":
+        """Stack several column sets (e.g. pipeline insights + ad-hoc posts), merging dictionaries."""
+        parts = [p for p in parts if p is not None]
+        categories: Dict[str, List[str]] = {}
+        codes: Dict[str, np.ndarray] = {}
+        for name in _CATEGORICAL:
+            merged: Dict[str, int] = {}
+            remapped = []
+            for p in parts:
+                cats = p.categories.get(name, [])
+                lut = np.array([merged.setdefault(v, len(merged)) for v in cats], dtype=np.int32)
+                remapped.append(lut[np.asarray(p.codes[name])] if len(cats) else np.zeros(p.n, dtype=np.int32))
+            categories[name] = list(merged)
+            codes[name] = np.concatenate(remapped) if remapped else np.empty(0, dtype=np.int32)
+
+        def _stack(attr: str, dtype) -> Dict[str, np.ndarray]:
+            names = sorted({k for p in parts for k in getattr(p, attr)})
+            return {
+                k: np.concatenate([np.asarray(getattr(p, attr)[k]) if k in getattr(p, attr) else np.zeros(p.n, dtype=dtype) for p in parts])
+                for k in names
+            }
+
+        return cls(
+            codes,
+            categories,
+            _stack("numeric", np.float32),
+            _stack("flags", bool),
+            np.concatenate([np.asarray(p.post_date) for p in parts]) if parts else np.empty(0, dtype="datetime64[D]"),
+        )
+
+    # ── Filters ──
+
+    def eq(self, column: str, values: Values) -> np.ndarray:
+        """Rows whose categorical `column` is one of `values`."""
+        if isinstance(values, str):
+            values = [values]
+        wanted = [self._lookup[column][v] for v in values if v in self._lookup[column]]
+        if not wanted:
+            return np.zeros(self.n, dtype=bool)
+        if len(wanted) == 1:
+            return np.asarray(self.codes[column]) == wanted[0]
+        return np.isin(self.codes[column], wanted)
+
+    def flag(self, name: str) -> np.ndarray:
+        arr = self.flags.get(name)
+        return np.asarray(arr, dtype=bool) if arr is not None else np.zeros(self.n, dtype=bool)
+
+    def dated(self, since: Optional[str] = None, until: Optional[str] = None) -> np.ndarray:
+        """Rows with a post_date in [since, until]; undated rows never match."""
+        d = np.asarray(self.post_date)
+        m = ~np.isnat(d)
+        if since:
+            m &= d >= np.datetime64(since[:10], "D")
+        if until:
+            m &= d <= np.datetime64(until[:10], "D")
+        return m
+
+    def mask(
+        self,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        flags: Sequence[str] = (),
+        **columns: Values,
+    ) -> np.ndarray:
+        """AND of categorical filters (type=, sentiment=, source=, ...), flags and a date window."""
+        m = np.ones(self.n, dtype=bool)
+        for column, values in columns.items():
+            m &= self.eq(column, values)
+        for name in flags:
+            m &= self.flag(name)
+        if since or until:
+            m &= self.dated(since, until)
+        return m
+
+    # ── Aggregates ──
+
+    def count(self, mask: Optional[np.ndarray] = None, **filters: Any) -> int:
+        if filters:
+            mask = self.mask(**filters) if mask is None else mask & self.mask(**filters)
+        return self.n if mask is None else int(np.count_nonzero(mask))
+
+    def value_counts(self, column: str, mask: Optional[np.ndarray] = None) -> Dict[str, int]:
+        """Category → count, most common first."""
+        codes = np.asarray(self.codes[column])
+        if mask is not None:
+            codes = codes[mask]
+        counts = np.bincount(codes, minlength=len(self.categories[column]))
+        order = np.argsort(-counts, kind="stable")
+        return {self.categories[column][k]: int(counts[k]) for k in order if counts[k]}
+
+    def date_range(self) -> Optional[tuple]:
+        """(first, last) post_date as YYYY-MM-DD strings, or None when nothing is dated."""
+        d = np.asarray(self.post_date)
+        d = d[~np.isnat(d)]
+        if not d.size:
+            return None
+        return str(d.min()), str(d.max())
+
+
+def build_insight_columns(
+    insights: List[Dict[str, Any]],
+    output_path: str = INSIGHT_COLUMNS_PATH,
+) -> str:
+    """Build and save the column store, stamped with the corpus digest of `insights` (for staleness checks)."""
+    from components.hybrid_retrieval import corpus_digest
+
+    InsightColumns.build(insights).save(output_path, meta={"digest": corpus_digest(insights)})
+    print(f"[COLUMNS] Saved {len(insights)} insight rows to {output_path}/")
+    return output_path
+
+
+def load_insight_columns(
+    path: str = INSIGHT_COLUMNS_PATH,
+    insights: Optional[List[Dict[str, Any]]] = None,
+) -> Optional[InsightColumns]:
+    """Memory-map the column store, or None if it is missing or was not built from `insights` as they are now."""
+    try:
+        cols = InsightColumns.load(path)
+    except Exception:
+        return None
+    if insights is not None:
+        # Content digest, like the BM25 index: a fresh checkout changes mtimes, not contents
+        from components.hybrid_retrieval import corpus_digest
+        if len(cols) != len(insights) or cols.meta.get("digest") != corpus_digest(insights):
+            return None
+    return cols
@@ -0,0 +1,280 @@
+# keyword_matcher.py — Compiled multi-phrase keyword matcher shared by relevance and routing filters
+#
+# The relevance filter (quick_process), workstream routing (workstream_routing), promo
+# detection (app.normalize_insight) and retrieval boosts (HybridRetriever) each ran long
+# `any(p in text for p in LIST)` chains — hundreds of substring scans per post. Instead:
+#   1. Every phrase of every named group is compiled into ONE trie-shaped regex
+#   2. A single findall pass (zero-width lookahead) finds the longest phrase starting at
+#      each position; phrases contained in a hit are added from a precomputed table, so
+#      the result is exactly the set of phrases for which `phrase in text` is true
+#   3. Group tests (any / count) are then set lookups on the matched phrase IDs
+#   4. Match sets are memoized (LRU) per text, or per insight fingerprint, so later
+#      stages reuse the first stage's scan
+#
+# match_insight() uses one process-wide matcher over "text title" (lowercased); modules
+# add their phrase groups with register_groups() at import time.
+#
+# Usage:
+#   RELEVANCE = KeywordMatcher({"sales": ["[h]", "for sale"], "bot": ["i am a bot"]}, name="relevance")
+#   m = RELEVANCE.match(text.lower())
+#   if m.any("sales"): ...
+#
+#   register_groups({"app.promo": ["we are live on", "use code "]})
+#   if match_insight(insight).any("app.promo"): ...
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
+
+_EMPTY: FrozenSet[int] = frozenset()
+
+
+def _trie_regex(phrases: Iterable[str]) -> str:
+    """Regex matching the longest of `phrases` at a position, branching one character at a time."""
+    trie: Dict[str, Any] = {}
+    for p in phrases:
+        node = trie
+        for ch in p:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def _build(node: Dict[str, Any]) -> str:
+        alts = [re.escape(ch) + _build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return _build(trie)
+
+
+class KeywordMatch:
+    """Phrases found in one text, with per-group tests."""
+
+    __slots__ = ("ids", "_matcher")
+
+    def __init__(self, ids: FrozenSet[int], matcher: "KeywordMatcher"):
+        self.ids = ids
+        self._matcher = matcher
+
+    def any(self, group: str) -> bool:
+        """Same as any(p in text for p in group)."""
+        return not self.ids.isdisjoint(self._matcher.group_ids[group])
+
+    def count(self, group: str) -> int:
+        """Same as sum(1 for p in group if p in text)."""
+        return len(self.ids & self._matcher.group_ids[group])
+
+    def has(self, phrase: str) -> bool:
+        """Same as `phrase in text`, for a phrase registered in any group."""
+        pid = self._matcher.phrase_ids.get(phrase)
+        return pid is not None and pid in self.ids
+
+    def phrases(self, group: Optional[str] = None) -> List[str]:
+        ids = self.ids if group is None else self.ids & self._matcher.group_ids[group]
+        return sorted(self._matcher.phrases[i] for i in ids)
+
+    def __bool__(self) -> bool:
+        return bool(self.ids)
+
+
+class KeywordMatcher:
+    """All named phrase groups compiled into one pattern; match() is a single pass over the text."""
+
+    def __init__(self, groups: Dict[str, Iterable[str]], name: str = "keywords", memo_size: int = 65536):
+        self.name = name
+        self.memo_size = memo_size
+        self.phrases: List[str] = []
+        self.phrase_ids: Dict[str, int] = {}
+        self.group_ids: Dict[str, FrozenSet[int]] = {}
+        for group, phrases in groups.items():
+            ids = set()
+            for p in phrases:
+                if not p:
+                    continue
+                if p not in self.phrase_ids:
+                    self.phrase_ids[p] = len(self.phrases)
+                    self.phrases.append(p)
+                ids.add(self.phrase_ids[p])
+            self.group_ids[group] = frozenset(ids)
+
+        # Phrases occurring inside each phrase (itself included): a hit on one implies the others
+        self._implied: List[FrozenSet[int]] = [
+            frozenset(j for j, q in enumerate(self.phrases) if q in p) for p in self.phrases
+        ]
+        self._pattern = re.compile(f"(?=({_trie_regex(self.phrases)}))") if self.phrases else None
+        self._memo: "OrderedDict[Any, FrozenSet[int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _scan(self, text: str) -> FrozenSet[int]:
+        if self._pattern is None or not text:
+            return _EMPTY
+        hits = set(self._pattern.findall(text))
+        if not hits:
+            return _EMPTY
+        found = set()
+        for phrase in hits:
+            found |= self._implied[self.phrase_ids[phrase]]
+        return frozenset(found)
+
+    def _recall(self, key: Any) -> Optional[FrozenSet[int]]:
+        with self._lock:
+            ids = self._memo.get(key)
+            if ids is not None:
+                self._memo.move_to_end(key)
+            return ids
+
+    def _remember(self, key: Any, ids: FrozenSet[int]):
+        with self._lock:
+            self._memo[key] = ids
+            if len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+
+    def match(self, text: str, key: Any = None) -> KeywordMatch:
+        """Phrases present in `text` (matched as-is; lowercase it first). Memoized on `key`, default the text."""
+        key = text if key is None else key
+        ids = self._recall(key)
+        if ids is None:
+            ids = self._scan(text)
+            self._remember(key, ids)
+        return KeywordMatch(ids, self)
+
+    def match_scan(self, text: str) -> KeywordMatch:
+        """match() without the memo (for one-off texts such as queries)."""
+        return KeywordMatch(self._scan(text), self)
+
+    def clear(self):
+        with self._lock:
+            self._memo.clear()
+
+
+# ---------------------------------------------------------------------------
+# Shared insight matcher
+# ---------------------------------------------------------------------------
+
+_insight_groups: Dict[str, List[str]] = {}
+_insight_matcher: Optional[KeywordMatcher] = None
+_insight_lock = threading.Lock()
+
+
+def register_groups(groups: Dict[str, Iterable[str]]):
+    """Add phrase groups to the shared insight matcher (names should be module-prefixed)."""
+    global _insight_matcher
+    with _insight_lock:
+        for group, phrases in groups.items():
+            phrases = list(phrases)
+            if _insight_groups.get(group) != phrases:
+                _insight_groups[group] = phrases
+                _insight_matcher = None
+
+
+def get_insight_matcher() -> KeywordMatcher:
+    global _insight_matcher
+    with _insight_lock:
+        if _insight_matcher is None:
+            _insight_matcher = KeywordMatcher(_insight_groups, name="insight")
+        return _insight_matcher
+
+
+def insight_text(insight: Dict[str, Any]) -> str:
+    """The text the routing filters look at: "text title", lowercased."""
+    return ((insight.get("text") or "") + " " + (insight.get("title") or "")).lower()
+
+
+def match_insight(insight: Dict[str, Any], text: Optional[str] = None) -> KeywordMatch:
+    """Shared-matcher result for an insight, memoized per fingerprint (+ title) when it has one."""
+    matcher = get_insight_matcher()
+    fp = insight.get("fingerprint")
+    if not fp:
+        return matcher.match(insight_text(insight) if text is None else text)
+    key = (fp, insight.get("title") or "")
+    ids = matcher._recall(key)
+    if ids is None:
+        ids = matcher._scan(insight_text(insight) if text is None else text)
+        matcher._remember(key, ids)
+    return KeywordMatch(ids, matcher)
+
+
+# ---------------------------------------------------------------------------
+# CLI — routing cost benchmark
+# ---------------------------------------------------------------------------
+
+def _synthetic_texts(count: int, phrases: List[str], seed: int = 7) -> List[str]:
+    """Forum-like texts that mix registered phrases into random filler."""
+    import random
+    rng = random.Random(seed)
+    filler = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(2, 9))) for _ in range(3000)]
+    texts = []
+    for _ in range(count):
+        words = rng.choices(filler, k=rng.randint(30, 150))
+        for _ in range(rng.randint(0, 4)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(phrases))
+        texts.append(" ".join(words))
+    return texts
+
+
+def benchmark(count: int = 20_000) -> List[Dict[str, Any]]:
+    """Per-text cost of naive `any(p in text ...)` group scans vs one matcher pass, per matcher."""
+    import time
+    import importlib
+
+    matchers = []
+    try:
+        matchers.append(importlib.import_module("quick_process").RELEVANCE_MATCHER)
+    except Exception as e:
+        print(f"[KEYWORDS] quick_process unavailable: {e}")
+    for mod in ("components.workstream_routing", "components.hybrid_retrieval", "app"):
+        try:
+            importlib.import_module(mod)
+        except Exception as e:
+            print(f"[KEYWORDS] {mod} unavailable ({e}) — its groups are not in the benchmark")
+    matchers.append(get_insight_matcher())
+
+    rows = []
+    for matcher in matchers:
+        if not matcher.phrases:
+            continue
+        texts = _synthetic_texts(count, matcher.phrases)
+        groups = {g: [matcher.phrases[i] for i in ids] for g, ids in matcher.group_ids.items()}
+
+        t0 = time.perf_counter()
+        naive = [{g: any(p in t for p in ps) for g, ps in groups.items()} for t in texts]
+        t1 = time.perf_counter()
+        scanned = [matcher.match_scan(t) for t in texts]
+        fast = [{g: m.any(g) for g in groups} for m in scanned]
+        t2 = time.perf_counter()
+        memo_texts = texts[:matcher.memo_size]
+        for t in memo_texts:
+            matcher.match(t)
+        t3 = time.perf_counter()
+        for t in memo_texts:
+            matcher.match(t)
+        t4 = time.perf_counter()
+
+        row = {
+            "matcher": matcher.name,
+            "groups": len(groups),
+            "phrases": len(matcher.phrases),
+            "texts": count,
+            "naive_us_per_text": round((t1 - t0) / count * 1e6, 1),
+            "matcher_us_per_text": round((t2 - t1) / count * 1e6, 1),
+            "memo_hit_us_per_text": round((t4 - t3) / len(memo_texts) * 1e6, 2),
+            "identical": naive == fast,
+        }
+        print(f"[KEYWORDS] {row}")
+        rows.append(row)
+        matcher.clear()
+    return rows
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Keyword matcher — routing cost benchmark")
+    parser.add_argument("--benchmark", type=int, default=20_000, help="Synthetic texts per matcher")
+    args = parser.parse_args()
+    benchmark(args.benchmark)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# llm_cache.py — Shared, crash-safe cache for LLM responses (SQLite WAL shards + in-memory LRU)
+#
+# Replaces the per-module JSON caches that were rewritten in full after every GPT call:
+#   1. One SQLite file per namespace (shard) under data/llm_cache/, journal_mode=WAL,
+#      so each new response is a single appended row and concurrent writers are safe
+#   2. A bounded in-memory LRU in front of it for hot keys
+#   3. Legacy JSON caches are imported once, the first time a shard is created
+#
+# Usage:
+#   cache = get_cache("gpt_sentiment", legacy_json="gpt_sentiment_cache.json")
+#   hit = cache.get(key)
+#   if hit is None: cache.put(key, call_gpt(...))
+
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Iterable
+
+LLM_CACHE_DIR = os.path.join("data", "llm_cache")
+
+_MISSING = object()
+
+
+def shard_path(namespace: str, cache_dir: str = LLM_CACHE_DIR) -> str:
+    """SQLite file holding one namespace."""
+    return os.path.join(cache_dir, f"{namespace}.sqlite")
+
+
+def make_key(*parts: Any) -> str:
+    """md5 over the joined parts — the key scheme the old JSON caches used."""
+    return hashlib.md5("_".join(str(p) for p in parts).encode()).hexdigest()
+
+
+class LLMResponseCache:
+    """Persistent key → JSON value map for one namespace, safe to share across threads and processes."""
+
+    def __init__(
+        self,
+        namespace: str,
+        cache_dir: str = LLM_CACHE_DIR,
+        capacity: int = 4096,
+        legacy_json: Optional[str] = None,
+    ):
+        self.namespace = namespace
+        self.path = shard_path(namespace, cache_dir)
+        self.capacity = capacity
+        self._lru: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.conn.commit()
+        if legacy_json and len(self) == 0:
+            self._import_legacy(legacy_json)
+
+    def _import_legacy(self, path: str):
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read().strip()
+            data = json.loads(content) if content else {}
+        except Exception as e:
+            print(f"[LLM CACHE] Could not import {path}: {e}")
+            return
+        if isinstance(data, dict) and data:
+            self.put_many(data)
+            print(f"[LLM CACHE] Imported {len(data)} entries from {path} into {self.path}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    # ── LRU front ──
+
+    def _remember(self, key: str, value: Any):
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.capacity:
+            self._lru.popitem(last=False)
+
+    # ── Reads ──
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                return self._lru[key]
+            row = self.conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return default
+            value = json.loads(row[0])
+            self._remember(key, value)
+            return value
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Cached values for the keys that are present."""
+        found: Dict[str, Any] = {}
+        todo = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                if key in self._lru:
+                    found[key] = self._lru[key]
+                else:
+                    todo.append(key)
+            for start in range(0, len(todo), 900):
+                chunk = todo[start:start + 900]
+                rows = self.conn.execute(
+                    f"SELECT key, value FROM responses WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                )
+                for key, value in rows:
+                    found[key] = json.loads(value)
+                    self._remember(key, found[key])
+        return found
+
+    # ── Writes ──
+
+    def put(self, key: str, value: Any) -> Any:
+        """Store one response and return it, so callers can `return cache.put(key, out)`."""
+        self.put_many({key: value})
+        return value
+
+    def put_many(self, items: Dict[str, Any]):
+        if not items:
+            return
+        rows = [(k, json.dumps(v, ensure_ascii=False)) for k, v in items.items()]
+        with self._lock:
+            self.conn.executemany("INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)", rows)
+            self.conn.commit()
+            for k, v in items.items():
+                self._remember(k, v)
+
+    def clear(self):
+        with self._lock:
+            self.conn.execute("DELETE FROM responses")
+            self.conn.commit()
+            self._lru.clear()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+_caches: Dict[str, LLMResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(namespace: str, legacy_json: Optional[str] = None, cache_dir: str = LLM_CACHE_DIR) -> LLMResponseCache:
+    """Process-wide LLMResponseCache for a namespace, opened on first use."""
+    with _caches_lock:
+        cache = _caches.get(namespace)
+        if cache is None:
+            cache = _caches[namespace] = LLMResponseCache(namespace, cache_dir=cache_dir, legacy_json=legacy_json)
+        return cache
@@ -0,0 +1,233 @@
+# llm_scheduler.py — Shared, rate-limited scheduler for OpenAI chat completions
+#
+# Every GPT call path (scoring_utils, ai_suggester, gpt_classifier, gpt_enrichment,
+# cluster_synthesizer) goes through one process-wide scheduler that:
+#   1. Enforces requests-per-minute and tokens-per-minute budgets (token buckets)
+#   2. Caps concurrent in-flight requests
+#   3. Retries 429 / 5xx / connection errors with exponential backoff + jitter,
+#      honouring Retry-After when the server sends it
+#   4. Coalesces identical requests that are already in flight into one call
+#   5. Runs orchestration jobs (e.g. one GPT batch or one cluster card) on a shared pool
+#
+# Budgets come from SS_LLM_RPM, SS_LLM_TPM, SS_LLM_CONCURRENCY. Any OpenAI-compatible
+# client works, so a local fake server can be used via OPENAI_BASE_URL (see
+# tests/test_llm_scheduler.py). Build clients with max_retries=0: the scheduler owns
+# retries, and the SDK's own would otherwise stack under them.
+#
+# Lanes: pipeline work uses the "batch" lane; app calls made while a user waits
+# (ai_suggester._chat) use the "interactive" lane, which has its own concurrency
+# slots and pool (SS_LLM_INTERACTIVE_CONCURRENCY) so a running batch or other
+# Streamlit sessions cannot fill them. Both lanes draw on the same RPM/TPM buckets.
+#
+# Usage:
+#   sched = get_scheduler()
+#   resp = sched.complete(client, model="gpt-4o-mini", messages=[...])      # sync
+#   fut = sched.submit(client, model=..., messages=[...])                  # Future
+#   resp = await sched.acomplete(client, model=..., messages=[...])        # asyncio
+#   futs = [sched.run(build_card, c) for c in clusters]                    # jobs
+#   get_scheduler("interactive").complete(client, ...)                     # app lane
+
+import os
+import json
+import time
+import random
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+_RETRYABLE_NAMES = {"RateLimitError", "APIConnectionError", "APITimeoutError", "InternalServerError"}
+
+
+class _TokenBucket:
+    """Refills `per_minute` units per minute; acquire() blocks until enough are available."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount: float):
+        amount = min(float(amount), self.capacity)
+        while True:
+            with self.lock:
+                self._refill()
+                if self.level >= amount:
+                    self.level -= amount
+                    return
+                wait = (amount - self.level) / self.rate
+            time.sleep(min(wait, 5.0))
+
+    def adjust(self, delta: float):
+        """Charge (delta > 0) or refund (delta < 0) units after the fact."""
+        with self.lock:
+            self._refill()
+            self.level = min(self.capacity, self.level - delta)
+
+
+def _estimate_tokens(request: Dict[str, Any]) -> int:
+    """Rough prompt size (~4 chars/token) plus the completion allowance."""
+    chars = 0
+    for m in request.get("messages") or []:
+        content = m.get("content") if isinstance(m, dict) else None
+        chars += len(content) if isinstance(content, str) else 0
+    completion = request.get("max_completion_tokens") or request.get("max_tokens") or 256
+    return chars // 4 + int(completion)
+
+
+def _request_key(client: Any, request: Dict[str, Any]) -> str:
+    payload = json.dumps(request, sort_keys=True, default=str)
+    return hashlib.md5(f"{id(client)}|{payload}".encode()).hexdigest()
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_retryable(exc: Exception) -> bool:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status in _RETRYABLE_STATUS or type(exc).__name__ in _RETRYABLE_NAMES
+
+
+class LLMScheduler:
+    """Rate-limited, retrying, de-duplicating front for client.chat.completions.create."""
+
+    def __init__(
+        self,
+        rpm: float = 500,
+        tpm: float = 200_000,
+        max_concurrency: int = 8,
+        max_retries: int = 6,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        budget: Optional["LLMScheduler"] = None,
+    ):
+        # A lane passes `budget` to draw on another scheduler's RPM/TPM buckets
+        self.requests = budget.requests if budget is not None else _TokenBucket(rpm)
+        self.tokens = budget.tokens if budget is not None else _TokenBucket(tpm)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self.stats = {"requests": 0, "coalesced": 0, "retries": 0, "tokens": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    # ── Core ──
+
+    def _call(self, client: Any, request: Dict[str, Any]) -> Any:
+        estimate = _estimate_tokens(request)
+        for attempt in range(self.max_retries + 1):
+            self.requests.acquire(1)
+            self.tokens.acquire(estimate)
+            try:
+                with self._slots:
+                    resp = client.chat.completions.create(**request)
+            except Exception as e:
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    raise
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = min(self.max_delay, self.base_delay * (2 ** attempt)) * random.uniform(0.5, 1.0)
+                self._count("retries")
+                time.sleep(delay)
+                continue
+            used = getattr(getattr(resp, "usage", None), "total_tokens", None)
+            if used:
+                self.tokens.adjust(used - estimate)
+                self._count("tokens", used)
+            self._count("requests")
+            return resp
+
+    def complete(self, client: Any, **request: Any) -> Any:
+        """Run one chat completion in the calling thread, sharing the result with identical in-flight calls."""
+        key = _request_key(client, request)
+        with self._inflight_lock:
+            pending = self._inflight.get(key)
+            if pending is None:
+                owner = Future()
+                self._inflight[key] = owner
+        if pending is not None:
+            self._count("coalesced")
+            return pending.result()
+
+        try:
+            resp = self._call(client, request)
+            owner.set_result(resp)
+            return resp
+        except BaseException as e:
+            owner.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    # ── Async / pooled entry points ──
+
+    def submit(self, client: Any, **request: Any) -> Future:
+        """complete() on the scheduler's pool; returns a concurrent.futures.Future."""
+        return self._pool.submit(self.complete, client, **request)
+
+    async def acomplete(self, client: Any, **request: Any) -> Any:
+        """Awaitable complete() for asyncio callers."""
+        return await asyncio.wrap_future(self.submit(client, **request))
+
+    def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Run a job that makes its own complete() calls (e.g. one GPT batch) on the shared pool."""
+        return self._pool.submit(fn, *args, **kwargs)
+
+
+LANES = ("batch", "interactive")
+
+_schedulers: Dict[str, LLMScheduler] = {}
+_scheduler_lock = threading.Lock()
+
+
+def _lane_scheduler(lane: str) -> LLMScheduler:
+    """Build or return one lane's scheduler; caller holds _scheduler_lock."""
+    if lane not in _schedulers:
+        if lane == "batch":
+            _schedulers[lane] = LLMScheduler(
+                rpm=float(os.getenv("SS_LLM_RPM", "500")),
+                tpm=float(os.getenv("SS_LLM_TPM", "200000")),
+                max_concurrency=int(os.getenv("SS_LLM_CONCURRENCY", "8")),
+            )
+        else:
+            _schedulers[lane] = LLMScheduler(
+                max_concurrency=int(os.getenv("SS_LLM_INTERACTIVE_CONCURRENCY", "16")),
+                budget=_lane_scheduler("batch"),
+            )
+    return _schedulers[lane]
+
+
+def get_scheduler(lane: str = "batch") -> LLMScheduler:
+    """
+    Process-wide scheduler for a lane, configured from SS_LLM_RPM / SS_LLM_TPM /
+    SS_LLM_CONCURRENCY ("batch") or SS_LLM_INTERACTIVE_CONCURRENCY ("interactive").
+    """
+    if lane not in LANES:
+        raise ValueError(f"Unknown LLM lane {lane!r}; expected one of {LANES}")
+    with _scheduler_lock:
+        return _lane_scheduler(lane)
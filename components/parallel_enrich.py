@@ -0,0 +1,73 @@
+# parallel_enrich.py — Chunked process-pool executor for CPU-bound enrichment passes
+#
+# quick_process and process_scraped_data_light spend most of their time in regex
+# detectors and text normalization, which hold the GIL. This runs them across cores:
+#   1. The input iterable is consumed lazily in fixed-size chunks
+#   2. Each chunk is processed by a top-level `fn(chunk)` in a worker process
+#   3. Workers are set up once with `initializer(*initargs)` (e.g. load a model)
+#   4. At most `max_pending` chunks are in flight, and results are yielded in input
+#      order, so output and stats match the serial run and memory stays bounded
+#
+# workers <= 1 runs everything inline (same code path, no pool).
+#
+# Usage:
+#   for results in map_chunks(_enrich_chunk, iter_all(), workers=16, chunk_size=256):
+#       for insight in results: ...
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+DEFAULT_CHUNK_SIZE = 256
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """--workers value → process count; 0 or negative means one per CPU."""
+    if workers is None:
+        return 1
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def map_chunks(
+    fn: Callable[[List[Any]], Any],
+    items: Iterable[Any],
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Sequence[Any] = (),
+    max_pending: Optional[int] = None,
+) -> Iterator[Any]:
+    """Yield fn(chunk) for consecutive chunks of `items`, in order, using `workers` processes."""
+    chunks = chunked(items, chunk_size)
+    if workers <= 1:
+        if initializer:
+            initializer(*initargs)
+        for chunk in chunks:
+            yield fn(chunk)
+        return
+
+    max_pending = max_pending or workers * 2
+    pending: deque = deque()
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=tuple(initargs))
+    try:
+        for chunk in chunks:
+            pending.append(pool.submit(fn, chunk))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
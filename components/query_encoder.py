@@ -0,0 +1,196 @@
+# query_encoder.py — Process-wide, pre-warmed query encoder with an LRU + SQLite embedding cache
+#
+# HybridRetriever used to load a SentenceTransformer inside the Streamlit session on the
+# first Ask AI question and encode each expanded query variant with its own forward pass.
+# Instead, one encoder per model is shared by every session in the process:
+#   1. warm() loads the model on a background thread at app startup (and can pre-encode
+#      the example prompts), so the first question does not pay for the model load
+#   2. Queries are normalized (case / whitespace) and looked up in an in-memory LRU, then
+#      in a SQLite WAL cache under data/query_embeddings/, so repeated and example
+#      questions never touch the model
+#   3. encode_many() sends every cache miss through the model in one batch
+#   4. encode_texts() encodes documents added to a retriever after startup with the same
+#      model, bypassing the query cache
+#
+# Usage:
+#   encoder = get_query_encoder("intfloat/e5-base-v2")
+#   encoder.warm(["What are the top complaints about Whatnot?"])
+#   vectors = encoder.encode_many([query, expanded_query])   # None where unavailable
+
+import os
+import re
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+QUERY_CACHE_DIR = os.path.join("data", "query_embeddings")
+
+_WS = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Cache key text: lowercased, whitespace collapsed."""
+    return _WS.sub(" ", (query or "").strip().lower())
+
+
+class QueryEncoder:
+    """Normalized query → unit-norm float32 embedding for one model, cached in memory and on disk."""
+
+    def __init__(self, model_name: str, cache_dir: str = QUERY_CACHE_DIR, capacity: int = 2048):
+        self.model_name = model_name
+        self.capacity = capacity
+        self._model = None
+        self._load_error: Optional[str] = None
+        self._loader: Optional[threading.Thread] = None
+        self._loaded = threading.Event()
+        self._load_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+        self.conn = None
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            name = hashlib.md5(model_name.encode()).hexdigest()[:12]
+            self.conn = sqlite3.connect(os.path.join(cache_dir, f"{name}.sqlite"), check_same_thread=False, timeout=30)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS embeddings (query TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+            self.conn.commit()
+        except Exception as e:
+            print(f"[QUERY ENCODER] Disk cache unavailable ({e}) — using the in-memory cache only")
+            self.conn = None
+
+    # ── Model ──
+
+    def _load(self):
+        try:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(self.model_name)
+            model.encode(["warm up"], normalize_embeddings=True)
+            self._model = model
+        except Exception as e:
+            self._load_error = str(e)
+            print(f"[QUERY ENCODER] Could not load {self.model_name}: {e}")
+        finally:
+            self._loaded.set()
+
+    def _start_loading(self):
+        with self._load_lock:
+            if self._loader is None:
+                self._loader = threading.Thread(target=self._load, name=f"load-{self.model_name}", daemon=True)
+                self._loader.start()
+
+    def warm(self, queries: Iterable[str] = ()) -> "QueryEncoder":
+        """Load the model (then encode `queries`) on background threads; returns immediately."""
+        self._start_loading()
+        queries = list(queries)
+        if queries:
+            threading.Thread(target=self.encode_many, args=(queries,), name="warm-queries", daemon=True).start()
+        return self
+
+    @property
+    def ready(self) -> bool:
+        return self._model is not None
+
+    @property
+    def available(self) -> bool:
+        """False once loading has failed (sentence-transformers missing, no network, ...)."""
+        return self._load_error is None
+
+    def _wait_for_model(self):
+        self._start_loading()
+        self._loaded.wait()
+
+    # ── Cache ──
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.capacity:
+            self._lru.popitem(last=False)
+
+    def _lookup(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        todo = []
+        with self._lock:
+            for key in keys:
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    found[key] = self._lru[key]
+                else:
+                    todo.append(key)
+            if todo and self.conn is not None:
+                rows = self.conn.execute(
+                    f"SELECT query, vector FROM embeddings WHERE query IN ({','.join('?' * len(todo))})", todo
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+                    self._remember(key, found[key])
+        return found
+
+    def _store(self, items: Dict[str, np.ndarray]):
+        with self._lock:
+            for key, vector in items.items():
+                self._remember(key, vector)
+            if self.conn is not None:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (query, vector) VALUES (?, ?)",
+                    [(k, v.astype(np.float32).tobytes()) for k, v in items.items()],
+                )
+                self.conn.commit()
+
+    # ── Encoding ──
+
+    def encode_many(self, queries: List[str]) -> List[Optional[np.ndarray]]:
+        """Embeddings for `queries` in order; cache misses share one forward pass. None if unavailable."""
+        keys = [normalize_query(q) for q in queries]
+        unique = [k for k in dict.fromkeys(keys) if k]
+        found = self._lookup(unique)
+        misses = [k for k in unique if k not in found]
+        if misses and self.available:
+            self._wait_for_model()
+            if self._model is not None:
+                try:
+                    vectors = np.asarray(
+                        self._model.encode(misses, batch_size=len(misses), normalize_embeddings=True),
+                        dtype=np.float32,
+                    )
+                    fresh = dict(zip(misses, vectors))
+                    self._store(fresh)
+                    found.update(fresh)
+                except Exception as e:
+                    print(f"[QUERY ENCODER] Encoding failed: {e}")
+        return [found.get(k) for k in keys]
+
+    def encode(self, query: str) -> Optional[np.ndarray]:
+        return self.encode_many([query])[0]
+
+    def encode_texts(self, texts: List[str], batch_size: int = 64) -> Optional[np.ndarray]:
+        """Uncached unit-norm embeddings of document texts (waits for the model); None if unavailable."""
+        if not texts or not self.available:
+            return None
+        self._wait_for_model()
+        if self._model is None:
+            return None
+        try:
+            return np.asarray(self._model.encode(texts, batch_size=batch_size, normalize_embeddings=True), dtype=np.float32)
+        except Exception as e:
+            print(f"[QUERY ENCODER] Encoding failed: {e}")
+            return None
+
+
+_encoders: Dict[str, QueryEncoder] = {}
+_encoders_lock = threading.Lock()
+
+
+def get_query_encoder(model_name: str, cache_dir: str = QUERY_CACHE_DIR) -> QueryEncoder:
+    """Process-wide QueryEncoder for a model (shared by all Streamlit sessions)."""
+    with _encoders_lock:
+        encoder = _encoders.get(model_name)
+        if encoder is None:
+            encoder = _encoders[model_name] = QueryEncoder(model_name, cache_dir=cache_dir)
+        return encoder
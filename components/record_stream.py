@@ -0,0 +1,175 @@
+# record_stream.py — Streaming reader/writer for record files (JSON Lines + legacy JSON arrays)
+#
+# Scraped posts and precomputed insights are lists of dicts that grow with the corpus.
+# json.load holds the whole file text *and* every parsed record at once; this module
+# keeps only one read chunk plus the records the caller chooses to keep:
+#   1. iter_records(path)   — yields one dict at a time from .jsonl files or JSON arrays
+#                             (arrays are parsed incrementally with JSONDecoder.raw_decode)
+#   2. RecordWriter / write_records — stream records out to .jsonl or a JSON array,
+#                             via temp file + os.replace so readers never see a partial file
+#   3. read_json(path)      — json.load drop-in that streams record files
+#   4. RecordFile(path)     — re-iterable view for consumers that take several passes
+#                             (each pass streams the file again; len() counts it once)
+#
+# Usage:
+#   for post in iter_records("data/all_scraped_posts.json"): ...
+#   n = write_records("precomputed_insights.json", insight_generator, indent=2)
+#   build_bm25_index(RecordFile("precomputed_insights.json", count=n))
+
+import os
+import re
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+CHUNK_SIZE = 1 << 20
+
+_SKIP = re.compile(r"[\s,]*")
+_WS = re.compile(r"\s*")
+
+
+def is_jsonl(path: str) -> bool:
+    return path.endswith(".jsonl")
+
+
+def _first_char(f) -> str:
+    while True:
+        ch = f.read(1)
+        if not ch or not ch.isspace():
+            return ch
+
+
+def _iter_jsonl(f) -> Iterator[Dict[str, Any]]:
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def _iter_json_array(f, chunk_size: int) -> Iterator[Any]:
+    """Yield the elements of a JSON array whose opening '[' has already been consumed."""
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def _more() -> bool:
+        nonlocal buf, pos, eof
+        data = f.read(chunk_size)
+        if not data:
+            eof = True
+            return False
+        buf, pos = buf[pos:] + data, 0
+        return True
+
+    while True:
+        pos = _SKIP.match(buf, pos).end()
+        if pos >= len(buf):
+            if _more():
+                continue
+            raise ValueError("Unterminated JSON array")
+        if buf[pos] == "]":
+            return
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if _more():
+                continue
+            raise
+        if end >= len(buf) and not eof and _more():
+            continue  # a bare number may continue in the next chunk
+        yield obj
+        pos = end
+        if pos > chunk_size:
+            buf, pos = buf[pos:], 0
+
+
+def iter_records(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Yield records from a JSON Lines file or a top-level JSON array, one at a time."""
+    with open(path, "r", encoding="utf-8") as f:
+        first = _first_char(f)
+        if not first:
+            return
+        if first == "[":
+            yield from _iter_json_array(f, chunk_size)
+        elif first == "{":
+            f.seek(0)
+            yield from _iter_jsonl(f)
+        else:
+            raise ValueError(f"{path} is neither a JSON array nor JSON Lines")
+
+
+def read_json(path: str) -> Any:
+    """json.load replacement: record files are parsed incrementally, anything else normally."""
+    if is_jsonl(path):
+        return list(iter_records(path))
+    with open(path, "r", encoding="utf-8") as f:
+        first = _first_char(f)
+        if first != "[":
+            f.seek(0)
+            return json.load(f)
+        return list(_iter_json_array(f, CHUNK_SIZE))
+
+
+class RecordFile:
+    """A record file as a re-iterable sequence: every iteration streams it from disk again."""
+
+    def __init__(self, path: str, count: Optional[int] = None):
+        self.path = path
+        self._count = count
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter_records(self.path)
+
+    def __len__(self) -> int:
+        if self._count is None:
+            self._count = sum(1 for _ in self)
+        return self._count
+
+
+class RecordWriter:
+    """Write records one at a time to a .jsonl file or a JSON array; the file is replaced on close."""
+
+    def __init__(self, path: str, indent: Optional[int] = None):
+        self.path = path
+        self.jsonl = is_jsonl(path)
+        self.indent = None if self.jsonl else indent
+        self.count = 0
+        self._tmp = f"{path}.tmp"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._f = open(self._tmp, "w", encoding="utf-8")
+        if not self.jsonl:
+            self._f.write("[")
+
+    def write(self, record: Any):
+        text = json.dumps(record, ensure_ascii=False, indent=self.indent)
+        if self.jsonl:
+            self._f.write(text + "\n")
+        else:
+            self._f.write(("," if self.count else "") + "\n" + text)
+        self.count += 1
+
+    def close(self):
+        if not self.jsonl:
+            self._f.write("\n]\n" if self.count else "]\n")
+        self._f.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self):
+        self._f.close()
+        if os.path.exists(self._tmp):
+            os.remove(self._tmp)
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_records(path: str, records: Iterable[Any], indent: Optional[int] = None) -> int:
+    """Stream an iterable of records to `path`; returns how many were written."""
+    with RecordWriter(path, indent=indent) as w:
+        for r in records:
+            w.write(r)
+    return w.count
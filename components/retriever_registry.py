@@ -0,0 +1,207 @@
+# retriever_registry.py — Process-wide, reference-counted HybridRetriever shared by Streamlit sessions
+#
+# app.py used to build a HybridRetriever per browser session (st.session_state), so every
+# session paid for its own BM25 index, embedding maps and boost features. Instead:
+#   1. Retrievers are keyed by artifact_key(): an md5 of the insights artifact's content
+#      (re-hashed only when its size / mtime changes) plus the stamps of the retrieval
+#      indexes the pipeline publishes next to it
+#   2. acquire() hands out a lease on the retriever for a key; leases are counted and
+#      released when the session drops them (session end, or a newer lease)
+#   3. When the pipeline publishes new artifacts, the new retriever is built once on a
+#      background thread while sessions keep getting the current one; it then replaces
+#      the current one atomically, and the old one is dropped when its last lease goes
+#   4. A failed build is remembered for RETRY_COOLDOWN seconds: sessions keep the current
+#      retriever meanwhile, and each artifact key is rebuilt at most once per cooldown
+#
+# Usage:
+#   lease = get_retriever_registry().acquire(artifact_key(), lambda: HybridRetriever(snapshot))
+#   st.session_state["_retriever_lease"] = lease
+#   lease.retriever.retrieve(question)
+
+import os
+import time
+import hashlib
+import threading
+import weakref
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+INSIGHTS_PATH = "precomputed_insights.json"
+# Written by the pipeline next to the insights; a new stamp means a new retriever
+RETRIEVAL_ARTIFACTS = (
+    os.path.join("precomputed_bm25", "meta.json"),
+    os.path.join("precomputed_ann", "meta.json"),
+    os.path.join("precomputed_embedding_store", "manifest.json"),
+    "precomputed_embeddings.npy",
+)
+
+_CHUNK = 1 << 20
+
+# Seconds before a failed retriever build is attempted again
+RETRY_COOLDOWN = float(os.getenv("SS_RETRIEVER_RETRY_COOLDOWN", "300"))
+
+
+def file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    """(size, mtime_ns) of a file, None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+_digests: Dict[str, Tuple[Optional[Tuple[int, int]], str]] = {}
+_digests_lock = threading.Lock()
+
+
+def file_digest(path: str) -> str:
+    """md5 of a file's content, recomputed only when its stamp changes ("" if missing)."""
+    stamp = file_stamp(path)
+    with _digests_lock:
+        cached = _digests.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    digest = ""
+    if stamp is not None:
+        h = hashlib.md5()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(_CHUNK), b""):
+                h.update(block)
+        digest = h.hexdigest()
+    with _digests_lock:
+        _digests[path] = (stamp, digest)
+    return digest
+
+
+def artifact_key(insights_path: str = INSIGHTS_PATH, extra_paths: Sequence[str] = RETRIEVAL_ARTIFACTS) -> str:
+    """Content hash of the insights artifact plus the stamps of the retrieval artifacts."""
+    parts = [file_digest(insights_path)] + [f"{p}={file_stamp(p)}" for p in extra_paths]
+    return hashlib.md5("|".join(parts).encode()).hexdigest()
+
+
+class RetrieverLease:
+    """A session's hold on a shared retriever; released when it is garbage-collected or release()d."""
+
+    __slots__ = ("key", "retriever", "_finalizer", "__weakref__")
+
+    def __init__(self, registry: "RetrieverRegistry", key: str, retriever: Any):
+        self.key = key
+        self.retriever = retriever
+        self._finalizer = weakref.finalize(self, registry._release, key)
+
+    def release(self):
+        self._finalizer()
+
+
+class _Entry:
+    __slots__ = ("retriever", "refs", "ready", "error", "retry_at")
+
+    def __init__(self):
+        self.retriever = None
+        self.refs = 0
+        self.ready = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.retry_at = 0.0  # monotonic time after which a failed build may be retried
+
+
+class RetrieverRegistry:
+    """Key → shared retriever, with lease counting and build-once, swap-when-ready refreshes."""
+
+    def __init__(self, retry_cooldown: float = RETRY_COOLDOWN):
+        self.retry_cooldown = retry_cooldown
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._current: Optional[str] = None
+
+    def acquire(self, key: str, factory: Callable[[], Any]) -> RetrieverLease:
+        """Lease the retriever for `key`, building it with `factory` if nobody has.
+
+        While a refresh builds in the background, or after it failed, callers get the
+        current retriever (the lease's key is then the old one, so check lease.key on the
+        next call). Only the very first build blocks; if it failed, its error is raised
+        again until the cooldown lets one caller retry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.error is not None and time.monotonic() >= entry.retry_at:
+                entry = None  # cooldown over: build it again
+            current = self._entries.get(self._current) if self._current else None
+            serving = current is not None and current.retriever is not None
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+                if serving:
+                    threading.Thread(target=self._build, args=(key, entry, factory), name="retriever-build", daemon=True).start()
+                    return self._lease(self._current, current)
+                build_here = True
+            else:
+                build_here = False
+                if serving and (not entry.ready.is_set() or entry.error is not None):
+                    return self._lease(self._current, current)
+
+        if build_here:
+            self._build(key, entry, factory)
+        entry.ready.wait()
+        if entry.error is not None:
+            raise entry.error
+        with self._lock:
+            return self._lease(key, entry)
+
+    def _lease(self, key: str, entry: _Entry) -> RetrieverLease:
+        entry.refs += 1
+        return RetrieverLease(self, key, entry.retriever)
+
+    def _build(self, key: str, entry: _Entry, factory: Callable[[], Any]):
+        try:
+            retriever = factory()
+        except BaseException as e:
+            print(f"[RETRIEVER REGISTRY] Build failed for {key[:12]}: {e}")
+            with self._lock:
+                # Kept, so the key is not rebuilt by every caller until the cooldown ends
+                entry.error = e
+                entry.retry_at = time.monotonic() + self.retry_cooldown
+            entry.ready.set()
+            return
+        with self._lock:
+            entry.retriever = retriever
+            self._current = key
+            self._evict()
+        entry.ready.set()
+        print(f"[RETRIEVER REGISTRY] Serving {key[:12]}")
+
+    def _release(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refs -= 1
+                self._evict()
+
+    def _evict(self):
+        """Drop built, unleased retrievers that are no longer current, and expired failures (lock held)."""
+        now = time.monotonic()
+        for key in [
+            k for k, e in self._entries.items()
+            if k != self._current and e.refs <= 0 and e.ready.is_set() and (e.error is None or now >= e.retry_at)
+        ]:
+            del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "current": self._current,
+                "entries": {
+                    k: {"refs": e.refs, "ready": e.ready.is_set(), "failed": e.error is not None}
+                    for k, e in self._entries.items()
+                },
+            }
+
+
+_registry: Optional[RetrieverRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_retriever_registry() -> RetrieverRegistry:
+    """Process-wide registry (shared by all Streamlit sessions)."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = RetrieverRegistry()
+        return _registry
@@ -1,36 +1,41 @@
 # scoring_utils.py — expanded competitor tagging, payments/UPI/high-ASP detection, topic focus, and sentiment hardening
 
-import os, re, json, hashlib
-from openai import OpenAI
+import os, re, hashlib
 from dotenv import load_dotenv
 
 load_dotenv()
 load_dotenv(os.path.expanduser(os.path.join("~", "signalsynth", ".env")), override=True)
 OPENAI_KEY=os.getenv("OPENAI_API_KEY")
-client=OpenAI(api_key=OPENAI_KEY) if OPENAI_KEY else None
+_client=None
 
-CACHE_PATH="gpt_sentiment_cache.json"
+def _get_client():
+    """OpenAI client, created on first GPT call so importing this module stays cheap."""
+    global _client
+    if _client is None and OPENAI_KEY:
+        from openai import OpenAI
+        _client=OpenAI(api_key=OPENAI_KEY, max_retries=0)
+    return _client
 
-def load_cache():
-    if os.path.exists(CACHE_PATH):
-        try: return json.load(open(CACHE_PATH,"r",encoding="utf-8"))
-        except: return {}
-    return {}
+CACHE_PATH="gpt_sentiment_cache.json"  # legacy JSON cache, imported into the shared LLM cache once
+
+def _sentiment_cache():
+    from components.llm_cache import get_cache
+    return get_cache("gpt_sentiment", legacy_json=CACHE_PATH)
 
-def save_cache(cache): json.dump(cache, open(CACHE_PATH,"w",encoding="utf-8"), indent=2)
 def clear_sentiment_cache():
-    global sentiment_cache; sentiment_cache={}
+    _sentiment_cache().clear()
     if os.path.exists(CACHE_PATH):
         try: os.remove(CACHE_PATH)
         except: pass
 
-sentiment_cache=load_cache()
-
 def gpt_estimate_sentiment_subtag(text):
+    client=_get_client()
     if not client:
         return {"sentiment":"Neutral","subtags":["General"],"summary":"","frustration":1,"impact":1,"gpt_confidence":0}
     key=hashlib.md5((text or "").strip().encode()).hexdigest()
-    if key in sentiment_cache: return sentiment_cache[key]
+    cache=_sentiment_cache()
+    hit=cache.get(key)
+    if hit is not None: return hit
     try:
         prompt=f"""Classify the feedback and return exactly these fields, one per line:
 
@@ -44,7 +49,8 @@ Summary: [One concise sentence summarizing the issue or praise]
 {text}
 """
         mdl=os.getenv("OPENAI_MODEL_SCREENER","gpt-4o-mini")
-        rsp=client.chat.completions.create(
+        from components.llm_scheduler import get_scheduler
+        rsp=get_scheduler().complete(client,
             model=mdl,
             messages=[{"role":"system","content":"You are a product analyst identifying themes and risk. Output must follow requested fields exactly."},
                       {"role":"user","content":prompt.strip()}],
@@ -63,7 +69,7 @@ Summary: [One concise sentence summarizing the issue or praise]
                 except: pass
             elif h=="summary": summary=v.strip().capitalize()
         out={"sentiment":sentiment,"subtags":subtags,"frustration":frustration,"impact":impact,"summary":summary,"gpt_confidence":100.0}
-        sentiment_cache[key]=out; save_cache(sentiment_cache); return out
+        return cache.put(key,out)
     except Exception as e:
         print("[GPT fallback error]", e)
         return {"sentiment":"Neutral","subtags":["General"],"summary":"","frustration":1,"impact":1,"gpt_confidence":0}
@@ -0,0 +1,178 @@
+# sentiment_engine.py — Shared batched RoBERTa sentiment inference (torch, int8 or ONNX Runtime)
+#
+# enhanced_classifier and process_scraped_data_light both classify with
+# cardiffnlp/twitter-roberta-base-sentiment. Instead of each loading the model at import
+# and running one text at a time, they share one lazily loaded engine that:
+#   1. Tokenizes a whole chunk once (truncated to 512 tokens, no padding)
+#   2. Sorts texts by token length and pads per batch (length-bucketed dynamic batching),
+#      capping both texts and padded tokens per batch
+#   3. Runs on torch (fp32), torch int8 dynamic quantization, or ONNX Runtime CPU
+#
+# A text the model fails on comes back as None (never a made-up "Neutral"), so callers
+# leave its sentiment unset; failures are logged and counted in engine.failures.
+#
+# Config (env): SS_SENTIMENT_BACKEND=torch|int8|onnx, SS_SENTIMENT_THREADS, SS_SENTIMENT_BATCH
+# (onnx needs onnxruntime + optimum from requirements-pipeline.txt)
+#
+# Usage:
+#   engine = get_sentiment_engine()
+#   engine.classify_many(["love the vault", "refund still pending"])
+#   → [{"sentiment": "Praise", "confidence": 97.1}, {"sentiment": "Complaint", "confidence": 88.4}]
+#   (None in place of a result when the model failed on that text)
+
+import os
+import threading
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+SENTIMENT_MODEL = "cardiffnlp/twitter-roberta-base-sentiment"
+
+_LABELS = ["Negative", "Neutral", "Positive"]
+_TO_INSIGHT = {"Positive": "Praise", "Negative": "Complaint", "Neutral": "Neutral"}
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    z = logits - logits.max(axis=-1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+class SentimentEngine:
+    """Batched sentiment classifier returning the same labels/confidences as the per-text code."""
+
+    def __init__(
+        self,
+        model_name: str = SENTIMENT_MODEL,
+        backend: str = "torch",
+        batch_size: int = 32,
+        max_batch_tokens: int = 8192,
+        num_threads: Optional[int] = None,
+        max_length: int = 512,
+    ):
+        import torch
+        from transformers import AutoTokenizer
+
+        self.torch = torch
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.max_length = max_length
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.backend = backend
+        self.model = self._load_model(backend, num_threads)
+        self.failures = 0
+        self._failures_lock = threading.Lock()
+
+    def _load_model(self, backend: str, num_threads: Optional[int]):
+        if backend == "onnx":
+            try:
+                import onnxruntime as ort
+                from optimum.onnxruntime import ORTModelForSequenceClassification
+
+                opts = ort.SessionOptions()
+                if num_threads:
+                    opts.intra_op_num_threads = num_threads
+                return ORTModelForSequenceClassification.from_pretrained(
+                    self.model_name, export=True, provider="CPUExecutionProvider", session_options=opts,
+                )
+            except Exception as e:
+                print(f"[SENTIMENT] ONNX Runtime backend unavailable ({e}) — using torch")
+                self.backend = backend = "torch"
+
+        from transformers import AutoModelForSequenceClassification
+        model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+        model.eval()
+        if backend == "int8":
+            model = self.torch.quantization.quantize_dynamic(model, {self.torch.nn.Linear}, dtype=self.torch.qint8)
+        return model
+
+    def _failed(self, count: int, error: Exception):
+        """Count texts the model could not classify; the first failure is logged."""
+        with self._failures_lock:
+            first = self.failures == 0
+            self.failures += count
+        if first:
+            print(f"[SENTIMENT] Classification failed ({type(error).__name__}: {error}) — sentiment left unset")
+
+    def _logits(self, features: List[Dict[str, List[int]]]) -> np.ndarray:
+        batch = self.tokenizer.pad(features, padding=True, return_tensors="pt")
+        with self.torch.no_grad():
+            out = self.model(**batch)
+        logits = out.logits
+        return logits.numpy() if hasattr(logits, "numpy") else np.asarray(logits)
+
+    def _batches(self, lengths: List[int]) -> List[List[int]]:
+        """Indices grouped into batches of similar length, longest first."""
+        order = sorted(range(len(lengths)), key=lambda k: -lengths[k])
+        batches, current = [], []
+        for k in order:
+            width = lengths[current[0]] if current else lengths[k]
+            if current and (len(current) >= self.batch_size or width * (len(current) + 1) > self.max_batch_tokens):
+                batches.append(current)
+                current = []
+            current.append(k)
+        if current:
+            batches.append(current)
+        return batches
+
+    def classify_many(self, texts: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """One {"sentiment", "confidence"} per text, in input order (None where the model failed).
+
+        A batch that fails is retried text by text, so one bad input does not fail its batch.
+        """
+        if not texts:
+            return []
+        try:
+            enc = self.tokenizer([t or "" for t in texts], truncation=True, max_length=self.max_length)
+        except Exception:
+            return [self.classify(t) for t in texts]
+        keys = list(enc.keys())
+        lengths = [len(ids) for ids in enc["input_ids"]]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        for batch in self._batches(lengths):
+            try:
+                scores = _softmax(self._logits([{k: enc[k][i] for k in keys} for i in batch]))
+            except Exception:
+                for i in batch:
+                    results[i] = self.classify(texts[i])
+                continue
+            for i, row in zip(batch, scores):
+                results[i] = {
+                    "sentiment": _TO_INSIGHT.get(_LABELS[int(row.argmax())], "Neutral"),
+                    "confidence": round(float(row.max()) * 100, 2),
+                }
+        return results
+
+    def classify(self, text: str) -> Optional[Dict[str, Any]]:
+        """{"sentiment", "confidence"} for one text, None if the model failed on it."""
+        try:
+            enc = self.tokenizer(text or "", truncation=True, max_length=self.max_length)
+            row = _softmax(self._logits([dict(enc)]))[0]
+        except Exception as e:
+            self._failed(1, e)
+            return None
+        return {
+            "sentiment": _TO_INSIGHT.get(_LABELS[int(row.argmax())], "Neutral"),
+            "confidence": round(float(row.max()) * 100, 2),
+        }
+
+
+_engine: Optional[SentimentEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_sentiment_engine() -> SentimentEngine:
+    """Process-wide engine, loaded on first use from SS_SENTIMENT_* settings."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            threads = os.getenv("SS_SENTIMENT_THREADS")
+            _engine = SentimentEngine(
+                backend=os.getenv("SS_SENTIMENT_BACKEND", "torch"),
+                batch_size=int(os.getenv("SS_SENTIMENT_BATCH", "32")),
+                num_threads=int(threads) if threads else None,
+            )
+        return _engine
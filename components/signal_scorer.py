@@ -1,13 +1,13 @@
 # signal_scorer.py — enriches insights + elevates Payments/UPI/high-ASP into visible tags/opportunities/persona
 
-import os, hashlib
-from sentence_transformers import SentenceTransformer, util
+#
+# The embedding model, its tokenizer and the exemplar embeddings are loaded on first use
+# (or via warm_up()), and the GPT-backed helpers are imported inside enrich_single_insight,
+# so importing this module does not touch torch, sentence-transformers or OpenAI.
+
+import os, hashlib, threading
 
-from components.enhanced_classifier import enhance_insight
-from components.ai_suggester import generate_pm_ideas
-from components.gpt_classifier import enrich_with_gpt_tags
 from components.scoring_utils import (
-    gpt_estimate_sentiment_subtag,
     detect_competitor_and_partner_mentions,
     infer_clarity, generate_insight_title, tag_topic_focus,
     classify_opportunity_type, classify_action_type, calculate_cluster_ready_score,
@@ -16,6 +16,7 @@ from components.scoring_utils import (
 )
 
 def _load_embed():
+    from sentence_transformers import SentenceTransformer
     name=os.getenv("SS_EMBED_MODEL","intfloat/e5-base-v2")
     try:
         if os.path.isdir(f"models/{name.replace('/','_')}"):
@@ -44,9 +45,21 @@ def _load_embed():
         pass
     return m
 
-model=_load_embed()
-# Cache the token limit for use in _truncate_to_token_limit
-_MODEL_TOKEN_LIMIT = model.max_seq_length
+_model=None
+_exemplar_embeddings=None
+_load_lock=threading.Lock()
+
+def get_model():
+    """Embedding model singleton, loaded on first call."""
+    global _model
+    if _model is None:
+        with _load_lock:
+            if _model is None:
+                _model=_load_embed()
+    return _model
+
+def _model_token_limit()->int:
+    return get_model().max_seq_length
 
 HIGH_SIGNAL_EXAMPLES=[
     "authentication guarantee failed",
@@ -57,7 +70,27 @@ HIGH_SIGNAL_EXAMPLES=[
     "counterfeit card detected in authenticity",
     "search relevancy broken on trading cards",
 ]
-EXEMPLAR_EMBEDDINGS=model.encode(HIGH_SIGNAL_EXAMPLES, convert_to_tensor=True, normalize_embeddings=True)
+
+def get_exemplar_embeddings():
+    """Normalized HIGH_SIGNAL_EXAMPLES embeddings, encoded once on first call."""
+    global _exemplar_embeddings
+    if _exemplar_embeddings is None:
+        m=get_model()
+        with _load_lock:
+            if _exemplar_embeddings is None:
+                _exemplar_embeddings=m.encode(HIGH_SIGNAL_EXAMPLES, convert_to_tensor=True, normalize_embeddings=True)
+    return _exemplar_embeddings
+
+def warm_up():
+    """Load the model, tokenizer and exemplar embeddings now instead of on the first scored insight."""
+    get_exemplar_embeddings()
+
+def __getattr__(name):
+    # Backward compatibility for callers that read the old module-level globals.
+    if name=="model": return get_model()
+    if name=="EXEMPLAR_EMBEDDINGS": return get_exemplar_embeddings()
+    if name=="_MODEL_TOKEN_LIMIT": return _model_token_limit()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 HEURISTIC_KEYWORDS={
     "scam":8,"fraud":8,"trust issue":10,"bid cancel":10,"auction integrity":12,"cancelled bid":8,
@@ -68,12 +101,12 @@ def _truncate_to_token_limit(text:str, max_tokens:int=0)->str:
     """Truncate text so it tokenizes to at most max_tokens.
     Uses the model's own tokenizer to count and truncate accurately."""
     if max_tokens <= 0:
-        max_tokens = _MODEL_TOKEN_LIMIT - 2  # room for special tokens
+        max_tokens = _model_token_limit() - 2  # room for special tokens
     t = (text or "").strip()
     if not t:
         return t
     try:
-        tok = model.tokenizer
+        tok = get_model().tokenizer
         ids = tok.encode(t, add_special_tokens=False, truncation=False)
         if len(ids) <= max_tokens:
             return t
@@ -87,15 +120,43 @@ def _truncate_to_token_limit(text:str, max_tokens:int=0)->str:
 def _safe_encode(text:str):
     """Encode text with guaranteed truncation to prevent tensor mismatch."""
     truncated = _truncate_to_token_limit(text)
-    return model.encode(truncated, convert_to_tensor=True, normalize_embeddings=True)
+    return get_model().encode(truncated, convert_to_tensor=True, normalize_embeddings=True)
+
+def _truncate_batch_to_token_limit(texts, max_tokens:int=0):
+    """Batch version of _truncate_to_token_limit: one tokenizer call for all texts."""
+    if max_tokens <= 0:
+        max_tokens = _model_token_limit() - 2
+    stripped=[(t or "").strip() for t in texts]
+    try:
+        tok = get_model().tokenizer
+        ids = tok(stripped, add_special_tokens=False, truncation=False)["input_ids"]
+        long_idx=[k for k,x in enumerate(ids) if len(x)>max_tokens]
+        if long_idx:
+            decoded=tok.batch_decode([ids[k][:max_tokens] for k in long_idx], skip_special_tokens=True)
+            for k,d in zip(long_idx,decoded): stripped[k]=d
+        return stripped
+    except Exception:
+        return [t[:max_tokens * 2] for t in stripped]
 
 def score_insight_semantic(text:str)->float:
     try:
-        sim=util.cos_sim(_safe_encode(text), EXEMPLAR_EMBEDDINGS).max().item()
+        from sentence_transformers import util
+        sim=util.cos_sim(_safe_encode(text), get_exemplar_embeddings()).max().item()
         return round(sim*100,2)
     except Exception:
         return 0.0
 
+def score_semantic_batch(texts, batch_size:int=64):
+    """score_insight_semantic for many texts: batched encode + one similarity matrix product."""
+    if not texts: return []
+    try:
+        from sentence_transformers import util
+        emb=get_model().encode(_truncate_batch_to_token_limit(texts), batch_size=batch_size, convert_to_tensor=True, normalize_embeddings=True)
+        sims=util.cos_sim(emb, get_exemplar_embeddings()).max(dim=1).values
+        return [round(s*100,2) for s in sims.tolist()]
+    except Exception:
+        return [score_insight_semantic(t) for t in texts]
+
 def score_insight_heuristic(text:str)->int:
     lowered=text.lower()
     return sum(v for k,v in HEURISTIC_KEYWORDS.items() if k in lowered)
@@ -163,15 +224,20 @@ def _apply_liquidity_flags(i:dict)->dict:
     i["type_subtag"]=i["type_subtags"][0]
     return i
 
-def enrich_single_insight(i:dict, min_score:float=3):
+def enrich_single_insight(i:dict, min_score:float=3, semantic:float=None, sentiment:dict=None):
+    from components.enhanced_classifier import enhance_insight
+    from components.ai_suggester import generate_pm_ideas
+    from components.gpt_classifier import enrich_with_gpt_tags
+    from components.scoring_utils import gpt_estimate_sentiment_subtag
+
     text=i.get("text","") or ""
     if len(text.strip())<10: return None
 
-    semantic=score_insight_semantic(text)
+    if semantic is None: semantic=score_insight_semantic(text)
     heuristic=score_insight_heuristic(text)
     gpt=gpt_estimate_sentiment_subtag(text)
 
-    i=enhance_insight(i)      # sentiment, subtags, severity, pm_priority, brand, etc.
+    i=enhance_insight(i, sentiment=sentiment)      # sentiment, subtags, severity, pm_priority, brand, etc.
     i=enrich_with_gpt_tags(i)
 
     i["semantic_score"]=semantic
@@ -186,7 +252,7 @@ def enrich_single_insight(i:dict, min_score:float=3):
 
     i["persona"]=i.get("persona") or "General"
     try:
-        i["ideas"]=generate_pm_ideas(text=_truncate_to_token_limit(text, 200), brand=i.get("target_brand"))
+        i["ideas"]=generate_pm_ideas(text=_truncate_to_token_limit(text, 200), brand=i.get("target_brand"), lane="batch")
     except (Exception, KeyboardInterrupt) as _pm_err:
         i["ideas"]=[]
     i["effort"]=classify_effort(i["ideas"])
@@ -215,11 +281,52 @@ def enrich_single_insight(i:dict, min_score:float=3):
 
     i["cluster_ready_score"]=calculate_cluster_ready_score(i["score"], i["frustration"], i["impact"])
     i["fingerprint"]=hashlib.md5(text.lower().encode()).hexdigest()
-    return i if i["score"]>=min_score else None
+    if i["score"]<min_score: return None
+    from components.workstream_routing import annotate_workstream
+    annotate_workstream(i)
+    return i
+
+def _prefetch_gpt(texts):
+    """Issue the per-insight GPT calls (sentiment + PM ideas) concurrently on the shared LLM
+    scheduler, so enrich_single_insight finds them in the LLM cache instead of waiting on each."""
+    from components.scoring_utils import gpt_estimate_sentiment_subtag, _get_client
+    if not texts or _get_client() is None: return
+    from components.ai_suggester import generate_pm_ideas
+    from components.brand_recognizer import recognize_brand
+    from components.llm_scheduler import get_scheduler
+
+    scheduler=get_scheduler()
+    futures=[scheduler.run(gpt_estimate_sentiment_subtag, t) for t in texts]
+    for t,short in zip(texts, _truncate_batch_to_token_limit(texts, 200)):
+        futures.append(scheduler.run(generate_pm_ideas, text=short, brand=recognize_brand(t.lower()), lane="batch"))
+    for f in futures:
+        try: f.result()
+        except Exception: pass  # enrich_single_insight retries inline
+
+def enrich_insights_batch(insights, min_score:float=3, batch_size:int=64, on_error=None):
+    """enrich_single_insight over a list, with semantic scores computed in batches.
+    Returns one result (or None) per input. If on_error is given, per-insight
+    exceptions are passed to on_error(index, exc) instead of raised."""
+    insights=list(insights or [])
+    todo=[k for k,i in enumerate(insights) if len((i.get("text","") or "").strip())>=10]
+    texts=[insights[k].get("text","") or "" for k in todo]
+    semantic=dict(zip(todo, score_semantic_batch(texts, batch_size=batch_size)))
+    from components.enhanced_classifier import USE_LIGHT_MODEL, classify_sentiment_many
+    sentiment={}
+    if USE_LIGHT_MODEL:
+        # {} marks a text the model failed on, so enhance_insight leaves its sentiment unset
+        sentiment={k:(s or {}) for k,s in zip(todo, classify_sentiment_many([t.lower() for t in texts]))}
+        failed=sum(1 for s in sentiment.values() if not s)
+        if failed: print(f"[SENTIMENT] {failed}/{len(todo)} texts could not be classified — brand_sentiment left unset")
+    _prefetch_gpt(texts)
+    out=[None]*len(insights)
+    for k in todo:
+        try:
+            out[k]=enrich_single_insight(insights[k], min_score, semantic=semantic[k], sentiment=sentiment.get(k))
+        except Exception as e:
+            if on_error is None: raise
+            on_error(k, e)
+    return out
 
 def filter_relevant_insights(insights, min_score:float=3):
-    enriched=[]
-    for it in insights or []:
-        x=enrich_single_insight(it, min_score)
-        if x: enriched.append(x)
-    return enriched
+    return [x for x in enrich_insights_batch(insights, min_score) if x]
@@ -0,0 +1,650 @@
+# workstream_routing.py — Workstream routing + topicality tables, precomputed onto insights
+#
+# Clustering routes every insight to an exec workstream (get_signal_category) and quote
+# selection tests each item's topicality per workstream with \b-bounded keyword searches.
+# Both used to rescan the text on every clustering run / render. Instead:
+#   1. annotate_workstream(insight) runs once during enrichment and stores `_routing`:
+#        category    — get_signal_category() result
+#        topical     — bitmask over WORKSTREAMS of is_topical_for_workstream()
+#        kw_topical  — bitmask of "has a \b-bounded workstream keyword" (quote picking)
+#        kw_offsets  — per workstream, offset of its first keyword in snippet_text() or -1
+#        v / sig     — ROUTING_VERSION (hash of the keyword tables) and a hash of the
+#                      fields routing reads, so stale records can be detected
+#   2. annotate_workstreams(insights) revalidates a whole pass at once (clustering and card
+#      synthesis call it on entry) and recomputes only the stale records
+#   3. Readers (workstream_category, is_topical, is_keyword_topical, keyword_offset) index the
+#      stored record directly, annotating only when it is missing
+#
+# Kept free of OpenAI / model imports so enrichment scripts can call it cheaply.
+#
+# Usage:
+#   annotate_workstream(insight)                      # during enrichment
+#   annotate_workstreams(cluster)                     # once per clustering pass
+#   workstream_category(insight)                      # clustering
+#   is_topical(insight, "Vault & Storage Trust")      # quote selection
+
+import re
+import json
+import hashlib
+from typing import Any, Dict, List
+
+from components.keyword_matcher import register_groups, match_insight
+
+# Bump when get_signal_category / topicality logic changes (tables are hashed automatically)
+_ROUTING_LOGIC = 1
+
+
+WORKSTREAM_KEYWORDS = {
+    "Vault & Storage Trust": ["ebay vault", "psa vault", "vault withdraw", "vault transfer", "vaulted", "vaulting", "vault storage", "vault fee", "vault program"],
+    "Authentication & Grading Confidence": ["grading", "graded", "authentication", "authenticity", "counterfeit", "fake", "psa", "bgs", "sgc", "cgc", "misgrade"],
+    "Competitive Positioning": ["whatnot app", "whatnot live", "whatnot seller", "whatnot vs", "selling on whatnot", "fanatics", "heritage auction", "heritage auctions", "vinted", "beckett", "competitor", "switched to", "leaving ebay", "moving to whatnot", "whatnot breaks"],
+    "Seller Economics & Fees": ["fee", "fees", "final value", "fvf", "take rate", "commission", "seller fee", "insertion fee", "promoted listing cost"],
+    "Payment & Checkout Friction": ["checkout", "payment method", "payment failed", "wire transfer", "managed payments", "payout", "payouts", "funds held", "payment hold", "can't pay", "unpaid item", "payment processing"],
+    "Customer Service & Support": ["customer service", "customer support", "support team", "chat bot", "ai bot", "can't reach", "call center", "live agent", "support ticket", "ebay support"],
+    "Shipping & Fulfillment": ["shipping", "delivery", "tracking", "lost package", "damaged", "return", "returns", "refund", "inad", "standard envelope", "usps", "ups", "fedex"],
+    "Pricing & Valuation Tools": ["price guide", "card ladder", "scan to price", "market value", "worth", "value", "comps"],
+    "Live Commerce & Breaks": ["live break", "case break", "box break", "live stream", "ebay live", "whatnot live"],
+    "Instant Liquidity & Buyback": ["instant offer", "buyback", "buy back", "cash out", "sell now", "psa offers", "courtyard", "arena club"],
+    "Subsidiary Ecosystem": ["goldin", "tcgplayer", "tcg player", "tcg"],
+    "Trust & Safety": ["scam", "fraud", "stolen", "chargeback", "buyer abuse", "seller protection"],
+    "Search & Discovery": ["search", "best match", "visibility", "promoted listing", "no views", "not showing up", "filter", "recommend"],
+    "Seller Tools & App Experience": ["seller hub", "app crash", "app bug", "listing tool", "bulk listing", "mobile app"],
+}
+
+WORKSTREAM_TOPIC_TAGS = {
+    "Vault & Storage Trust": ["vault", "vault friction"],
+    "Authentication & Grading Confidence": ["trust issue", "counterfeit concern", "grading complaint"],
+    "Competitive Positioning": ["competitive churn"],
+    "Seller Economics & Fees": ["fees/pricing", "fee frustration", "upi"],
+    "Payment & Checkout Friction": ["payments", "payouts/holds"],
+    "Shipping & Fulfillment": ["shipping concern", "tracking confusion", "returns/policy"],
+    "Pricing & Valuation Tools": ["price guide"],
+    "Live Commerce & Breaks": ["live shopping", "case break / repack"],
+    "Instant Liquidity & Buyback": ["instant offers / liquidity", "instant offers"],
+    "Search & Discovery": ["search/relevancy"],
+    "Trust & Safety": ["fraud concern"],
+    "Subsidiary Ecosystem": ["consignment/auctions"],
+}
+
+WORKSTREAM_FLAG_FIELDS = {
+    "Vault & Storage Trust": ["is_vault_signal"],
+    "Authentication & Grading Confidence": ["is_ag_signal", "is_psa_turnaround"],
+    "Seller Economics & Fees": ["is_fees_concern", "_upi_flag"],
+    "Payment & Checkout Friction": ["_payment_issue"],
+    "Shipping & Fulfillment": ["is_shipping_issue", "is_refund_issue"],
+    "Pricing & Valuation Tools": ["is_price_guide_signal"],
+    "Instant Liquidity & Buyback": ["_liquidity_signal"],
+}
+
+
+def keyword_in_text(text, keyword):
+    """Match keywords as whole words where possible to avoid false positives (e.g., 'fee' in 'feedback')."""
+    if not keyword:
+        return False
+    if any(ch in keyword for ch in ["/", "-"]):
+        return keyword in text
+    if " " in keyword:
+        return re.search(r"\b" + re.escape(keyword) + r"\b", text) is not None
+    return re.search(r"\b" + re.escape(keyword) + r"\b", text) is not None
+
+
+def is_topical_for_workstream(item, workstream_name, text=None):
+    ws_keywords = WORKSTREAM_KEYWORDS.get(workstream_name, [])
+    ws_topics = WORKSTREAM_TOPIC_TAGS.get(workstream_name, [])
+    ws_flags = WORKSTREAM_FLAG_FIELDS.get(workstream_name, [])
+
+    if text is None:
+        text = (item.get("text", "") + " " + item.get("title", "")).lower()
+    if ws_keywords and has_workstream_keyword(text, workstream_name):
+        if workstream_name == "Vault & Storage Trust":
+            if not any(ctx in text for ctx in ["psa", "ebay", "card", "graded", "grading", "storage", "consignment"]):
+                return False
+        if workstream_name == "Competitive Positioning":
+            # Require marketplace/collectibles context to filter out casual uses of competitor names
+            if not any(ctx in text for ctx in ["ebay", "sell", "buy", "card", "collectible", "auction", "marketplace", "platform", "fee", "shipping", "grading", "listing", "seller", "buyer"]):
+                return False
+        return True
+
+    if ws_topics:
+        item_topics = [t.lower() for t in (item.get("topic_focus") or item.get("topic_focus_list") or [])]
+        if any(t in item_topics for t in ws_topics):
+            return True
+
+    if ws_flags and any(item.get(flag) for flag in ws_flags):
+        return True
+
+    if workstream_name == "Competitive Positioning" and item.get("mentions_competitor"):
+        return True
+
+    if workstream_name == "Subsidiary Ecosystem":
+        comps = [c.lower() for c in (item.get("mentions_competitor") or [])]
+        if any(c in ("tcgplayer", "goldin") for c in comps):
+            return True
+        source = (item.get("source", "") or "").lower()
+        if "tcgplayer" in source or "goldin" in source:
+            return True
+
+    if not (ws_keywords or ws_topics or ws_flags):
+        return True
+
+    return False
+
+
+# ── Workstream routing phrase lists ──
+# All compiled into the shared keyword matcher (one pass per insight, memoized by
+# fingerprint) — _get_signal_category tests them with m.any("cluster.<name>").
+_ROUTING_PHRASES = {
+    # Seller self-promo, platform marketing, giveaway ads are NOT customer feedback
+    "promo": [
+        "we are live on", "we're live on", "going live on", "live right now",
+        "come join the show", "join the show", "join us live",
+        "free giveaway", "giveaway every", "giving away",
+        "use code ", "use my link", "use this link", "sign up for",
+        "check out my", "follow me on", "subscribe to",
+        "auctioning vintage cards of stars",
+        "register your interest",
+        "and we are live:",
+        "beauty is winning on whatnot",
+        # PSA memes (Public Service Announcement, not grading)
+        "psa, your human", "psa: your human", "psa, if exposed",
+        "psa: do not use the seed vault", "psa do not use the seed vault",
+    ],
+    # Gaming, general tech, and other irrelevant content for eBay Collectibles
+    "exclude": [
+        # Gaming terms
+        "psa:", "public service announcement", "psa do not", "psa warning", "psa alert",
+        "seed vault", "stella montis", "run", "lost", "die to this", "game", "gaming", "video game",
+        "minecraft", "fortnite", "call of duty", "playstation", "xbox", "nintendo",
+        # General tech/non-collectibles
+        "software", "programming", "coding", "app development", "website", "tech support",
+        # Non-collectibles hobbies
+        "cooking", "fitness", "travel", "movies", "music"
+    ],
+    # Collectibles-related terms (allow even if exclude keywords are present)
+    "collectibles": [
+        "card", "cards", "trading card", "sports card", "pokemon", "magic", "yugioh",
+        "collectible", "collectibles", "graded", "slab", "psa grading", "bgs", "sgc",
+        "autograph", "memorabilia", "comic", "coin", "stamp", "ebay", "whatnot", "fanatics",
+        "auction", "auctions", "seller", "buyer", "listing", "sale", "purchase"
+    ],
+    # Cross-cutting concern flags (override domain routing when they are the PRIMARY complaint)
+    "payment_primary": [
+        "checkout", "payment method", "payment failed", "failed payment",
+        "can't pay", "won't accept", "wire transfer", "managed payments",
+        "payout delay", "funds held", "payment hold", "checkout error",
+        "payment issue", "unpaid item", "buyer didn't pay", "payment problem",
+        "payment not going", "payment processing", "can't complete purchase",
+    ],
+    "cs_primary": [
+        "customer service", "customer support", "support team", "chat bot",
+        "ai bot", "can't reach", "no response", "call center", "help desk",
+        "live agent", "talk to a human", "automated response", "support ticket",
+        "ebay support", "contact ebay", "get ahold of", "get a hold of",
+    ],
+    "vault": [
+        "ebay vault", "psa vault", "vault withdraw", "vault transfer",
+        "vault storage", "vaulted card", "vaulted item", "vault fee",
+        "my vault", "the vault", "in the vault", "from the vault",
+        "vault program", "vault review", "vault trust", "vault ship",
+    ],
+    "grading_terms": ["psa grading", "psa card", "psa slab", "psa authenticated", "psa 10", "psa 9", "psa 8", "bgs", "sgc", "cgc"],
+    "psa_announcement": ["psa:", "public service announcement", "psa do not", "psa warning", "psa alert"],
+    "competitors": ["whatnot", "fanatics", "heritage auction", "vinted", "beckett", "stockx"],
+    "churn": ["switched to", "leaving ebay", "moving to"],
+    "fees": [
+        "fee", "fees", "final value", "fvf", "take rate", "commission",
+        "promoted listing cost", "seller fee", "insertion fee",
+    ],
+    "payment_friction": [
+        "checkout", "payment method", "payment failed", "failed payment",
+        "can't pay", "won't accept", "wire transfer", "managed payments",
+        "payout", "payouts", "payout delay", "funds held", "payment hold",
+        "payment not going", "checkout error", "payment issue",
+        "unpaid item", "buyer didn't pay", "didn't pay",
+        "payment processing", "payment problem",
+    ],
+    "fraud_scam": ["scam", "fraud", "fake", "counterfeit", "stolen", "chargeback"],
+    "shipping": [
+        "shipping", "tracking", "lost package", "damaged in transit",
+        "standard envelope", "return", "refund", "inad",
+    ],
+    "pricing_tools": [
+        "price guide", "card ladder", "scan to price", "market value",
+        "what is it worth", "comps", "card value",
+    ],
+    "live_commerce": [
+        "live break", "case break", "box break", "live shopping",
+        "ebay live", "live stream", "card break",
+    ],
+    "liquidity": [
+        "instant offer", "buyback", "cash out", "sell now",
+        "psa offers", "courtyard", "arena club",
+    ],
+    "subsidiaries": ["goldin", "tcgplayer", "tcg player"],
+    "consignment_houses": ["goldin", "heritage"],
+    "trust_safety": [
+        "scam", "fraud", "buyer abuse", "seller protection",
+        "chargeback", "fake buyer", "stolen",
+    ],
+    "customer_service": [
+        "customer service", "customer support", "support team",
+        "chat bot", "ai bot", "can't reach", "no response",
+        "call center", "help desk", "live agent", "talk to a human",
+        "automated response", "support ticket", "ebay support",
+    ],
+    "search": [
+        "search", "best match", "cassini", "no views", "visibility",
+        "not showing up", "promoted listing",
+    ],
+    "seller_tools": [
+        "seller hub", "app crash", "app bug", "listing tool",
+        "mobile app", "app update", "app glitch",
+    ],
+    "payment_fraud": ["scam", "fraud", "fake", "stolen"],
+    "gaming": [
+        "psa:", "public service announcement", "psa do not", "psa warning", "psa alert",
+        "seed vault", "stella montis", "die to this",
+    ],
+    "collector": [
+        "collection", "collecting", "collector", "hobby", "mail day", "pickup",
+        "pulled", "just pulled", "rip", "box break", "hit", "chase",
+        "set build", "rainbow", "master set", "parallel", "insert",
+        "lcs", "card show", "card shop", "local card",
+    ],
+    "buyer": [
+        "buyer", "purchased", "buying", "won auction", "best offer",
+        "shopping", "bid", "bidding", "snipe", "outbid", "won the auction",
+        "just bought", "order", "tracking", "delivery",
+        "buyer protection", "money back guarantee",
+    ],
+    "seller_side": ["seller", "selling", "listed", "listing"],
+    "listing": [
+        "listing", "description", "photo", "title", "category",
+        "condition", "item specifics", "catalog", "stock photo",
+        "duplicate listing", "relisted", "ended listing",
+    ],
+    "tech": [
+        "app", "bug", "glitch", "crash", "error", "broken",
+        "update", "not working", "doesn't work", "won't load",
+        "page error", "blank page", "slow", "frozen",
+        "notification", "email", "alert",
+    ],
+    "market": [
+        "price", "pricing", "market", "value", "invest",
+        "undervalued", "overpriced", "comp", "sold for",
+        "going for", "worth", "trend", "bubble", "crash",
+        "flip", "profit", "roi",
+    ],
+    "account": [
+        "suspended", "restricted", "banned", "account",
+        "locked out", "deactivated", "policy", "terms of service",
+        "violation", "appeal", "reinstate",
+    ],
+}
+register_groups({f"cluster.{name}": phrases for name, phrases in _ROUTING_PHRASES.items()})
+
+
+def get_signal_category(insight):
+    """Map each insight to an exec-actionable workstream.
+    
+    These are designed as workstreams an eBay Collectibles VP would assign
+    to a PM or team lead — each one is a deliverable initiative, not a
+    generic topic bucket.
+    
+    FILTER: Only include eBay Collectibles-relevant content. Exclude gaming, general content, etc.
+    """
+    text = (insight.get("text", "") + " " + insight.get("title", "")).lower()
+    m = match_insight(insight, text)  # every _ROUTING_PHRASES list, one memoized pass
+    subtag = (insight.get("type_subtag") or insight.get("subtag") or "").lower()
+    topics = [t.lower() for t in (insight.get("topic_focus") or insight.get("topic_focus_list") or [])]
+    competitors = [c.lower() for c in (insight.get("mentions_competitor") or [])]
+    partners = [p.lower() for p in (insight.get("mentions_ecosystem_partner") or [])]
+
+    # ── FILTER OUT PROMOTIONAL / MARKETING CONTENT ──
+    # Seller self-promo, platform marketing, giveaway ads are NOT customer feedback
+    if m.any("cluster.promo"):
+        return "EXCLUDE_NON_COLLECTIBLES"
+
+    # ── FILTER OUT NON-COLLECTIBLES CONTENT ──
+    # Exclude gaming, general tech, and other irrelevant content for eBay Collectibles,
+    # but allow it if it contains collectibles-related terms
+    _has_exclude = m.any("cluster.exclude")
+    _has_collectibles = m.any("cluster.collectibles")
+    
+    # Filter out if has exclude keywords but no collectibles context
+    if _has_exclude and not _has_collectibles:
+        return "EXCLUDE_NON_COLLECTIBLES"
+
+    # ── Pre-compute cross-cutting concern flags ──
+    # These override domain routing when they are the PRIMARY complaint
+    _payment_primary = m.any("cluster.payment_primary")
+    _cs_primary = m.any("cluster.cs_primary")
+
+    # ── 1. Vault & Storage Trust ──
+    # Owner: Vault PM. Covers: PSA Vault, eBay Vault, withdrawal, transfer, vaulting UX
+    if (insight.get("is_vault_signal") or
+        m.any("cluster.vault") or
+        any(t in topics for t in ["vault", "vault friction"])):
+        # Override: if the primary complaint is about checkout/payment friction WITH vault
+        if _payment_primary:
+            return "Payment & Checkout Friction"
+        if _cs_primary:
+            return "Customer Service & Support"
+        return "Vault & Storage Trust"
+
+    # ── 2. Authentication & Grading Confidence ──
+    # Owner: AG PM. Covers: Authenticity Guarantee, grading disputes, PSA/BGS turnaround, counterfeit
+    if (insight.get("is_ag_signal") or insight.get("is_psa_turnaround") or
+        "authenticity guarantee" in text or "authentication" in text or
+        ("grading" in text and m.any("cluster.grading_terms") and 
+         not m.any("cluster.psa_announcement")) or
+        "counterfeit" in text or "fake card" in text or
+        any(t in topics for t in ["trust issue", "counterfeit concern", "grading complaint"])):
+        # Override: if the primary complaint is about customer service around grading
+        if _cs_primary:
+            return "Customer Service & Support"
+        return "Authentication & Grading Confidence"
+
+    # ── 3. Competitive Positioning ──
+    # Owner: Strategy. Covers: Whatnot, Fanatics, Heritage, Vinted, Beckett, competitive churn
+    if (competitors or
+        m.any("cluster.competitors") or
+        any(t in topics for t in ["competitive churn"]) or
+        m.any("cluster.churn")):
+        # Override: if primary complaint is payment friction or customer service on a competitor
+        if _payment_primary:
+            return "Payment & Checkout Friction"
+        if _cs_primary:
+            return "Customer Service & Support"
+        return "Competitive Positioning"
+
+    # ── 4. Seller Economics & Fees ──
+    # Owner: Seller Experience PM. Covers: fees, take rate, promoted listings cost, commission structures
+    if (insight.get("is_fees_concern") or insight.get("_upi_flag") or
+        any(t in topics for t in ["fees/pricing", "fee frustration", "upi"]) or
+        m.any("cluster.fees")):
+        if _cs_primary:
+            return "Customer Service & Support"
+        return "Seller Economics & Fees"
+
+    # ── 4b. Payment & Checkout Friction ──
+    # Owner: Payments PM. Covers: checkout errors, payment method issues, wire transfer,
+    # managed payments setup, payout delays, funds held, buyer can't pay, seller can't get paid
+    _has_payment_text = m.any("cluster.payment_friction")
+    _has_fraud_text = m.any("cluster.fraud_scam")
+    
+    if _has_payment_text and not _has_fraud_text:
+        return "Payment & Checkout Friction"
+    if (insight.get("_payment_issue") or any(t in topics for t in ["payments", "payouts/holds"])):
+        if _has_fraud_text:
+            pass  # Let fall through to Trust & Safety
+        else:
+            return "Payment & Checkout Friction"
+
+    # ── 5. Shipping & Fulfillment ──
+    # Owner: Shipping PM. Covers: shipping damage, tracking, standard envelope, international shipping, returns logistics
+    if (insight.get("is_shipping_issue") or insight.get("is_refund_issue") or
+        any(t in topics for t in ["shipping concern", "tracking confusion", "returns/policy"]) or
+        m.any("cluster.shipping")):
+        if _cs_primary:
+            return "Customer Service & Support"
+        return "Shipping & Fulfillment"
+
+    # ── 6. Pricing & Valuation Tools ──
+    # Owner: Price Guide PM. Covers: Price Guide, Card Ladder, scan to price, comps, market value
+    if (insight.get("is_price_guide_signal") or
+        any(t in topics for t in ["price guide"]) or
+        m.any("cluster.pricing_tools")):
+        return "Pricing & Valuation Tools"
+
+    # ── 7. Live Commerce & Breaks ──
+    # Owner: eBay Live PM. Covers: live breaks, case breaks, streaming, eBay Live
+    if (any(t in topics for t in ["live shopping", "case break / repack"]) or
+        m.any("cluster.live_commerce")):
+        return "Live Commerce & Breaks"
+
+    # ── 8. Instant Liquidity & Buyback ──
+    # Owner: Marketplace Innovation PM. Covers: instant offers, buyback, PSA Offers, Courtyard, cash out
+    if (insight.get("_liquidity_signal") or
+        any(t in topics for t in ["instant offers / liquidity", "instant offers"]) or
+        m.any("cluster.liquidity")):
+        return "Instant Liquidity & Buyback"
+
+    # ── 9. Subsidiary Ecosystem (Goldin & TCGPlayer) ──
+    # Owner: Subsidiary Integration PM. Covers: Goldin, TCGPlayer, cross-platform synergy
+    if (m.any("cluster.subsidiaries") or
+        any(t in topics for t in ["consignment/auctions"]) and m.any("cluster.consignment_houses")):
+        return "Subsidiary Ecosystem"
+
+    # ── 10. Trust & Safety ──
+    # Owner: Trust & Safety. Covers: scams, fraud, seller protection, buyer abuse, INAD abuse
+    if (any(t in topics for t in ["fraud concern"]) or
+        m.any("cluster.trust_safety")):
+        return "Trust & Safety"
+
+    # ── 11. Customer Service & Support ──
+    # Owner: CX PM. Covers: AI bot complaints, can't reach human, chat support, phone support
+    if m.any("cluster.customer_service"):
+        return "Customer Service & Support"
+
+    # ── 12. Search & Discovery ──
+    # Owner: Search PM. Covers: search relevancy, Best Match, visibility, promoted listings effectiveness
+    if (any(t in topics for t in ["search/relevancy"]) or
+        m.any("cluster.search")):
+        return "Search & Discovery"
+
+    # ── 13. Seller Tools & App Experience ──
+    # Owner: Seller Hub PM. Covers: Seller Hub, app bugs, listing tools, mobile experience
+    if m.any("cluster.seller_tools"):
+        return "Seller Tools & App Experience"
+
+    # ── Route remaining subtag-tagged posts to appropriate workstreams ──
+    if subtag in ("grading complaint", "speed issue", "trust issue", "counterfeit concern"):
+        return "Authentication & Grading Confidence"
+    if subtag in ("delays", "tracking confusion", "refund issue", "shipping concern"):
+        return "Shipping & Fulfillment"
+    if subtag in ("fee frustration",):
+        return "Seller Economics & Fees"
+    if subtag in ("fraud concern",):
+        return "Trust & Safety"
+    if subtag in ("payments",) and m.any("cluster.payment_fraud"):
+        return "Trust & Safety"
+
+    # ── Filter out gaming content (PSA = Public Service Announcement in gaming) ──
+    if m.any("cluster.gaming") and "grading" not in text and "card" not in text:
+        return "EXCLUDE_NON_COLLECTIBLES"
+
+    # ── NEW WORKSTREAMS — break up the General catch-all ──
+
+    # ── 16. Collector Community & Hobby Health ──
+    # Owner: Community PM. Covers: collecting culture, hobby sentiment, mail day, pulls, set building
+    if m.any("cluster.collector"):
+        return "Collector Community & Hobby"
+
+    # ── 17. Buyer Experience & Purchase Flow ──
+    # Owner: Buyer Experience PM. Covers: buying friction, offer flow, bidding, purchase issues
+    if (m.any("cluster.buyer") and
+        not m.any("cluster.seller_side")):
+        return "Buyer Experience & Purchase Flow"
+
+    # ── 18. Listing & Catalog Quality ──
+    # Owner: Catalog PM. Covers: listing descriptions, photos, category accuracy, item specifics
+    if m.any("cluster.listing"):
+        return "Listing & Catalog Quality"
+
+    # ── 19. App & Platform Technical Issues ──
+    # Owner: Platform Engineering. Covers: app bugs, crashes, errors, UX issues
+    if m.any("cluster.tech"):
+        return "App & Platform Technical"
+
+    # ── 20. Market Intelligence & Pricing Trends ──
+    # Owner: Market Strategy. Covers: price trends, market shifts, investment signals, valuations
+    if m.any("cluster.market"):
+        return "Market Intelligence & Pricing"
+
+    # ── 21. Account & Policy Issues ──
+    # Owner: Trust & Policy PM. Covers: suspensions, restrictions, policy confusion
+    if m.any("cluster.account"):
+        return "Account & Policy Issues"
+
+    # ── Route by taxonomy topic for remaining signals ──
+    _tax_topic = ((insight.get("taxonomy") or {}).get("topic") or insight.get("subtag") or "").lower()
+
+    if _tax_topic == "trust":
+        return "Trust & Safety"
+    if _tax_topic in ("comc",):
+        return "Subsidiary Ecosystem"
+    if _tax_topic in ("heritage auctions",):
+        return "Competitive Positioning"
+    if _tax_topic in ("goldin",):
+        return "Subsidiary Ecosystem"
+    if _tax_topic in ("competitor intel",):
+        return "Competitive Positioning"
+
+    # ── Route Trustpilot reviews to their respective workstreams ──
+    _source = (insight.get("source") or "").lower()
+    if "trustpilot" in _source:
+        if "whatnot" in _source or "heritage" in _source or "fanatics" in _source:
+            return "Competitive Positioning"
+        if "goldin" in _source or "tcgplayer" in _source:
+            return "Subsidiary Ecosystem"
+        return "Customer Service & Support"  # Trustpilot:eBay → CX signal
+
+    return "General Platform Feedback"
+
+
+# ---------------------------------------------------------------------------
+# Precomputed routing record
+# ---------------------------------------------------------------------------
+
+# Workstreams with topicality rules, in bitmask order
+WORKSTREAMS: List[str] = list(dict.fromkeys([*WORKSTREAM_KEYWORDS, *WORKSTREAM_TOPIC_TAGS, *WORKSTREAM_FLAG_FIELDS]))
+_WS_INDEX = {ws: k for k, ws in enumerate(WORKSTREAMS)}
+
+ROUTING_VERSION = hashlib.md5(json.dumps(
+    [_ROUTING_LOGIC, _ROUTING_PHRASES, WORKSTREAM_KEYWORDS, WORKSTREAM_TOPIC_TAGS, WORKSTREAM_FLAG_FIELDS, WORKSTREAMS],
+    sort_keys=True,
+).encode()).hexdigest()[:12]
+
+# Non-text fields get_signal_category / is_topical_for_workstream read
+_SIGNATURE_FIELDS = (
+    "type_subtag", "subtag", "topic_focus", "topic_focus_list", "mentions_competitor", "source", "taxonomy",
+    "is_vault_signal", "is_ag_signal", "is_psa_turnaround", "is_fees_concern", "_upi_flag", "_payment_issue",
+    "is_shipping_issue", "is_refund_issue", "is_price_guide_signal", "_liquidity_signal",
+)
+
+
+def _keyword_regex(keywords: List[str]):
+    """One compiled \\b(?:kw1|kw2|...)\\b — equivalent to any(keyword_in_text(...)) for plain keywords."""
+    bounded = [re.escape(k) for k in keywords if k and not any(ch in k for ch in ["/", "-"])]
+    return re.compile(r"\b(?:" + "|".join(bounded) + r")\b") if bounded else None
+
+
+_WS_KEYWORD_RE = {ws: _keyword_regex(kws) for ws, kws in WORKSTREAM_KEYWORDS.items()}
+_WS_PLAIN_KEYWORDS = {
+    ws: [k for k in kws if k and any(ch in k for ch in ["/", "-"])] for ws, kws in WORKSTREAM_KEYWORDS.items()
+}
+
+
+def has_workstream_keyword(text: str, workstream_name: str) -> bool:
+    """any(keyword_in_text(text, kw) for kw in WORKSTREAM_KEYWORDS[workstream_name]), one regex search."""
+    pattern = _WS_KEYWORD_RE.get(workstream_name)
+    if pattern is not None and pattern.search(text):
+        return True
+    return any(k in text for k in _WS_PLAIN_KEYWORDS.get(workstream_name, ()))
+
+
+def snippet_text(item: Dict[str, Any]) -> str:
+    """Title + body as shown in cluster quotes (offsets in kw_offsets index into this)."""
+    title = (item.get("title", "") or "").strip()
+    body = (item.get("text", "") or "").strip()
+    return (title + ". " + body).strip(". ") if title else body
+
+
+def _first_keyword_offset(text_lower: str, keywords: List[str]) -> int:
+    for kw in keywords:
+        idx = text_lower.find(kw)
+        if idx != -1:
+            return idx
+    return -1
+
+
+def _routing_signature(insight: Dict[str, Any]) -> str:
+    h = hashlib.md5()
+    h.update((insight.get("text") or "").encode("utf-8", "ignore"))
+    h.update(b"\0")
+    h.update((insight.get("title") or "").encode("utf-8", "ignore"))
+    h.update(json.dumps([insight.get(f) for f in _SIGNATURE_FIELDS], sort_keys=True, default=str).encode())
+    return h.hexdigest()[:12]
+
+
+def annotate_workstream(insight: Dict[str, Any], force: bool = False) -> Dict[str, Any]:
+    """Compute (or reuse) the insight's `_routing` record and store it on the insight."""
+    sig = _routing_signature(insight)
+    record = insight.get("_routing")
+    if not force and isinstance(record, dict) and record.get("v") == ROUTING_VERSION and record.get("sig") == sig:
+        return record
+
+    text = (insight.get("text", "") + " " + insight.get("title", "")).lower()
+    quote_lower = snippet_text(insight).lower()
+    topical = kw_topical = 0
+    offsets = []
+    for k, ws in enumerate(WORKSTREAMS):
+        if is_topical_for_workstream(insight, ws, text=text):
+            topical |= 1 << k
+        if has_workstream_keyword(text, ws):
+            kw_topical |= 1 << k
+        offsets.append(_first_keyword_offset(quote_lower, WORKSTREAM_KEYWORDS.get(ws, [])))
+
+    record = {
+        "v": ROUTING_VERSION,
+        "sig": sig,
+        "category": get_signal_category(insight),
+        "topical": topical,
+        "kw_topical": kw_topical,
+        "kw_offsets": offsets,
+    }
+    insight["_routing"] = record
+    return record
+
+
+def annotate_workstreams(insights: List[Dict[str, Any]]) -> int:
+    """annotate_workstream over a list; returns how many records were (re)computed."""
+    changed = 0
+    for i in insights:
+        before = i.get("_routing")
+        if annotate_workstream(i) is not before:
+            changed += 1
+    return changed
+
+
+def _record(insight: Dict[str, Any]) -> Dict[str, Any]:
+    # Not revalidated here: the signature costs more than most reads it would save
+    return insight.get("_routing") or annotate_workstream(insight)
+
+
+def workstream_category(insight: Dict[str, Any]) -> str:
+    return _record(insight)["category"]
+
+
+def is_topical(insight: Dict[str, Any], workstream_name: str) -> bool:
+    """is_topical_for_workstream() from the stored bitmask."""
+    k = _WS_INDEX.get(workstream_name)
+    if k is None:
+        return is_topical_for_workstream(insight, workstream_name)
+    return bool(_record(insight)["topical"] >> k & 1)
+
+
+def is_keyword_topical(insight: Dict[str, Any], workstream_name: str) -> bool:
+    """True if the item has a \\b-bounded keyword of the workstream (or the workstream has none)."""
+    if not WORKSTREAM_KEYWORDS.get(workstream_name):
+        return True
+    return bool(_record(insight)["kw_topical"] >> _WS_INDEX[workstream_name] & 1)
+
+
+def keyword_offset(insight: Dict[str, Any], workstream_name: str) -> int:
+    """Offset in snippet_text() of the workstream's first listed keyword, or -1."""
+    k = _WS_INDEX.get(workstream_name)
+    if k is None or not WORKSTREAM_KEYWORDS.get(workstream_name):
+        return -1
+    return _record(insight)["kw_offsets"][k]
@@ -0,0 +1,87 @@
+# enrichment_store.py — Content-addressed cache of enrich_single_insight results
+#
+# Weekly runs re-scrape mostly the same posts. Results are keyed by
+#   md5(post text) + enrichment-version hash
+# so only new or edited posts go through the sentence-transformer / GPT calls.
+# Posts that scored below the threshold are cached too (as null results).
+#
+# Usage:
+#   store = EnrichmentStore("data/enrichment_cache.sqlite", version=enrichment_version())
+#   cached = store.get_many(keys)
+#   store.put_many({key: result_or_None})
+
+import os
+import json
+import sqlite3
+import hashlib
+from typing import Dict, Any, Optional, Iterable
+
+ENRICHMENT_STORE_PATH = os.path.join("data", "enrichment_cache.sqlite")
+
+# Bump when enrich_single_insight / the flag detectors change output.
+ENRICHMENT_VERSION = "1"
+
+
+def enrichment_version() -> str:
+    """Hash of everything that changes enrichment output besides the post text."""
+    parts = [
+        ENRICHMENT_VERSION,
+        os.getenv("SS_EMBED_MODEL", "intfloat/e5-base-v2"),
+        os.getenv("OPENAI_MODEL_SCREENER", "gpt-4o-mini"),
+    ]
+    return hashlib.md5("|".join(parts).encode("utf-8")).hexdigest()[:12]
+
+
+def post_fingerprint(text: str) -> str:
+    """Same fingerprint enrich_single_insight assigns to its output."""
+    return hashlib.md5((text or "").lower().encode()).hexdigest()
+
+
+class EnrichmentStore:
+    """SQLite-backed map of (fingerprint, version) → enriched insight or None."""
+
+    def __init__(self, path: str = ENRICHMENT_STORE_PATH, version: Optional[str] = None):
+        self.path = path
+        self.version = version or enrichment_version()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS enrichment ("
+            " fingerprint TEXT NOT NULL, version TEXT NOT NULL, result TEXT,"
+            " PRIMARY KEY (fingerprint, version))"
+        )
+        self.conn.commit()
+
+    def get_many(self, fingerprints: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Cached results for the given fingerprints; absent keys were never enriched."""
+        fps = list(dict.fromkeys(fingerprints))
+        found: Dict[str, Optional[Dict[str, Any]]] = {}
+        for start in range(0, len(fps), 900):
+            chunk = fps[start:start + 900]
+            rows = self.conn.execute(
+                f"SELECT fingerprint, result FROM enrichment WHERE version = ? AND fingerprint IN ({','.join('?' * len(chunk))})",
+                [self.version, *chunk],
+            )
+            for fp, result in rows:
+                found[fp] = json.loads(result) if result is not None else None
+        return found
+
+    def put_many(self, results: Dict[str, Optional[Dict[str, Any]]]):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO enrichment (fingerprint, version, result) VALUES (?, ?, ?)",
+            [
+                (fp, self.version, json.dumps(r, ensure_ascii=False) if r is not None else None)
+                for fp, r in results.items()
+            ],
+        )
+        self.conn.commit()
+
+    def prune(self) -> int:
+        """Drop results from other enrichment versions."""
+        cur = self.conn.execute("DELETE FROM enrichment WHERE version != ?", (self.version,))
+        self.conn.commit()
+        return cur.rowcount
+
+    def close(self):
+        self.conn.close()
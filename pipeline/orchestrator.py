@@ -1,17 +1,21 @@
 # orchestrator.py — Real pipeline orchestration with sequential steps and checkpoints
 #
 # Replaces the passthrough run_pipeline.py with a proper DAG:
-#   1. Load raw scraped data
-#   2. Deduplicate (SimHash + exact prefix)
+#   1. Locate raw scraped data (posts are streamed from disk by the steps that read them)
+#   2. Deduplicate (SimHash + exact prefix) in two streaming passes
 #   3. Enrich (signal scorer, GPT tags, etc.)
-#   4. Precompute embeddings (for hybrid retrieval)
-#   5. Cluster (subtag → DBSCAN)
+#   4. Build BM25 index + embed new insights into the store + ANN index (for hybrid retrieval)
+#   5. Cluster (subtag → DBSCAN; --semantic-clusters runs it on the embedding store's vectors)
 #   6. Detect trends & anomalies
 #   7. Save all outputs + checkpoint metadata
 #
+# Enriched insights are streamed to precomputed_insights.json; the index, embedding,
+# cluster and trend steps re-read that file (RecordFile) instead of sharing a list.
+#
 # Usage:
 #   python -m pipeline.orchestrator --input data/all_scraped_posts.json
 #   python -m pipeline.orchestrator --input data/all_scraped_posts.json --skip-embeddings
+#   python -m pipeline.orchestrator --input data/all_scraped_posts.json --full-dedup
 
 import os
 import sys
@@ -19,7 +23,8 @@ import json
 import argparse
 import time
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from itertools import islice
+from typing import List, Dict, Any, Optional, Iterable, Iterator
 
 # Ensure project root is on path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -90,6 +95,10 @@ def run_pipeline(
     skip_embeddings: bool = False,
     skip_trends: bool = False,
     max_items: Optional[int] = None,
+    dedup_store_path: Optional[str] = os.path.join("data", "dedup_index"),
+    full_dedup: bool = False,
+    enrichment_store_path: Optional[str] = os.path.join("data", "enrichment_cache.sqlite"),
+    semantic_clusters: bool = False,
 ) -> Dict[str, Any]:
     """
     Run the full SignalSynth pipeline with checkpoints.
@@ -101,15 +110,18 @@ def run_pipeline(
     steps: List[PipelineStep] = []
 
     # ── Step 1: Load raw data ──
-    step1 = PipelineStep("load", "Load raw scraped posts from JSON files")
+    step1 = PipelineStep("load", "Stream raw scraped posts from JSON / JSONL files")
     steps.append(step1)
     step1.start()
 
+    # Posts are not loaded here: every pass re-reads the scraped files, so no step holds
+    # the raw corpus (dedup reads them twice, the second time feeding enrichment)
+    def raw_posts() -> Iterator[Dict[str, Any]]:
+        return islice(_iter_scraped_data(input_path), max_items or None)
+
     try:
-        raw_posts = _load_scraped_data(input_path)
-        if max_items and len(raw_posts) > max_items:
-            raw_posts = raw_posts[:max_items]
-        step1.done({"total_posts": len(raw_posts)})
+        paths = _scraped_paths(input_path)
+        step1.done({"files": len(paths), "bytes": sum(os.path.getsize(p) for p in paths)})
     except Exception as e:
         step1.fail(str(e))
         return _make_checkpoint(steps, pipeline_start)
@@ -120,13 +132,24 @@ def run_pipeline(
     step2.start()
 
     try:
-        from components.deduplicator import deduplicate_insights
-        unique_posts, dedup_stats = deduplicate_insights(raw_posts, similarity_threshold=5)
+        from components.deduplicator import deduplicate_stream
+        store = None
+        if dedup_store_path:
+            from components.dedup_store import DedupStore
+            if full_dedup and os.path.isdir(dedup_store_path):
+                import shutil
+                shutil.rmtree(dedup_store_path)
+            store = DedupStore(dedup_store_path)
+        # Verdicts come from per-post keys and fingerprints; the survivors are streamed again
+        unique_posts, dedup_stats = deduplicate_stream(raw_posts, similarity_threshold=5, store=store)
+        if store is not None:
+            store.save()
+            dedup_stats["store_size"] = len(store)
         step2.done(dedup_stats)
     except Exception as e:
         step2.fail(str(e))
         # Fall back to raw posts
-        unique_posts = raw_posts
+        unique_posts = raw_posts()
         print(f"  ⚠️ Falling back to raw posts without dedup")
 
     # ── Step 3: Enrich ──
@@ -135,19 +158,49 @@ def run_pipeline(
     step3.start()
 
     try:
-        enriched = _enrich_posts(unique_posts)
+        from components.record_stream import RecordFile, RecordWriter
+        cache_stats = {"cache_hits": 0, "cache_misses": 0}
         insights_path = os.path.join(output_dir, "precomputed_insights.json")
-        with open(insights_path, "w", encoding="utf-8") as f:
-            json.dump(enriched, f, ensure_ascii=False, indent=2)
+        # Posts stream in and results stream straight to disk
+        with RecordWriter(insights_path, indent=2) as writer:
+            for insight in _iter_enriched(unique_posts, store_path=enrichment_store_path, stats=cache_stats):
+                writer.write(insight)
+        # Later steps re-read the written insights; each pass streams the file again
+        enriched = RecordFile(insights_path, count=writer.count)
+        try:
+            from components.insight_columns import build_insight_columns
+            build_insight_columns(
+                enriched,
+                output_path=os.path.join(output_dir, "precomputed_insights_columns"),
+            )
+        except Exception as e:
+            print(f"  ⚠️ Column store failed — the app will build counts from JSON: {e}")
         step3.done({
             "enriched": len(enriched),
+            **cache_stats,
             "output": insights_path,
         })
     except Exception as e:
         step3.fail(str(e))
         return _make_checkpoint(steps, pipeline_start)
 
-    # ── Step 4: Precompute embeddings ──
+    # ── Step 4: BM25 index ──
+    step_idx = PipelineStep("bm25_index", "Build inverted BM25 index for hybrid retrieval")
+    steps.append(step_idx)
+    step_idx.start()
+
+    try:
+        from components.hybrid_retrieval import build_bm25_index
+        index_path = build_bm25_index(
+            enriched,
+            output_path=os.path.join(output_dir, "precomputed_bm25"),
+        )
+        step_idx.done({"index_path": index_path, "count": len(enriched)})
+    except Exception as e:
+        step_idx.fail(str(e))
+        print(f"  ⚠️ BM25 index failed — the app will build it in memory at startup")
+
+    # ── Step 4b: Precompute embeddings ──
     step4 = PipelineStep("embed", "Precompute dense embeddings for hybrid retrieval")
     steps.append(step4)
 
@@ -156,13 +209,17 @@ def run_pipeline(
     else:
         step4.start()
         try:
-            from components.hybrid_retrieval import precompute_embeddings
+            from components.hybrid_retrieval import precompute_embeddings, build_ann_index
             embed_path = precompute_embeddings(
                 enriched,
-                output_path=os.path.join(output_dir, "precomputed_embeddings.npy"),
-                meta_path=os.path.join(output_dir, "precomputed_embeddings_meta.json"),
+                output_path=os.path.join(output_dir, "precomputed_embedding_store"),
+            )
+            ann_path = build_ann_index(
+                enriched,
+                store_path=embed_path,
+                output_path=os.path.join(output_dir, "precomputed_ann"),
             )
-            step4.done({"embeddings_path": embed_path, "count": len(enriched)})
+            step4.done({"embeddings_path": embed_path, "ann_index_path": ann_path, "count": len(enriched)})
         except Exception as e:
             step4.fail(str(e))
             print(f"  ⚠️ Embeddings failed — hybrid retrieval will use BM25 only")
@@ -174,7 +231,10 @@ def run_pipeline(
 
     try:
         clusters_path = os.path.join(output_dir, "precomputed_clusters.json")
-        _run_clustering(enriched, clusters_path)
+        _run_clustering(
+            enriched, clusters_path,
+            store_path=os.path.join(output_dir, "precomputed_embedding_store") if semantic_clusters else None,
+        )
         step5.done({"output": clusters_path})
     except Exception as e:
         step5.fail(str(e))
@@ -224,68 +284,145 @@ def run_pipeline(
 # Step implementations
 # ---------------------------------------------------------------------------
 
-def _load_scraped_data(input_path: str) -> List[Dict[str, Any]]:
-    """Load posts from one file or multiple known scraper outputs."""
-    all_posts = []
-
-    if os.path.exists(input_path):
-        with open(input_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if isinstance(data, list):
-            all_posts.extend(data)
-            print(f"  📂 {input_path}: {len(data)} posts")
-
-    # Also check standard scraper output paths
-    standard_paths = [
-        "data/scraped_reddit_posts.json",
-        "data/scraped_bluesky_posts.json",
-        "data/scraped_ebay_forums.json",
-        "data/scraped_community_posts.json",
-    ]
-    for path in standard_paths:
-        if path != input_path and os.path.exists(path):
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                if isinstance(data, list):
-                    print(f"  📂 {path}: {len(data)} posts")
-                    all_posts.extend(data)
-            except Exception as e:
-                print(f"  ⚠️ {path}: {e}")
-
-    if not all_posts:
-        raise FileNotFoundError(f"No scraped data found at {input_path} or standard paths")
+# Post fields the pipeline reads; everything else is dropped at load time
+_POST_FIELDS = (
+    "text", "title", "source", "url", "post_date", "_logged_date", "subreddit",
+    "forum_section", "username", "score", "num_comments",
+)
 
-    return all_posts
 
+# Scraper outputs read alongside --input
+_STANDARD_PATHS = (
+    "data/scraped_reddit_posts.json",
+    "data/scraped_bluesky_posts.json",
+    "data/scraped_ebay_forums.json",
+    "data/scraped_community_posts.json",
+)
 
-def _enrich_posts(posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Enrich posts through the signal scorer pipeline."""
-    from components.signal_scorer import enrich_single_insight
-    from components.scoring_utils import detect_payments_upi_highasp, detect_competitor_and_partner_mentions, detect_liquidity_signals
 
-    enriched = []
-    for idx, post in enumerate(posts):
-        text = post.get("text", "")
-        if not text or len(text) < 30:
-            continue
+def _scraped_paths(input_path: str) -> List[str]:
+    """The input file plus the standard scraper outputs that exist."""
+    paths = [input_path] if os.path.exists(input_path) else []
+    paths += [p for p in _STANDARD_PATHS if p != input_path and os.path.exists(p)]
+    if not paths:
+        raise FileNotFoundError(f"No scraped data found at {input_path} or standard paths")
+    return paths
 
-        insight = {
-            "text": text,
-            "title": post.get("title", ""),
-            "source": post.get("source", "Unknown"),
-            "url": post.get("url", ""),
-            "post_date": post.get("post_date", datetime.now().strftime("%Y-%m-%d")),
-            "_logged_date": post.get("_logged_date", datetime.now().isoformat()),
-            "subreddit": post.get("subreddit", ""),
-            "forum_section": post.get("forum_section", ""),
-            "username": post.get("username", ""),
-            "score": post.get("score", 0),
-            "num_comments": post.get("num_comments", 0),
-        }
 
+def _iter_scraped_data(input_path: str) -> Iterator[Dict[str, Any]]:
+    """Stream posts (trimmed to _POST_FIELDS) from one file or multiple known scraper outputs."""
+    from components.record_stream import iter_records
+
+    for path in _scraped_paths(input_path):
+        count = 0
         try:
-            result = enrich_single_insight(insight)
+            for post in iter_records(path):
+                if isinstance(post, dict):
+                    count += 1
+                    yield {k: post[k] for k in _POST_FIELDS if k in post}
+        except Exception as e:
+            if path == input_path:
+                raise
+            print(f"  ⚠️ {path}: {e}")
+        print(f"  📂 {path}: {count} posts")
+
+
+# Post fields copied onto the insight as-is; refreshed from the current scrape on cache hits
+_PASSTHROUGH_FIELDS = (
+    "source", "url", "post_date", "_logged_date", "subreddit",
+    "forum_section", "username", "num_comments",
+)
+
+
+def _iter_enriched(
+    posts: Iterable[Dict[str, Any]],
+    store_path: Optional[str] = None,
+    stats: Optional[Dict[str, int]] = None,
+    chunk_size: int = 256,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Enrich posts through the signal scorer pipeline, reusing cached results by text fingerprint.
+    Generator stage: posts are consumed and results yielded one chunk at a time, in post order.
+    Cache hit/miss counts are accumulated into `stats`.
+    """
+    store = None
+    if store_path:
+        from pipeline.enrichment_store import EnrichmentStore
+        store = EnrichmentStore(store_path)
+    stats = stats if stats is not None else {}
+    stats.setdefault("cache_hits", 0)
+    stats.setdefault("cache_misses", 0)
+
+    def _insights() -> Iterator[Dict[str, Any]]:
+        for post in posts:
+            text = post.get("text", "")
+            if not text or len(text) < 30:
+                continue
+            yield {
+                "text": text,
+                "title": post.get("title", ""),
+                "source": post.get("source", "Unknown"),
+                "url": post.get("url", ""),
+                "post_date": post.get("post_date", datetime.now().strftime("%Y-%m-%d")),
+                "_logged_date": post.get("_logged_date", datetime.now().isoformat()),
+                "subreddit": post.get("subreddit", ""),
+                "forum_section": post.get("forum_section", ""),
+                "username": post.get("username", ""),
+                "score": post.get("score", 0),
+                "num_comments": post.get("num_comments", 0),
+            }
+
+    try:
+        stream = _insights()
+        processed = 0
+        while True:
+            chunk = list(islice(stream, chunk_size))
+            if not chunk:
+                break
+            yield from _enrich_chunk(chunk, store, stats)
+            processed += len(chunk)
+            print(f"  Processed {processed} posts ({stats['cache_hits']} cached, {stats['cache_misses']} new)...")
+    finally:
+        if store:
+            store.prune()
+            store.close()
+
+
+def _enrich_chunk(
+    insights: List[Dict[str, Any]],
+    store,
+    stats: Dict[str, int],
+) -> List[Dict[str, Any]]:
+    """Enrich one chunk: cache lookup, batch-enrich the misses, merge back in order."""
+    from pipeline.enrichment_store import post_fingerprint
+    from components.workstream_routing import annotate_workstream
+    fingerprints = [post_fingerprint(i["text"]) for i in insights]
+    cached = store.get_many(fingerprints) if store else {}
+    uncached = [idx for idx, fp in enumerate(fingerprints) if fp not in cached]
+    stats["cache_hits"] += len(insights) - len(uncached)
+    stats["cache_misses"] += len(uncached)
+    # Posts sharing a text are enriched once (first occurrence)
+    first: Dict[str, int] = {}
+    for idx in uncached:
+        first.setdefault(fingerprints[idx], idx)
+    misses = list(first.values())
+
+    fresh: Dict[str, Optional[Dict[str, Any]]] = {}
+    if misses:
+        from components.signal_scorer import enrich_insights_batch
+        from components.scoring_utils import detect_payments_upi_highasp, detect_competitor_and_partner_mentions, detect_liquidity_signals
+
+        failed = set()
+
+        def _on_error(k, e):
+            failed.add(k)
+            print(f"  ⚠️ Enrichment error at {misses[k]}: {e}")
+
+        results = enrich_insights_batch([insights[idx] for idx in misses], on_error=_on_error)
+        for k, (idx, result) in enumerate(zip(misses, results)):
+            if k in failed:
+                continue
+            text = insights[idx]["text"]
             if result:
                 # Add extra flags
                 flags = detect_payments_upi_highasp(text)
@@ -303,19 +440,28 @@ def _enrich_posts(posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
                 result["liquidity_signal_types"] = liq.get("liquidity_signal_types", [])
                 result["liquidity_platforms"] = liq.get("liquidity_platforms", [])
 
-                enriched.append(result)
-        except Exception as e:
-            if (idx + 1) % 100 == 0:
-                print(f"  ⚠️ Enrichment error at {idx}: {e}")
+            fresh[fingerprints[idx]] = result or None
 
-        if (idx + 1) % 500 == 0:
-            print(f"  Processed {idx + 1}/{len(posts)} ({len(enriched)} enriched)...")
+        if store:
+            store.put_many(fresh)
 
+    # Merge cached and fresh results back in post order; each post gets its own copy
+    # stamped with its own source/url/date (several posts can share one text)
+    enriched = []
+    for insight, fp in zip(insights, fingerprints):
+        result = cached[fp] if fp in cached else fresh.get(fp)
+        if not result:
+            continue
+        result = dict(result)
+        result.update({k: insight[k] for k in _PASSTHROUGH_FIELDS})
+        # Flags / passthrough fields above feed workstream routing — refresh it if they changed
+        annotate_workstream(result)
+        enriched.append(result)
     return enriched
 
 
-def _run_clustering(insights: List[Dict[str, Any]], output_path: str):
-    """Run clustering and save results."""
+def _run_clustering(insights: List[Dict[str, Any]], output_path: str, store_path: Optional[str] = None):
+    """Run clustering and save results (density clustering on the embedding store when store_path is set)."""
     from components.cluster_synthesizer import cluster_by_subtag_then_embed, synthesize_cluster
     from components.scoring_utils import detect_payments_upi_highasp
 
@@ -331,7 +477,7 @@ def _run_clustering(insights: List[Dict[str, Any]], output_path: str):
     ]
 
     print(f"  Clustering {len(filtered)} collectibles insights...")
-    raw_clusters = cluster_by_subtag_then_embed(filtered)
+    raw_clusters = cluster_by_subtag_then_embed(filtered, fast_mode=store_path is None, store_path=store_path)
 
     clusters = []
     cards = []
@@ -407,6 +553,11 @@ def main():
     parser.add_argument("--skip-embeddings", action="store_true", help="Skip embedding precomputation")
     parser.add_argument("--skip-trends", action="store_true", help="Skip trend detection")
     parser.add_argument("--max-items", type=int, default=None, help="Cap input size for testing")
+    parser.add_argument("--dedup-store", default=os.path.join("data", "dedup_index"), help="Persistent dedup index directory")
+    parser.add_argument("--full-dedup", action="store_true", help="Discard the dedup index and re-deduplicate everything")
+    parser.add_argument("--enrichment-cache", default=os.path.join("data", "enrichment_cache.sqlite"), help="Enrichment result cache (SQLite)")
+    parser.add_argument("--no-enrichment-cache", action="store_true", help="Re-enrich every post")
+    parser.add_argument("--semantic-clusters", action="store_true", help="Density-cluster on the embedding store's cached vectors")
     args = parser.parse_args()
 
     run_pipeline(
@@ -415,6 +566,10 @@ def main():
         skip_embeddings=args.skip_embeddings,
         skip_trends=args.skip_trends,
         max_items=args.max_items,
+        dedup_store_path=args.dedup_store,
+        full_dedup=args.full_dedup,
+        enrichment_store_path=None if args.no_enrichment_cache else args.enrichment_cache,
+        semantic_clusters=args.semantic_clusters,
     )
 
 
@@ -5,6 +5,7 @@
 # - Collectibles-first gate
 # - CLI filters: brand, persona, topic, since, min-score, max-items
 # - Uses cluster_by_subtag_then_embed + synthesize_cluster from cluster_synthesizer
+#   (--semantic: DBSCAN on the embedding store's cached vectors, e.g. in the weekly job)
 # - Saves clusters as dicts with stats and metadata, plus summary cards
 
 import os
@@ -13,7 +14,7 @@ import argparse
 import time
 from datetime import datetime, date
 from typing import List, Dict, Any, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
 
 from components.cluster_synthesizer import (
     cluster_by_subtag_then_embed,
@@ -309,6 +310,8 @@ def main():
     parser.add_argument("--input", type=str, default=PRECOMPUTED_INSIGHTS_PATH, help="Path to precomputed insights JSON")
     parser.add_argument("--output", type=str, default=CLUSTER_OUTPUT_PATH, help="Where to save the cluster cache JSON")
     parser.add_argument("--skip-gpt", action="store_true", help="Skip GPT API calls for fast clustering (no problem statements or quotes)")
+    parser.add_argument("--semantic", action="store_true", help="Density-cluster on the embedding store's cached vectors instead of keyword grouping")
+    parser.add_argument("--embedding-store", type=str, default="precomputed_embedding_store", help="Embedding store directory for --semantic")
     args = parser.parse_args()
 
     in_path = args.input
@@ -318,23 +321,21 @@ def main():
         print(f"[ERROR] File not found: {in_path}")
         return
 
-    with open(in_path, "r", encoding="utf-8") as f:
-        insights: List[Dict[str, Any]] = json.load(f)
+    from components.record_stream import iter_records
 
-    print(f"[INFO] Loaded {len(insights)} insights from {in_path}")
-
-    # Hygiene + money-risk + domain filter
-    hydrated: List[Dict[str, Any]] = []
-    for i in insights:
+    # Streamed: hygiene + money-risk + domain filter, then non-destructive user filters.
+    # Only insights that pass every filter are kept in memory.
+    counts = {"input": 0, "hydrated": 0}
+    filtered: List[Dict[str, Any]] = []
+    for i in iter_records(in_path):
+        counts["input"] += 1
         i = _ensure_lists(i)
         i = _promote_money_risk(i)
-        if _is_collectibles(i):
-            hydrated.append(i)
-
-    # Non-destructive user filters
-    filtered = [
-        i
-        for i in hydrated
+        if not _is_collectibles(i):
+            continue
+        counts["hydrated"] += 1
+        if args.max_items and len(filtered) >= args.max_items:
+            continue
         if _passes_filters(
             i,
             brand=args.brand,
@@ -342,11 +343,10 @@ def main():
             topic=args.topic,
             since=args.since,
             min_score=args.min_score,
-        )
-    ]
+        ):
+            filtered.append(i)
 
-    if args.max_items and len(filtered) > args.max_items:
-        filtered = filtered[: args.max_items]
+    print(f"[INFO] Loaded {counts['input']} insights from {in_path}")
 
     print(
         "[INFO] Filtered set: "
@@ -362,7 +362,9 @@ def main():
 
     # Cluster + synthesized cards using cluster_by_subtag_then_embed
     print("[INFO] Generating cluster groups…")
-    raw_cluster_tuples = cluster_by_subtag_then_embed(filtered)
+    raw_cluster_tuples = cluster_by_subtag_then_embed(
+        filtered, fast_mode=not args.semantic, store_path=args.embedding_store
+    )
     if not raw_cluster_tuples:
         print("[WARN] cluster_by_subtag_then_embed returned no clusters.")
         data = {
@@ -378,8 +380,8 @@ def main():
                     "input_path": in_path,
                 },
                 "counts": {
-                    "input_insights": len(insights),
-                    "hydrated_collectibles": len(hydrated),
+                    "input_insights": counts["input"],
+                    "hydrated_collectibles": counts["hydrated"],
                     "filtered_for_clustering": len(filtered),
                     "cluster_count": 0,
                 },
@@ -455,28 +457,29 @@ def main():
             cards.append(card)
             print(f"  [{idx+1}/{len(raw_cluster_tuples)}] {workstream or 'General'}: {len(cluster_items)} signals (skip-gpt)")
     else:
-        # Normal path: GPT calls in parallel with ThreadPoolExecutor
+        # Normal path: GPT calls in parallel on the shared LLM scheduler (rate limits + retries)
+        from components.llm_scheduler import get_scheduler
+        scheduler = get_scheduler()
         results = [None] * len(raw_cluster_tuples)
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            futures = {}
-            for idx, (cluster_items, meta) in enumerate(raw_cluster_tuples):
-                workstream = meta.get("category", "")
-                print(f"  [{idx+1}/{len(raw_cluster_tuples)}] Submitting {workstream or 'General'} ({len(cluster_items)} signals)...")
-                fut = executor.submit(_build_card, idx, cluster_items, meta)
-                futures[fut] = idx
-
-            for fut in as_completed(futures):
-                idx, card, stats, cluster_items, meta = fut.result()
-                cid = card.get("cluster_id", idx)
-                cluster_record = {
-                    "cluster_id": cid, "insights": cluster_items, "stats": stats,
-                    "coherent": card["coherent"], "was_reclustered": card["was_reclustered"],
-                    "avg_similarity": card["avg_similarity"],
-                }
-                results[idx] = (cluster_record, card)
-                elapsed = time.time() - t_start
-                workstream = meta.get("category", "")
-                print(f"  ✓ [{idx+1}/{len(raw_cluster_tuples)}] {workstream or 'General'} done ({elapsed:.1f}s)")
+        futures = {}
+        for idx, (cluster_items, meta) in enumerate(raw_cluster_tuples):
+            workstream = meta.get("category", "")
+            print(f"  [{idx+1}/{len(raw_cluster_tuples)}] Submitting {workstream or 'General'} ({len(cluster_items)} signals)...")
+            fut = scheduler.run(_build_card, idx, cluster_items, meta)
+            futures[fut] = idx
+
+        for fut in as_completed(futures):
+            idx, card, stats, cluster_items, meta = fut.result()
+            cid = card.get("cluster_id", idx)
+            cluster_record = {
+                "cluster_id": cid, "insights": cluster_items, "stats": stats,
+                "coherent": card["coherent"], "was_reclustered": card["was_reclustered"],
+                "avg_similarity": card["avg_similarity"],
+            }
+            results[idx] = (cluster_record, card)
+            elapsed = time.time() - t_start
+            workstream = meta.get("category", "")
+            print(f"  ✓ [{idx+1}/{len(raw_cluster_tuples)}] {workstream or 'General'} done ({elapsed:.1f}s)")
 
         for cluster_record, card in results:
             clusters.append(cluster_record)
@@ -519,8 +522,8 @@ def main():
             "input_path": in_path,
         },
         "counts": {
-            "input_insights": len(insights),
-            "hydrated_collectibles": len(hydrated),
+            "input_insights": counts["input"],
+            "hydrated_collectibles": counts["hydrated"],
             "filtered_for_clustering": len(filtered),
             "cluster_count": len(clusters),
         },
@@ -35,18 +35,15 @@ from components.scoring_utils import (
     calculate_cluster_ready_score,
 )
 from components.brand_recognizer import recognize_brand
+from components.workstream_routing import annotate_workstream
 
-# ── Load local models ──
-print("Loading local models (no GPT)...")
+# ── Local models ──
+# Sentiment (RoBERTa) runs through the shared batched engine, loaded on first use.
+# Backend / threads / batch size: SS_SENTIMENT_BACKEND, SS_SENTIMENT_THREADS, SS_SENTIMENT_BATCH
+from components.sentiment_engine import get_sentiment_engine
 
-# Sentiment model (RoBERTa)
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-from scipy.special import softmax
-
-SENT_MODEL_NAME = "cardiffnlp/twitter-roberta-base-sentiment"
-sent_tokenizer = AutoTokenizer.from_pretrained(SENT_MODEL_NAME)
-sent_model = AutoModelForSequenceClassification.from_pretrained(SENT_MODEL_NAME)
+# Posts per classify_many call (and per worker task) in main()
+ENRICH_CHUNK = 512
 
 # NOTE: e5-base-v2 semantic scoring skipped in light mode (too slow per-post on CPU).
 # Embeddings are precomputed separately via: python -m components.hybrid_retrieval
@@ -87,8 +84,6 @@ VAULT_FRICTION_PHRASES = [
     "shipped back to themselves", "wait for it to be in-gated",
 ]
 
-print("Models loaded.\n")
-
 # ── Input/Output ──
 SCRAPED_FILES = [
     "data/scraped_reddit_posts.json",
@@ -109,20 +104,14 @@ SCRAPED_FILES = [
 OUTPUT_PATH = "precomputed_insights.json"
 
 
-def classify_sentiment_local(text: str) -> dict:
-    """Classify sentiment using local RoBERTa — no GPT."""
-    try:
-        encoded = sent_tokenizer(text, return_tensors='pt', truncation=True, padding=True, max_length=512)
-        with torch.no_grad():
-            output = sent_model(**encoded)
-            scores = softmax(output.logits[0].numpy())
-            labels = ["Negative", "Neutral", "Positive"]
-            label = labels[scores.argmax()]
-            confidence = round(float(scores.max()) * 100, 2)
-        sentiment = {"Positive": "Praise", "Negative": "Complaint", "Neutral": "Neutral"}.get(label, "Neutral")
-        return {"sentiment": sentiment, "confidence": confidence}
-    except Exception:
-        return {"sentiment": "Neutral", "confidence": 0}
+def classify_sentiment_local(text: str) -> dict | None:
+    """Classify sentiment using local RoBERTa — no GPT. None if the model failed."""
+    return get_sentiment_engine().classify(text)
+
+
+def classify_sentiment_local_many(texts: list) -> list:
+    """Batched classify_sentiment_local — one engine call per chunk."""
+    return get_sentiment_engine().classify_many(texts)
 
 
 def detect_subtags_local(text: str) -> list:
@@ -213,15 +202,22 @@ def _is_domain_relevant(text: str, title: str = "", source: str = "") -> bool:
     return True
 
 
-def enrich_light(post: dict) -> dict | None:
-    """Full enrichment with zero GPT calls."""
+def _passes_prefilter(post: dict) -> bool:
+    """Length + domain relevance gate applied before any model work."""
     text = post.get("text", "")
     if not text or len(text.strip()) < 30:
-        return None
-
+        return False
     # Domain relevance filter — reject off-topic content
-    if not _is_domain_relevant(text, post.get("title", ""), post.get("source", "")):
+    return _is_domain_relevant(text, post.get("title", ""), post.get("source", ""))
+
+
+def enrich_light(post: dict, sent: dict | None = None, prefiltered: bool = False) -> dict | None:
+    """Full enrichment with zero GPT calls. `sent` is a precomputed classify_sentiment_local result
+    ({} when the model failed on the text: brand_sentiment is left unset, rule overrides still apply).
+    prefiltered=True skips _passes_prefilter for posts the caller already gated."""
+    if not prefiltered and not _passes_prefilter(post):
         return None
+    text = post.get("text", "")
 
     i = {
         "text": text,
@@ -238,14 +234,17 @@ def enrich_light(post: dict) -> dict | None:
     }
 
     # Local sentiment
-    sent = classify_sentiment_local(text)
-    i["brand_sentiment"] = sent["sentiment"]
-    i["sentiment_confidence"] = sent["confidence"]
+    if sent is None:
+        sent = classify_sentiment_local(text) or {}
+    label, confidence = sent.get("sentiment"), sent.get("confidence", 0)
+    if sent:
+        i["brand_sentiment"] = label
+        i["sentiment_confidence"] = confidence
 
     # Override: vault friction signals should always be Complaint
     lo = text.lower()
     _is_vault_friction = any(phrase in lo for phrase in VAULT_FRICTION_PHRASES)
-    if _is_vault_friction and i["brand_sentiment"] != "Complaint":
+    if _is_vault_friction and i.get("brand_sentiment") != "Complaint":
         i["brand_sentiment"] = "Complaint"
         i["_vault_override"] = True
 
@@ -265,11 +264,11 @@ def enrich_light(post: dict) -> dict | None:
     i["heuristic_score"] = heuristic
 
     # Default frustration/impact (would normally come from GPT)
-    frustration = 3 if (sent["sentiment"] == "Complaint" or _is_vault_friction) else 1
+    frustration = 3 if (label == "Complaint" or _is_vault_friction) else 1
     impact = 2
     i["frustration"] = frustration
     i["impact"] = impact
-    i["score"] = round((0.3 * heuristic) + (0.1 * frustration * 10) + (0.1 * impact * 10) + (sent["confidence"] * 0.3), 2)
+    i["score"] = round((0.3 * heuristic) + (0.1 * frustration * 10) + (0.1 * impact * 10) + (confidence * 0.3), 2)
 
     # Severity (regex-based)
     severity, reason = estimate_severity(text)
@@ -332,7 +331,7 @@ def enrich_light(post: dict) -> dict | None:
     i["topic_focus"] = topic
 
     # Taxonomy (normalized)
-    type_tag = "Complaint" if sent["sentiment"] == "Complaint" else "Discussion"
+    type_tag = "Complaint" if label == "Complaint" else "Discussion"
     if any(w in lo for w in ["wish", "should", "would be great", "please add", "feature request"]):
         type_tag = "Feature Request"
     if any(w in lo for w in ["leaving ebay", "switched to", "done with ebay", "moving to"]):
@@ -340,7 +339,7 @@ def enrich_light(post: dict) -> dict | None:
     if _is_vault_friction:
         type_tag = "Complaint"
     i["type_tag"] = type_tag
-    i["type_confidence"] = sent["confidence"]
+    i["type_confidence"] = confidence
 
     canonical_topic = subtags[0] if subtags[0] != "General" else (topic[0] if topic else "General")
     i["taxonomy"] = {"type": type_tag, "topic": canonical_topic, "theme": canonical_topic}
@@ -351,10 +350,38 @@ def enrich_light(post: dict) -> dict | None:
     i["fingerprint"] = hashlib.md5(text.lower().encode()).hexdigest()
 
     # Min score filter
-    return i if i["score"] >= 3 else None
+    if i["score"] < 3:
+        return None
+    # Workstream category + topicality, so clustering doesn't rescan the text
+    annotate_workstream(i)
+    return i
+
+
+def _init_worker(threads: int):
+    """Pool initializer: load the sentiment model once per worker process."""
+    os.environ.setdefault("SS_SENTIMENT_THREADS", str(threads))
+    get_sentiment_engine()
+
+
+def _enrich_chunk(chunk: list) -> tuple:
+    """Enrich one chunk of (idx, post): ([insight or None], [(idx, error)], unclassified count) in input order."""
+    # Prefilter once here; enrich_light is told not to repeat it
+    chunk = [(idx, p) for idx, p in chunk if _passes_prefilter(p)]
+    # One batched sentiment pass per chunk instead of one model call per post
+    sents = classify_sentiment_local_many([p.get("text", "") for _, p in chunk])
+    results, errors = [], []
+    unclassified = sum(1 for s in sents if s is None)
+    for (idx, post), sent in zip(chunk, sents):
+        try:
+            results.append(enrich_light(post, sent=sent or {}, prefiltered=True))
+        except Exception as e:
+            errors.append((idx, str(e)))
+    return results, errors, unclassified
 
 
-def main():
+def main(workers: int = 1):
+    from components.parallel_enrich import map_chunks, resolve_workers
+    workers = resolve_workers(workers)
     print("🔄 Processing scraped data (LIGHT mode — no GPT calls)...\n")
 
     print("📥 Loading scraped data...")
@@ -389,21 +416,26 @@ def main():
     print(f"  {before} → {len(all_posts)} ({before - len(all_posts)} exact dupes removed)")
 
     # Enrich
-    print(f"\n🔬 Enriching {len(all_posts)} posts (local only)...")
+    print(f"\n🔬 Enriching {len(all_posts)} posts (local only, {workers} worker{'s' if workers != 1 else ''})...")
     insights = []
     errors = 0
-    for idx, post in enumerate(all_posts):
-        try:
-            enriched = enrich_light(post)
-            if enriched:
-                insights.append(enriched)
-        except Exception as e:
+    unclassified = 0
+    # Split torch threads across workers so N processes don't oversubscribe the CPU
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    done = 0
+    for results, chunk_errors, chunk_unclassified in map_chunks(
+        _enrich_chunk, enumerate(all_posts), workers=workers, chunk_size=ENRICH_CHUNK,
+        initializer=_init_worker if workers > 1 else None, initargs=(threads,),
+    ):
+        insights.extend(i for i in results if i)
+        unclassified += chunk_unclassified
+        for idx, e in chunk_errors:
             errors += 1
             if errors <= 5:
                 print(f"  ⚠️ Error at {idx}: {e}")
 
-        if (idx + 1) % 500 == 0:
-            print(f"  {idx + 1}/{len(all_posts)} processed ({len(insights)} enriched)...", flush=True)
+        done = min(done + ENRICH_CHUNK, len(all_posts))
+        print(f"  {done}/{len(all_posts)} processed ({len(insights)} enriched)...", flush=True)
 
     # Save
     with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
@@ -411,6 +443,8 @@ def main():
 
     print(f"\n✅ Done: {len(insights)} insights saved to {OUTPUT_PATH}")
     print(f"  Errors: {errors}")
+    if unclassified:
+        print(f"  ⚠️ Sentiment model failed on {unclassified} posts — brand_sentiment left unset")
     print(f"  Pass rate: {len(insights) / max(len(all_posts), 1):.1%}")
 
     # Quick stats
@@ -418,7 +452,7 @@ def main():
     sentiments = defaultdict(int)
     for i in insights:
         sources[i.get("source", "Unknown")] += 1
-        sentiments[i.get("brand_sentiment", "Neutral")] += 1
+        sentiments[i.get("brand_sentiment", "Unclassified")] += 1
 
     print(f"\n📊 Sentiment: {dict(sentiments)}")
     print(f"📍 Sources:")
@@ -432,10 +466,15 @@ def main():
         "total_posts_loaded": len(all_posts),
         "insights_generated": len(insights),
         "errors": errors,
+        "sentiment_failures": unclassified,
     }
     with open("_pipeline_meta.json", "w", encoding="utf-8") as f:
         json.dump(meta, f, indent=2)
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="Light processing of scraped data (no GPT calls)")
+    parser.add_argument("--workers", type=int, default=1, help="Enrichment processes (0 = one per CPU)")
+    args = parser.parse_args()
+    main(workers=args.workers)
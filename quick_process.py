@@ -6,6 +6,9 @@ import re
 import unicodedata
 from datetime import datetime, timezone
 
+from components.keyword_matcher import KeywordMatcher
+from components.workstream_routing import annotate_workstream
+
 
 def normalize_text(text):
     """Clean up weird formatting, vertical text, and unicode issues."""
@@ -225,23 +228,15 @@ def is_competitor_subsidiary_intel(text):
     text_lower = text.lower()
     if len(text_lower) < 40:
         return False
+    m = RELEVANCE_MATCHER.match(text_lower)
     # Must mention a subsidiary or competitor
-    has_entity = (
-        any(e in text_lower for e in SUBSIDIARY_ENTITIES)
-        or any(e in text_lower for e in COMPETITOR_ENTITIES)
-    )
+    has_entity = m.any("subsidiary") or m.any("competitor")
     if not has_entity:
         return False
     # Must have collectibles context (not random mentions)
     has_collectibles = bool(RE_COLLECTIBLES.search(text)) or bool(RE_GRADING_SERVICE.search(text))
     # Or must have marketplace/platform discussion context
-    has_platform_context = any(w in text_lower for w in [
-        "fee", "price", "sell", "buy", "list", "auction", "marketplace",
-        "consign", "premium", "commission", "ship", "experience",
-        "review", "complaint", "issue", "problem", "love", "hate",
-        "better", "worse", "switch", "moved to", "prefer",
-        "versus", " vs ", "compared", "alternative",
-    ])
+    has_platform_context = m.any("platform_context")
     return has_collectibles or has_platform_context
 
 
@@ -270,6 +265,72 @@ NOISE_SUBREDDITS = {
     "corporatefacepalm", "antiwork", "latestagecapitalism",
 }
 
+# ── Relevance filter phrase lists (all matched in one pass by RELEVANCE_MATCHER) ──
+
+# Trading/sales posts (not user feedback)
+SALES_PATTERNS = [
+    "[h]", "[w]", "[fs]", "[ft]", "[wts]", "[wtb]", "[wtt]",
+    "for sale", "selling my", "looking to sell", "paypal only",
+    "prices include shipping", "shipping included", "obo",
+    "timestampe", "timestamps", "pm me", "dm me",
+]
+
+# Reddit bot/moderator messages (not real user feedback)
+BOT_PATTERNS = [
+    "welcome /u/", "our two most-common rule violations",
+    "i am a bot", "this action was performed automatically",
+    "automoderator", "this is a reminder", "this post has been removed",
+    "your post has been", "your submission has been", "please read the rules",
+    "this thread is locked", "daily newbie thread", "weekly thread",
+    "megathread", "please use the", "this is an automated",
+]
+
+# Product listings and promotional posts (ads, not feedback)
+LISTING_PATTERNS = [
+    "ebay.com/itm", "#ad", "check out this", "starting at",
+    "buy it now", "free shipping", "ships free", "pre-order",
+    "listed on ebay", "just listed", "new listing",
+    "cents at auction", "auction on ebay", "ending soon",
+    "bid now", "shop now", "order now", "get yours",
+    "use code", "promo code", "discount code", "coupon",
+]
+
+# Non-collectibles categories (padded with spaces where needed to avoid false positives like "car" in "card")
+RELEVANCE_NON_COLLECTIBLES = [
+    "shoes", "sneakers", "louboutin", "jordan shoe", "nike shoe", "adidas", "yeezy",
+    "clothing", "clothes", "shirt", "pants", "dress", "jacket", "jeans",
+    "thrift", "goodwill", "salvation army", "mystery box",
+    "laptop", "computer", "phone", "iphone", "electronics", "ram stick", "cpu",
+    "furniture", "appliance", " car ", "vehicle", "motorcycle",
+    # Woodworking/tools (not collectibles)
+    "woodworking", "hand tool", "power tool", "cabinet", "workbench", "dovetail",
+    "plywood", "lumber", "sawdust", "chisel", "plane ", "jointer", "router",
+    "lie-nielsen", "veritas", "stanley plane", "wood shop", "workshop",
+]
+
+# Ecosystem entities: relevant with pain OR an eBay mention
+# (avoids flooding with generic PSA/BGS grading discussion)
+ECOSYSTEM_ENTITIES = [
+    "psa", "bgs", "cgc", "sgc",
+    "goldin", "tcgplayer", "tcg player",
+    "fanatics", "whatnot", "heritage auction",
+]
+
+# Marketplace/platform discussion context for competitor/subsidiary intel
+PLATFORM_CONTEXT = [
+    "fee", "price", "sell", "buy", "list", "auction", "marketplace",
+    "consign", "premium", "commission", "ship", "experience",
+    "review", "complaint", "issue", "problem", "love", "hate",
+    "better", "worse", "switch", "moved to", "prefer",
+    "versus", " vs ", "compared", "alternative",
+]
+
+# Lighter lists for curated sources (already topic-filtered by their scrapers)
+CURATED_BOT_PATTERNS = ["i am a bot", "this action was performed automatically", "automoderator"]
+CURATED_SALES_PATTERNS = ["[h]", "[w]", "[fs]", "[ft]", "paypal only", "prices include shipping"]
+CURATED_NON_COLLECTIBLES = ["shoes", "sneakers", "laptop", "computer", "phone", "furniture", "woodworking"]
+
+
 def is_relevant(text, subreddit=""):
     """
     Balanced filter: eBay marketplace issues relevant to collectibles PM.
@@ -282,53 +343,23 @@ def is_relevant(text, subreddit=""):
     if subreddit_lower in NOISE_SUBREDDITS:
         return False
     
+    # One pass over the text for every phrase list below
+    m = RELEVANCE_MATCHER.match(text_lower)
+
     # Exclude trading/sales posts (not user feedback)
-    sales_patterns = [
-        "[h]", "[w]", "[fs]", "[ft]", "[wts]", "[wtb]", "[wtt]",
-        "for sale", "selling my", "looking to sell", "paypal only",
-        "prices include shipping", "shipping included", "obo",
-        "timestampe", "timestamps", "pm me", "dm me",
-    ]
-    if any(sp in text_lower for sp in sales_patterns):
+    if m.any("sales"):
         return False
     
     # Exclude Reddit bot/moderator messages (not real user feedback)
-    bot_patterns = [
-        "welcome /u/", "our two most-common rule violations",
-        "i am a bot", "this action was performed automatically",
-        "automoderator", "this is a reminder", "this post has been removed",
-        "your post has been", "your submission has been", "please read the rules",
-        "this thread is locked", "daily newbie thread", "weekly thread",
-        "megathread", "please use the", "this is an automated",
-    ]
-    if any(bp in text_lower for bp in bot_patterns):
+    if m.any("bot"):
         return False
     
     # Exclude product listings and promotional posts (ads, not feedback)
-    listing_patterns = [
-        "ebay.com/itm", "#ad", "check out this", "starting at",
-        "buy it now", "free shipping", "ships free", "pre-order",
-        "listed on ebay", "just listed", "new listing",
-        "cents at auction", "auction on ebay", "ending soon",
-        "bid now", "shop now", "order now", "get yours",
-        "use code", "promo code", "discount code", "coupon",
-    ]
-    if any(lp in text_lower for lp in listing_patterns):
+    if m.any("listing"):
         return False
     
-    # Exclude non-collectibles categories (use word boundaries to avoid false positives like "car" in "card")
-    non_collectibles = [
-        "shoes", "sneakers", "louboutin", "jordan shoe", "nike shoe", "adidas", "yeezy",
-        "clothing", "clothes", "shirt", "pants", "dress", "jacket", "jeans",
-        "thrift", "goodwill", "salvation army", "mystery box",
-        "laptop", "computer", "phone", "iphone", "electronics", "ram stick", "cpu",
-        "furniture", "appliance", " car ", "vehicle", "motorcycle",
-        # Woodworking/tools (not collectibles)
-        "woodworking", "hand tool", "power tool", "cabinet", "workbench", "dovetail",
-        "plywood", "lumber", "sawdust", "chisel", "plane ", "jointer", "router",
-        "lie-nielsen", "veritas", "stanley plane", "wood shop", "workshop",
-    ]
-    if any(nc in text_lower for nc in non_collectibles):
+    # Exclude non-collectibles categories
+    if m.any("non_collectibles"):
         return False
     
     # Exclude posts with vertical text formatting (corrupted Reddit markdown)
@@ -338,7 +369,7 @@ def is_relevant(text, subreddit=""):
         return False
     
     # Exclude obvious noise phrases
-    noise_count = sum(1 for phrase in NOISE_PHRASES if phrase in text_lower)
+    noise_count = m.count("noise")
     if noise_count >= 2:
         return False
     
@@ -350,20 +381,15 @@ def is_relevant(text, subreddit=""):
         return True
     
     # COMC is a direct eBay partner — always relevant if mentioned
-    has_comc = any(e in text_lower for e in ["comc", "check out my cards", "checkoutmycards"])
+    has_comc = m.any("comc")
     if has_comc:
         return True
     
     # Other ecosystem entities need pain OR eBay mention to stay relevant
     # (avoids flooding with generic PSA/BGS grading discussion)
-    ecosystem_entities = [
-        "psa", "bgs", "cgc", "sgc",
-        "goldin", "tcgplayer", "tcg player",
-        "fanatics", "whatnot", "heritage auction",
-    ]
-    has_ecosystem = any(e in text_lower for e in ecosystem_entities)
-    has_ebay = "ebay" in text_lower
-    has_psa_vault = "psa vault" in text_lower or ("vault" in text_lower and "psa" in text_lower)
+    has_ecosystem = m.any("ecosystem")
+    has_ebay = m.has("ebay")
+    has_psa_vault = m.has("psa vault") or (m.has("vault") and m.has("psa"))
     if has_ecosystem and (has_pain or has_ebay or has_psa_vault):
         return True
     
@@ -380,17 +406,15 @@ def is_relevant_curated(text):
     text_lower = text.lower()
     if len(text_lower) < 30:
         return False
+    m = RELEVANCE_MATCHER.match(text_lower)
     # Exclude bot / automated
-    bot_patterns = ["i am a bot", "this action was performed automatically", "automoderator"]
-    if any(bp in text_lower for bp in bot_patterns):
+    if m.any("curated_bot"):
         return False
     # Exclude pure sales/listing posts
-    sales_patterns = ["[h]", "[w]", "[fs]", "[ft]", "paypal only", "prices include shipping"]
-    if any(sp in text_lower for sp in sales_patterns):
+    if m.any("curated_sales"):
         return False
     # Exclude non-collectibles categories
-    non_collectibles = ["shoes", "sneakers", "laptop", "computer", "phone", "furniture", "woodworking"]
-    if any(nc in text_lower for nc in non_collectibles):
+    if m.any("curated_non_collectibles"):
         return False
     return True
 
@@ -415,6 +439,30 @@ YT_QUALITY_KEYWORDS = [
     "hobby", "industry", "future", "license", "exclusive", "monopoly",
 ]
 
+# Self-promo / affiliate spam in YouTube comments
+YT_SPAM_PATTERNS = ["sign up for", "use this link", "use code", "subscribe", "check out my", "follow me", "giveaway"]
+
+# Every relevance phrase list compiled into one matcher; match sets are memoized per text,
+# so is_relevant_curated / is_competitor_subsidiary_intel / is_relevant share one scan
+RELEVANCE_MATCHER = KeywordMatcher({
+    "sales": SALES_PATTERNS,
+    "bot": BOT_PATTERNS,
+    "listing": LISTING_PATTERNS,
+    "non_collectibles": RELEVANCE_NON_COLLECTIBLES,
+    "noise": NOISE_PHRASES,
+    "comc": ["comc", "check out my cards", "checkoutmycards"],
+    "ecosystem": ECOSYSTEM_ENTITIES,
+    "marketplace": ["ebay", "psa vault", "vault", "psa"],
+    "subsidiary": SUBSIDIARY_ENTITIES,
+    "competitor": COMPETITOR_ENTITIES,
+    "platform_context": PLATFORM_CONTEXT,
+    "curated_bot": CURATED_BOT_PATTERNS,
+    "curated_sales": CURATED_SALES_PATTERNS,
+    "curated_non_collectibles": CURATED_NON_COLLECTIBLES,
+    "yt_spam": YT_SPAM_PATTERNS,
+    "yt_quality": YT_QUALITY_KEYWORDS,
+}, name="relevance", memo_size=4096)
+
 
 def is_quality_yt_comment(post):
     """
@@ -430,12 +478,12 @@ def is_quality_yt_comment(post):
         return False
 
     # Exclude self-promo / affiliate spam
-    spam_patterns = ["sign up for", "use this link", "use code", "subscribe", "check out my", "follow me", "giveaway"]
-    if any(sp in text_lower for sp in spam_patterns):
+    m = RELEVANCE_MATCHER.match(text_lower)
+    if m.any("yt_spam"):
         return False
 
     # Count quality signals
-    keyword_hits = sum(1 for kw in YT_QUALITY_KEYWORDS if kw in text_lower)
+    keyword_hits = m.count("yt_quality")
 
     # High likes + any keyword = quality
     if likes >= 5 and keyword_hits >= 1:
@@ -531,18 +579,22 @@ def classify_insight(text):
     
     return insight_type, sentiment, is_urgent
 
-def load_all():
-    posts = []
+def iter_all():
+    """Stream posts from every scraped file (JSON arrays or .jsonl) without loading whole files."""
+    from components.record_stream import iter_records
     for path in SCRAPED_FILES:
         if os.path.exists(path):
+            count = 0
             try:
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    print(f"  {path}: {len(data)} posts")
-                    posts.extend(data)
+                for post in iter_records(path):
+                    count += 1
+                    yield post
+                print(f"  {path}: {count} posts")
             except Exception as e:
-                print(f"  {path}: error - {e}")
-    return posts
+                print(f"  {path}: error after {count} posts - {e}")
+
+def load_all():
+    return list(iter_all())
 
 def enrich(post):
     text = normalize_text(post.get("text", "") or "")
@@ -748,7 +800,7 @@ def enrich(post):
     topic_bonus = 10 if subtag != "General" else 0  # 10 pts for specific topic
     signal_strength = round(min(engagement + specificity + pain_bonus + churn_bonus + topic_bonus, 100), 1)
 
-    return {
+    insight = {
         "text": text[:2000],
         "title": title,
         "source": post.get("source", "Reddit"),
@@ -791,65 +843,91 @@ def enrich(post):
         "clarity": clarity,
         "persona": persona,
     }
+    # Workstream category + topicality, so clustering doesn't rescan the text
+    annotate_workstream(insight)
+    return insight
 
-def main():
-    print("🚀 Quick processing scraped data...")
-    posts = load_all()
-    print(f"📊 Loaded {len(posts)} total posts")
-    
-    # Filter for relevance first
-    print("\n🔬 Filtering for eBay-specific actionable insights...")
-    relevant_posts = []
-    yt_quality_count = 0
-    for post in posts:
-        text = f"{post.get('title', '')} {post.get('text', '')}"
-        subreddit = post.get("subreddit", "")
-        source = post.get("source", "")
+def relevance(post):
+    """Why a post passes the relevance filter: "yt", "relevant", or None if it doesn't."""
+    text = f"{post.get('title', '')} {post.get('text', '')}"
+    subreddit = post.get("subreddit", "")
+    source = post.get("source", "")
 
-        # Quality YouTube comments bypass normal relevance filter
-        if source == "YouTube (comment)" and is_quality_yt_comment(post):
-            relevant_posts.append(post)
-            yt_quality_count += 1
-            continue
+    # Quality YouTube comments bypass normal relevance filter
+    if source == "YouTube (comment)" and is_quality_yt_comment(post):
+        return "yt"
 
-        # Curated sources get a lighter relevance bar
-        if source in CURATED_SOURCES and is_relevant_curated(text):
-            relevant_posts.append(post)
-            continue
+    # Curated sources get a lighter relevance bar
+    if source in CURATED_SOURCES and is_relevant_curated(text):
+        return "relevant"
 
-        # Competitor/subsidiary intel — valuable even without pain signals
-        if is_competitor_subsidiary_intel(text):
-            relevant_posts.append(post)
-            continue
+    # Competitor/subsidiary intel — valuable even without pain signals
+    if is_competitor_subsidiary_intel(text):
+        return "relevant"
 
-        if is_relevant(text, subreddit):
-            relevant_posts.append(post)
+    return "relevant" if is_relevant(text, subreddit) else None
 
-    if yt_quality_count:
-        print(f"  🎬 YouTube quality comments promoted: {yt_quality_count}")
-    
-    print(f"📊 Relevant posts: {len(relevant_posts)} / {len(posts)} ({100*len(relevant_posts)//len(posts)}%)")
-    
-    insights = []
-    for post in relevant_posts:
-        enriched = enrich(post)
-        if enriched:
-            insights.append(enriched)
-    
-    # Dedupe
+def _process_chunk(posts):
+    """Relevance filter + enrich for one chunk: [(relevance, insight or None)] in input order."""
+    out = []
+    for post in posts:
+        why = relevance(post)
+        out.append((why, enrich(post) if why else None))
+    return out
+
+def build_derived_artifacts(insights):
+    """Column store + BM25 index mirroring precomputed_insights.json; rebuild after every write to it."""
+    try:
+        from components.insight_columns import build_insight_columns
+        build_insight_columns(insights)
+    except Exception as e:
+        print(f"⚠️ Column store build failed: {e}")
+
+    # BM25 index for Ask AI (memory-mapped by the app instead of built per session)
+    try:
+        from components.hybrid_retrieval import build_bm25_index
+        build_bm25_index(insights)
+    except Exception as e:
+        print(f"⚠️ BM25 index build failed: {e}")
+
+def main(workers=1, chunk_size=256):
+    from components.parallel_enrich import map_chunks, resolve_workers
+    workers = resolve_workers(workers)
+    print("🚀 Quick processing scraped data...")
+    print(f"\n🔬 Streaming posts through relevance filter → enrich → dedupe ({workers} worker{'s' if workers != 1 else ''})...")
+    loaded_count = 0
+    relevant_count = 0
+    yt_quality_count = 0
+
+    # Enrich + dedupe; chunks come back in input order, so results match a serial run.
+    # Only the unique enriched insights are held in memory.
     seen = set()
     unique = []
-    for i in insights:
-        key = i["text"][:100]
-        if key not in seen:
-            seen.add(key)
-            unique.append(i)
+    for results in map_chunks(_process_chunk, iter_all(), workers=workers, chunk_size=chunk_size):
+        for why, i in results:
+            loaded_count += 1
+            if not why:
+                continue
+            relevant_count += 1
+            if why == "yt":
+                yt_quality_count += 1
+            if not i:
+                continue
+            key = i["text"][:100]
+            if key not in seen:
+                seen.add(key)
+                unique.append(i)
+
+    print(f"📊 Loaded {loaded_count} total posts")
+    if yt_quality_count:
+        print(f"  🎬 YouTube quality comments promoted: {yt_quality_count}")
+    print(f"📊 Relevant posts: {relevant_count} / {loaded_count} ({100*relevant_count//max(loaded_count, 1)}%)")
     
     # Save
-    with open("precomputed_insights.json", "w", encoding="utf-8") as f:
-        json.dump(unique, f, ensure_ascii=False, indent=2)
-    
+    from components.record_stream import write_records
+    write_records("precomputed_insights.json", unique, indent=2)
     print(f"\n✅ Saved {len(unique)} insights to precomputed_insights.json")
+    build_derived_artifacts(unique)
     
     # Stats
     payment = sum(1 for i in unique if i.get("_payment_issue"))
@@ -1007,8 +1085,8 @@ def main():
 
     # Save pipeline metadata for the app to read
     pipeline_meta = {
-        "total_posts_loaded": len(posts),
-        "total_relevant": len(relevant_posts),
+        "total_posts_loaded": loaded_count,
+        "total_relevant": relevant_count,
         "total_insights": len(unique),
         "unique_sources": len(src_dist),
         "source_distribution": {src: cnt for src, cnt in src_dist.most_common()},
@@ -1019,23 +1097,30 @@ def main():
     print(f"\n📋 Saved pipeline metadata → _pipeline_meta.json")
 
 if __name__ == "__main__":
-    import sys
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="Quick process scraped data")
+    parser.add_argument("--workers", type=int, default=1, help="Enrichment processes (0 = one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Posts per worker task")
+    parser.add_argument("--gpt-enrich", action="store_true", help="Run the GPT enrichment pass afterwards")
+    args = parser.parse_args()
+    main(workers=args.workers, chunk_size=args.chunk_size)
     
     # Optional: GPT enrichment pass (run with --gpt-enrich flag)
-    if "--gpt-enrich" in sys.argv:
+    if args.gpt_enrich:
         print("\n🤖 Running GPT enrichment pass...")
         try:
             from components.gpt_enrichment import enrich_signals_with_gpt
-            with open("precomputed_insights.json", "r", encoding="utf-8") as f:
-                insights = json.load(f)
+            from components.record_stream import read_json
+            insights = read_json("precomputed_insights.json")
             
-            enriched = enrich_signals_with_gpt(insights, batch_size=10, max_workers=4)
+            enriched = enrich_signals_with_gpt(insights, batch_size=10)
             
             with open("precomputed_insights.json", "w", encoding="utf-8") as f:
                 json.dump(enriched, f, ensure_ascii=False)
             
             gpt_count = sum(1 for i in enriched if i.get("_gpt_enriched"))
             print(f"✅ GPT-enriched {gpt_count}/{len(enriched)} signals → precomputed_insights.json")
+            # The rewrite changed the file the column store and BM25 index mirror
+            build_derived_artifacts(enriched)
         except Exception as e:
             print(f"⚠️ GPT enrichment failed: {e}")
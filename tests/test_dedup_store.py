@@ -0,0 +1,68 @@
+# test_dedup_store.py — DedupStore across pipeline runs
+#
+# Each "run" opens the store from disk, dedups the run's whole corpus and saves, the way
+# the orchestrator does. The tests check:
+#   1. A post kept in an earlier run drops a near-duplicate that arrives later
+#   2. Once that post leaves the corpus it no longer blocks the near-duplicate, and its
+#      fingerprint is gone from the store
+#   3. deduplicate_stream gives the same verdicts and stats as deduplicate_insights
+#
+# Run: python -m pytest -q tests/test_dedup_store.py
+
+import pytest
+
+from components.dedup_store import DedupStore
+from components.deduplicator import deduplicate_insights, deduplicate_stream
+
+VAULT = (
+    "My PSA 10 slab arrived from the eBay vault with a cracked case and support says the "
+    "authenticity guarantee does not cover shipping damage from the vault warehouse, so I "
+    "am stuck paying for a regrade and a new case out of pocket."
+)
+ORIGINAL = {"text": VAULT, "score": 5, "url": "original"}
+REPOST = {"text": "Update: " + VAULT, "score": 9, "url": "repost"}  # different prefix, SimHash 3 bits away
+OTHER = {"text": "Whatnot fees went up again for trading card breaks this month.", "score": 1, "url": "other"}
+
+
+def _run(path, posts, streamed=False):
+    store = DedupStore(str(path))
+    if streamed:
+        unique, stats = deduplicate_stream(lambda: iter(posts), store=store)
+        unique = list(unique)
+    else:
+        unique, stats = deduplicate_insights(posts, store=store)
+    store.save()
+    return [p["url"] for p in unique], stats, store
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_departed_post_no_longer_blocks_near_duplicate(tmp_path, streamed):
+    path = tmp_path / "dedup_index"
+
+    urls, _, _ = _run(path, [ORIGINAL, OTHER], streamed)
+    assert urls == ["original", "other"]
+
+    # The stored post wins regardless of score
+    urls, stats, _ = _run(path, [ORIGINAL, OTHER, REPOST], streamed)
+    assert urls == ["original", "other"]
+    assert (stats["known"], stats["near_dupes"]) == (2, 1)
+
+    # The original expired: the repost is decided again and kept
+    urls, stats, store = _run(path, [OTHER, REPOST], streamed)
+    assert urls == ["other", "repost"]
+    assert stats["forgotten"] == 2  # the original, and the repost's dropped verdict
+    assert (len(store), len(store.fps)) == (2, 2)
+
+    # Stable afterwards: both are known and kept
+    urls, stats, store = _run(path, [OTHER, REPOST], streamed)
+    assert urls == ["other", "repost"]
+    assert (stats["forgotten"], stats["fingerprinted"]) == (0, 0)
+
+
+def test_stream_matches_list(tmp_path):
+    runs = [[ORIGINAL, OTHER], [ORIGINAL, dict(ORIGINAL, score=7), REPOST, OTHER], [REPOST, OTHER]]
+    for posts in runs:
+        listed = _run(tmp_path / "listed", posts)
+        streamed = _run(tmp_path / "streamed", posts, streamed=True)
+        assert sorted(listed[0]) == sorted(streamed[0])
+        assert listed[1] == streamed[1]
@@ -0,0 +1,86 @@
+# test_import_budget.py — importing pipeline helpers must not load models or API clients
+#
+# Each module is imported in a fresh interpreter, which reports which heavy packages
+# ended up in sys.modules. Stub heavy packages are put first on its PYTHONPATH, so they
+# are importable whether or not the real ones are installed and any module-level import
+# of them shows up. The tests check that
+# torch / sentence_transformers / transformers / openai are not loaded at import time
+# (models and clients are lazy singletons, loaded on first use). Wall-clock import time
+# is not asserted: it depends on the machine, and the heavy packages are what cost it.
+#
+# Run: python -m pytest -q tests/test_import_budget.py
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("torch", "sentence_transformers", "transformers", "openai")
+
+MODULES = [
+    "components.signal_scorer",
+    "components.scoring_utils",
+    "components.deduplicator",
+    "components.dedup_store",
+    "components.record_stream",
+    "components.insight_columns",
+    "components.bm25_index",
+    "components.ann_index",
+    "components.embedding_store",
+    "components.hybrid_retrieval",
+    "components.query_encoder",
+    "components.retriever_registry",
+    "components.trend_detector",
+    "components.llm_scheduler",
+    "pipeline.orchestrator",
+]
+
+# Any attribute of a stub package is a dummy class, so `from torch import nn` succeeds
+_STUB = """
+class _Stub:
+    def __init__(self, *args, **kwargs):
+        pass
+
+def __getattr__(name):
+    return _Stub
+"""
+
+_PROBE = """
+import json, sys
+import {module}
+print(json.dumps({{
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+@pytest.fixture(scope="module")
+def stub_path(tmp_path_factory):
+    root = tmp_path_factory.mktemp("heavy_stubs")
+    for name in HEAVY:
+        (root / name).mkdir()
+        (root / name / "__init__.py").write_text(_STUB)
+    return str(root)
+
+
+def _import_in_subprocess(module, stub_path):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [stub_path, os.environ.get("PYTHONPATH")])))
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY)],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_import_is_light(module, stub_path):
+    result = _import_in_subprocess(module, stub_path)
+    assert result["heavy"] == [], f"{module} loads {result['heavy']} at import time"
@@ -0,0 +1,160 @@
+# test_llm_scheduler.py — LLMScheduler driving a real OpenAI client against a local fake server
+#
+# A ThreadingHTTPServer speaks just enough of the chat completions API for
+# OpenAI(base_url=...). The requested model name picks the server's behaviour ("rate-limited"
+# answers its first request with a 429 + Retry-After, "slow" takes SLOW seconds) and every
+# hit is logged, so the tests can check:
+#   1. A 429 is retried by the scheduler after the server's Retry-After (not its backoff)
+#   2. Identical requests in flight at the same time reach the server once
+#   3. The batch and interactive lanes draw on one RPM / TPM budget, while a busy batch
+#      lane does not hold up interactive calls
+#
+# Run: python -m pytest -q tests/test_llm_scheduler.py
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+openai = pytest.importorskip("openai")
+
+from components.llm_scheduler import LLMScheduler
+
+RETRY_AFTER = 0.3  # seconds the fake server asks for on a 429
+SLOW = 0.5  # seconds a "slow" completion takes
+USAGE = 40  # total_tokens the fake server reports per completion
+
+
+class FakeOpenAI:
+    """Chat completions at http://127.0.0.1:<port>/v1; logs (model, arrival time) per hit."""
+
+    def __init__(self):
+        self.hits = []
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                model = body["model"]
+                with server._lock:
+                    server.hits.append((model, time.monotonic()))
+                    n = sum(1 for m, _ in server.hits if m == model)
+                if model == "rate-limited" and n == 1:
+                    self._reply(429, {"error": {"message": "slow down", "type": "rate_limit"}},
+                                {"Retry-After": str(RETRY_AFTER)})
+                    return
+                if model == "slow":
+                    time.sleep(SLOW)
+                self._reply(200, {
+                    "id": f"chatcmpl-{n}",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": model,
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": f"{model} #{n}"},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": {"prompt_tokens": USAGE - 10, "completion_tokens": 10, "total_tokens": USAGE},
+                })
+
+            def _reply(self, status, payload, headers=None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def count(self, model):
+        with self._lock:
+            return sum(1 for m, _ in self.hits if m == model)
+
+
+@pytest.fixture
+def server():
+    fake = FakeOpenAI()
+    yield fake
+    fake.httpd.shutdown()
+    fake.httpd.server_close()
+
+
+@pytest.fixture
+def client(server):
+    # The scheduler owns retries, as with the clients in components/
+    return openai.OpenAI(base_url=server.base_url, api_key="test", max_retries=0)
+
+
+def _ask(model):
+    return {"model": model, "messages": [{"role": "user", "content": "hi"}], "max_tokens": 10}
+
+
+def _content(resp):
+    return resp.choices[0].message.content
+
+
+def test_429_is_retried_after_retry_after(server, client):
+    # A backoff of base_delay=30s would time the test out; Retry-After must win
+    sched = LLMScheduler(max_retries=2, base_delay=30.0)
+    start = time.monotonic()
+    resp = sched.complete(client, **_ask("rate-limited"))
+    elapsed = time.monotonic() - start
+
+    assert _content(resp) == "rate-limited #2"
+    assert server.count("rate-limited") == 2
+    assert sched.stats["retries"] == 1
+    assert RETRY_AFTER <= elapsed < RETRY_AFTER + 2.0
+
+
+def test_identical_inflight_requests_are_coalesced(server, client):
+    sched = LLMScheduler(max_concurrency=8)
+    futures = [sched.submit(client, **_ask("slow")) for _ in range(5)]
+    contents = {_content(f.result(timeout=10)) for f in futures}
+
+    assert contents == {"slow #1"}
+    assert server.count("slow") == 1
+    assert (sched.stats["requests"], sched.stats["coalesced"]) == (1, 4)
+
+
+@pytest.mark.parametrize("bucket", ["requests", "tokens"])
+def test_lanes_share_one_rate_budget(server, client, bucket):
+    batch = LLMScheduler(rpm=120, tpm=1200)  # refills 2 requests / 20 tokens per second; a call needs 1 / ~10
+    interactive = LLMScheduler(budget=batch)
+    assert interactive.requests is batch.requests and interactive.tokens is batch.tokens
+
+    # The batch lane spends the whole budget; the interactive call waits for the refill
+    drained = getattr(batch, bucket)
+    drained.acquire(drained.capacity)
+    start = time.monotonic()
+    interactive.complete(client, **_ask("fast"))
+    elapsed = time.monotonic() - start
+    assert 0.3 <= elapsed < 3.0
+
+    # Tokens are charged by the reported usage, whichever lane spent them
+    assert interactive.stats["tokens"] == USAGE
+
+
+def test_busy_batch_lane_does_not_block_interactive(server, client):
+    batch = LLMScheduler(max_concurrency=1)
+    interactive = LLMScheduler(budget=batch)
+
+    slow = batch.submit(client, **_ask("slow"))
+    while not server.count("slow"):
+        time.sleep(0.01)
+    start = time.monotonic()
+    interactive.complete(client, **_ask("fast"))
+    assert time.monotonic() - start < SLOW / 2
+    assert not slow.done()
+    slow.result(timeout=10)
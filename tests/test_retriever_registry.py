@@ -0,0 +1,76 @@
+# test_retriever_registry.py — RetrieverRegistry refreshes when a new artifact set fails to build
+#
+# Factories are plain callables that count their calls, so the tests check:
+#   1. While a refresh is failing, every caller keeps the current retriever and the
+#      broken key is rebuilt at most once per cooldown
+#   2. After the cooldown one caller retries, and a successful retry becomes current
+#   3. A failed first build (nothing to serve) re-raises its error without rebuilding
+#
+# Run: python -m pytest -q tests/test_retriever_registry.py
+
+import time
+
+import pytest
+
+from components.retriever_registry import RetrieverRegistry
+
+COOLDOWN = 0.3
+
+
+class Factory:
+    def __init__(self, result=None, error=None):
+        self.result, self.error, self.calls = result, error, 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def _wait_settled(registry, key):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        entry = registry.stats()["entries"].get(key)
+        if entry is not None and entry["ready"]:
+            return entry
+        time.sleep(0.01)
+    raise AssertionError(f"{key} never finished building")
+
+
+def test_failed_refresh_serves_current_and_waits_out_cooldown():
+    registry = RetrieverRegistry(retry_cooldown=COOLDOWN)
+    current = registry.acquire("v1", Factory(result="retriever v1"))
+    assert current.retriever == "retriever v1"
+
+    broken = Factory(error=RuntimeError("bad artifacts"))
+    first = registry.acquire("v2", broken)
+    assert (first.key, first.retriever) == ("v1", "retriever v1")
+    assert _wait_settled(registry, "v2")["failed"]
+
+    # Reruns from any session during the cooldown: no new builds
+    for _ in range(20):
+        lease = registry.acquire("v2", broken)
+        assert (lease.key, lease.retriever) == ("v1", "retriever v1")
+    assert broken.calls == 1
+
+    # After the cooldown one caller retries; a good build replaces v1
+    time.sleep(COOLDOWN)
+    fixed = Factory(result="retriever v2")
+    assert registry.acquire("v2", fixed).key == "v1"
+    assert not _wait_settled(registry, "v2")["failed"]
+    assert fixed.calls == 1
+    assert registry.acquire("v2", fixed).retriever == "retriever v2"
+    assert registry.stats()["current"] == "v2"
+
+
+def test_failed_first_build_reraises_until_cooldown():
+    registry = RetrieverRegistry(retry_cooldown=COOLDOWN)
+    broken = Factory(error=RuntimeError("no artifacts"))
+    for _ in range(3):
+        with pytest.raises(RuntimeError, match="no artifacts"):
+            registry.acquire("v1", broken)
+    assert broken.calls == 1
+
+    time.sleep(COOLDOWN)
+    assert registry.acquire("v1", Factory(result="retriever v1")).retriever == "retriever v1"
@@ -0,0 +1,219 @@
+# test_scrape_runtime.py — scrape_runtime against a local replay server of recorded responses
+#
+# Every request made through the shared HTTPAdapter is rerouted to a local HTTP server
+# that replays tests/fixtures/scrape_replay.json (recorded Reddit listings, RSS feeds and
+# Bluesky API responses, keyed by URL; a key with a query string matches requests carrying
+# those parameters, one without matches any query; anything unrecorded is a 404). The
+# server adds a fixed latency per response and logs (host, arrival time) for every
+# request, so the tests can check:
+#   1. run_sources() returns the same results, in the same order, concurrently as serially
+#   2. Each host's requests stay within its token bucket (rate + burst), however many
+#      sources hit it at once, and a slow host does not hold up the others
+#   3. run_bluesky_scraper() discovers accounts, filters and de-duplicates their posts
+#
+# Run: python -m pytest -q tests/test_scrape_runtime.py
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+import requests.adapters
+
+import utils.scrape_bluesky as bluesky
+import utils.scrape_runtime as rt
+from utils.scrape_news_rss import RSS_FEEDS, fetch_rss_feed
+from utils.scrape_reddit import get_subreddit_posts
+
+REPLAY_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "scrape_replay.json")
+LATENCY = 0.05  # seconds per replayed response
+
+REDDIT_RATE = (10.0, 1)  # reddit.com during the tests: 10 req/s, no burst
+OTHER_RATE = (50.0, 2)
+
+
+class ReplayServer:
+    """Serves recorded responses at http://127.0.0.1:<port>/<host><path>; logs every hit."""
+
+    def __init__(self, recorded):
+        # URL without query -> [(recorded params, entry)], most specific first
+        self.recorded = {}
+        for key, entry in recorded.items():
+            url, _, query = key.partition("?")
+            self.recorded.setdefault(url, []).append((set(parse_qsl(query)), entry))
+        for candidates in self.recorded.values():
+            candidates.sort(key=lambda c: -len(c[0]))
+        self.hits = []
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                host, _, path = url.path.lstrip("/").partition("/")
+                with server._lock:
+                    server.hits.append((host, time.monotonic()))
+                time.sleep(LATENCY)
+                entry = server.lookup(f"https://{host}/{path}", set(parse_qsl(url.query)))
+                if entry is None:
+                    entry = {"status": 404, "content_type": "text/plain", "body": "not recorded"}
+                data = entry["body"].encode("utf-8")
+                self.send_response(entry["status"])
+                self.send_header("Content-Type", entry["content_type"])
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def lookup(self, url, params):
+        for recorded, entry in self.recorded.get(url, []):
+            if recorded <= params:
+                return entry
+        return None
+
+    def times(self, host):
+        with self._lock:
+            return sorted(t for h, t in self.hits if h == host)
+
+
+@pytest.fixture
+def replay(monkeypatch):
+    with open(REPLAY_PATH, "r", encoding="utf-8") as f:
+        server = ReplayServer(json.load(f))
+
+    send = requests.adapters.HTTPAdapter.send
+
+    def replay_send(self, request, **kwargs):
+        url = urlsplit(request.url)
+        request.url = f"http://127.0.0.1:{server.port}/{url.hostname}{url.path}" + (f"?{url.query}" if url.query else "")
+        return send(self, request, **kwargs)
+
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", replay_send)
+    monkeypatch.setattr(rt, "HOST_RATES", {"reddit.com": REDDIT_RATE})
+    monkeypatch.setattr(rt, "DEFAULT_RATE", OTHER_RATE)
+    monkeypatch.setattr(rt, "_buckets", {})
+    rt.reset_http_stats()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
+
+
+def _reddit_source(subreddit):
+    def scrape():
+        return get_subreddit_posts(subreddit, sort="hot") + get_subreddit_posts(subreddit, sort="new")
+    return f"Reddit r/{subreddit}", scrape
+
+
+def _rss_source(name):
+    feed = next(f for f in RSS_FEEDS if f["name"] == name)
+    return name, lambda: fetch_rss_feed(feed)
+
+
+SOURCES = [
+    _reddit_source("Ebay"),
+    _rss_source("Beckett News"),
+    _reddit_source("Flipping"),
+    _rss_source("Just Collect Blog"),
+    _reddit_source("PSAcard"),
+]
+REDDIT_REQUESTS = 6
+RSS_HOSTS = ("www.beckett.com", "blog.justcollect.com")
+
+
+def _snapshot(results):
+    """(name, error, posts) per source, without the fetch-time _logged_date."""
+    return [
+        (r.name, r.error, [{k: v for k, v in p.items() if k != "_logged_date"} for p in r.posts])
+        for r in results
+    ]
+
+
+def _assert_within_bucket(times, rate, burst, slack=0.05):
+    """No window of requests is denser than `burst` plus `rate` per second allows
+    (slack absorbs thread-scheduling jitter between the client's bucket and the server)."""
+    for i in range(len(times)):
+        for j in range(i + 1, len(times)):
+            allowed = burst + rate * (times[j] - times[i] + slack)
+            assert j - i + 1 <= allowed, f"{j - i + 1} requests in {times[j] - times[i]:.3f}s"
+
+
+def test_concurrent_matches_sequential(replay):
+    sequential = rt.run_sources(SOURCES, workers=1)
+    rt._buckets.clear()
+    concurrent = rt.run_sources(SOURCES, workers=len(SOURCES))
+
+    assert [r.name for r in concurrent] == [name for name, _ in SOURCES]
+    assert all(r.error is None for r in sequential + concurrent)
+    assert all(r.posts for r in sequential)
+    assert _snapshot(concurrent) == _snapshot(sequential)
+
+
+def test_per_host_rate_limits(replay):
+    results = rt.run_sources(SOURCES, workers=len(SOURCES))
+    assert all(r.error is None and r.posts for r in results)
+
+    reddit = replay.times("www.reddit.com")
+    assert len(reddit) == REDDIT_REQUESTS
+    rate, burst = REDDIT_RATE
+    _assert_within_bucket(reddit, rate, burst)
+    assert reddit[-1] - reddit[0] >= (REDDIT_REQUESTS - burst) / rate * 0.9
+
+    # The RSS hosts have their own buckets: their feeds are not queued behind reddit.com
+    for host in RSS_HOSTS:
+        times = replay.times(host)
+        assert len(times) == 1
+        assert times[0] < reddit[-1]
+
+    stats = rt.http_stats()
+    assert stats["www.reddit.com"]["requests"] == REDDIT_REQUESTS
+    assert stats["www.reddit.com"]["statuses"] == {200: REDDIT_REQUESTS}
+
+
+def test_set_host_rate_paces_host(replay):
+    rt.set_host_rate("www.beckett.com", 5.0, 1)
+    feed = next(f for f in RSS_FEEDS if f["name"] == "Beckett News")
+    rt.run_sources([(f"Beckett {k}", lambda: fetch_rss_feed(feed)) for k in range(4)], workers=4)
+
+    times = replay.times("www.beckett.com")
+    assert len(times) == 4
+    _assert_within_bucket(times, 5.0, 1)
+    assert times[-1] - times[0] >= 3 / 5.0 * 0.9
+
+
+def test_bluesky_scraper(replay, monkeypatch, tmp_path):
+    save_path = tmp_path / "scraped_bluesky_posts.json"
+    monkeypatch.setattr(bluesky, "SAVE_PATH", str(save_path))
+    monkeypatch.setattr(bluesky, "ACCOUNT_SEARCH_TERMS", ["trading cards", "sports cards", "funko pop"])
+
+    posts = bluesky.run_bluesky_scraper()
+
+    # cardshop's off-topic and too-short posts are filtered, pokefan's repost of the
+    # vault post is de-duplicated, and slabking.com does not resolve (404)
+    by_url = {p["url"]: p for p in posts}
+    assert sorted(by_url) == [
+        "https://bsky.app/profile/cardshop.bsky.social/post/3kcs001",
+        "https://bsky.app/profile/pokefan.bsky.social/post/3kpf001",
+    ]
+    whatnot = by_url["https://bsky.app/profile/pokefan.bsky.social/post/3kpf001"]
+    assert whatnot["source"] == "Bluesky"
+    assert whatnot["username"] == "pokefan.bsky.social"
+    assert whatnot["post_date"] == "2026-10-01"
+    assert (whatnot["like_count"], whatnot["repost_count"], whatnot["reply_count"]) == (40, 1, 2)
+
+    with open(save_path, "r", encoding="utf-8") as f:
+        assert json.load(f) == posts
+
+    # 3 actor searches, 3 handle resolutions, 2 author feeds, all paced by one bucket
+    times = replay.times("public.api.bsky.app")
+    assert len(times) == 8
+    _assert_within_bucket(times, *OTHER_RATE)
+    assert rt.http_stats()["public.api.bsky.app"]["statuses"] == {200: 7, 404: 1}
@@ -1,20 +1,36 @@
 # adhoc_scrape.py — Comprehensive on-demand topic scraper for Ask AI follow-up
-# Scrapes 6 sources in parallel-style: Google News, Reddit, YouTube, Bluesky,
-# Twitter/X (via Google), and Bing News. Enriches with sentiment, persona,
-# signal strength, journey stage, and relevance ranking.
-import requests
-import json
+# Scrapes 6 sources: Google News, Reddit, YouTube, Bluesky, Twitter/X (via Google),
+# and Bing News. Enriches with sentiment, persona, signal strength, journey stage,
+# and relevance ranking.
+#
+# Every source × query variant is fired at once on a thread pool (fan-out) under one
+# global deadline (SS_ADHOC_DEADLINE): each search's posts are enriched as soon as it
+# lands, on_source() reports it to the UI, and searches still running at the deadline
+# are abandoned — so a scrape takes about as long as its slowest source, not the sum.
+#
+# New posts are appended to the ad-hoc log (utils/adhoc_store.py), deduplicated against
+# its URL / title key index — earlier posts are never re-read or rewritten.
 import os
 import re
 import time
 import math
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import List, Dict, Any, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from urllib.parse import quote
 from xml.etree import ElementTree as ET
 from collections import Counter
 
-ADHOC_PATH = "data/adhoc_scraped_posts.json"
+try:
+    from utils.scrape_runtime import http_get
+    from utils.adhoc_store import get_adhoc_store
+except ImportError:
+    from scrape_runtime import http_get
+    from adhoc_store import get_adhoc_store
+
+# Whole scrape must finish within this many seconds; a single request within REQUEST_TIMEOUT
+ADHOC_DEADLINE = float(os.getenv("SS_ADHOC_DEADLINE", "20"))
+REQUEST_TIMEOUT = 15
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -101,13 +117,13 @@ def _parse_rss_date(date_str: str) -> str:
 
 # ── Source scrapers ───────────────────────────────────────────────────
 
-def _scrape_google_news(query: str, max_results: int = 30) -> List[Dict[str, Any]]:
+def _scrape_google_news(query: str, max_results: int = 30, timeout: float = REQUEST_TIMEOUT) -> List[Dict[str, Any]]:
     """Scrape Google News RSS for a topic."""
     posts = []
     try:
         encoded = quote(query)
         rss_url = f"https://news.google.com/rss/search?q={encoded}&hl=en-US&gl=US&ceid=US:en"
-        r = requests.get(rss_url, headers=HEADERS, timeout=15)
+        r = http_get(rss_url, headers=HEADERS, timeout=timeout, retries=0, pace=False)
         if r.status_code != 200:
             return posts
         root = ET.fromstring(r.content)
@@ -143,13 +159,13 @@ def _scrape_google_news(query: str, max_results: int = 30) -> List[Dict[str, Any
     return posts
 
 
-def _scrape_bing_news(query: str, max_results: int = 25) -> List[Dict[str, Any]]:
+def _scrape_bing_news(query: str, max_results: int = 25, timeout: float = REQUEST_TIMEOUT) -> List[Dict[str, Any]]:
     """Scrape Bing News RSS for a topic — complementary to Google News."""
     posts = []
     try:
         encoded = quote(query)
         rss_url = f"https://www.bing.com/news/search?q={encoded}&format=rss"
-        r = requests.get(rss_url, headers=HEADERS, timeout=15)
+        r = http_get(rss_url, headers=HEADERS, timeout=timeout, retries=0, pace=False)
         if r.status_code != 200:
             return posts
         root = ET.fromstring(r.content)
@@ -185,13 +201,13 @@ def _scrape_bing_news(query: str, max_results: int = 25) -> List[Dict[str, Any]]
     return posts
 
 
-def _scrape_reddit_search(query: str, max_results: int = 30) -> List[Dict[str, Any]]:
+def _scrape_reddit_search(query: str, max_results: int = 30, timeout: float = REQUEST_TIMEOUT) -> List[Dict[str, Any]]:
     """Search Reddit for a topic via the public JSON API."""
     posts = []
     try:
         encoded = quote(query)
         url = f"https://www.reddit.com/search.json?q={encoded}&sort=relevance&limit={max_results}"
-        r = requests.get(url, headers={**HEADERS, "Accept": "application/json"}, timeout=15)
+        r = http_get(url, headers={**HEADERS, "Accept": "application/json"}, timeout=timeout, retries=0, pace=False)
         if r.status_code != 200:
             return posts
         data = r.json()
@@ -227,14 +243,14 @@ def _scrape_reddit_search(query: str, max_results: int = 30) -> List[Dict[str, A
     return posts
 
 
-def _scrape_twitter_via_google(query: str, max_results: int = 20) -> List[Dict[str, Any]]:
+def _scrape_twitter_via_google(query: str, max_results: int = 20, timeout: float = REQUEST_TIMEOUT) -> List[Dict[str, Any]]:
     """Scrape indexed tweets via Google News RSS (site:x.com query)."""
     posts = []
     try:
         gn_query = f"site:x.com OR site:twitter.com {query}"
         encoded = quote(gn_query)
         rss_url = f"https://news.google.com/rss/search?q={encoded}&hl=en-US&gl=US&ceid=US:en"
-        r = requests.get(rss_url, headers=HEADERS, timeout=15)
+        r = http_get(rss_url, headers=HEADERS, timeout=timeout, retries=0, pace=False)
         if r.status_code != 200:
             return posts
         root = ET.fromstring(r.content)
@@ -276,14 +292,14 @@ def _scrape_twitter_via_google(query: str, max_results: int = 20) -> List[Dict[s
     return posts
 
 
-def _scrape_youtube_rss(query: str, max_results: int = 15) -> List[Dict[str, Any]]:
+def _scrape_youtube_rss(query: str, max_results: int = 15, timeout: float = REQUEST_TIMEOUT) -> List[Dict[str, Any]]:
     """Search YouTube via Google News RSS (site:youtube.com) — no API key needed."""
     posts = []
     try:
         gn_query = f"site:youtube.com {query}"
         encoded = quote(gn_query)
         rss_url = f"https://news.google.com/rss/search?q={encoded}&hl=en-US&gl=US&ceid=US:en"
-        r = requests.get(rss_url, headers=HEADERS, timeout=15)
+        r = http_get(rss_url, headers=HEADERS, timeout=timeout, retries=0, pace=False)
         if r.status_code != 200:
             return posts
         root = ET.fromstring(r.content)
@@ -324,7 +340,7 @@ def _scrape_youtube_rss(query: str, max_results: int = 15) -> List[Dict[str, Any
     return posts
 
 
-def _scrape_bluesky(query: str, max_results: int = 25) -> List[Dict[str, Any]]:
+def _scrape_bluesky(query: str, max_results: int = 25, timeout: float = REQUEST_TIMEOUT) -> List[Dict[str, Any]]:
     """Search Bluesky public API — no auth required."""
     posts = []
     try:
@@ -335,7 +351,7 @@ def _scrape_bluesky(query: str, max_results: int = 25) -> List[Dict[str, Any]]:
             "User-Agent": HEADERS["User-Agent"],
             "Accept": "application/json",
         }
-        r = requests.get(url, params=params, headers=bsky_headers, timeout=15)
+        r = http_get(url, params=params, headers=bsky_headers, timeout=timeout, retries=0, pace=False)
         if r.status_code != 200:
             return posts
 
@@ -597,29 +613,77 @@ def _enrich(post: Dict[str, Any], query: str) -> Dict[str, Any]:
     return post
 
 
-# ── Persistence ───────────────────────────────────────────────────────
+# ── Fan-out ──────────────────────────────────────────────────────────
 
-def _load_existing() -> List[Dict[str, Any]]:
-    """Load existing adhoc posts."""
-    if os.path.exists(ADHOC_PATH):
-        try:
-            with open(ADHOC_PATH, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            pass
-    return []
+ScrapeJob = Tuple[str, str, Callable[..., List[Dict[str, Any]]]]  # (source, query, scraper)
 
 
-def _save(posts: List[Dict[str, Any]]):
-    """Save adhoc posts."""
-    os.makedirs(os.path.dirname(ADHOC_PATH) if os.path.dirname(ADHOC_PATH) else ".", exist_ok=True)
-    with open(ADHOC_PATH, "w", encoding="utf-8") as f:
-        json.dump(posts, f, ensure_ascii=False, indent=2)
+def _adhoc_jobs(topic: str, queries: List[str]) -> List[ScrapeJob]:
+    """Every (source, query) search of one ad-hoc scrape, in the order results are merged."""
+    jobs: List[ScrapeJob] = []
+    # 1. Google News — primary news source
+    jobs += [("Google News", q, _scrape_google_news) for q in queries[:3]]
+    # 2. Bing News — complementary news coverage
+    jobs += [("Bing News", q, _scrape_bing_news) for q in queries[:2]]
+    # 3. Reddit — community discussions
+    jobs += [("Reddit", q, _scrape_reddit_search) for q in queries[:2]]
+    # 4. Twitter/X — social pulse via Google indexing
+    jobs.append(("Twitter/X", topic, _scrape_twitter_via_google))
+    # 5. YouTube — video commentary
+    jobs.append(("YouTube", topic, _scrape_youtube_rss))
+    # 6. Bluesky — emerging social signals
+    jobs += [("Bluesky", q, _scrape_bluesky) for q in queries[:2]]
+    return jobs
+
+
+def _run_jobs(jobs: List[ScrapeJob], deadline: float, parallel: bool = True) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """Yield (job index, posts) as searches finish, until all are done or `deadline` passes.
+
+    Each request's timeout is capped at the time left, and searches still running at the
+    deadline are abandoned (their results are dropped; not-yet-started ones are cancelled).
+    """
+    stop_at = time.monotonic() + deadline
+
+    def call(job: ScrapeJob) -> List[Dict[str, Any]]:
+        _, query, scraper = job
+        timeout = max(1.0, min(REQUEST_TIMEOUT, stop_at - time.monotonic()))
+        return scraper(query, timeout=timeout)
+
+    if not parallel:
+        for index, job in enumerate(jobs):
+            if time.monotonic() >= stop_at:
+                return
+            yield index, call(job)
+        return
+
+    pool = ThreadPoolExecutor(max_workers=max(1, len(jobs)), thread_name_prefix="adhoc")
+    futures = {pool.submit(call, job): index for index, job in enumerate(jobs)}
+    pending = set(futures)
+    try:
+        while pending:
+            remaining = stop_at - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=futures.get):
+                try:
+                    yield futures[future], future.result()
+                except Exception as e:
+                    source, query, _ = jobs[futures[future]]
+                    print(f"  [WARN] {source} failed for '{query}': {e}")
+                    yield futures[future], []
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
 
 
 # ── Main entry point ─────────────────────────────────────────────────
 
-def run_adhoc_scrape(topic: str) -> Tuple[List[Dict[str, Any]], str]:
+def run_adhoc_scrape(
+    topic: str,
+    on_source: Optional[Callable[[str, str, List[Dict[str, Any]], int, int], None]] = None,
+    deadline: Optional[float] = None,
+    parallel: bool = True,
+) -> Tuple[List[Dict[str, Any]], str]:
     """
     Run a comprehensive ad-hoc scrape across 6 sources for a specific topic.
 
@@ -627,68 +691,38 @@ def run_adhoc_scrape(topic: str) -> Tuple[List[Dict[str, Any]], str]:
     Each post is enriched with sentiment, persona, journey stage, signal
     strength, and relevance ranking.
 
+    All searches run concurrently (parallel=False runs them one by one) and must finish
+    within `deadline` seconds (SS_ADHOC_DEADLINE); slower ones are dropped. As each search
+    lands, its enriched posts are passed to on_source(source, query, posts, done, total),
+    called from the calling thread.
+
     Returns:
         (new_posts, summary_message)
     """
     print(f"🔍 Ad-hoc scrape: '{topic}'")
+    deadline = ADHOC_DEADLINE if deadline is None else deadline
 
     queries = _expand_queries(topic)
     print(f"  📝 Query variants: {queries}")
 
-    all_posts = []
-    source_log = []
-
-    # 1. Google News — primary news source
-    for q in queries[:3]:
-        print(f"  📰 Google News: {q}")
-        posts = _scrape_google_news(q)
-        all_posts.extend(posts)
-        if posts:
-            source_log.append(f"Google News({len(posts)})")
-        time.sleep(0.3)
-
-    # 2. Bing News — complementary news coverage
-    for q in queries[:2]:
-        print(f"  🔎 Bing News: {q}")
-        posts = _scrape_bing_news(q)
-        all_posts.extend(posts)
-        if posts:
-            source_log.append(f"Bing News({len(posts)})")
-        time.sleep(0.3)
-
-    # 3. Reddit — community discussions
-    for q in queries[:2]:
-        print(f"  💬 Reddit: {q}")
-        posts = _scrape_reddit_search(q)
-        all_posts.extend(posts)
-        if posts:
-            source_log.append(f"Reddit({len(posts)})")
-        time.sleep(0.3)
-
-    # 4. Twitter/X — social pulse via Google indexing
-    print(f"  🐦 Twitter/X: {topic}")
-    tw_posts = _scrape_twitter_via_google(topic)
-    all_posts.extend(tw_posts)
-    if tw_posts:
-        source_log.append(f"Twitter/X({len(tw_posts)})")
-    time.sleep(0.3)
-
-    # 5. YouTube — video commentary
-    print(f"  🎥 YouTube: {topic}")
-    yt_posts = _scrape_youtube_rss(topic)
-    all_posts.extend(yt_posts)
-    if yt_posts:
-        source_log.append(f"YouTube({len(yt_posts)})")
-    time.sleep(0.3)
-
-    # 6. Bluesky — emerging social signals
-    for q in queries[:2]:
-        print(f"  🦋 Bluesky: {q}")
-        posts = _scrape_bluesky(q)
-        all_posts.extend(posts)
-        if posts:
-            source_log.append(f"Bluesky({len(posts)})")
-        time.sleep(0.3)
+    jobs = _adhoc_jobs(topic, queries)
+    results: List[Optional[List[Dict[str, Any]]]] = [None] * len(jobs)
+    started = time.monotonic()
+    done = 0
+    for index, posts in _run_jobs(jobs, deadline, parallel=parallel):
+        # Enrich each search's posts as soon as it lands, while the others are in flight
+        results[index] = [_enrich(p, topic) for p in posts]
+        done += 1
+        source, query, _ = jobs[index]
+        print(f"  ✓ {source}: {query} → {len(posts)} posts ({time.monotonic() - started:.1f}s)")
+        if on_source is not None:
+            on_source(source, query, results[index], done, len(jobs))
+
+    timed_out = [f"{source}: {query}" for (source, query, _), r in zip(jobs, results) if r is None]
+    if timed_out:
+        print(f"  ⏱️ Dropped {len(timed_out)} searches still running after {deadline:.0f}s: {timed_out}")
+    # Merged in job order (not completion order), so the result matches a serial run
+    all_posts = [p for r in results if r for p in r]
 
     # ── Deduplicate by URL or title ──
     seen = set()
@@ -699,23 +733,16 @@ def run_adhoc_scrape(topic: str) -> Tuple[List[Dict[str, Any]], str]:
             seen.add(key)
             unique.append(p)
 
-    # ── Enrich all posts ──
-    enriched = [_enrich(p, topic) for p in unique]
+    # ── Posts were enriched as their search finished ──
+    enriched = unique
 
     # ── Rank by relevance + signal strength ──
     enriched.sort(key=lambda x: (x.get("_relevance_score", 0) + x.get("signal_strength", 0)), reverse=True)
 
-    # ── Merge with existing adhoc data ──
-    existing = _load_existing()
-    existing_urls = {p.get("url", "") for p in existing if p.get("url")}
-    existing_titles = {p.get("title", "")[:80] for p in existing if p.get("title")}
-    new_posts = [
-        p for p in enriched
-        if (p.get("url", "") not in existing_urls)
-        and (p.get("title", "")[:80] not in existing_titles)
-    ]
-    merged = existing + new_posts
-    _save(merged)
+    # ── Append posts with an unseen URL and title to the adhoc log ──
+    store = get_adhoc_store()
+    new_posts = store.append(enriched)
+    total_stored = len(store)
 
     # ── Summary ──
     source_counts = Counter(p.get("source", "?") for p in new_posts)
@@ -729,10 +756,12 @@ def run_adhoc_scrape(topic: str) -> Tuple[List[Dict[str, Any]], str]:
         f"for \"{topic}\".\n\n"
         f"**By source:** {', '.join(summary_parts) if summary_parts else 'no new posts found'}.\n\n"
         f"**Sentiment mix:** {', '.join(sentiment_parts) if sentiment_parts else 'n/a'}.\n\n"
-        f"Total adhoc dataset: **{len(merged)} posts**."
+        f"Total adhoc dataset: **{total_stored} posts**."
     )
+    if timed_out:
+        summary += f"\n\n_{len(timed_out)} of {len(jobs)} searches were still running after {deadline:.0f}s and were skipped._"
 
-    print(f"  ✅ {len(new_posts)} new posts added from {sources_hit} sources (total adhoc: {len(merged)})")
+    print(f"  ✅ {len(new_posts)} new posts added from {sources_hit} sources (total adhoc: {total_stored})")
     return new_posts, summary
 
 
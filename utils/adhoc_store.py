@@ -0,0 +1,235 @@
+# adhoc_store.py — Append-only log of ad-hoc scraped posts with a persistent URL / title key index
+#
+# Every Ask AI ad-hoc scrape used to re-read all of data/adhoc_scraped_posts.json to build
+# its URL / title sets, then rewrite the whole file (indent=2) with the new posts added —
+# so each scrape cost grew with every scrape before it. Instead:
+#   1. Posts are appended to data/adhoc_scraped_posts.jsonl, one JSON object per line;
+#      existing lines are never rewritten
+#   2. A SQLite WAL index (data/adhoc_index.sqlite) holds each post's URL, title key and
+#      byte range in the log, so the dedupe check is a key lookup and the post count a
+#      COUNT(*), neither of which reads the log
+#   3. Filtering and appending happen in one write transaction, so concurrent scrapes
+#      (sessions or processes) never store the same post twice
+#   4. Readers cache the posts they have read and only parse lines appended since
+#      (load_adhoc_posts), so an app rerun does not re-parse the log
+#
+# The old JSON file, if present, is imported into the log once. Lines appended by a run
+# that crashed before indexing them are indexed on the next open; a torn last line is
+# cut off and a corrupt complete line is skipped with a warning.
+#
+# Usage:
+#   store = get_adhoc_store()
+#   new_posts = store.append(posts)        # only posts with an unseen URL and title
+#   total = len(store)
+#   posts = load_adhoc_posts()             # every stored post, in append order
+
+import os
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+ADHOC_LOG_PATH = os.path.join("data", "adhoc_scraped_posts.jsonl")
+ADHOC_INDEX_PATH = os.path.join("data", "adhoc_index.sqlite")
+# Pre-log store (whole JSON array rewritten per scrape); imported once
+ADHOC_LEGACY_PATH = os.path.join("data", "adhoc_scraped_posts.json")
+
+TITLE_KEY_CHARS = 80
+
+
+def post_keys(post: Dict[str, Any]) -> Tuple[str, str]:
+    """(url, title key) a post is deduplicated by; "" when the post has none."""
+    return post.get("url", "") or "", (post.get("title", "") or "")[:TITLE_KEY_CHARS]
+
+
+def _parse_line(line: bytes) -> Optional[Dict[str, Any]]:
+    """The post on a log line, or None when the line is not a JSON object."""
+    try:
+        post = json.loads(line)
+    except ValueError:
+        return None
+    return post if isinstance(post, dict) else None
+
+
+class AdhocStore:
+    """Append-only JSONL log of ad-hoc posts plus a SQLite index of their URL / title keys."""
+
+    def __init__(
+        self,
+        log_path: str = ADHOC_LOG_PATH,
+        index_path: str = ADHOC_INDEX_PATH,
+        legacy_path: Optional[str] = ADHOC_LEGACY_PATH,
+    ):
+        self.log_path = log_path
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+        os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(index_path, check_same_thread=False, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS posts ("
+            " start INTEGER PRIMARY KEY, end INTEGER NOT NULL, url TEXT NOT NULL, title TEXT NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS posts_url ON posts (url) WHERE url != ''")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS posts_title ON posts (title) WHERE title != ''")
+
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                if not os.path.exists(log_path) and legacy_path and os.path.exists(legacy_path):
+                    self._import_legacy(legacy_path)
+                self._index_tail()
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    # ── Log maintenance (write transaction held) ──
+
+    def _indexed_end(self) -> int:
+        return self.conn.execute("SELECT COALESCE(MAX(end), 0) FROM posts").fetchone()[0]
+
+    def _import_legacy(self, path: str):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                posts = json.load(f)
+        except Exception as e:
+            print(f"[ADHOC STORE] Could not import {path}: {e}")
+            return
+        if isinstance(posts, list):
+            self._append_locked([p for p in posts if isinstance(p, dict)])
+            print(f"[ADHOC STORE] Imported {len(posts)} posts from {path}")
+
+    def _index_tail(self):
+        """Index log lines written after the last indexed one.
+
+        A torn last line (no newline: a crashed append) is truncated away, back to the end
+        of the last complete line. A complete line that is not a JSON object is skipped with
+        a warning and never indexed, so read() does not return it.
+        """
+        if not os.path.exists(self.log_path):
+            return
+        end = self._indexed_end()
+        if os.path.getsize(self.log_path) <= end:
+            return
+        rows = []
+        with open(self.log_path, "rb+") as f:
+            f.seek(end)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    print(f"[ADHOC STORE] {self.log_path}: truncating torn last line at byte {end}")
+                    f.truncate(end)
+                    break
+                start, end = end, end + len(line)
+                if not line.strip():
+                    continue
+                post = _parse_line(line)
+                if post is None:
+                    print(f"[ADHOC STORE] {self.log_path}: skipping corrupt line at bytes {start}-{end}")
+                    continue
+                rows.append((start, end) + post_keys(post))
+        self.conn.executemany("INSERT INTO posts (start, end, url, title) VALUES (?, ?, ?, ?)", rows)
+
+    def _known(self, column: str, keys: List[str]) -> set:
+        found = set()
+        for i in range(0, len(keys), 900):
+            chunk = keys[i:i + 900]
+            rows = self.conn.execute(
+                f"SELECT {column} FROM posts WHERE {column} IN ({','.join('?' * len(chunk))})", chunk
+            )
+            found.update(r[0] for r in rows)
+        return found
+
+    def _filter_new(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        keys = [post_keys(p) for p in posts]
+        urls = self._known("url", [u for u, _ in keys if u])
+        titles = self._known("title", [t for _, t in keys if t])
+        return [p for p, (url, title) in zip(posts, keys) if url not in urls and title not in titles]
+
+    def _append_locked(self, posts: List[Dict[str, Any]]):
+        if not posts:
+            return
+        end = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        rows, lines = [], []
+        for post in posts:
+            line = (json.dumps(post, ensure_ascii=False) + "\n").encode("utf-8")
+            rows.append((end, end + len(line)) + post_keys(post))
+            lines.append(line)
+            end += len(line)
+        with open(self.log_path, "ab") as f:
+            f.write(b"".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        self.conn.executemany("INSERT INTO posts (start, end, url, title) VALUES (?, ?, ?, ?)", rows)
+
+    # ── Public API ──
+
+    def append(self, posts: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Append the posts whose URL and title key are both not stored yet; returns those posts.
+
+        Posts are checked against what is stored, not against each other — callers
+        deduplicate a batch themselves (as run_adhoc_scrape does by URL or title).
+        """
+        posts = list(posts)
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._index_tail()  # another process may have appended since
+                new = self._filter_new(posts)
+                self._append_locked(new)
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return new
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def read(self, start: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """Posts indexed at or after byte offset `start`, and the offset to resume from."""
+        with self._lock:
+            end = self._indexed_end()
+        if end <= start:
+            return [], start
+        with open(self.log_path, "rb") as f:
+            f.seek(start)
+            data = f.read(end - start)
+        # Corrupt lines were skipped (and reported) when indexed; they are skipped here too
+        posts = (_parse_line(line) for line in data.splitlines() if line.strip())
+        return [p for p in posts if p is not None], end
+
+
+_stores: Dict[Tuple[str, str], AdhocStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_adhoc_store(log_path: str = ADHOC_LOG_PATH, index_path: str = ADHOC_INDEX_PATH) -> AdhocStore:
+    """Process-wide AdhocStore for a log (shared by scrapes and Streamlit sessions)."""
+    with _stores_lock:
+        store = _stores.get((log_path, index_path))
+        if store is None:
+            store = _stores[(log_path, index_path)] = AdhocStore(log_path, index_path)
+        return store
+
+
+_cache: Dict[str, Tuple[int, List[Dict[str, Any]]]] = {}
+_cache_lock = threading.Lock()
+
+
+def load_adhoc_posts(log_path: str = ADHOC_LOG_PATH, index_path: str = ADHOC_INDEX_PATH) -> List[Dict[str, Any]]:
+    """Every stored post in append order; lines already read by this process are not re-parsed.
+
+    Returns a new list of fresh dicts on each call, so callers may modify them.
+    """
+    store = get_adhoc_store(log_path, index_path)
+    with _cache_lock:
+        offset, posts = _cache.get(log_path, (0, []))
+        added, offset = store.read(offset)
+        if added:
+            posts = posts + added
+            _cache[log_path] = (offset, posts)
+    return [dict(p) for p in posts]
@@ -0,0 +1,236 @@
+# fetch_state.py — Per-source fetch state for incremental scraping (validators, cursors, seen items)
+#
+# Every weekly scrape used to refetch every listing and feed in full, although most items
+# were collected the week before. Each scraper now keeps a FetchState (one SQLite WAL file,
+# rows keyed by source) and only pays for what changed:
+#   1. Conditional GET: the ETag / Last-Modified of each URL is stored with a compressed
+#      copy of its body; get() sends If-None-Match / If-Modified-Since and replays the
+#      stored body on 304, so parsers see the same response they would have downloaded
+#   2. Cursors: newest created_utc per subreddit / search query (and when a slow-moving
+#      listing was last refreshed), so listings are paginated only until known items
+#   3. Seen sets: RSS GUIDs already collected, so known feed items are skipped
+#   4. Items that were not refetched are carried forward from the scraper's previous
+#      output file (carry_forward), so the saved output stays complete
+#
+# Writes are buffered and only reach the database on commit(), which scrapers call after
+# their output file is saved — a crashed run never marks unsaved items as known. A source
+# with no previous output (first run, deleted file) or SS_SCRAPE_INCREMENTAL=0 fetches
+# everything, but still records state for the next run.
+#
+# Usage:
+#   previous = load_previous(SAVE_PATH)
+#   state = FetchState("reddit", enabled=bool(previous))
+#   res = state.get(url, params=params, headers=HEADERS, timeout=15)
+#   since = state.cursor(f"new:{subreddit}", 0)
+#   posts = carry_forward(fresh_posts, previous, key=lambda p: p.get("post_id"))
+#   ...save posts...; state.commit()
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from requests.models import PreparedRequest
+
+try:
+    from utils.scrape_runtime import http_get
+except ImportError:
+    from scrape_runtime import http_get
+
+FETCH_STATE_PATH = os.path.join("data", "fetch_state.sqlite")
+
+# Slow-moving listings (e.g. top-of-year) are refetched in full this often
+FULL_REFRESH_DAYS = float(os.getenv("SS_SCRAPE_FULL_REFRESH_DAYS", "28"))
+# Carried-forward listing items older than this (by post_date) are dropped
+RETENTION_DAYS = int(os.getenv("SS_SCRAPE_RETENTION_DAYS", "365"))
+INCREMENTAL = os.getenv("SS_SCRAPE_INCREMENTAL", "1") != "0"
+
+
+def request_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """The full URL a GET for (url, params) requests — the validator cache key."""
+    prepared = PreparedRequest()
+    prepared.prepare_url(url, params)
+    return prepared.url
+
+
+class FetchState:
+    """Validators, cursors and seen items of one scraper source, buffered until commit()."""
+
+    def __init__(self, source: str, path: str = FETCH_STATE_PATH, enabled: bool = True):
+        self.source = source
+        self.enabled = enabled and INCREMENTAL
+        self.stats = {"requests": 0, "not_modified": 0}
+        self._validators: Dict[str, tuple] = {}
+        self._cursors: Dict[str, Any] = {}
+        self._seen: Set[str] = set()
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS validators ("
+            " source TEXT NOT NULL, url TEXT NOT NULL, etag TEXT, last_modified TEXT, body BLOB,"
+            " PRIMARY KEY (source, url))"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cursors ("
+            " source TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, updated_at TEXT,"
+            " PRIMARY KEY (source, key))"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            " source TEXT NOT NULL, item TEXT NOT NULL, first_seen TEXT,"
+            " PRIMARY KEY (source, item))"
+        )
+        self.conn.commit()
+
+    # ── Conditional GET ──
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None, **kwargs):
+        """http_get() with the stored validators; a 304 comes back as the stored 200 body."""
+        key = request_key(url, params)
+        stored = None
+        if self.enabled:
+            with self._lock:
+                stored = self._validators.get(key) or self.conn.execute(
+                    "SELECT etag, last_modified, body FROM validators WHERE source = ? AND url = ?",
+                    (self.source, key),
+                ).fetchone()
+        headers = dict(headers or {})
+        if stored is not None and stored[2] is not None:
+            if stored[0]:
+                headers["If-None-Match"] = stored[0]
+            if stored[1]:
+                headers["If-Modified-Since"] = stored[1]
+
+        res = http_get(url, params=params, headers=headers, **kwargs)
+        with self._lock:
+            self.stats["requests"] += 1
+            if res.status_code == 304 and stored is not None and stored[2] is not None:
+                self.stats["not_modified"] += 1
+                res.status_code = 200
+                res._content = zlib.decompress(stored[2])
+                res.from_cache = True
+                return res
+            etag, last_modified = res.headers.get("ETag"), res.headers.get("Last-Modified")
+            if res.status_code == 200 and (etag or last_modified):
+                self._validators[key] = (etag, last_modified, zlib.compress(res.content))
+        res.from_cache = False
+        return res
+
+    # ── Cursors ──
+
+    def cursor(self, key: str, default: Any = None) -> Any:
+        """Last committed value of a cursor (default when disabled or never set)."""
+        if not self.enabled:
+            return default
+        with self._lock:
+            if key in self._cursors:
+                return self._cursors[key]
+            row = self.conn.execute(
+                "SELECT value FROM cursors WHERE source = ? AND key = ?", (self.source, key)
+            ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_cursor(self, key: str, value: Any):
+        with self._lock:
+            self._cursors[key] = value
+
+    def due(self, key: str, days: float = FULL_REFRESH_DAYS) -> bool:
+        """True when the listing `key` was last refreshed more than `days` ago (or never)."""
+        last = self.cursor(f"refreshed:{key}")
+        return last is None or time.time() - float(last) >= days * 86400
+
+    def mark_refreshed(self, key: str):
+        self.set_cursor(f"refreshed:{key}", time.time())
+
+    # ── Seen items ──
+
+    def known(self, items: Iterable[str]) -> Set[str]:
+        """The subset of `items` collected by an earlier run."""
+        items = [i for i in dict.fromkeys(items) if i]
+        if not self.enabled or not items:
+            return set()
+        found: Set[str] = set()
+        with self._lock:
+            for start in range(0, len(items), 900):
+                chunk = items[start:start + 900]
+                rows = self.conn.execute(
+                    f"SELECT item FROM seen WHERE source = ? AND item IN ({','.join('?' * len(chunk))})",
+                    [self.source] + chunk,
+                )
+                found.update(r[0] for r in rows)
+        return found
+
+    def mark_seen(self, items: Iterable[str]):
+        with self._lock:
+            self._seen.update(i for i in items if i)
+
+    # ── Persist ──
+
+    def commit(self):
+        """Write the buffered state; call once the scraper's output is saved."""
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO validators (source, url, etag, last_modified, body) VALUES (?, ?, ?, ?, ?)",
+                [(self.source, k, e, m, b) for k, (e, m, b) in self._validators.items()],
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO cursors (source, key, value, updated_at) VALUES (?, ?, ?, ?)",
+                [(self.source, k, json.dumps(v), now) for k, v in self._cursors.items()],
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen (source, item, first_seen) VALUES (?, ?, ?)",
+                [(self.source, i, now) for i in self._seen],
+            )
+            self.conn.commit()
+            self._validators.clear()
+            self._cursors.clear()
+            self._seen.clear()
+        if self.stats["not_modified"]:
+            print(f"  [FETCH STATE] {self.source}: {self.stats['not_modified']}/{self.stats['requests']} requests not modified")
+
+
+def load_previous(save_path: str) -> List[Dict[str, Any]]:
+    """The posts a scraper saved last run ([] if missing or unreadable)."""
+    if not INCREMENTAL or not os.path.exists(save_path):
+        return []
+    try:
+        with open(save_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, list) else []
+    except Exception as e:
+        print(f"  [FETCH STATE] Could not read {save_path}: {e}")
+        return []
+
+
+def carry_forward(
+    fresh: List[Dict[str, Any]],
+    previous: List[Dict[str, Any]],
+    key: Callable[[Dict[str, Any]], Any],
+    retention_days: Optional[int] = RETENTION_DAYS,
+) -> List[Dict[str, Any]]:
+    """`fresh` plus the previous posts it does not replace, minus those past retention.
+
+    A post is dated by post_date, else by when it was logged (_logged_date); undated posts
+    are kept. retention_days=None keeps every previous post.
+    """
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=retention_days)).strftime("%Y-%m-%d") if retention_days is not None else ""
+    keys = {key(p) for p in fresh}
+    keys.discard(None)
+    keys.discard("")
+    carried = []
+    for p in previous:
+        if key(p) in keys:
+            continue
+        date = p.get("post_date") or (p.get("_logged_date") or "")[:10]
+        if not date or date >= cutoff:
+            carried.append(p)
+    return fresh + carried
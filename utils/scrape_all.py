@@ -1,11 +1,17 @@
 # scrape_all.py — Master scraper that runs all sources and consolidates data
+# Sources run concurrently on utils/scrape_runtime (per-host rate limits, pooled HTTP); --serial runs them in turn
 import json
 import os
 import time
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 # Import individual scrapers
+try:
+    from utils.scrape_runtime import format_http_stats, reset_http_stats, run_sources
+except ImportError:
+    from scrape_runtime import format_http_stats, reset_http_stats, run_sources
+
 try:
     from utils.scrape_reddit import run_reddit_scraper
 except ImportError:
@@ -142,173 +148,64 @@ def run_all_scrapers(
     include_forums_blogs: bool = True,
     include_podcasts: bool = True,
     include_new_sources: bool = True,
+    parallel: bool = True,
+    workers: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
-    """Run all scrapers and consolidate results."""
+    """Run all scrapers (concurrently unless parallel=False) and consolidate results."""
     
     print("=" * 60)
     print("🚀 SIGNALSYNTH MASTER SCRAPER")
     print(f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 60)
     
+    sources = [
+        (include_reddit, "Reddit", "📍 REDDIT", lambda: run_reddit_scraper(include_comments=True, include_search=True)),
+        (include_bluesky, "Bluesky", "📍 BLUESKY", run_bluesky_scraper),
+        (include_ebay_forums, "eBay Forums", "📍 EBAY FORUMS", run_ebay_forums_scraper),
+        (include_competitors, "Competitors", "📍 COMPETITORS & SUBSIDIARIES", run_competitor_scraper),
+        # Cllct.com News
+        (include_cllct, "Cllct", "📍 CLLCT.COM NEWS", run_cllct_scraper),
+        # RSS News Feeds (Beckett, Sports Collectors Daily, Cardlines, etc.)
+        (include_news_rss, "News RSS", "📍 NEWS RSS FEEDS", run_news_rss_scraper),
+        # Twitter/X (via Google News indexed tweets)
+        (include_twitter, "Twitter/X", "\U0001f4cd TWITTER/X", run_twitter_scraper),
+        # YouTube (transcripts + comments)
+        (include_youtube, "YouTube", "\U0001f3ac YOUTUBE", run_youtube_scraper),
+        # Forums & Blogs (Bench Trading, Alt.xyz, Net54, COMC, Whatnot, Fanatics, etc.)
+        (include_forums_blogs, "Forums & Blogs", "\U0001f4ac FORUMS & BLOGS", run_forums_blogs_scraper),
+        # Podcasts (Sports Card Nonsense, Hobby Wire, Card Shop Life, etc.)
+        (include_podcasts, "Podcasts", "🎙️ PODCASTS", run_podcast_scraper),
+        # New Sources (Trustpilot, Goldin Blog, Heritage Blog, Card Ladder, PSA Forums, etc.)
+        (include_new_sources, "New Sources", "🆕 NEW SOURCES", run_new_sources_scraper),
+        # Blowout Cards (indirect via Reddit, Bluesky, Google News)
+        (include_blowout, "Blowout (indirect)", "📍 BLOWOUT CARDS (INDIRECT)", run_blowout_scraper),
+    ]
+    sources = [(name, header, fn) for enabled, name, header, fn in sources if enabled]
+    reset_http_stats()
+
+    # Sources run concurrently (each request paced by its host's token bucket); results
+    # are collected in the order above, so the output matches a serial run
+    if parallel:
+        print(f"\n⚡ Running {len(sources)} sources concurrently...")
+        results = run_sources([(name, fn) for name, _, fn in sources], workers=workers)
+    else:
+        results = []
+        for name, header, fn in sources:
+            print("\n" + "=" * 40)
+            print(header)
+            print("=" * 40)
+            results.extend(run_sources([(name, fn)], workers=1))
+
     all_posts = []
     source_counts = {}
-    
-    # Reddit
-    if include_reddit:
-        print("\n" + "=" * 40)
-        print("📍 REDDIT")
-        print("=" * 40)
-        try:
-            posts = run_reddit_scraper(include_comments=True, include_search=True)
-            all_posts.extend(posts)
-            source_counts["Reddit"] = len(posts)
-        except Exception as e:
-            print(f"❌ Reddit scraper failed: {e}")
-            source_counts["Reddit"] = 0
-    
-    # Bluesky
-    if include_bluesky:
-        print("\n" + "=" * 40)
-        print("📍 BLUESKY")
-        print("=" * 40)
-        try:
-            posts = run_bluesky_scraper()
-            all_posts.extend(posts)
-            source_counts["Bluesky"] = len(posts)
-        except Exception as e:
-            print(f"❌ Bluesky scraper failed: {e}")
-            source_counts["Bluesky"] = 0
-    
-    # eBay Forums
-    if include_ebay_forums:
-        print("\n" + "=" * 40)
-        print("📍 EBAY FORUMS")
-        print("=" * 40)
-        try:
-            posts = run_ebay_forums_scraper()
-            all_posts.extend(posts)
-            source_counts["eBay Forums"] = len(posts)
-        except Exception as e:
-            print(f"❌ eBay Forums scraper failed: {e}")
-            source_counts["eBay Forums"] = 0
-    
-    # Competitors & Subsidiaries
-    if include_competitors:
-        print("\n" + "=" * 40)
-        print("📍 COMPETITORS & SUBSIDIARIES")
-        print("=" * 40)
-        try:
-            posts = run_competitor_scraper()
-            all_posts.extend(posts)
-            source_counts["Competitors"] = len(posts)
-        except Exception as e:
-            print(f"❌ Competitor scraper failed: {e}")
-            source_counts["Competitors"] = 0
-    
-    # Cllct.com News
-    if include_cllct:
-        print("\n" + "=" * 40)
-        print("📍 CLLCT.COM NEWS")
-        print("=" * 40)
-        try:
-            posts = run_cllct_scraper()
-            all_posts.extend(posts)
-            source_counts["Cllct"] = len(posts)
-        except Exception as e:
-            print(f"❌ Cllct scraper failed: {e}")
-            source_counts["Cllct"] = 0
-    
-    # RSS News Feeds (Beckett, Sports Collectors Daily, Cardlines, etc.)
-    if include_news_rss:
-        print("\n" + "=" * 40)
-        print("📍 NEWS RSS FEEDS")
-        print("=" * 40)
-        try:
-            posts = run_news_rss_scraper()
-            all_posts.extend(posts)
-            source_counts["News RSS"] = len(posts)
-        except Exception as e:
-            print(f"❌ News RSS scraper failed: {e}")
-            source_counts["News RSS"] = 0
-    
-    # Twitter/X (via Google News indexed tweets)
-    if include_twitter:
-        print("\n" + "=" * 40)
-        print("\U0001f4cd TWITTER/X")
-        print("=" * 40)
-        try:
-            posts = run_twitter_scraper()
-            all_posts.extend(posts)
-            source_counts["Twitter/X"] = len(posts)
-        except Exception as e:
-            print(f"\u274c Twitter/X scraper failed: {e}")
-            source_counts["Twitter/X"] = 0
-    
-    # YouTube (transcripts + comments)
-    if include_youtube:
-        print("\n" + "=" * 40)
-        print("\U0001f3ac YOUTUBE")
-        print("=" * 40)
-        try:
-            posts = run_youtube_scraper()
-            all_posts.extend(posts)
-            source_counts["YouTube"] = len(posts)
-        except Exception as e:
-            print(f"\u274c YouTube scraper failed: {e}")
-            source_counts["YouTube"] = 0
-    
-    # Forums & Blogs (Bench Trading, Alt.xyz, Net54, COMC, Whatnot, Fanatics, etc.)
-    if include_forums_blogs:
-        print("\n" + "=" * 40)
-        print("\U0001f4ac FORUMS & BLOGS")
-        print("=" * 40)
-        try:
-            posts = run_forums_blogs_scraper()
-            all_posts.extend(posts)
-            source_counts["Forums & Blogs"] = len(posts)
-        except Exception as e:
-            print(f"\u274c Forums & Blogs scraper failed: {e}")
-            source_counts["Forums & Blogs"] = 0
-    
-    # Podcasts (Sports Card Nonsense, Hobby Wire, Card Shop Life, etc.)
-    if include_podcasts:
-        print("\n" + "=" * 40)
-        print("🎙️ PODCASTS")
-        print("=" * 40)
-        try:
-            posts = run_podcast_scraper()
-            all_posts.extend(posts)
-            source_counts["Podcasts"] = len(posts)
-        except Exception as e:
-            print(f"❌ Podcast scraper failed: {e}")
-            source_counts["Podcasts"] = 0
-
-    # New Sources (Trustpilot, Goldin Blog, Heritage Blog, Card Ladder, PSA Forums, etc.)
-    if include_new_sources:
-        print("\n" + "=" * 40)
-        print("🆕 NEW SOURCES")
-        print("=" * 40)
-        try:
-            posts = run_new_sources_scraper()
-            all_posts.extend(posts)
-            source_counts["New Sources"] = len(posts)
-        except Exception as e:
-            print(f"❌ New sources scraper failed: {e}")
-            source_counts["New Sources"] = 0
+    source_seconds = {}
+    for result in results:
+        if result.error is not None:
+            print(f"❌ {result.name} scraper failed: {result.error}")
+        all_posts.extend(result.posts)
+        source_counts[result.name] = len(result.posts)
+        source_seconds[result.name] = result.seconds
 
-    # Blowout Cards (indirect via Reddit, Bluesky, Google News)
-    if include_blowout:
-        print("\n" + "=" * 40)
-        print("📍 BLOWOUT CARDS (INDIRECT)")
-        print("=" * 40)
-        try:
-            posts = run_blowout_scraper()
-            all_posts.extend(posts)
-            source_counts["Blowout (indirect)"] = len(posts)
-        except Exception as e:
-            print(f"❌ Blowout indirect scraper failed: {e}")
-            source_counts["Blowout (indirect)"] = 0
-    
     # Consolidate and deduplicate
     print("\n" + "=" * 40)
     print("📊 CONSOLIDATING RESULTS")
@@ -331,7 +228,10 @@ def run_all_scrapers(
     print("=" * 60)
     print(f"\n📊 Posts by source:")
     for source, count in sorted(source_counts.items(), key=lambda x: -x[1]):
-        print(f"  {source}: {count:,}")
+        print(f"  {source}: {count:,} ({source_seconds[source]:.0f}s)")
+    
+    print(f"\n🌐 HTTP by host:")
+    print(format_http_stats())
     
     print(f"\n📦 Total raw posts: {len(all_posts):,}")
     print(f"✅ Unique posts after dedup: {len(unique):,}")
@@ -365,6 +265,8 @@ if __name__ == "__main__":
     parser.add_argument("--no-forums-blogs", action="store_true", help="Skip Forums & Blogs scraping")
     parser.add_argument("--no-podcasts", action="store_true", help="Skip Podcast scraping")
     parser.add_argument("--no-new-sources", action="store_true", help="Skip new sources scraping")
+    parser.add_argument("--serial", action="store_true", help="Run the sources one after another")
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent sources (default: all)")
     
     args = parser.parse_args()
     
@@ -380,4 +282,6 @@ if __name__ == "__main__":
         include_forums_blogs=not args.no_forums_blogs,
         include_podcasts=not args.no_podcasts,
         include_new_sources=not args.no_new_sources,
+        parallel=not args.serial,
+        workers=args.workers,
     )
@@ -5,16 +5,19 @@
 #   2. Bluesky (posts mentioning Blowout)
 #   3. Google News RSS (Blowout Cards news articles)
 
-import requests
 import json
 import os
-import time
 import re
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
 from urllib.parse import quote
 
+try:
+    from utils.scrape_runtime import http_get
+except ImportError:
+    from scrape_runtime import http_get
+
 SAVE_PATH = "data/scraped_blowout_posts.json"
 
 HEADERS = {
@@ -55,14 +58,9 @@ BLUESKY_SEARCH_TERMS = [
 
 
 def _reddit_get(url: str, params: dict = None) -> dict:
-    """Make a Reddit JSON API request with rate limiting."""
+    """Make a Reddit JSON API request (http_get handles 429 / Retry-After backoff)."""
     try:
-        r = requests.get(url, headers=HEADERS, params=params, timeout=15)
-        if r.status_code == 429:
-            wait = int(r.headers.get("Retry-After", 60))
-            print(f"  [RATE LIMITED] Waiting {wait}s...")
-            time.sleep(wait)
-            r = requests.get(url, headers=HEADERS, params=params, timeout=15)
+        r = http_get(url, headers=HEADERS, params=params, timeout=15)
         if r.status_code == 200:
             return r.json()
     except Exception as e:
@@ -119,7 +117,6 @@ def scrape_reddit_blowout() -> List[Dict[str, Any]]:
                 "_blowout_source": "reddit_search",
             })
 
-        time.sleep(1.5)
 
     # 2. Search within specific subreddits
     for sub in BLOWOUT_SUBREDDITS:
@@ -160,7 +157,6 @@ def scrape_reddit_blowout() -> List[Dict[str, Any]]:
                 "_blowout_source": "reddit_subreddit",
             })
 
-        time.sleep(1.5)
 
     print(f"  Found {len(posts)} Reddit posts mentioning Blowout Cards")
     return posts
@@ -181,7 +177,7 @@ def scrape_bluesky_blowout() -> List[Dict[str, Any]]:
             "sort": "latest",
         }
         try:
-            r = requests.get(url, params=params, headers=HEADERS, timeout=15)
+            r = http_get(url, params=params, headers=HEADERS, timeout=15)
             if r.status_code != 200:
                 continue
 
@@ -234,7 +230,6 @@ def scrape_bluesky_blowout() -> List[Dict[str, Any]]:
         except Exception as e:
             print(f"  [WARN] Bluesky search failed for '{term}': {e}")
 
-        time.sleep(1.0)
 
     print(f"  Found {len(posts)} Bluesky posts mentioning Blowout Cards")
     return posts
@@ -255,7 +250,7 @@ def scrape_google_news_blowout() -> List[Dict[str, Any]]:
         rss_url = f"https://news.google.com/rss/search?q={encoded}&hl=en-US&gl=US&ceid=US:en"
 
         try:
-            r = requests.get(rss_url, headers=HEADERS, timeout=15)
+            r = http_get(rss_url, headers=HEADERS, timeout=15)
             if r.status_code != 200:
                 print(f"  [WARN] Google News RSS returned {r.status_code} for '{query}'")
                 continue
@@ -302,7 +297,6 @@ def scrape_google_news_blowout() -> List[Dict[str, Any]]:
         except Exception as e:
             print(f"  [WARN] Google News RSS failed for '{query}': {e}")
 
-        time.sleep(1.0)
 
     print(f"  Found {len(posts)} Google News articles about Blowout Cards")
     return posts
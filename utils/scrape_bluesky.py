@@ -2,10 +2,14 @@
 import requests
 import json
 import os
-import time
 from datetime import datetime
 from urllib.parse import quote
 
+try:
+    from utils.scrape_runtime import http_get
+except ImportError:
+    from scrape_runtime import http_get
+
 # Search terms for collectibles/marketplace topics
 SEARCH_TERMS = [
     "ebay trading cards",
@@ -65,7 +69,7 @@ def search_posts(query, limit=25):
             "sort": "latest",
         }
         
-        res = requests.get(url, params=params, headers=HEADERS, timeout=15)
+        res = http_get(url, params=params, headers=HEADERS, timeout=15)
         
         if res.status_code == 200:
             data = res.json()
@@ -115,8 +119,7 @@ def search_posts(query, limit=25):
                     continue
                     
         elif res.status_code == 429:
-            print(f"  ⚠️ Rate limited for '{query}', waiting...")
-            time.sleep(30)
+            print(f"  ⚠️ Rate limited for '{query}' (retries exhausted)")
         else:
             print(f"  ⚠️ Search failed for '{query}': HTTP {res.status_code}")
             
@@ -135,7 +138,7 @@ def get_author_feed(handle, limit=20):
     try:
         # First resolve the handle to a DID
         resolve_url = f"{BLUESKY_API}/xrpc/com.atproto.identity.resolveHandle"
-        res = requests.get(resolve_url, params={"handle": handle}, headers=HEADERS, timeout=10)
+        res = http_get(resolve_url, params={"handle": handle}, headers=HEADERS, timeout=10)
         
         if res.status_code != 200:
             print(f"  ⚠️ Could not resolve @{handle}")
@@ -153,7 +156,7 @@ def get_author_feed(handle, limit=20):
             "filter": "posts_no_replies",
         }
         
-        res = requests.get(feed_url, params=params, headers=HEADERS, timeout=15)
+        res = http_get(feed_url, params=params, headers=HEADERS, timeout=15)
         
         if res.status_code == 200:
             data = res.json()
@@ -216,7 +219,7 @@ def search_accounts(query, limit=25):
     try:
         url = f"{BLUESKY_API}/xrpc/app.bsky.actor.searchActors"
         params = {"q": query, "limit": limit}
-        res = requests.get(url, params=params, headers=HEADERS, timeout=15)
+        res = http_get(url, params=params, headers=HEADERS, timeout=15)
         
         if res.status_code == 200:
             data = res.json()
@@ -261,7 +264,7 @@ def get_feed_posts(feed_uri, limit=30):
     try:
         url = f"{BLUESKY_API}/xrpc/app.bsky.feed.getFeed"
         params = {"feed": feed_uri, "limit": limit}
-        res = requests.get(url, params=params, headers=HEADERS, timeout=15)
+        res = http_get(url, params=params, headers=HEADERS, timeout=15)
         
         if res.status_code == 200:
             data = res.json()
@@ -329,7 +332,7 @@ def run_bluesky_scraper():
     print("🦋 Starting Bluesky scraper (public API)...")
     
     all_posts = []
-    all_handles = set()
+    all_handles = {}  # handle → None, in discovery order (a set would reorder per process)
     
     # Search for collectibles-related accounts
     print("\n🔍 Searching for collectibles accounts...")
@@ -337,8 +340,7 @@ def run_bluesky_scraper():
         print(f"  🔍 Searching: '{term}'...")
         accounts = search_accounts(term, limit=15)
         for acc in accounts:
-            all_handles.add(acc["handle"])
-        time.sleep(0.5)
+            all_handles.setdefault(acc["handle"])
     
     print(f"\n👤 Found {len(all_handles)} unique accounts, fetching feeds...")
     
@@ -357,7 +359,6 @@ def run_bluesky_scraper():
                 print(f"  📥 @{handle}: {len(filtered)} relevant posts")
                 all_posts.extend(filtered)
         
-        time.sleep(0.3)
     
     if not all_posts:
         print("\n❌ No posts scraped from Bluesky.")
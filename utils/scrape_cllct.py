@@ -3,11 +3,15 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import os
-import time
 import re
 from datetime import datetime
 from typing import List, Dict, Any
 
+try:
+    from utils.scrape_runtime import http_get
+except ImportError:
+    from scrape_runtime import http_get
+
 # Cllct.com category pages to scrape
 CATEGORY_PAGES = [
     {"name": "Sports Cards", "url": "https://www.cllct.com/sports-collectibles/sports-cards"},
@@ -37,7 +41,7 @@ def scrape_category_page(category: Dict[str, str], max_pages: int = 3) -> List[D
         url = f"{base_url}?page={page}" if page > 1 else base_url
 
         try:
-            res = requests.get(url, headers=HEADERS, timeout=20)
+            res = http_get(url, headers=HEADERS, timeout=20)
 
             if res.status_code != 200:
                 print(f"    ⚠️ Page {page}: HTTP {res.status_code}")
@@ -113,7 +117,6 @@ def scrape_category_page(category: Dict[str, str], max_pages: int = 3) -> List[D
             if not links:
                 break
 
-            time.sleep(1)  # Rate limiting between pages
 
         except requests.exceptions.Timeout:
             print(f"    ⏱️ Page {page}: Timeout")
@@ -126,7 +129,7 @@ def scrape_category_page(category: Dict[str, str], max_pages: int = 3) -> List[D
 def scrape_article(url: str, title: str, category: str) -> Dict[str, Any]:
     """Scrape the full text of a single Cllct.com article."""
     try:
-        res = requests.get(url, headers=HEADERS, timeout=15)
+        res = http_get(url, headers=HEADERS, timeout=15)
 
         if res.status_code != 200:
             return None
@@ -248,7 +251,6 @@ def run_cllct_scraper(max_articles_per_category: int = 15) -> List[Dict[str, Any
         else:
             print(f"  ⚠️ {category['name']}: No articles found")
 
-        time.sleep(1)
 
     if not all_article_refs:
         print("\n❌ No articles found on Cllct.com.")
@@ -280,7 +282,6 @@ def run_cllct_scraper(max_articles_per_category: int = 15) -> List[Dict[str, Any
             all_posts.append(article)
             category_counts[cat] += 1
 
-        time.sleep(0.5)  # Rate limiting
 
     if not all_posts:
         print("\n❌ No article content scraped from Cllct.com.")
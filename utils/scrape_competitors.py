@@ -8,12 +8,16 @@ Scrapes social discussions about:
 import json
 import os
 import re
-import time
 import xml.etree.ElementTree as ET
 import requests
 from datetime import datetime
 from typing import List, Dict, Any
 
+try:
+    from utils.scrape_runtime import http_get
+except ImportError:
+    from scrape_runtime import http_get
+
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 }
@@ -224,10 +228,9 @@ def search_reddit(query: str, limit: int = 50, time_filter: str = "year") -> Lis
     }
     
     try:
-        res = requests.get(url, params=params, headers=HEADERS, timeout=15)
+        res = http_get(url, params=params, headers=HEADERS, timeout=15)
         if res.status_code == 429:
-            print(f"    ⚠️ Rate limited, waiting...")
-            time.sleep(10)
+            print(f"    ⚠️ Rate limited (retries exhausted)")
             return []
         if res.status_code != 200:
             return []
@@ -275,10 +278,7 @@ def scrape_subreddit_for_competitor(subreddit: str, competitor: str, limit: int
     }
     
     try:
-        res = requests.get(url, params=params, headers=HEADERS, timeout=15)
-        if res.status_code == 429:
-            time.sleep(10)
-            return []
+        res = http_get(url, params=params, headers=HEADERS, timeout=15)
         if res.status_code != 200:
             return []
         
@@ -317,7 +317,7 @@ def _google_news_competitor(query: str, comp_name: str, comp_type: str) -> List[
     url = f"https://news.google.com/rss/search?q={encoded_q}&hl=en-US&gl=US&ceid=US:en"
     posts = []
     try:
-        res = requests.get(url, headers=HEADERS, timeout=15)
+        res = http_get(url, headers=HEADERS, timeout=15)
         if res.status_code != 200:
             return posts
         root = ET.fromstring(res.content)
@@ -405,7 +405,6 @@ def run_competitor_scraper() -> List[Dict[str, Any]]:
                     comp_posts.append(p)
                     added += 1
             print(f"     └─ {added} relevant posts (of {len(posts)} found)")
-            time.sleep(1.5)  # Rate limiting
         
         # Search in specific subreddits
         for subreddit in comp_config["subreddits"][:5]:  # Limit to top 5 subreddits
@@ -437,7 +436,6 @@ def run_competitor_scraper() -> List[Dict[str, Any]]:
                     comp_posts.append(p)
                     added += 1
             print(f"     └─ {added} relevant posts")
-            time.sleep(1.5)
         
         # Google News for policy/product announcements
         gn_queries = comp_config.get("google_news_queries", [])
@@ -452,7 +450,6 @@ def run_competitor_scraper() -> List[Dict[str, Any]]:
                     comp_posts.append(p)
                     added += 1
             print(f"     └─ {added} articles")
-            time.sleep(1)
 
         all_posts.extend(comp_posts)
         print(f"  ✅ Total for {comp_name}: {len(comp_posts)} posts")
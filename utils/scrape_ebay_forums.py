@@ -2,16 +2,19 @@
 # Primary strategy: Lithium REST API v2 (LiQL) — bypasses Akamai WAF.
 # Secondary strategy: Google News RSS with site:community.ebay.com queries.
 # Direct HTML scraping is blocked by Akamai (HTTP 202 JS challenge).
-import requests
 import json
 import os
-import time
 import re
 from datetime import datetime
 from typing import List, Dict, Any
 from urllib.parse import quote
 from xml.etree import ElementTree as ET
 
+try:
+    from utils.scrape_runtime import http_get
+except ImportError:
+    from scrape_runtime import http_get
+
 SAVE_PATH = "data/scraped_ebay_forums.json"
 
 LITHIUM_API = "https://community.ebay.com/api/2.0/search"
@@ -133,7 +136,7 @@ def _parse_lithium_date(date_str: str) -> str:
 def _liql_query(query: str) -> List[Dict[str, Any]]:
     """Execute a LiQL query against the Lithium REST API v2."""
     try:
-        r = requests.get(LITHIUM_API, params={"q": query}, headers=HEADERS, timeout=15)
+        r = http_get(LITHIUM_API, params={"q": query}, headers=HEADERS, timeout=15)
         if r.status_code != 200:
             return []
         data = r.json()
@@ -251,7 +254,6 @@ def _scrape_keywords(keywords: List[str], limit_per: int = 50) -> List[Dict[str,
         if posts:
             print(f"    '{kw}' => {len(posts)} posts")
         all_posts.extend(posts)
-        time.sleep(0.3)
     print(f"    Total keyword posts: {len(all_posts)}")
     return all_posts
 
@@ -264,7 +266,7 @@ def _google_news_rss(query: str, max_results: int = 100) -> List[Dict[str, Any]]
     try:
         encoded = quote(query)
         rss_url = f"https://news.google.com/rss/search?q={encoded}&hl=en-US&gl=US&ceid=US:en"
-        r = requests.get(rss_url, headers=HTML_HEADERS, timeout=15)
+        r = http_get(rss_url, headers=HTML_HEADERS, timeout=15)
         if r.status_code != 200:
             return posts
         root = ET.fromstring(r.content)
@@ -315,7 +317,6 @@ def _scrape_google_news_supplement() -> List[Dict[str, Any]]:
         if posts:
             print(f"    '{q[:50]}' => {len(posts)} items")
         all_posts.extend(posts)
-        time.sleep(0.5)
     print(f"    Total Google News posts: {len(all_posts)}")
     return all_posts
 
@@ -1,16 +1,19 @@
 # scrape_forums_blogs.py — Scrape collectibles forums, blogs, and marketplace signals
 # Direct scraping for accessible sites, Google News RSS fallback for blocked ones.
 
-import requests
 import json
 import os
 import re
-import time
 import xml.etree.ElementTree as ET
 from datetime import datetime
 from urllib.parse import quote
 from bs4 import BeautifulSoup
 
+try:
+    from utils.scrape_runtime import http_get
+except ImportError:
+    from scrape_runtime import http_get
+
 SAVE_PATH = "data/scraped_forums_blogs_posts.json"
 
 HEADERS = {
@@ -27,7 +30,7 @@ def _google_news_rss(query, source_label, max_results=100):
     try:
         encoded = quote(query)
         rss_url = f"https://news.google.com/rss/search?q={encoded}&hl=en-US&gl=US&ceid=US:en"
-        r = requests.get(rss_url, headers=HEADERS, timeout=15)
+        r = http_get(rss_url, headers=HEADERS, timeout=15)
         if r.status_code != 200:
             return posts
 
@@ -79,7 +82,7 @@ def scrape_bench_trading():
     base_url = "https://thebenchtrading.com"
 
     try:
-        r = requests.get(base_url, headers=HEADERS, timeout=15)
+        r = http_get(base_url, headers=HEADERS, timeout=15)
         if r.status_code != 200:
             print(f"    [WARN] Bench Trading returned {r.status_code}, falling back to Google News")
             return _google_news_rss("site:thebenchtrading.com", "Bench Trading")
@@ -100,7 +103,7 @@ def scrape_bench_trading():
         # Scrape up to 20 threads
         for title, url in thread_links[:20]:
             try:
-                tr = requests.get(url, headers=HEADERS, timeout=10)
+                tr = http_get(url, headers=HEADERS, timeout=10)
                 if tr.status_code != 200:
                     continue
 
@@ -129,7 +132,6 @@ def scrape_bench_trading():
                         "post_id": f"bench_{hash(text[:100]) % 10**8}",
                     })
 
-                time.sleep(0.5)
             except Exception:
                 continue
 
@@ -154,7 +156,7 @@ def scrape_alt_blog():
     blog_url = "https://www.alt.xyz/blog"
 
     try:
-        r = requests.get(blog_url, headers=HEADERS, timeout=15)
+        r = http_get(blog_url, headers=HEADERS, timeout=15)
         if r.status_code != 200:
             print(f"    [WARN] Alt.xyz returned {r.status_code}")
             return _google_news_rss("site:alt.xyz", "Alt.xyz Blog")
@@ -176,7 +178,7 @@ def scrape_alt_blog():
         # Scrape up to 15 articles
         for title, url in article_links[:15]:
             try:
-                ar = requests.get(url, headers=HEADERS, timeout=10)
+                ar = http_get(url, headers=HEADERS, timeout=10)
                 if ar.status_code != 200:
                     continue
 
@@ -215,7 +217,6 @@ def scrape_alt_blog():
                     "post_id": f"alt_{hash(url) % 10**8}",
                 })
 
-                time.sleep(0.5)
             except Exception:
                 continue
 
@@ -312,7 +313,6 @@ def run_forums_blogs_scraper():
             all_posts.extend(posts)
         except Exception as e:
             print(f"  \u274c {scraper_fn.__name__} failed: {e}")
-        time.sleep(1.0)
 
     # Deduplicate by URL
     seen_urls = set()
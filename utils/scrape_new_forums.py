@@ -24,9 +24,13 @@ import hashlib
 from datetime import datetime
 from typing import List, Dict, Any
 
-import requests
 import feedparser
 
+try:
+    from utils.scrape_runtime import http_get
+except ImportError:
+    from scrape_runtime import http_get
+
 OUTPUT_PATH = "data/scraped_new_forums_posts.json"
 
 HEADERS = {
@@ -37,7 +41,7 @@ HEADERS = {
 def _fetch(url: str, timeout: int = 20) -> str:
     """Fetch a URL with error handling."""
     try:
-        r = requests.get(url, headers=HEADERS, timeout=timeout)
+        r = http_get(url, headers=HEADERS, timeout=timeout)
         r.raise_for_status()
         return r.text
     except Exception as e:
@@ -194,7 +198,6 @@ def scrape_consumer_affairs() -> List[Dict[str, Any]]:
                 "score": 0,
                 "num_comments": 0,
             })
-        time.sleep(2)
 
     return posts
 
@@ -249,7 +252,6 @@ def scrape_collectors_universe_direct() -> List[Dict[str, Any]]:
                 "score": 0,
                 "num_comments": 0,
             })
-            time.sleep(1)
 
     return posts
 
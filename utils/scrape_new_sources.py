@@ -10,16 +10,19 @@ Fills coverage gaps identified in the scraping audit:
 - App Store reviews: eBay & TCGPlayer product feedback via Google News
 """
 
-import requests
 import json
 import os
 import re
-import time
 import xml.etree.ElementTree as ET
 from datetime import datetime
 from urllib.parse import quote
 from typing import List, Dict, Any
 
+try:
+    from utils.scrape_runtime import http_get
+except ImportError:
+    from scrape_runtime import http_get
+
 SAVE_PATH = "data/scraped_new_sources_posts.json"
 
 HEADERS = {
@@ -37,7 +40,7 @@ def _google_news_rss(query, source_label, max_results=100):
     try:
         encoded = quote(query)
         rss_url = f"https://news.google.com/rss/search?q={encoded}&hl=en-US&gl=US&ceid=US:en"
-        r = requests.get(rss_url, headers=HEADERS, timeout=15)
+        r = http_get(rss_url, headers=HEADERS, timeout=15)
         if r.status_code != 200:
             return posts
 
@@ -92,7 +95,7 @@ def _scrape_html_articles(base_url, source_label, link_pattern, max_articles=15)
 
     posts = []
     try:
-        r = requests.get(base_url, headers=HEADERS, timeout=15)
+        r = http_get(base_url, headers=HEADERS, timeout=15)
         if r.status_code != 200:
             print(f"    [WARN] {source_label} returned {r.status_code}")
             return posts
@@ -113,7 +116,7 @@ def _scrape_html_articles(base_url, source_label, link_pattern, max_articles=15)
 
         for title, url in article_links[:max_articles]:
             try:
-                ar = requests.get(url, headers=HEADERS, timeout=10)
+                ar = http_get(url, headers=HEADERS, timeout=10)
                 if ar.status_code != 200:
                     continue
 
@@ -158,7 +161,6 @@ def _scrape_html_articles(base_url, source_label, link_pattern, max_articles=15)
                     "post_id": f"{source_label.lower().replace(' ', '_')}_{hash(url) % 10**8}",
                 })
 
-                time.sleep(0.5)
             except Exception:
                 continue
 
@@ -207,7 +209,6 @@ def scrape_trustpilot():
 
         print(f"      {len(posts)} posts")
         all_posts.extend(posts)
-        time.sleep(1.0)
 
     print(f"    Total Trustpilot: {len(all_posts)} posts")
     return all_posts
@@ -341,7 +342,6 @@ def scrape_psa_forums():
     for query in queries:
         gn_posts = _google_news_rss(query, "PSA Forums")
         posts.extend(gn_posts)
-        time.sleep(0.5)
 
     print(f"    Total PSA Forums: {len(posts)} posts")
     return posts
@@ -380,7 +380,6 @@ def scrape_app_reviews():
     for query in queries:
         gn_posts = _google_news_rss(query, "App Reviews")
         posts.extend(gn_posts)
-        time.sleep(0.5)
 
     print(f"    Total App Reviews: {len(posts)} posts")
     return posts
@@ -436,7 +435,6 @@ def scrape_industry_analysis():
     for query in queries:
         gn_posts = _google_news_rss(query, "Industry Analysis")
         posts.extend(gn_posts)
-        time.sleep(0.5)
 
     print(f"    Total Industry Analysis: {len(posts)} posts")
     return posts
@@ -479,7 +477,6 @@ def scrape_seller_communities():
     for query in queries:
         gn_posts = _google_news_rss(query, "Seller Community")
         posts.extend(gn_posts)
-        time.sleep(0.5)
 
     print(f"    Total Seller Community: {len(posts)} posts")
     return posts
@@ -638,7 +635,6 @@ def run_new_sources_scraper():
             print(f"  ✅ {name}: {len(posts)} posts")
         except Exception as e:
             print(f"  ❌ {name} failed: {e}")
-        time.sleep(1.0)
 
     # Deduplicate by URL
     seen_urls = set()
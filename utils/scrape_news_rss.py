@@ -3,12 +3,18 @@ import requests
 import json
 import os
 import re
-import time
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from xml.etree import ElementTree as ET
 from html import unescape
 
+try:
+    from utils.scrape_runtime import http_get
+    from utils.fetch_state import FetchState, RETENTION_DAYS, carry_forward, load_previous
+except ImportError:
+    from scrape_runtime import http_get
+    from fetch_state import FetchState, RETENTION_DAYS, carry_forward, load_previous
+
 # RSS feeds to scrape — high-signal collectibles/marketplace news sources
 RSS_FEEDS = [
     {
@@ -115,15 +121,31 @@ def parse_rss_date(date_str: str) -> str:
     return datetime.now().strftime("%Y-%m-%d")
 
 
-def fetch_rss_feed(feed_config: Dict[str, str], max_items: int = 25) -> List[Dict[str, Any]]:
-    """Fetch and parse a single RSS feed."""
+def _item_key(item) -> str:
+    """Stable identity of a feed item: its GUID / Atom id, else its link, else its title."""
+    for tag in ("guid", "{http://www.w3.org/2005/Atom}id", "link", "title"):
+        elem = item.find(tag)
+        if elem is not None:
+            value = (elem.text or elem.get("href", "") or "").strip()
+            if value:
+                return value
+    return ""
+
+
+def fetch_rss_feed(feed_config: Dict[str, str], max_items: int = 25, state: Optional[FetchState] = None) -> List[Dict[str, Any]]:
+    """Fetch and parse a single RSS feed.
+
+    With a FetchState the feed is fetched conditionally and items whose GUID an earlier
+    run collected are skipped.
+    """
     feed_name = feed_config["name"]
     feed_url = feed_config["url"]
     feed_focus = feed_config["focus"]
     posts = []
 
     try:
-        res = requests.get(feed_url, headers=HEADERS, timeout=20)
+        fetch = state.get if state is not None else http_get
+        res = fetch(feed_url, headers=HEADERS, timeout=20)
 
         if res.status_code != 200:
             print(f"    ⚠️ HTTP {res.status_code}")
@@ -155,7 +177,13 @@ def fetch_rss_feed(feed_config: Dict[str, str], max_items: int = 25) -> List[Dic
             # Try Atom format
             items = root.findall(".//{http://www.w3.org/2005/Atom}entry")
 
-        for item in items[:max_items]:
+        items = items[:max_items]
+        keys = [f"{feed_url}#{_item_key(item)}" for item in items]
+        known = state.known(keys) if state is not None else set()
+
+        for item, key in zip(items, keys):
+            if key in known:
+                continue
             try:
                 # Extract title
                 title_elem = item.find("title")
@@ -236,6 +264,8 @@ def fetch_rss_feed(feed_config: Dict[str, str], max_items: int = 25) -> List[Dic
                     "categories": categories,
                     "summary": description[:500] if description else "",
                 })
+                if state is not None:
+                    state.mark_seen([key])
 
             except Exception:
                 continue
@@ -254,6 +284,10 @@ def run_news_rss_scraper(max_items_per_feed: int = 25) -> List[Dict[str, Any]]:
     """Main entry point for RSS news scraping."""
     print("📰 Starting RSS news feed scraper...")
 
+    # Incremental: feeds are fetched conditionally, known items skipped, and the articles
+    # saved last run are carried forward
+    previous = load_previous(SAVE_PATH)
+    state = FetchState("news_rss", enabled=bool(previous))
     all_posts = []
     feed_counts = {}
 
@@ -261,17 +295,17 @@ def run_news_rss_scraper(max_items_per_feed: int = 25) -> List[Dict[str, Any]]:
         feed_name = feed_config["name"]
         print(f"  📡 {feed_name}...")
 
-        posts = fetch_rss_feed(feed_config, max_items=max_items_per_feed)
+        posts = fetch_rss_feed(feed_config, max_items=max_items_per_feed, state=state)
 
         if posts:
-            print(f"  📥 {feed_name}: {len(posts)} articles")
+            print(f"  📥 {feed_name}: {len(posts)} {'new ' if previous else ''}articles")
             all_posts.extend(posts)
             feed_counts[feed_name] = len(posts)
         else:
-            print(f"  ⚠️ {feed_name}: No articles found")
+            print(f"  ⚠️ {feed_name}: No {'new ' if previous else ''}articles found")
             feed_counts[feed_name] = 0
 
-        time.sleep(1)  # Rate limiting between feeds
+    all_posts = carry_forward(all_posts, previous, key=lambda p: p.get("url"), retention_days=RETENTION_DAYS)
 
     if not all_posts:
         print("\n❌ No articles scraped from RSS feeds.")
@@ -295,6 +329,7 @@ def run_news_rss_scraper(max_items_per_feed: int = 25) -> List[Dict[str, Any]]:
     os.makedirs(os.path.dirname(SAVE_PATH) if os.path.dirname(SAVE_PATH) else ".", exist_ok=True)
     with open(SAVE_PATH, "w", encoding="utf-8") as f:
         json.dump(unique_posts, f, ensure_ascii=False, indent=2)
+    state.commit()
 
     print(f"\n✅ Scraped {len(unique_posts)} unique articles → {SAVE_PATH}")
 
@@ -1,14 +1,19 @@
 # scrape_podcasts.py — Podcast RSS scraper for collectibles industry podcasts
-import requests
 import json
 import os
 import re
-import time
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from xml.etree import ElementTree as ET
 from html import unescape
 
+try:
+    from utils.scrape_runtime import http_get
+    from utils.fetch_state import FetchState, RETENTION_DAYS, carry_forward, load_previous
+except ImportError:
+    from scrape_runtime import http_get
+    from fetch_state import FetchState, RETENTION_DAYS, carry_forward, load_previous
+
 SAVE_PATH = "data/scraped_podcast_posts.json"
 
 HEADERS = {
@@ -87,15 +92,16 @@ def _parse_date(date_str: str) -> str:
     return datetime.now().strftime("%Y-%m-%d")
 
 
-def scrape_podcast_feed(feed: Dict[str, str], max_episodes: int = 20) -> List[Dict[str, Any]]:
-    """Scrape episodes from a single podcast RSS feed."""
+def scrape_podcast_feed(feed: Dict[str, str], max_episodes: int = 20, state: Optional[FetchState] = None) -> List[Dict[str, Any]]:
+    """Scrape episodes from a single podcast RSS feed (conditional GET, known GUIDs skipped with `state`)."""
     name = feed["name"]
     url = feed["url"]
     focus = feed.get("focus", "")
     posts = []
 
     try:
-        r = requests.get(url, headers=HEADERS, timeout=20)
+        fetch = state.get if state is not None else http_get
+        r = fetch(url, headers=HEADERS, timeout=20)
         if r.status_code != 200:
             print(f"    [WARN] {name}: HTTP {r.status_code}")
             return posts
@@ -107,8 +113,12 @@ def scrape_podcast_feed(feed: Dict[str, str], max_episodes: int = 20) -> List[Di
         show_title = (channel.findtext("title") or name).strip()
 
         # Parse episodes
-        items = channel.findall("item") or root.findall(".//item")
-        for item in items[:max_episodes]:
+        items = (channel.findall("item") or root.findall(".//item"))[:max_episodes]
+        keys = [f"{url}#{(item.findtext('guid') or item.findtext('title') or '').strip()}" for item in items]
+        known = state.known(keys) if state is not None else set()
+        for item, key in zip(items, keys):
+            if key in known:
+                continue
             title = (item.findtext("title") or "").strip()
             if not title:
                 continue
@@ -170,6 +180,8 @@ def scrape_podcast_feed(feed: Dict[str, str], max_episodes: int = 20) -> List[Di
                 "duration": duration,
                 "post_id": f"podcast_{hash(f'{name}_{title}') % 10**8}",
             })
+            if state is not None:
+                state.mark_seen([key])
 
     except ET.ParseError as e:
         print(f"    [WARN] {name}: XML parse error — {e}")
@@ -183,17 +195,23 @@ def run_podcast_scraper() -> List[Dict[str, Any]]:
     """Main entry point for podcast scraping."""
     print("🎙️ Starting Podcast scraper...")
 
+    # Incremental: known episodes are skipped and last run's episodes carried forward
+    previous = load_previous(SAVE_PATH)
+    state = FetchState("podcasts", enabled=bool(previous))
     all_posts = []
 
     for feed in PODCAST_FEEDS:
         print(f"  📻 {feed['name']}...")
-        posts = scrape_podcast_feed(feed)
+        posts = scrape_podcast_feed(feed, state=state)
         if posts:
-            print(f"    {len(posts)} episodes")
+            print(f"    {len(posts)} {'new ' if previous else ''}episodes")
             all_posts.extend(posts)
+        elif previous:
+            print(f"    No new episodes")
         else:
             print(f"    No episodes found (feed may be unavailable)")
-        time.sleep(1.0)
+
+    all_posts = carry_forward(all_posts, previous, key=lambda p: p.get("title", "").lower().strip(), retention_days=RETENTION_DAYS)
 
     # Deduplicate by title
     seen_titles = set()
@@ -212,6 +230,7 @@ def run_podcast_scraper() -> List[Dict[str, Any]]:
     os.makedirs(os.path.dirname(SAVE_PATH) if os.path.dirname(SAVE_PATH) else ".", exist_ok=True)
     with open(SAVE_PATH, "w", encoding="utf-8") as f:
         json.dump(unique, f, ensure_ascii=False, indent=2)
+    state.commit()
 
     # Summary
     from collections import Counter
@@ -2,10 +2,16 @@
 import requests
 import json
 import os
-import time
 import re
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+try:
+    from utils.scrape_runtime import http_get
+    from utils.fetch_state import FetchState, carry_forward, load_previous
+except ImportError:
+    from scrape_runtime import http_get
+    from fetch_state import FetchState, carry_forward, load_previous
 
 # Subreddits to scrape (collectibles/marketplace related)
 SUBREDDITS = [
@@ -182,13 +188,25 @@ HEADERS = {
 }
 
 
-def get_subreddit_posts(subreddit: str, sort: str = "hot", limit: int = 50, time_filter: str = "week") -> List[Dict[str, Any]]:
+def get_subreddit_posts(
+    subreddit: str,
+    sort: str = "hot",
+    limit: int = 50,
+    time_filter: str = "week",
+    since_utc: float = 0,
+    max_pages: int = 1,
+    state: Optional[FetchState] = None,
+) -> List[Dict[str, Any]]:
     """
     Fetch posts from a subreddit using Reddit's public JSON API.
     sort: hot, new, top, rising
     time_filter: hour, day, week, month, year, all (only for top)
+    since_utc: for sort=new, page through the listing (up to max_pages) until a post
+               at or before this time, i.e. one a previous run already collected
+    state: fetch the first page with a conditional GET
     """
     posts = []
+    pages = 0
     
     url = f"https://www.reddit.com/r/{subreddit}/{sort}.json"
     params = {
@@ -199,70 +217,82 @@ def get_subreddit_posts(subreddit: str, sort: str = "hot", limit: int = 50, time
         params["t"] = time_filter
     
     try:
-        res = requests.get(url, params=params, headers=HEADERS, timeout=15)
+        while True:
+            fetch = state.get if state is not None and "after" not in params else http_get
+            res = fetch(url, params=params, headers=HEADERS, timeout=15)
+            pages += 1
         
-        if res.status_code == 200:
-            data = res.json()
-            children = data.get("data", {}).get("children", [])
+            if res.status_code == 200:
+                data = res.json()
+                children = data.get("data", {}).get("children", [])
+                reached_known = False
             
-            for child in children:
-                post = child.get("data", {})
+                for child in children:
+                    post = child.get("data", {})
+                    if since_utc and not post.get("stickied") and post.get("created_utc", 0) <= since_utc:
+                        reached_known = True
                 
-                # Combine title and selftext
-                title = post.get("title", "")
-                selftext = post.get("selftext", "")
-                text = f"{title}\n\n{selftext}".strip() if selftext else title
+                    # Combine title and selftext
+                    title = post.get("title", "")
+                    selftext = post.get("selftext", "")
+                    text = f"{title}\n\n{selftext}".strip() if selftext else title
                 
-                if not text or len(text) < 30:
-                    continue
+                    if not text or len(text) < 30:
+                        continue
                 
-                # Skip removed/deleted posts
-                if selftext in ["[removed]", "[deleted]"]:
-                    continue
+                    # Skip removed/deleted posts
+                    if selftext in ["[removed]", "[deleted]"]:
+                        continue
                 
-                created_utc = post.get("created_utc", 0)
-                post_date = datetime.fromtimestamp(created_utc).strftime("%Y-%m-%d") if created_utc else datetime.now().strftime("%Y-%m-%d")
+                    created_utc = post.get("created_utc", 0)
+                    post_date = datetime.fromtimestamp(created_utc).strftime("%Y-%m-%d") if created_utc else datetime.now().strftime("%Y-%m-%d")
                 
-                # Extract image URL if present
-                image_url = None
-                if post.get("post_hint") == "image":
-                    image_url = post.get("url")
-                elif post.get("thumbnail") and post.get("thumbnail") not in ["self", "default", "nsfw", "spoiler", ""]:
-                    image_url = post.get("thumbnail")
-                elif post.get("preview", {}).get("images"):
-                    try:
-                        image_url = post["preview"]["images"][0]["source"]["url"].replace("&amp;", "&")
-                    except (KeyError, IndexError):
-                        pass
+                    # Extract image URL if present
+                    image_url = None
+                    if post.get("post_hint") == "image":
+                        image_url = post.get("url")
+                    elif post.get("thumbnail") and post.get("thumbnail") not in ["self", "default", "nsfw", "spoiler", ""]:
+                        image_url = post.get("thumbnail")
+                    elif post.get("preview", {}).get("images"):
+                        try:
+                            image_url = post["preview"]["images"][0]["source"]["url"].replace("&amp;", "&")
+                        except (KeyError, IndexError):
+                            pass
                 
-                posts.append({
-                    "text": text,
-                    "title": title,
-                    "source": "Reddit",
-                    "subreddit": subreddit,
-                    "username": post.get("author", "unknown"),
-                    "url": f"https://reddit.com{post.get('permalink', '')}",
-                    "post_id": post.get("id", ""),
-                    "post_date": post_date,
-                    "created_utc": created_utc,
-                    "_logged_date": datetime.now().isoformat(),
-                    "score": post.get("score", 0),
-                    "num_comments": post.get("num_comments", 0),
-                    "upvote_ratio": post.get("upvote_ratio", 0),
-                    "image_url": image_url,
-                    "is_self": post.get("is_self", True),
-                    "link_flair_text": post.get("link_flair_text", ""),
-                })
+                    posts.append({
+                        "text": text,
+                        "title": title,
+                        "source": "Reddit",
+                        "subreddit": subreddit,
+                        "username": post.get("author", "unknown"),
+                        "url": f"https://reddit.com{post.get('permalink', '')}",
+                        "post_id": post.get("id", ""),
+                        "post_date": post_date,
+                        "created_utc": created_utc,
+                        "_logged_date": datetime.now().isoformat(),
+                        "score": post.get("score", 0),
+                        "num_comments": post.get("num_comments", 0),
+                        "upvote_ratio": post.get("upvote_ratio", 0),
+                        "image_url": image_url,
+                        "is_self": post.get("is_self", True),
+                        "link_flair_text": post.get("link_flair_text", ""),
+                    })
+
+                after = data.get("data", {}).get("after")
+                if reached_known or not after or pages >= max_pages:
+                    break
+                params["after"] = after
+                continue
                 
-        elif res.status_code == 429:
-            print(f"  ⚠️ Rate limited on r/{subreddit}, waiting...")
-            time.sleep(60)
-        elif res.status_code == 403:
-            print(f"  🔒 r/{subreddit}: Private or quarantined")
-        elif res.status_code == 404:
-            print(f"  ❓ r/{subreddit}: Not found")
-        else:
-            print(f"  ⚠️ r/{subreddit}: HTTP {res.status_code}")
+            elif res.status_code == 429:
+                print(f"  ⚠️ Rate limited on r/{subreddit} (retries exhausted)")
+            elif res.status_code == 403:
+                print(f"  🔒 r/{subreddit}: Private or quarantined")
+            elif res.status_code == 404:
+                print(f"  ❓ r/{subreddit}: Not found")
+            else:
+                print(f"  ⚠️ r/{subreddit}: HTTP {res.status_code}")
+            break
             
     except requests.exceptions.Timeout:
         print(f"  ⏱️ r/{subreddit}: Timeout")
@@ -272,8 +302,8 @@ def get_subreddit_posts(subreddit: str, sort: str = "hot", limit: int = 50, time
     return posts
 
 
-def get_post_comments(post_url: str, limit: int = 100) -> List[Dict[str, Any]]:
-    """Fetch comments from a specific Reddit post URL."""
+def get_post_comments(post_url: str, limit: int = 100, state: Optional[FetchState] = None) -> List[Dict[str, Any]]:
+    """Fetch comments from a specific Reddit post URL (conditional GET when `state` is given)."""
     comments = []
     
     # Convert URL to JSON endpoint
@@ -281,7 +311,8 @@ def get_post_comments(post_url: str, limit: int = 100) -> List[Dict[str, Any]]:
         post_url = post_url.rstrip('/') + '.json'
     
     try:
-        res = requests.get(post_url, params={"raw_json": 1, "limit": limit}, headers=HEADERS, timeout=15)
+        fetch = state.get if state is not None else http_get
+        res = fetch(post_url, params={"raw_json": 1, "limit": limit}, headers=HEADERS, timeout=15)
         
         if res.status_code == 200:
             data = res.json()
@@ -342,7 +373,7 @@ def get_subreddit_comments(subreddit: str, limit: int = 100) -> List[Dict[str, A
     params = {"limit": limit, "raw_json": 1}
     
     try:
-        res = requests.get(url, params=params, headers=HEADERS, timeout=15)
+        res = http_get(url, params=params, headers=HEADERS, timeout=15)
         
         if res.status_code == 200:
             data = res.json()
@@ -379,13 +410,23 @@ def get_subreddit_comments(subreddit: str, limit: int = 100) -> List[Dict[str, A
     return comments
 
 
-def search_reddit(query: str, limit: int = 50, sort: str = "relevance", time_filter: str = "month") -> List[Dict[str, Any]]:
+def search_reddit(
+    query: str,
+    limit: int = 50,
+    sort: str = "relevance",
+    time_filter: str = "month",
+    since_utc: float = 0,
+    max_pages: int = 1,
+) -> List[Dict[str, Any]]:
     """
     Search Reddit across all subreddits.
     sort: relevance, hot, top, new, comments
     time_filter: hour, day, week, month, year, all
+    since_utc: for sort=new, page through results (up to max_pages) until a post at or
+               before this time
     """
     posts = []
+    pages = 0
     
     url = "https://www.reddit.com/search.json"
     params = {
@@ -397,49 +438,61 @@ def search_reddit(query: str, limit: int = 50, sort: str = "relevance", time_fil
     }
     
     try:
-        res = requests.get(url, params=params, headers=HEADERS, timeout=15)
+        while True:
+            res = http_get(url, params=params, headers=HEADERS, timeout=15)
+            pages += 1
         
-        if res.status_code == 200:
-            data = res.json()
-            children = data.get("data", {}).get("children", [])
+            if res.status_code == 200:
+                data = res.json()
+                children = data.get("data", {}).get("children", [])
+                reached_known = False
             
-            for child in children:
-                post = child.get("data", {})
+                for child in children:
+                    post = child.get("data", {})
+                    if since_utc and post.get("created_utc", 0) <= since_utc:
+                        reached_known = True
                 
-                title = post.get("title", "")
-                selftext = post.get("selftext", "")
-                text = f"{title}\n\n{selftext}".strip() if selftext else title
+                    title = post.get("title", "")
+                    selftext = post.get("selftext", "")
+                    text = f"{title}\n\n{selftext}".strip() if selftext else title
                 
-                if not text or len(text) < 30:
-                    continue
+                    if not text or len(text) < 30:
+                        continue
                 
-                if selftext in ["[removed]", "[deleted]"]:
-                    continue
+                    if selftext in ["[removed]", "[deleted]"]:
+                        continue
                 
-                created_utc = post.get("created_utc", 0)
-                post_date = datetime.fromtimestamp(created_utc).strftime("%Y-%m-%d") if created_utc else datetime.now().strftime("%Y-%m-%d")
+                    created_utc = post.get("created_utc", 0)
+                    post_date = datetime.fromtimestamp(created_utc).strftime("%Y-%m-%d") if created_utc else datetime.now().strftime("%Y-%m-%d")
                 
-                posts.append({
-                    "text": text,
-                    "title": title,
-                    "source": "Reddit",
-                    "subreddit": post.get("subreddit", "unknown"),
-                    "search_term": query,
-                    "username": post.get("author", "unknown"),
-                    "url": f"https://reddit.com{post.get('permalink', '')}",
-                    "post_id": post.get("id", ""),
-                    "post_date": post_date,
-                    "_logged_date": datetime.now().isoformat(),
-                    "score": post.get("score", 0),
-                    "num_comments": post.get("num_comments", 0),
-                    "upvote_ratio": post.get("upvote_ratio", 0),
-                })
+                    posts.append({
+                        "text": text,
+                        "title": title,
+                        "source": "Reddit",
+                        "subreddit": post.get("subreddit", "unknown"),
+                        "search_term": query,
+                        "username": post.get("author", "unknown"),
+                        "url": f"https://reddit.com{post.get('permalink', '')}",
+                        "post_id": post.get("id", ""),
+                        "post_date": post_date,
+                        "created_utc": created_utc,
+                        "_logged_date": datetime.now().isoformat(),
+                        "score": post.get("score", 0),
+                        "num_comments": post.get("num_comments", 0),
+                        "upvote_ratio": post.get("upvote_ratio", 0),
+                    })
+
+                after = data.get("data", {}).get("after")
+                if reached_known or not after or pages >= max_pages:
+                    break
+                params["after"] = after
+                continue
                 
-        elif res.status_code == 429:
-            print(f"  ⚠️ Rate limited on search, waiting...")
-            time.sleep(60)
-        else:
-            print(f"  ⚠️ Search failed: HTTP {res.status_code}")
+            elif res.status_code == 429:
+                print(f"  ⚠️ Rate limited on search (retries exhausted)")
+            else:
+                print(f"  ⚠️ Search failed: HTTP {res.status_code}")
+            break
             
     except Exception as e:
         print(f"  ❌ Search error: {e}")
@@ -447,6 +500,13 @@ def search_reddit(query: str, limit: int = 50, sort: str = "relevance", time_fil
     return posts
 
 
+def _advance_cursor(state: FetchState, key: str, since: float, posts: List[Dict[str, Any]]):
+    """Move a listing's cursor to the newest created_utc fetched."""
+    newest = max([since] + [p.get("created_utc") or 0 for p in posts])
+    if newest > since:
+        state.set_cursor(key, newest)
+
+
 def filter_high_signal_posts(posts: List[Dict[str, Any]], min_score: int = 2) -> List[Dict[str, Any]]:
     """Filter posts to keep only high-signal content."""
     
@@ -487,6 +547,10 @@ def run_reddit_scraper(include_comments: bool = False, include_search: bool = Tr
     """Main entry point for Reddit scraping."""
     print("🤖 Starting Reddit scraper (public JSON API)...")
     
+    # Incremental: listings are only read back to what the previous run saved; posts
+    # that are not refetched are carried forward from it
+    previous = load_previous(SAVE_PATH)
+    state = FetchState("reddit", enabled=bool(previous))
     all_posts = []
     
     # Scrape subreddits
@@ -495,15 +559,23 @@ def run_reddit_scraper(include_comments: bool = False, include_search: bool = Tr
         print(f"  📂 r/{subreddit}...")
         
         # Get hot posts
-        posts = get_subreddit_posts(subreddit, sort="hot", limit=50)
+        posts = get_subreddit_posts(subreddit, sort="hot", limit=50, state=state)
         
-        # Get top posts from past year (covers 9 months)
-        top_posts = get_subreddit_posts(subreddit, sort="top", limit=100, time_filter="year")
-        posts.extend(top_posts)
+        # Get top posts from past year (covers 9 months) — a slow-moving listing, so it is
+        # refetched every FULL_REFRESH_DAYS and carried forward in between
+        if state.due(f"top:{subreddit}"):
+            top_posts = get_subreddit_posts(subreddit, sort="top", limit=100, time_filter="year", state=state)
+            posts.extend(top_posts)
+            if top_posts:
+                state.mark_refreshed(f"top:{subreddit}")
         
-        # Get new posts
-        new_posts = get_subreddit_posts(subreddit, sort="new", limit=50)
+        # Get new posts, paging back to the newest post the previous run saw
+        since = state.cursor(f"new:{subreddit}", 0)
+        new_posts = get_subreddit_posts(
+            subreddit, sort="new", limit=100 if since else 50, since_utc=since, max_pages=5 if since else 1
+        )
         posts.extend(new_posts)
+        _advance_cursor(state, f"new:{subreddit}", since, new_posts)
         
         if posts:
             print(f"  📥 r/{subreddit}: {len(posts)} posts")
@@ -516,7 +588,6 @@ def run_reddit_scraper(include_comments: bool = False, include_search: bool = Tr
                 print(f"  💬 r/{subreddit}: {len(comments)} comments")
                 all_posts.extend(comments)
         
-        time.sleep(1)  # Rate limiting (Reddit allows ~60 req/min)
     
     # Scrape comments from high-value discussion posts
     high_value_posts = [
@@ -538,26 +609,32 @@ def run_reddit_scraper(include_comments: bool = False, include_search: bool = Tr
     print(f"\n💬 Scraping comments from {len(high_value_posts)} high-value posts...")
     for post_url in high_value_posts:
         print(f"  📝 Fetching comments: {post_url[:60]}...")
-        comments = get_post_comments(post_url, limit=100)
+        comments = get_post_comments(post_url, limit=100, state=state)
         if comments:
             print(f"  💬 Got {len(comments)} comments")
             all_posts.extend(comments)
-        time.sleep(2)  # Rate limiting
     
     # Search for specific topics
     if include_search:
         print(f"\n🔍 Searching {len(SEARCH_QUERIES)} queries...")
         for query in SEARCH_QUERIES:
             print(f"  🔍 Searching: '{query}'...")
-            posts = search_reddit(query, limit=50, time_filter="year")
+            # After a full relevance search, later runs only page through new matches
+            since = state.cursor(f"search:{query}", 0)
+            if since and not state.due(f"search:{query}"):
+                posts = search_reddit(query, limit=100, sort="new", time_filter="year", since_utc=since, max_pages=5)
+            else:
+                posts = search_reddit(query, limit=50, time_filter="year")
+                if posts:
+                    state.mark_refreshed(f"search:{query}")
+            _advance_cursor(state, f"search:{query}", since, posts)
             
             if posts:
                 print(f"  📥 '{query}': {len(posts)} posts")
                 all_posts.extend(posts)
             
-            time.sleep(1)
     
-    if not all_posts:
+    if not all_posts and not previous:
         print("\n❌ No posts scraped from Reddit.")
         return []
     
@@ -581,6 +658,8 @@ def run_reddit_scraper(include_comments: bool = False, include_search: bool = Tr
         seen_ids.add(post_id)
         seen_text.add(text_hash)
         unique_posts.append(post)
+    fresh_count = len(unique_posts)
+    unique_posts = carry_forward(unique_posts, previous, key=lambda p: p.get("post_id"))
     
     # Sort by score (highest first)
     unique_posts.sort(key=lambda x: x.get("score", 0), reverse=True)
@@ -589,8 +668,11 @@ def run_reddit_scraper(include_comments: bool = False, include_search: bool = Tr
     os.makedirs(os.path.dirname(SAVE_PATH) if os.path.dirname(SAVE_PATH) else ".", exist_ok=True)
     with open(SAVE_PATH, "w", encoding="utf-8") as f:
         json.dump(unique_posts, f, ensure_ascii=False, indent=2)
+    state.commit()
     
     print(f"\n✅ Scraped {len(unique_posts)} unique high-signal posts → {SAVE_PATH}")
+    if previous:
+        print(f"   ({fresh_count} fetched this run, {len(unique_posts) - fresh_count} carried forward)")
     
     # Print top subreddits by volume
     subreddit_counts = {}
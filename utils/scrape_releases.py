@@ -1,16 +1,19 @@
 # scrape_releases.py — Scrape upcoming trading card product releases and checklists
 # Sources: Google News RSS for Cardboard Connection, Beckett, and general release calendars
 
-import requests
 import json
 import os
 import re
-import time
 import xml.etree.ElementTree as ET
 from datetime import datetime
 from urllib.parse import quote
 from bs4 import BeautifulSoup
 
+try:
+    from utils.scrape_runtime import http_get
+except ImportError:
+    from scrape_runtime import http_get
+
 SAVE_PATH = "data/upcoming_releases.json"
 
 MANUAL_CHECKLIST_URLS = [
@@ -29,7 +32,7 @@ def _google_news_rss(query, max_results=50):
     try:
         encoded = quote(query)
         rss_url = f"https://news.google.com/rss/search?q={encoded}&hl=en-US&gl=US&ceid=US:en"
-        r = requests.get(rss_url, headers=HEADERS, timeout=15)
+        r = http_get(rss_url, headers=HEADERS, timeout=15)
         if r.status_code != 200:
             return posts
         root = ET.fromstring(r.content)
@@ -135,7 +138,7 @@ def _scrape_direct_checklist(url):
     title = fallback_title
 
     try:
-        r = requests.get(url, headers=HEADERS, timeout=20)
+        r = http_get(url, headers=HEADERS, timeout=20)
         if r.status_code == 200:
             soup = BeautifulSoup(r.text, "html.parser")
             title_el = soup.find("h1") or soup.find("title")
@@ -190,7 +193,6 @@ def scrape_upcoming_releases():
         print(f"  Searching: {query}")
         posts = _google_news_rss(query)
         all_posts.extend(posts)
-        time.sleep(1.0)
 
     # Direct checklist pages we always want represented
     for url in MANUAL_CHECKLIST_URLS:
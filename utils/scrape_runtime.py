@@ -0,0 +1,345 @@
+# scrape_runtime.py — Concurrent runtime for the source scrapers: per-host rate limits + pooled HTTP
+#
+# scrape_all used to run every source scraper one after another, and each scraper paced
+# itself with fixed time.sleep() gaps between requests — so the weekly scrape was mostly
+# wall-clock sleeping. Instead:
+#   1. Scrapers fetch through http_get(), a drop-in for requests.get() that first takes a
+#      token from the target host's bucket (rate + burst per host, see HOST_RATES), so the
+#      pacing is per host no matter how many sources hit it at once
+#   2. All requests share one pooled HTTPAdapter (keep-alive connections per host); each
+#      thread gets its own Session on top of it, advertising gzip / deflate (and brotli
+#      when the brotli package is installed — urllib3 decodes it)
+#   3. Throttling and transient failures are handled here, the same for every scraper:
+#      429 / 5xx responses and connection errors are retried with exponential backoff
+#      (jittered), honouring Retry-After; a 429 pauses the host's bucket, so every
+#      thread backs off that host, not just the one that was throttled
+#   4. Each request's latency, wire bytes and status are counted per host (http_stats())
+#   5. run_sources() runs the source scrapers on a bounded thread pool and returns their
+#      results in the order given, so the consolidated output matches a serial run
+#
+# Config (env): SS_SCRAPE_WORKERS (source threads), SS_SCRAPE_RATE (default req/s per host),
+#               SS_SCRAPE_RETRIES (retries per request), SS_SCRAPE_MAX_WAIT (longest
+#               backoff / Retry-After honoured, seconds — longer ones give up instead)
+#
+# Usage:
+#   res = http_get("https://www.reddit.com/r/Ebay/hot.json", params={"limit": 50}, timeout=15)
+#   results = run_sources([("Reddit", run_reddit_scraper), ("Bluesky", run_bluesky_scraper)])
+#   print(format_http_stats())
+
+import os
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+# (requests per second, burst) per host; a host also matches its subdomains
+HOST_RATES: Dict[str, Tuple[float, int]] = {
+    "reddit.com": (1.0, 2),           # public JSON API: ~60 req/min
+    "news.google.com": (1.0, 2),
+    "bsky.app": (2.0, 2),
+    "bsky.social": (2.0, 2),
+    "googleapis.com": (2.0, 2),
+    "youtube.com": (2.0, 2),
+}
+DEFAULT_RATE = (float(os.getenv("SS_SCRAPE_RATE", "2.0")), 2)
+
+_POOL_CONNECTIONS = 64   # hosts kept in the pool
+_POOL_MAXSIZE = 8        # keep-alive connections per host
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = int(os.getenv("SS_SCRAPE_RETRIES", "3"))
+MAX_WAIT = float(os.getenv("SS_SCRAPE_MAX_WAIT", "120"))
+BACKOFF_BASE = 2.0       # seconds before the first retry; doubles per attempt
+
+
+class HostBucket:
+    """Token bucket for one host: `rate` requests per second, up to `burst` at once."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = float(rate)
+        self.capacity = float(max(1, burst))
+        self.level = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is available; returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.level >= 1.0:
+                        self.level -= 1.0
+                        return waited
+                    wait = (1.0 - self.level) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def wait_for_pause(self):
+        """Sleep out a pause() without taking a token."""
+        with self.lock:
+            wait = self.paused_until - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold every caller for `seconds` (the host asked us to back off); the bucket restarts empty."""
+        with self.lock:
+            until = time.monotonic() + seconds
+            if until > self.paused_until:
+                self.paused_until = until
+                self.level = 0.0
+                self.updated = until
+
+
+_buckets: Dict[str, HostBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def _rate_key(host: str) -> str:
+    for domain in HOST_RATES:
+        if host == domain or host.endswith("." + domain):
+            return domain
+    return host
+
+
+def host_bucket(url: str) -> HostBucket:
+    """The shared bucket for a URL's host (subdomains of a HOST_RATES entry share its bucket)."""
+    key = _rate_key((urlsplit(url).hostname or "").lower())
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            rate, burst = HOST_RATES.get(key, DEFAULT_RATE)
+            bucket = _buckets[key] = HostBucket(rate, burst)
+        return bucket
+
+
+def set_host_rate(host: str, rate: float, burst: int = 1):
+    """Override the pacing of one host (e.g. after an API key raises its limit)."""
+    with _buckets_lock:
+        HOST_RATES[host] = (rate, burst)
+        _buckets.pop(host, None)
+
+
+_adapter = HTTPAdapter(pool_connections=_POOL_CONNECTIONS, pool_maxsize=_POOL_MAXSIZE)
+_local = threading.local()
+
+
+# gzip/deflate, plus br / zstd when urllib3 can decode them (brotli / zstandard installed)
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+
+def get_session() -> requests.Session:
+    """This thread's Session; every Session shares the same connection pool."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.mount("https://", _adapter)
+        session.mount("http://", _adapter)
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        _local.session = session
+    return session
+
+
+def retry_after(res: requests.Response) -> Optional[float]:
+    """Seconds the server asked us to wait (Retry-After as seconds or an HTTP date), if any."""
+    value = (res.headers.get("Retry-After") or "").strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _backoff(attempt: int) -> float:
+    """Exponential backoff with jitter: ~2s, 4s, 8s, ... (50–100% of the nominal wait)."""
+    return BACKOFF_BASE * (2 ** attempt) * (0.5 + random.random() / 2)
+
+
+def http_get(url: str, retries: Optional[int] = None, pace: bool = True, **kwargs) -> requests.Response:
+    """requests.get() paced by the host's token bucket, over the shared connection pool.
+
+    429 / 5xx responses and connection errors are retried up to `retries` times
+    (SS_SCRAPE_RETRIES); the last response is returned as-is, so callers still see the
+    final status. Read timeouts are not retried. pace=False skips the bucket (a handful
+    of interactive requests, e.g. the Ask AI ad-hoc scrape) but still waits out a 429 pause.
+    """
+    retries = MAX_RETRIES if retries is None else retries
+    host = (urlsplit(url).hostname or "").lower()
+    bucket = host_bucket(url)
+    kwargs.setdefault("timeout", 15)
+    attempt = 0
+    while True:
+        if pace:
+            bucket.acquire()
+        else:
+            bucket.wait_for_pause()
+        start = time.monotonic()
+        try:
+            res = get_session().get(url, **kwargs)
+        except requests.exceptions.ConnectionError:
+            _record(host, time.monotonic() - start, 0, None)
+            if attempt >= retries:
+                raise
+            wait = _backoff(attempt)
+        else:
+            _record(host, time.monotonic() - start, _wire_bytes(res), res.status_code)
+            if res.status_code not in RETRY_STATUSES or attempt >= retries:
+                return res
+            wait = retry_after(res)
+            if wait is None:
+                wait = _backoff(attempt)
+            if wait > MAX_WAIT:
+                print(f"  [HTTP] {host}: HTTP {res.status_code}, asked to wait {wait:.0f}s — giving up")
+                return res
+            if res.status_code == 429:
+                print(f"  [HTTP] {host}: rate limited, backing off {wait:.0f}s")
+                bucket.pause(wait)
+                wait = 0.0
+        attempt += 1
+        _record_retry(host)
+        if wait:
+            time.sleep(wait)
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+class HostStats:
+    __slots__ = ("requests", "retries", "errors", "bytes", "seconds", "statuses")
+
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.statuses: Dict[int, int] = {}
+
+
+_stats: Dict[str, HostStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _wire_bytes(res: requests.Response) -> int:
+    """Bytes read off the socket for a response body (compressed size), else its decoded size."""
+    try:
+        return int(res.raw.tell())
+    except Exception:
+        return len(res.content or b"")
+
+
+def _record(host: str, seconds: float, nbytes: int, status: Optional[int]):
+    with _stats_lock:
+        stats = _stats.get(host)
+        if stats is None:
+            stats = _stats[host] = HostStats()
+        stats.requests += 1
+        stats.seconds += seconds
+        stats.bytes += nbytes
+        if status is None:
+            stats.errors += 1
+        else:
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+
+def _record_retry(host: str):
+    with _stats_lock:
+        _stats[host].retries += 1
+
+
+def http_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-host request counts, retries, connection errors, wire bytes, latency and statuses."""
+    with _stats_lock:
+        return {
+            host: {
+                "requests": s.requests,
+                "retries": s.retries,
+                "errors": s.errors,
+                "bytes": s.bytes,
+                "avg_latency": s.seconds / s.requests if s.requests else 0.0,
+                "statuses": dict(s.statuses),
+            }
+            for host, s in _stats.items()
+        }
+
+
+def reset_http_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def format_http_stats(top: int = 15) -> str:
+    """Summary table of http_stats(), busiest hosts first."""
+    stats = sorted(http_stats().items(), key=lambda kv: -kv[1]["requests"])
+    lines = []
+    for host, s in stats[:top]:
+        throttled = s["statuses"].get(429, 0)
+        lines.append(
+            f"  {host}: {s['requests']} req, {s['bytes'] / 1e6:.1f} MB, {s['avg_latency'] * 1000:.0f} ms avg"
+            + (f", {s['retries']} retries" if s["retries"] else "")
+            + (f", {throttled}×429" if throttled else "")
+            + (f", {s['errors']} errors" if s["errors"] else "")
+        )
+    if len(stats) > top:
+        lines.append(f"  ... {len(stats) - top} more hosts")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Source runner
+# ---------------------------------------------------------------------------
+
+class SourceResult:
+    __slots__ = ("name", "posts", "error", "seconds")
+
+    def __init__(self, name: str, posts: List[Dict[str, Any]], error: Optional[str], seconds: float):
+        self.name = name
+        self.posts = posts
+        self.error = error
+        self.seconds = seconds
+
+
+def _run_one(name: str, fn: Callable[[], List[Dict[str, Any]]]) -> SourceResult:
+    start = time.monotonic()
+    try:
+        posts = fn() or []
+        return SourceResult(name, posts, None, time.monotonic() - start)
+    except Exception as e:
+        return SourceResult(name, [], str(e), time.monotonic() - start)
+
+
+def run_sources(
+    sources: Sequence[Tuple[str, Callable[[], List[Dict[str, Any]]]]],
+    workers: Optional[int] = None,
+) -> List[SourceResult]:
+    """Run (name, scraper) pairs concurrently; results come back in the order given."""
+    workers = workers or int(os.getenv("SS_SCRAPE_WORKERS", "0")) or len(sources) or 1
+    if workers <= 1:
+        return [_run_one(name, fn) for name, fn in sources]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape") as pool:
+        futures = [pool.submit(_run_one, name, fn) for name, fn in sources]
+        return [f.result() for f in futures]
@@ -3,16 +3,19 @@
 # This scraper pulls indexed tweets from Google News RSS (site:x.com queries),
 # which reliably captures public tweets about collectibles topics.
 
-import requests
 import json
 import os
 import re
-import time
 import xml.etree.ElementTree as ET
 from datetime import datetime
 from urllib.parse import quote
 from bs4 import BeautifulSoup
 
+try:
+    from utils.scrape_runtime import http_get
+except ImportError:
+    from scrape_runtime import http_get
+
 # Search queries — "site:x.com" restricts Google to indexed tweets
 SEARCH_QUERIES = [
     # eBay core
@@ -78,7 +81,7 @@ def _parse_google_news_rss(rss_url: str, search_term: str) -> list:
     """Fetch and parse a Google News RSS feed, extracting tweet-like content."""
     posts = []
     try:
-        r = requests.get(rss_url, headers=HEADERS, timeout=15)
+        r = http_get(rss_url, headers=HEADERS, timeout=15)
         if r.status_code != 200:
             return posts
 
@@ -152,7 +155,6 @@ def scrape_twitter_search() -> list:
         posts = _parse_google_news_rss(rss_url, query)
         all_posts.extend(posts)
         print(f"    '{query}': {len(posts)} tweets")
-        time.sleep(1.0)
 
     return all_posts
 
@@ -169,7 +171,6 @@ def scrape_twitter_accounts() -> list:
         posts = _parse_google_news_rss(rss_url, f"@{account}")
         all_posts.extend(posts)
         print(f"    @{account}: {len(posts)} tweets")
-        time.sleep(1.0)
 
     return all_posts
 
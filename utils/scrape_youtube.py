@@ -3,7 +3,6 @@
 # YouTube Data API v3 for search/comments (requires YOUTUBE_API_KEY in .env).
 # Falls back to RSS feeds if no API key is set.
 
-import requests
 import json
 import os
 import re
@@ -13,6 +12,11 @@ from datetime import datetime
 from urllib.parse import quote, urlparse, parse_qs
 from dotenv import load_dotenv
 
+try:
+    from utils.scrape_runtime import http_get
+except ImportError:
+    from scrape_runtime import http_get
+
 load_dotenv()
 
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
@@ -146,7 +150,7 @@ def _get_video_comments_api(video_id, max_comments=20):
     }
 
     try:
-        r = requests.get(url, params=params, timeout=15)
+        r = http_get(url, params=params, timeout=15)
         if r.status_code != 200:
             return []
 
@@ -183,7 +187,7 @@ def _search_videos_api(query, max_results=10):
     }
 
     try:
-        r = requests.get(url, params=params, timeout=15)
+        r = http_get(url, params=params, timeout=15)
         if r.status_code != 200:
             return []
 
@@ -211,7 +215,7 @@ def _get_channel_videos_rss(channel_id, channel_name):
     rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
 
     try:
-        r = requests.get(rss_url, headers=HEADERS, timeout=15)
+        r = http_get(rss_url, headers=HEADERS, timeout=15)
         if r.status_code != 200:
             return []
 
@@ -265,7 +269,6 @@ def scrape_channel_videos():
         videos = _get_channel_videos_rss(channel_id, name)
         all_videos.extend(videos)
         print(f"    {name}: {len(videos)} videos")
-        time.sleep(0.5)
 
     return all_videos
 
@@ -287,7 +290,6 @@ def scrape_search_videos():
                 seen_ids.add(v["video_id"])
                 all_videos.append(v)
         print(f"    '{query}': {len(videos)} videos")
-        time.sleep(0.5)
 
     return all_videos
 